@@ -0,0 +1,89 @@
+/**
+ * 인증 onRequest 훅의 요청당 오버헤드 마이크로벤치마크
+ *
+ * 같은 앱에서 skipAuth 라우트와 인증 라우트를 fastify.inject로 번갈아 호출하고,
+ * 두 라우트의 요청당 평균 시간 차이를 인증 비용으로 본다.
+ * - verify: 토큰 캐시 비활성화 (매 요청 jwt.verify)
+ * - cached: 검증된 토큰 캐시 사용
+ * - *+debug: debug 레벨 로깅을 켰을 때
+ *
+ * 사용 예:
+ *   node benchmarks/auth.bench.js
+ *   node benchmarks/auth.bench.js --iterations 50000
+ */
+
+const { Writable } = require("stream");
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+
+process.env.JWT_SECRET = process.env.JWT_SECRET || "bench-jwt-secret";
+delete process.env.DISABLE_JWT_AUTH;
+
+const authPlugin = require("../src/plugins/auth");
+const { VerifiedTokenCache } = require("../src/services/tokenCache");
+
+const iterationsArg = process.argv.indexOf("--iterations");
+const ITERATIONS = iterationsArg > 0 ? parseInt(process.argv[iterationsArg + 1], 10) : 20000;
+const WARMUP = Math.min(2000, ITERATIONS);
+
+// 로그는 직렬화 비용까지만 측정하고 버린다
+const discard = new Writable({
+  write(chunk, encoding, callback) {
+    callback();
+  },
+});
+
+async function buildApp({ cacheSize, level }) {
+  const app = fastify({ logger: { level, stream: discard } });
+  await app.register(authPlugin, { tokenCache: new VerifiedTokenCache({ maxEntries: cacheSize }) });
+  app.get("/open", { config: { skipAuth: true } }, async () => ({ ok: true }));
+  app.get("/secure", async () => ({ ok: true }));
+  await app.ready();
+  return app;
+}
+
+async function timePerRequest(app, url, headers) {
+  for (let i = 0; i < WARMUP; i += 1) {
+    await app.inject({ method: "GET", url, headers });
+  }
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i += 1) {
+    await app.inject({ method: "GET", url, headers });
+  }
+  return Number(process.hrtime.bigint() - start) / ITERATIONS / 1000;
+}
+
+async function main() {
+  const token = jwt.sign({ user_id: "bench-user", username: "bench" }, process.env.JWT_SECRET, {
+    expiresIn: "1h",
+  });
+  const headers = { authorization: `Bearer ${token}` };
+
+  const variants = [
+    { name: "verify", cacheSize: 0, level: "info" },
+    { name: "cached", cacheSize: 1000, level: "info" },
+    { name: "verify+debug", cacheSize: 0, level: "debug" },
+    { name: "cached+debug", cacheSize: 1000, level: "debug" },
+  ];
+
+  console.log(`iterations: ${ITERATIONS} (node ${process.version})`);
+  const results = [];
+  for (const variant of variants) {
+    const app = await buildApp(variant);
+    const openUs = await timePerRequest(app, "/open", {});
+    const secureUs = await timePerRequest(app, "/secure", headers);
+    await app.close();
+    results.push({
+      variant: variant.name,
+      "request µs (skipAuth)": openUs.toFixed(2),
+      "request µs (auth)": secureUs.toFixed(2),
+      "auth overhead µs": (secureUs - openUs).toFixed(2),
+    });
+  }
+  console.table(results);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
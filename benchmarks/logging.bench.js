@@ -0,0 +1,84 @@
+/**
+ * 요청 로깅 방식별 처리량 벤치마크
+ *
+ * 같은 라우트를 fastify.inject로 반복 호출해 로깅 방식마다 초당 요청 수를 비교한다.
+ * 로그는 /dev/null에 실제로 써서 stdout과 같은 write syscall 비용을 포함한다.
+ * - off: 로깅 없음
+ * - sync: 기존 방식 (Fastify 기본 요청 로그 2줄, 줄마다 동기 write)
+ * - buffered: 요청당 1줄, BufferedLogStream으로 모아서 비동기 write
+ * - sampled: buffered + 성공 응답 1% 샘플링 (LOG_SAMPLE_RATE=0.01)
+ *
+ * 사용 예:
+ *   node benchmarks/logging.bench.js
+ *   node benchmarks/logging.bench.js --iterations 50000
+ */
+
+const fs = require("fs");
+const fastify = require("fastify");
+const requestLogPlugin = require("../src/plugins/requestLog");
+const { BufferedLogStream } = require("../src/services/logStream");
+
+const iterationsArg = process.argv.indexOf("--iterations");
+const ITERATIONS = iterationsArg > 0 ? parseInt(process.argv[iterationsArg + 1], 10) : 20000;
+const WARMUP = Math.min(2000, ITERATIONS);
+
+const devNull = fs.openSync("/dev/null", "w");
+
+// pino 기본 destination(stdout)처럼 줄마다 동기로 쓰는 스트림
+const syncStream = {
+  write(chunk) {
+    fs.writeSync(devNull, chunk);
+    return true;
+  },
+};
+
+async function buildApp({ mode }) {
+  const buffered = mode === "buffered" || mode === "sampled";
+  const stream = buffered ? new BufferedLogStream({ fd: devNull }) : syncStream;
+  const app = fastify({
+    logger: mode === "off" ? false : { level: "info", stream },
+    disableRequestLogging: buffered,
+  });
+  if (buffered) {
+    await app.register(requestLogPlugin, { sampleRate: mode === "sampled" ? 0.01 : 1 });
+  }
+  app.get("/questions", async () => ({ items: [{ question_number: "0001", topic_id: "AWS_DVA" }] }));
+  await app.ready();
+  return { app, stream: buffered ? stream : null };
+}
+
+async function requestsPerSecond(app) {
+  for (let i = 0; i < WARMUP; i += 1) {
+    await app.inject({ method: "GET", url: "/questions" });
+  }
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i += 1) {
+    await app.inject({ method: "GET", url: "/questions" });
+  }
+  return ITERATIONS / (Number(process.hrtime.bigint() - start) / 1e9);
+}
+
+async function main() {
+  console.log(`iterations: ${ITERATIONS} (node ${process.version})`);
+  const results = [];
+  let baseline = null;
+  for (const mode of ["off", "sync", "buffered", "sampled"]) {
+    const { app, stream } = await buildApp({ mode });
+    const rps = await requestsPerSecond(app);
+    await app.close();
+    await stream?.close();
+    baseline = baseline ?? rps;
+    results.push({
+      mode,
+      "requests/sec": Math.round(rps),
+      "vs off": `${((rps / baseline) * 100).toFixed(1)}%`,
+      ...(stream && { "log flushes": stream.stats().flushes }),
+    });
+  }
+  console.table(results);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+배포 스크립트 공용 AWS 세션 및 인프라 값 조회
+
+하나의 boto3 Session과 커넥션 풀/재시도가 조정된 클라이언트를 재사용하고,
+서로 독립적인 인프라 값(EC2 IP, API Gateway ID, ECR URI, 배포할 이미지 digest 등)을
+스레드 풀에서 동시에 조회한다. 결과는 짧은 TTL의 로컬 파일에 캐시되어
+파이프라인의 이후 단계가 다시 AWS를 호출하지 않고 재사용한다 (릴리스 이미지처럼
+푸시마다 바뀌는 값은 제외).
+
+CI 사용 예:
+    python scripts/aws_session.py api_gateway_id --require ec2_public_ip --github-env
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+CACHE_FILE = Path(__file__).resolve().parent.parent / '.aws_values.json'
+CACHE_TTL_SECONDS = int(os.getenv('AWS_VALUES_TTL_SECONDS', '600'))
+# build_and_push.py가 빌드(또는 캐시 재사용)한 이미지로 옮기는 고정 태그. 앱 변경 없는 배포는 이 태그의 이미지를 쓴다
+RELEASE_TAG = os.getenv('RELEASE_TAG', 'main')
+
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '20')),
+    retries={'mode': 'adaptive', 'max_attempts': int(os.getenv('AWS_MAX_ATTEMPTS', '5'))},
+    connect_timeout=5,
+    read_timeout=30,
+    tcp_keepalive=True,
+)
+
+_session = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_region():
+    return os.getenv('AWS_REGION', 'ap-northeast-2')
+
+
+def get_environment():
+    return os.getenv('ENVIRONMENT', 'prod')
+
+
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            _session = boto3.session.Session(region_name=get_region())
+        return _session
+
+
+def get_client(service_name):
+    """서비스별 클라이언트를 한 번만 생성해 재사용 (boto3 클라이언트는 스레드 안전)"""
+    session = get_session()
+    with _lock:
+        if service_name not in _clients:
+            _clients[service_name] = session.client(service_name, config=BOTO_CONFIG)
+        return _clients[service_name]
+
+
+def ecr_repository_name():
+    return f"quiznox-{get_environment()}"
+
+
+def resolve_aws_account_id():
+    return get_client('sts').get_caller_identity()['Account']
+
+
+def resolve_ec2_public_ip():
+    resp = get_client('ec2').describe_instances(Filters=[
+        {'Name': 'tag:Name', 'Values': [f"authcore-k8s-node-{get_environment()}"]},
+        {'Name': 'instance-state-name', 'Values': ['running']},
+    ])
+    for reservation in resp.get('Reservations', []):
+        for instance in reservation.get('Instances', []):
+            if instance.get('PublicIpAddress'):
+                return instance['PublicIpAddress']
+    return ''
+
+
+def resolve_api_gateway_id():
+    client = get_client('apigatewayv2')
+    params = {}
+    while True:
+        resp = client.get_apis(**params)
+        for api in resp.get('Items', []):
+            if 'quiznox' in api.get('Name', '').lower():
+                return api['ApiId']
+        if not resp.get('NextToken'):
+            return ''
+        params['NextToken'] = resp['NextToken']
+
+
+def resolve_ecr_repository_uri():
+    resp = get_client('ecr').describe_repositories(repositoryNames=[ecr_repository_name()])
+    repositories = resp.get('repositories', [])
+    return repositories[0]['repositoryUri'] if repositories else ''
+
+
+def resolve_release_image_digest():
+    """RELEASE_TAG가 가리키는 이미지의 digest (imagePushedAt은 재태깅 시 바뀌지 않으므로 태그로 찾는다)"""
+    try:
+        resp = get_client('ecr').describe_images(
+            repositoryName=ecr_repository_name(), imageIds=[{'imageTag': RELEASE_TAG}],
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ImageNotFoundException':
+            return ''
+        raise
+    images = resp.get('imageDetails', [])
+    return images[0]['imageDigest'] if images else ''
+
+
+# 푸시마다 바뀌는 값은 TTL 안에서도 달라질 수 있으므로 캐시하지 않고 항상 조회한다
+UNCACHED_KEYS = {'release_image_digest'}
+
+RESOLVERS = {
+    'aws_account_id': resolve_aws_account_id,
+    'ec2_public_ip': resolve_ec2_public_ip,
+    'api_gateway_id': resolve_api_gateway_id,
+    'ecr_repository_uri': resolve_ecr_repository_uri,
+    'release_image_digest': resolve_release_image_digest,
+}
+
+
+def cache_scope():
+    return f"{get_region()}/{get_environment()}"
+
+
+def read_cache():
+    try:
+        data = json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get('scope') != cache_scope():
+        return {}
+    now = time.time()
+    return {
+        key: entry['value'] for key, entry in data.get('values', {}).items()
+        if key not in UNCACHED_KEYS and now - entry.get('resolved_at', 0) < CACHE_TTL_SECONDS
+    }
+
+
+def write_cache(values):
+    try:
+        data = json.loads(CACHE_FILE.read_text())
+        if data.get('scope') != cache_scope():
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    now = time.time()
+    entries = data.get('values', {})
+    entries.update({key: {'value': value, 'resolved_at': now} for key, value in values.items()})
+    try:
+        CACHE_FILE.write_text(json.dumps({'scope': cache_scope(), 'values': entries}, indent=2))
+    except OSError:
+        pass
+
+
+def result_or_empty(key, future):
+    """조회 실패(리소스 없음, 권한 부족 등)는 빈 값으로 보고 호출 측에서 판단하게 한다"""
+    try:
+        return future.result()
+    except (BotoCoreError, ClientError) as e:
+        print(f"Failed to resolve {key}: {e}", file=sys.stderr)
+        return ''
+
+
+def resolve_values(keys, use_cache=True):
+    """요청한 값들을 캐시에서 찾고, 없는 값만 스레드 풀에서 동시에 조회"""
+    cached = read_cache() if use_cache else {}
+    values = {key: cached[key] for key in keys if key in cached}
+    missing = [key for key in keys if key not in values]
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            futures = {key: pool.submit(RESOLVERS[key]) for key in missing}
+            resolved = {key: result_or_empty(key, future) for key, future in futures.items()}
+        # 빈 값은 '아직 없음'일 수 있으므로 캐시하지 않는다
+        write_cache({key: value for key, value in resolved.items() if value and key not in UNCACHED_KEYS})
+        values.update(resolved)
+    return values
+
+
+def resolve_value(key, use_cache=True):
+    return resolve_values([key], use_cache)[key]
+
+
+def export_github_env(values):
+    """GITHUB_ENV/GITHUB_OUTPUT에 KEY=value 형식으로 기록 (빈 값은 생략)"""
+    lines = [f"{key.upper()}={value}" for key, value in values.items() if value]
+    for variable in ('GITHUB_ENV', 'GITHUB_OUTPUT'):
+        path = os.getenv(variable)
+        if path:
+            with open(path, 'a') as f:
+                f.write(''.join(f"{line}\n" for line in lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve AWS infrastructure values concurrently')
+    parser.add_argument('keys', nargs='*', choices=sorted(RESOLVERS))
+    parser.add_argument('--no-cache', action='store_true', help='캐시 파일을 무시하고 다시 조회')
+    parser.add_argument('--github-env', action='store_true', help='GITHUB_ENV/GITHUB_OUTPUT에 결과 기록')
+    parser.add_argument('--require', nargs='+', default=[], choices=sorted(RESOLVERS), help='비어 있으면 실패로 처리할 값')
+    args = parser.parse_args()
+
+    keys = list(dict.fromkeys(args.keys + args.require))
+    start = time.perf_counter()
+    values = resolve_values(keys, use_cache=not args.no_cache)
+    print(f"Resolved {len(values)} value(s) in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    for key, value in values.items():
+        print(f"{key.upper()}={value}")
+    if args.github_env:
+        export_github_env(values)
+
+    missing = [key for key in args.require if not values.get(key)]
+    for key in missing:
+        print(f"::error::{key.upper()} could not be resolved. Ensure cluster-infra has been applied.")
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
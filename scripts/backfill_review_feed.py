@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+QuizNox_Reviews 최신순 목록 GSI 마이그레이션
+
+GET /reviews는 review_feed(상수 파티션 키) + created_at(정렬 키) GSI를 Query한다.
+GSI 추가 전에 저장된 후기에는 review_feed가 없으므로, 테이블을 병렬 세그먼트로
+Scan하면서 누락된 항목에만 조건부 UpdateItem으로 review_feed를 채운다.
+여러 번 실행해도 안전하다 (이미 채워진 항목/삭제된 항목은 건너뜀).
+
+GSI 자체는 cluster-infra에서 추가한다:
+    IndexName=review_feed-created_at-index, HASH review_feed(S), RANGE created_at(S), Projection ALL
+
+사용 예:
+    python scripts/backfill_review_feed.py --dry-run
+    python scripts/backfill_review_feed.py --segments 8
+    AWS_ENDPOINT_URL_DYNAMODB=http://127.0.0.1:8000 python scripts/backfill_review_feed.py  # 로컬 대체 서버
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from aws_session import get_client
+
+REVIEW_FEED = 'ALL'
+INDEX_NAME = 'review_feed-created_at-index'
+DEFAULT_SEGMENTS = 8
+PAGE_SIZE = 500
+
+
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    NC = '\033[0m'
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+
+def index_status(client, table_name, index_name=INDEX_NAME):
+    """GSI 상태 (ACTIVE/CREATING/...) 또는 없으면 빈 문자열"""
+    table = client.describe_table(TableName=table_name)['Table']
+    for index in table.get('GlobalSecondaryIndexes', []):
+        if index['IndexName'] == index_name:
+            return index.get('IndexStatus', '')
+    return ''
+
+def backfill_segment(client, table_name, segment, total_segments, dry_run=False, page_size=PAGE_SIZE):
+    """한 세그먼트를 Scan하며 review_feed가 없는 항목을 채우고 처리 건수를 반환"""
+    counts = {'scanned': 0, 'missing': 0, 'updated': 0, 'skipped': 0}
+    params = {
+        'TableName': table_name,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'Limit': page_size,
+        'ProjectionExpression': 'review_id, review_feed, created_at',
+    }
+    while True:
+        resp = client.scan(**params)
+        items = resp.get('Items', [])
+        counts['scanned'] += len(items)
+        for item in items:
+            # created_at이 없는 항목은 GSI에 들어갈 수 없으므로(sparse) 대상에서 제외
+            if 'review_feed' in item or 'created_at' not in item:
+                continue
+            counts['missing'] += 1
+            if dry_run:
+                continue
+            try:
+                client.update_item(
+                    TableName=table_name,
+                    Key={'review_id': item['review_id']},
+                    UpdateExpression='SET review_feed = :feed',
+                    ConditionExpression='attribute_exists(review_id) AND attribute_not_exists(review_feed)',
+                    ExpressionAttributeValues={':feed': {'S': REVIEW_FEED}},
+                )
+                counts['updated'] += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # 그 사이 삭제되었거나 새 코드가 이미 기록한 항목
+                counts['skipped'] += 1
+        if 'LastEvaluatedKey' not in resp:
+            return counts
+        params['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def backfill(client, table_name, segments=DEFAULT_SEGMENTS, dry_run=False, page_size=PAGE_SIZE):
+    """세그먼트별 병렬 Scan/Update. 합계와 세그먼트별 소요 시간을 반환"""
+    def run(segment):
+        start = time.perf_counter()
+        counts = backfill_segment(client, table_name, segment, segments, dry_run, page_size)
+        return segment, counts, time.perf_counter() - start
+
+    totals = {'scanned': 0, 'missing': 0, 'updated': 0, 'skipped': 0}
+    timings = {}
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        for segment, counts, seconds in pool.map(run, range(segments)):
+            for key, value in counts.items():
+                totals[key] += value
+            timings[segment] = seconds
+    return totals, timings
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Backfill review_feed for the reviews list index')
+    parser.add_argument('--table', default=os.getenv('DYNAMODB_REVIEWS_TABLE_NAME', 'QuizNox_Reviews'))
+    parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS, help='병렬 Scan 세그먼트 수')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help='채워야 할 항목 수만 집계')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("=" * 60)
+    print("🔄 QuizNox Reviews review_feed Backfill")
+    print("=" * 60)
+
+    client = get_client('dynamodb')
+    status = index_status(client, args.table)
+    if status:
+        print_info(f"Index {INDEX_NAME}: {status}")
+    else:
+        print_info(f"Index {INDEX_NAME} not found on {args.table} (add it in cluster-infra; the API falls back to Scan until then)")
+
+    start = time.perf_counter()
+    totals, timings = backfill(client, args.table, args.segments, args.dry_run, args.page_size)
+    elapsed = time.perf_counter() - start
+
+    print_info(f"Scanned {totals['scanned']} reviews in {args.segments} segments ({elapsed:.2f}s, "
+               f"slowest segment {max(timings.values()):.2f}s)")
+    if args.dry_run:
+        print_success(f"Dry run: {totals['missing']} reviews need review_feed")
+    else:
+        print_success(f"Updated {totals['updated']} reviews ({totals['skipped']} skipped)")
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
@@ -3,10 +3,21 @@
 Podman으로 이미지를 빌드하고 ECR에 푸시하는 스크립트
 """
 
+import hashlib
 import os
+import re
 import subprocess
 import sys
-import boto3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from botocore.exceptions import ClientError
+
+from aws_session import RELEASE_TAG, get_client, resolve_value
+
+PLATFORM = 'linux/amd64'
+CONTEXT_TAG_PREFIX = 'ctx-'
+HASH_WORKERS = 8
 
 class Colors:
     RED = '\033[0;31m'
@@ -33,17 +44,146 @@ def run_command(cmd, check=True, cwd=None):
             print_error(e.stderr)
         sys.exit(1)
 
+def load_dockerignore(project_root):
+    """.dockerignore 규칙을 (패턴, 제외 여부) 목록으로 읽는다 (뒤에 오는 규칙이 우선)"""
+    path = os.path.join(project_root, '.dockerignore')
+    if not os.path.exists(path):
+        return []
+    rules = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            excluded = not line.startswith('!')
+            pattern = line.lstrip('!').strip().strip('/')
+            rules.append((os.path.normpath(pattern), excluded))
+    return rules
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern):
+    """.dockerignore 패턴을 정규식으로 변환 (Go filepath.Match 기준: *와 ?는 /를 넘지 않고, **는 0개 이상의 경로 구간)"""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**', i):
+            i += 2
+            if pattern.startswith('/', i):
+                regex += '(?:.*/)?'
+                i += 1
+            else:
+                regex += '.*'
+            continue
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end < 0:
+                regex += re.escape(char)
+            else:
+                # 문자 클래스([a-z], [^0-9])는 정규식과 문법이 같다
+                regex += pattern[i:end + 1]
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return re.compile(f'^{regex}$')
+
+def pattern_matches(pattern, rel_path):
+    regex = compile_pattern(pattern)
+    parts = rel_path.split('/')
+    # 디렉토리 패턴은 하위 파일 전체에 적용된다 (상위 경로 중 하나라도 일치하면 제외)
+    return any(regex.match('/'.join(parts[:i])) for i in range(1, len(parts) + 1))
+
+def is_ignored(rel_path, rules):
+    ignored = False
+    for pattern, excluded in rules:
+        if pattern_matches(pattern, rel_path):
+            ignored = excluded
+    return ignored
+
+def list_context_files(project_root, rules):
+    files = []
+    for root, dirs, names in os.walk(project_root):
+        rel_root = os.path.relpath(root, project_root)
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in names:
+            rel_path = os.path.normpath(os.path.join(rel_root, name)).replace(os.sep, '/')
+            # Dockerfile은 ignore 여부와 관계없이 빌드 결과를 결정하므로 항상 포함
+            if rel_path == 'Dockerfile' or not is_ignored(rel_path, rules):
+                files.append(rel_path)
+    return sorted(files)
+
+def hash_file(project_root, rel_path):
+    full_path = os.path.join(project_root, rel_path)
+    digest = hashlib.sha256()
+    with open(full_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    executable = os.access(full_path, os.X_OK)
+    return f"{rel_path}\0{int(executable)}\0{digest.hexdigest()}\n"
+
+def compute_context_digest(project_root):
+    """.dockerignore를 반영한 빌드 컨텍스트의 내용 기반 digest (파일 해시는 병렬 계산)"""
+    files = list_context_files(project_root, load_dockerignore(project_root))
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        entries = list(pool.map(lambda rel_path: hash_file(project_root, rel_path), files))
+    digest = hashlib.sha256(f"platform={PLATFORM}\n".encode())
+    for entry in entries:
+        digest.update(entry.encode())
+    return digest.hexdigest(), len(files)
+
+def find_image_manifest(ecr, repository_name, image_tag):
+    """ECR에서 태그로 이미지 manifest를 조회 (없으면 None)"""
+    try:
+        resp = ecr.batch_get_image(repositoryName=repository_name, imageIds=[{'imageTag': image_tag}])
+    except ClientError as e:
+        print_info(f"ECR lookup failed: {e}")
+        return None
+    images = resp.get('images', [])
+    return images[0] if images else None
+
+def retag_image(ecr, repository_name, image, new_tag):
+    """manifest API로 기존 이미지에 태그 추가 (pull/push 없이)"""
+    params = {'repositoryName': repository_name, 'imageManifest': image['imageManifest'], 'imageTag': new_tag}
+    if image.get('imageManifestMediaType'):
+        params['imageManifestMediaType'] = image['imageManifestMediaType']
+    try:
+        ecr.put_image(**params)
+    except ClientError as e:
+        # 같은 manifest에 같은 태그가 이미 있으면 재태깅할 필요가 없다
+        if e.response['Error']['Code'] != 'ImageAlreadyExistsException':
+            raise
+
+def resolve_cache_repository(ecr, ecr_repo_name, repository_uri):
+    """레이어 캐시용 ECR 저장소 (BUILD_CACHE_REPOSITORY 또는 '<repo>-cache'가 존재할 때만 사용)"""
+    cache_repo = os.getenv('BUILD_CACHE_REPOSITORY', '')
+    if cache_repo:
+        return cache_repo
+    try:
+        ecr.describe_repositories(repositoryNames=[f"{ecr_repo_name}-cache"])
+        return f"{repository_uri}-cache"
+    except ClientError:
+        return ''
+
 def main():
     print("🚀 Building and pushing image with Podman...")
 
     aws_region = os.getenv('AWS_REGION', 'ap-northeast-2')
     environment = os.getenv('ENVIRONMENT', 'prod')
     image_tag = os.getenv('IMAGE_TAG', 'latest')
+    force_build = os.getenv('FORCE_BUILD', 'false') == 'true'
     ecr_repo_name = f"quiznox-{environment}"
 
-    sts = boto3.client('sts')
-    aws_account_id = sts.get_caller_identity()['Account']
+    aws_account_id = resolve_value('aws_account_id')
     repository_uri = f"{aws_account_id}.dkr.ecr.{aws_region}.amazonaws.com/{ecr_repo_name}"
+    ecr = get_client('ecr')
 
     print_info(f"ECR Repository: {ecr_repo_name}")
     print_info(f"Image Tag: {image_tag}")
@@ -56,17 +196,44 @@ def main():
         print_error("Dockerfile not found")
         sys.exit(1)
 
-    print_info("Logging in to ECR...")
-    run_command(f"aws ecr get-login-password --region {aws_region} | podman login --username AWS --password-stdin {repository_uri}")
-
-    print_info("Building image...")
-    run_command(f"podman build --platform linux/amd64 -t {ecr_repo_name}:{image_tag} .", cwd=project_root)
-    print_success("Image built successfully")
-
-    run_command(f"podman tag {ecr_repo_name}:{image_tag} {repository_uri}:{image_tag}")
-
-    print_info("Pushing image to ECR...")
-    run_command(f"podman push {repository_uri}:{image_tag}")
+    context_digest, file_count = compute_context_digest(project_root)
+    context_tag = f"{CONTEXT_TAG_PREFIX}{context_digest[:32]}"
+    print_info(f"Build context digest: {context_digest[:12]} ({file_count} files)")
+
+    cached_image = None if force_build else find_image_manifest(ecr, ecr_repo_name, context_tag)
+    if cached_image:
+        print_success(f"Image for this build context already exists ({context_tag}), skipping build and push")
+        retag_image(ecr, ecr_repo_name, cached_image, image_tag)
+        print_success(f"Tagged {context_tag} as {image_tag}")
+        release_image = cached_image
+    else:
+        print_info("Logging in to ECR...")
+        run_command(f"aws ecr get-login-password --region {aws_region} | podman login --username AWS --password-stdin {repository_uri}")
+
+        cache_repo = resolve_cache_repository(ecr, ecr_repo_name, repository_uri)
+        cache_args = f" --layers --cache-from {cache_repo} --cache-to {cache_repo}" if cache_repo else ''
+        if cache_repo:
+            print_info(f"Using registry layer cache: {cache_repo}")
+
+        print_info("Building image...")
+        run_command(f"podman build --platform {PLATFORM}{cache_args} -t {ecr_repo_name}:{image_tag} .", cwd=project_root)
+        print_success("Image built successfully")
+
+        run_command(f"podman tag {ecr_repo_name}:{image_tag} {repository_uri}:{image_tag}")
+
+        print_info("Pushing image to ECR...")
+        run_command(f"podman push {repository_uri}:{image_tag}")
+
+        pushed_image = find_image_manifest(ecr, ecr_repo_name, image_tag)
+        if pushed_image:
+            retag_image(ecr, ecr_repo_name, pushed_image, context_tag)
+            print_info(f"Tagged {image_tag} as {context_tag} for future builds")
+        release_image = pushed_image
+
+    # 재태깅은 imagePushedAt을 바꾸지 않으므로, 앱 변경 없는 배포가 쓸 이미지는 고정 태그로 가리킨다
+    if RELEASE_TAG and release_image:
+        retag_image(ecr, ecr_repo_name, release_image, RELEASE_TAG)
+        print_info(f"Moved {RELEASE_TAG} tag to {image_tag}")
 
     print_success(f"Image URI: {repository_uri}:{image_tag}")
 
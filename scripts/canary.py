@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+카나리 배포용 지연 비교 유틸리티
+
+새 이미지로 1개 replica의 quiznox-api-canary Deployment를 만들고(같은 app 라벨이므로
+Service 트래픽도 일부 받는다. 비교 기준은 CANARY_* 환경변수, canary_settings() 참고), 카나리 Pod와 기존(stable) Pod에 같은 시각 같은 요청을
+asyncio로 보내 경로별 p50/p95/오류율을 비교한다. 배포/승격/롤백은 deploy_to_k8s.py가 수행한다.
+
+Pod에는 status.podIP로 직접 요청하므로 Pod 네트워크에 닿는 곳(클러스터 노드 등)에서 실행해야 한다.
+(API 서버 proxy는 Authorization 헤더를 제거하므로 인증이 필요한 /questions를 측정할 수 없다)
+"""
+
+import asyncio
+import copy
+import os
+import time
+
+from http_probe import HttpConnectionPool, mint_jwt, percentile
+
+CANARY_SUFFIX = '-canary'
+TRACK_LABEL = 'track'
+CANARY_TRACK = 'canary'
+DEFAULT_PORT = 4000
+
+# 비교 기준 기본값. 실행 시 canary_settings()가 CANARY_* 환경변수로 덮어쓴다
+DEFAULT_SETTINGS = {
+    'duration': 30.0,
+    'rate': 10.0,
+    'paths': ['/health', '/questions?topicId=AWS_DVA'],
+    'timeout': 5.0,
+    'max_p50_increase': 0.2,
+    'max_p95_increase': 0.3,
+    'latency_slack_ms': 5.0,
+    'max_error_rate_increase': 0.01,
+}
+SETTINGS_ENV = {
+    'duration': 'CANARY_DURATION_SECONDS',
+    'rate': 'CANARY_RATE',
+    'paths': 'CANARY_PATHS',
+    'timeout': 'CANARY_REQUEST_TIMEOUT_SECONDS',
+    'max_p50_increase': 'CANARY_MAX_P50_INCREASE',
+    'max_p95_increase': 'CANARY_MAX_P95_INCREASE',
+    'latency_slack_ms': 'CANARY_LATENCY_SLACK_MS',
+    'max_error_rate_increase': 'CANARY_MAX_ERROR_RATE_INCREASE',
+}
+
+
+def canary_settings():
+    """환경변수를 반영한 비교 기준 (deploy_to_k8s.py main에서 호출)"""
+    settings = dict(DEFAULT_SETTINGS)
+    for key, name in SETTINGS_ENV.items():
+        value = os.getenv(name, '')
+        if value:
+            settings[key] = [path for path in value.split(',') if path] if key == 'paths' else float(value)
+    return settings
+
+
+def canary_name(name):
+    return name + CANARY_SUFFIX
+
+
+def stable_selector(app_label):
+    """stable Pod만 고르는 label selector (track 라벨이 없거나 canary가 아닌 Pod)"""
+    return f"app={app_label},{TRACK_LABEL}!={CANARY_TRACK}"
+
+
+def build_canary_deployment(stable):
+    """stable Deployment를 복사해 replica 1개, track=canary 라벨의 카나리 Deployment를 만든다.
+    카나리 selector에는 track을 더해 stable Pod를 포함하지 않게 하고, app 라벨은 그대로 두어
+    Service가 카나리 Pod에도 트래픽을 보내게 한다.
+    stable selector(app=...)는 변경할 수 없으므로 카나리 Pod도 포함한다: ReplicaSet은 ownerReference로
+    자기 Pod만 관리하지만 HPA 지표와 `kubectl -l app=...`에는 카나리가 섞이므로,
+    stable Pod만 볼 때는 stable_selector()를 쓴다."""
+    canary = copy.deepcopy(stable)
+    metadata = canary['metadata']
+    metadata['name'] = canary_name(metadata['name'])
+    metadata.setdefault('labels', {})[TRACK_LABEL] = CANARY_TRACK
+    metadata.pop('annotations', None)
+    spec = canary['spec']
+    spec['replicas'] = 1
+    spec['selector'].setdefault('matchLabels', {})[TRACK_LABEL] = CANARY_TRACK
+    spec['template']['metadata'].setdefault('labels', {})[TRACK_LABEL] = CANARY_TRACK
+    return canary
+
+
+def pod_is_ready(pod):
+    if pod['metadata'].get('deletionTimestamp'):
+        return False
+    conditions = pod.get('status', {}).get('conditions', [])
+    return any(c['type'] == 'Ready' and c.get('status') == 'True' for c in conditions)
+
+
+def pod_endpoint(pod):
+    """Pod의 http 컨테이너 포트로 가는 base URL"""
+    ports = [port for container in pod['spec'].get('containers', []) for port in container.get('ports', [])]
+    port = next((p['containerPort'] for p in ports if p.get('name') == 'http'), None)
+    port = port or (ports[0]['containerPort'] if ports else DEFAULT_PORT)
+    return f"http://{pod['status']['podIP']}:{port}"
+
+
+def track_endpoints(client, namespace, app_label):
+    """{'stable': {pod 이름: URL}, 'canary': {...}} (Ready이고 IP가 있는 Pod만)"""
+    tracks = {'stable': {}, 'canary': {}}
+    for pod in client.list('Pod', namespace, f"app={app_label}"):
+        if not pod_is_ready(pod) or not pod.get('status', {}).get('podIP'):
+            continue
+        labels = pod['metadata'].get('labels') or {}
+        track = 'canary' if labels.get(TRACK_LABEL) == CANARY_TRACK else 'stable'
+        tracks[track][pod['metadata']['name']] = pod_endpoint(pod)
+    return tracks
+
+
+def summarize_samples(samples):
+    """[(지연 ms, 성공 여부)] → 요청 수/오류율/p50/p95"""
+    latencies = sorted(latency for latency, ok in samples if ok)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+    }
+
+
+async def probe(tracks, paths, headers, rate, duration, timeout):
+    """
+    매 1/rate초마다 모든 track에 같은 경로를 동시에 요청한다 (경로와 Pod는 순서대로 돌아가며 선택).
+    같은 시각에 보내므로 DynamoDB 등 외부 요인의 변동이 두 track에 똑같이 반영된다.
+    반환: {track: {path: summary}}
+    """
+    pools = {
+        track: [HttpConnectionPool(url, 4) for url in endpoints.values()]
+        for track, endpoints in tracks.items() if endpoints
+    }
+    samples = {track: {path: [] for path in paths} for track in pools}
+
+    async def fire(track, pool, path):
+        start = time.perf_counter()
+        try:
+            status, _ = await asyncio.wait_for(pool.request('GET', path, headers), timeout)
+            ok = status < 400
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            ok = False
+        samples[track][path].append(((time.perf_counter() - start) * 1000, ok))
+
+    tasks = []
+    start = time.perf_counter()
+    for index in range(max(1, int(rate * duration))):
+        delay = start + index / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        path = paths[index % len(paths)]
+        for track, track_pools in pools.items():
+            pool = track_pools[(index // len(paths)) % len(track_pools)]
+            tasks.append(asyncio.create_task(fire(track, pool, path)))
+    if tasks:
+        await asyncio.wait(tasks)
+    for track_pools in pools.values():
+        for pool in track_pools:
+            await pool.close()
+
+    return {
+        track: {path: summarize_samples(path_samples) for path, path_samples in by_path.items()}
+        for track, by_path in samples.items()
+    }
+
+
+def latency_limit(stable_ms, increase, slack_ms):
+    """허용되는 카나리 지연: stable × (1 + increase) + slack (작은 값에서 측정 잡음으로 실패하지 않도록)"""
+    return round(stable_ms * (1 + increase) + slack_ms, 3)
+
+
+def compare(results, settings):
+    """경로별 검사 목록. stable 결과가 없으면(최초 배포) 카나리 오류율만 본다"""
+    checks = []
+    canary = results.get('canary', {})
+    stable = results.get('stable', {})
+    for path, current in canary.items():
+        baseline = stable.get(path)
+        baseline_errors = baseline['error_rate'] if baseline else 0
+        error_limit = round(baseline_errors + settings['max_error_rate_increase'], 4)
+        checks.append({
+            'path': path, 'metric': 'error_rate', 'stable': baseline_errors if baseline else None,
+            'canary': current['error_rate'], 'limit': error_limit,
+            'passed': current['requests'] > 0 and current['error_rate'] <= error_limit,
+        })
+        if not baseline:
+            continue
+        for metric, increase in (('p50_ms', settings['max_p50_increase']), ('p95_ms', settings['max_p95_increase'])):
+            if baseline[metric] is None:
+                continue
+            limit = latency_limit(baseline[metric], increase, settings['latency_slack_ms'])
+            checks.append({
+                'path': path, 'metric': metric, 'stable': baseline[metric], 'canary': current[metric],
+                'limit': limit, 'passed': current[metric] is not None and current[metric] <= limit,
+            })
+    return checks
+
+
+def evaluate(tracks, jwt_secret, settings=None):
+    """카나리/stable Pod를 측정하고 보고서(dict)를 반환. verdict는 'promote' 또는 'rollback'
+    settings에 없는 항목은 DEFAULT_SETTINGS 값을 쓴다"""
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    report = {
+        'pods': {track: sorted(endpoints) for track, endpoints in tracks.items()},
+        'settings': settings,
+    }
+    if not tracks.get('canary'):
+        return {**report, 'verdict': 'rollback', 'reason': 'no ready canary pod', 'results': {}, 'checks': []}
+
+    headers = {'Authorization': f"Bearer {mint_jwt(jwt_secret, 'canary-probe', 'canary-probe')}"}
+    results = asyncio.run(probe(
+        tracks, settings['paths'], headers, settings['rate'], settings['duration'], settings['timeout'],
+    ))
+    checks = compare(results, settings)
+    failed = [check for check in checks if not check['passed']]
+    return {
+        **report,
+        'verdict': 'rollback' if failed else 'promote',
+        'reason': '; '.join(f"{c['path']} {c['metric']} {c['canary']} > {c['limit']}" for c in failed) or None,
+        'results': results,
+        'checks': checks,
+    }
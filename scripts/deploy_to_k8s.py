@@ -3,14 +3,73 @@
 Kubernetes에 QuizNox API를 배포하는 스크립트
 """
 
+import argparse
+import base64
+import hashlib
 import os
 import re
-import subprocess
 import sys
 import json
-import boto3
+import time
+import yaml
 from pathlib import Path
 
+from aws_session import get_client
+from canary import build_canary_deployment, canary_settings, evaluate, stable_selector, track_endpoints
+from k8s_client import K8sApiError, get_cluster_client, object_ref
+from k8s_watch import wait_for_ready
+
+APPLIED_HASH_ANNOTATION = 'quiznox.io/applied-hash'
+# Pod template에 찍는 설정 해시: Secret/ConfigMap만 바뀌어도 Pod가 재시작되도록 한다
+CONFIG_HASH_ANNOTATION = 'quiznox.io/config-hash'
+CONFIG_KINDS = {'Secret', 'ConfigMap'}
+ECR_EXPIRES_ANNOTATION = 'quiznox.io/expires-at'
+ECR_SECRET_NAME = 'ecr-registry-secret'
+FIELD_MANAGER = 'quiznox-deploy'
+# 토큰 만료(12시간)까지 이 시간보다 적게 남았을 때만 ECR secret을 갱신한다
+ECR_REFRESH_WINDOW_SECONDS = 3600
+CLUSTER_SCOPED_KINDS = {'Namespace'}
+# 같은 apply 안에서도 의존 대상(네임스페이스, 설정)이 먼저 생성되도록 정렬
+APPLY_ORDER = ['Namespace', 'Secret', 'ConfigMap', 'Service', 'Deployment', 'HorizontalPodAutoscaler', 'PodDisruptionBudget']
+ROLLOUT_TIMEOUT_SECONDS = 300
+# DynamoDB 클라이언트 연결 풀/타임아웃/재시도 설정 (배포 환경변수로 덮어쓸 수 있음)
+DYNAMODB_CLIENT_DEFAULTS = {
+    'DYNAMODB_MAX_SOCKETS': '64',
+    'DYNAMODB_KEEP_ALIVE_MS': '15000',
+    'DYNAMODB_CONNECTION_TIMEOUT_MS': '1000',
+    'DYNAMODB_REQUEST_TIMEOUT_MS': '3000',
+    'DYNAMODB_MAX_ATTEMPTS': '3',
+    'DYNAMODB_RETRY_MODE': 'adaptive',
+    'DYNAMODB_WARM_CONNECTIONS': '2',
+}
+# Pod 안의 Node 프로세스 설정: ready 전에 캐시에 채울 topic,
+# SIGTERM 후 endpoint 제거를 기다렸다가 drain, 버퍼링 로그와 성공 요청 로그 샘플링(probe/스크레이프는 제외).
+# CLUSTER_WORKERS는 기본 비활성: CPU limit 200m에서는 auto도 워커 1개라 primary 프로세스 메모리만 늘어난다.
+# limit을 2코어 이상으로 올릴 때 'auto'로 켠다
+SERVER_DEFAULTS = {
+    'CLUSTER_WORKERS': '',
+    'PRELOAD_TOPICS': 'AWS_DVA',
+    'SHUTDOWN_DELAY_MS': '5000',
+    'SHUTDOWN_TIMEOUT_MS': '20000',
+    'LOG_ASYNC': 'true',
+    'LOG_SAMPLE_RATE': '0.1',
+    'LOG_ROUTE_SAMPLE_RATES': '/health=0,/ready=0,/metrics=0',
+}
+# HPA/PDB 설정. HPA_MAX_REPLICAS=0이면 HPA 없이 deployment.yaml의 replicas를 사용한다.
+# CPU 사용률은 requests.cpu(100m) 기준이므로 80%는 약 80m (limit 200m의 40%).
+# HPA_TARGET_RPS는 기본 0(CPU만 사용): RPS 지표는 README의 prometheus-adapter 규칙을 등록한 뒤에만 켠다
+AUTOSCALING_DEFAULTS = {
+    'HPA_MIN_REPLICAS': '2',
+    'HPA_MAX_REPLICAS': '6',
+    'HPA_TARGET_CPU_UTILIZATION': '80',
+    'HPA_TARGET_RPS': '0',
+    'HPA_SCALE_DOWN_STABILIZATION_SECONDS': '300',
+    'PDB_MIN_AVAILABLE': '1',
+}
+RPS_METRIC = 'quiznox_http_requests_per_second'
+APP_NAME = 'quiznox-api'
+SERVICE_READY_TIMEOUT_SECONDS = 60
+
 class Colors:
     RED = '\033[0;31m'
     GREEN = '\033[0;32m'
@@ -26,75 +85,13 @@ def print_error(msg):
 def print_info(msg):
     print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
 
-def run_kubectl(cmd, check=True):
-    kubeconfig = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
-    env = os.environ.copy()
-    env['KUBECONFIG'] = kubeconfig
-    try:
-        result = subprocess.run(f"kubectl {cmd}", shell=True, check=check, capture_output=True, text=True, env=env)
-        return True, result.stdout.strip(), result.stderr.strip()
-    except subprocess.CalledProcessError as e:
-        return False, getattr(e, 'stdout', '') or '', getattr(e, 'stderr', '') or ''
-
-def create_namespace(namespace):
-    success, _, stderr = run_kubectl(f"get namespace {namespace}", check=False)
-    if not success or "NotFound" in stderr:
-        import tempfile
-        ns_yaml = f"apiVersion: v1\nkind: Namespace\nmetadata:\n  name: {namespace}\n"
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(ns_yaml)
-            tmp = f.name
-        try:
-            run_kubectl(f"apply -f {tmp}")
-            print_success(f"Namespace '{namespace}' created")
-        finally:
-            os.remove(tmp)
-    else:
-        print_info(f"Namespace '{namespace}' already exists")
-
-def create_ecr_secret(namespace, aws_region, ecr_repo_url):
-    import base64
-    try:
-        ecr_client = boto3.client('ecr', region_name=aws_region)
-        token_resp = ecr_client.get_authorization_token()
-        token = token_resp['authorizationData'][0]['authorizationToken']
-        decoded = base64.b64decode(token).decode('utf-8')
-        username, password = decoded.split(':')
-        registry = ecr_repo_url.split('/')[0]
-
-        docker_config = json.dumps({"auths": {registry: {"username": username, "password": password, "auth": token}}})
-        config_b64 = base64.b64encode(docker_config.encode()).decode()
-
-        run_kubectl(f"delete secret ecr-registry-secret -n {namespace} --ignore-not-found=true", check=False)
-
-        import tempfile
-        secret_yaml = f"""apiVersion: v1
-kind: Secret
-metadata:
-  name: ecr-registry-secret
-  namespace: {namespace}
-type: kubernetes.io/dockerconfigjson
-data:
-  .dockerconfigjson: {config_b64}
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write(secret_yaml)
-            tmp = f.name
-        try:
-            run_kubectl(f"apply -f {tmp}")
-            print_success("ECR imagePullSecret created")
-        finally:
-            os.remove(tmp)
-    except Exception as e:
-        print_error(f"Failed to create ECR secret: {e}")
-
-def get_jwt_secret(environment, aws_region):
+def get_jwt_secret(environment):
     """AuthCore의 Secrets Manager에서 JWT Secret 조회"""
     jwt = os.getenv('JWT_SECRET')
     if jwt:
         return jwt
     try:
-        sm = boto3.client('secretsmanager', region_name=aws_region)
+        sm = get_client('secretsmanager')
         resp = sm.get_secret_value(SecretId=f'authcore/jwt-secret-{environment}')
         secret = resp['SecretString']
         try:
@@ -108,43 +105,380 @@ def get_jwt_secret(environment, aws_region):
         print_info(f"Secrets Manager lookup failed: {e}")
         return None
 
-def apply_manifest(file_path, env_vars=None):
-    abs_path = os.path.abspath(file_path)
-    if not os.path.exists(abs_path):
-        print_error(f"Manifest not found: {abs_path}")
+def substitute_env(content, env_vars):
+    for key, value in env_vars.items():
+        placeholder = f"${{{key}}}"
+        if placeholder in content:
+            content = content.replace(placeholder, str(value))
+        else:
+            pattern = re.compile(r'\$' + re.escape(key) + r'(?![a-zA-Z0-9_])')
+            content = pattern.sub(str(value), content)
+    return content
+
+def get_config_data(aws_region, environment, questions_table):
+    """quiznox-config ConfigMap에 들어갈 값"""
+    return {
+        'AWS_REGION': aws_region,
+        'NODE_ENV': environment,
+        'DYNAMODB_TABLE_NAME': questions_table,
+        'DYNAMODB_REVIEWS_TABLE_NAME': 'QuizNox_Reviews',
+        **{key: os.getenv(key, default) for key, default in DYNAMODB_CLIENT_DEFAULTS.items()},
+        **{key: os.getenv(key, default) for key, default in SERVER_DEFAULTS.items()},
+    }
+
+def get_autoscaling_settings():
+    """AUTOSCALING_DEFAULTS를 환경변수로 덮어쓴 정수 설정"""
+    settings = {key: int(os.getenv(key, default)) for key, default in AUTOSCALING_DEFAULTS.items()}
+    if settings['HPA_MAX_REPLICAS'] and settings['HPA_MIN_REPLICAS'] > settings['HPA_MAX_REPLICAS']:
+        raise ValueError("HPA_MIN_REPLICAS must not exceed HPA_MAX_REPLICAS")
+    if settings['HPA_MAX_REPLICAS'] and settings['PDB_MIN_AVAILABLE'] >= settings['HPA_MIN_REPLICAS']:
+        # 최소 replica 수에서도 노드 drain 시 Pod 하나는 옮길 수 있어야 한다
+        raise ValueError("PDB_MIN_AVAILABLE must be less than HPA_MIN_REPLICAS")
+    return settings
+
+def build_secret(namespace, jwt_secret):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Secret',
+        'metadata': {'name': 'quiznox-secrets', 'namespace': namespace},
+        'type': 'Opaque',
+        'data': {'JWT_SECRET': base64.b64encode(str(jwt_secret).encode()).decode()},
+    }
+
+def build_configmap(namespace, config_data):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': 'quiznox-config', 'namespace': namespace},
+        'data': {key: str(value) for key, value in config_data.items()},
+    }
+
+def build_hpa(namespace, settings):
+    """CPU 사용률(+ Pod당 초당 요청 수)로 quiznox-api를 스케일링하는 HPA.
+    스케일 업은 즉시, 스케일 다운은 안정화 구간 동안 가장 높았던 권장값 기준으로 1분에 1개씩"""
+    metrics = [{
+        'type': 'Resource',
+        'resource': {
+            'name': 'cpu',
+            'target': {'type': 'Utilization', 'averageUtilization': settings['HPA_TARGET_CPU_UTILIZATION']},
+        },
+    }]
+    if settings['HPA_TARGET_RPS']:
+        metrics.append({
+            'type': 'Pods',
+            'pods': {
+                'metric': {'name': RPS_METRIC},
+                'target': {'type': 'AverageValue', 'averageValue': str(settings['HPA_TARGET_RPS'])},
+            },
+        })
+    return {
+        'apiVersion': 'autoscaling/v2',
+        'kind': 'HorizontalPodAutoscaler',
+        'metadata': {'name': APP_NAME, 'namespace': namespace, 'labels': {'app': APP_NAME}},
+        'spec': {
+            'scaleTargetRef': {'apiVersion': 'apps/v1', 'kind': 'Deployment', 'name': APP_NAME},
+            'minReplicas': settings['HPA_MIN_REPLICAS'],
+            'maxReplicas': settings['HPA_MAX_REPLICAS'],
+            'metrics': metrics,
+            'behavior': {
+                'scaleUp': {
+                    'stabilizationWindowSeconds': 0,
+                    'selectPolicy': 'Max',
+                    'policies': [
+                        {'type': 'Percent', 'value': 100, 'periodSeconds': 30},
+                        {'type': 'Pods', 'value': 2, 'periodSeconds': 30},
+                    ],
+                },
+                'scaleDown': {
+                    'stabilizationWindowSeconds': settings['HPA_SCALE_DOWN_STABILIZATION_SECONDS'],
+                    'policies': [{'type': 'Pods', 'value': 1, 'periodSeconds': 60}],
+                },
+            },
+        },
+    }
+
+def build_pdb(namespace, settings):
+    """노드 drain 등 자발적 중단 중에도 PDB_MIN_AVAILABLE개의 Pod는 남겨 둔다"""
+    return {
+        'apiVersion': 'policy/v1',
+        'kind': 'PodDisruptionBudget',
+        'metadata': {'name': APP_NAME, 'namespace': namespace, 'labels': {'app': APP_NAME}},
+        'spec': {
+            'minAvailable': settings['PDB_MIN_AVAILABLE'],
+            'selector': {'matchLabels': {'app': APP_NAME}},
+        },
+    }
+
+def build_autoscaling(namespace, settings):
+    """설정에서 켜진 HPA/PDB 객체 목록 (값이 0이면 만들지 않음)"""
+    objects = []
+    if settings['HPA_MAX_REPLICAS']:
+        objects.append(build_hpa(namespace, settings))
+    if settings['PDB_MIN_AVAILABLE']:
+        objects.append(build_pdb(namespace, settings))
+    return objects
+
+def release_replicas(objects, settings):
+    """HPA가 replica 수를 관리하면 Deployment에서 spec.replicas를 빼서 배포마다 되돌리지 않게 한다"""
+    if settings['HPA_MAX_REPLICAS']:
+        for obj in objects:
+            if obj['kind'] == 'Deployment' and obj['metadata']['name'] == APP_NAME:
+                obj['spec'].pop('replicas', None)
+    return objects
+
+def build_ecr_secret(namespace, ecr_repo_url):
+    """ECR imagePullSecret 객체 생성 (만료 시각을 annotation으로 기록)"""
+    ecr_client = get_client('ecr')
+    auth_data = ecr_client.get_authorization_token()['authorizationData'][0]
+    token = auth_data['authorizationToken']
+    username, password = base64.b64decode(token).decode('utf-8').split(':')
+    registry = ecr_repo_url.split('/')[0]
+
+    docker_config = json.dumps({"auths": {registry: {"username": username, "password": password, "auth": token}}})
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Secret',
+        'metadata': {
+            'name': ECR_SECRET_NAME,
+            'namespace': namespace,
+            'annotations': {ECR_EXPIRES_ANNOTATION: str(int(auth_data['expiresAt'].timestamp()))},
+        },
+        'type': 'kubernetes.io/dockerconfigjson',
+        'data': {'.dockerconfigjson': base64.b64encode(docker_config.encode()).decode()},
+    }
+
+def render_manifest(path, namespace, env_vars=None):
+    """매니페스트 파일 하나를 메모리에서 렌더링 (임시 파일 없이)"""
+    content = substitute_env(Path(path).read_text(), env_vars or {})
+    objects = []
+    for obj in yaml.safe_load_all(content):
+        if not obj:
+            continue
+        if obj['kind'] in CLUSTER_SCOPED_KINDS:
+            obj['metadata']['name'] = namespace
+        else:
+            obj['metadata']['namespace'] = namespace
+        objects.append(obj)
+    return objects
+
+def render_manifests(manifest_dir, namespace, env_vars):
+    objects = []
+    for path in sorted(Path(manifest_dir).glob('*.yaml')):
+        objects += render_manifest(path, namespace, env_vars)
+    return objects
+
+def object_hash(obj):
+    """annotation을 제외한 desired 객체의 정규화된 해시"""
+    metadata = {k: v for k, v in obj['metadata'].items() if k != 'annotations'}
+    annotations = {
+        k: v for k, v in (obj['metadata'].get('annotations') or {}).items()
+        if k != APPLIED_HASH_ANNOTATION
+    }
+    canonical = json.dumps({**obj, 'metadata': {**metadata, 'annotations': annotations}}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def stamp_hash(obj):
+    obj['metadata'].setdefault('annotations', {})[APPLIED_HASH_ANNOTATION] = object_hash(obj)
+    return obj
+
+def stamp_config_hash(objects):
+    """
+    objects 안의 Secret/ConfigMap data 해시를 Deployment Pod template annotation으로 기록.
+    env로 읽는 설정은 Pod 재시작 전까지 반영되지 않으므로, 설정만 바뀐 배포도 롤아웃되게 한다
+    """
+    config = {object_ref(obj): obj.get('data', {}) for obj in objects if obj['kind'] in CONFIG_KINDS}
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+    for obj in objects:
+        if obj['kind'] == 'Deployment':
+            template_metadata = obj['spec']['template'].setdefault('metadata', {})
+            template_metadata.setdefault('annotations', {})[CONFIG_HASH_ANNOTATION] = digest
+    return objects
+
+def live_annotation(live_obj, key):
+    return ((live_obj or {}).get('metadata', {}).get('annotations') or {}).get(key)
+
+def ecr_secret_is_fresh(live_obj, now):
+    expires_at = live_annotation(live_obj, ECR_EXPIRES_ANNOTATION)
+    return bool(expires_at) and int(expires_at) - now > ECR_REFRESH_WINDOW_SECONDS
+
+def diff_objects(desired, live):
+    """
+    live의 applied-hash annotation과 다른 객체만 반환.
+    live 필드 자체는 비교하지 않으므로 kubectl edit 등 클러스터에서 직접 바꾼 값은 되돌리지 않는다
+    (desired가 바뀌거나 --reconcile 없이 배포하면 전체를 다시 apply)
+    """
+    return [
+        obj for obj in desired
+        if live_annotation(live.get(object_ref(obj)), APPLIED_HASH_ANNOTATION) != obj['metadata']['annotations'][APPLIED_HASH_ANNOTATION]
+    ]
+
+def apply_order(obj):
+    kind = obj['kind']
+    return APPLY_ORDER.index(kind) if kind in APPLY_ORDER else len(APPLY_ORDER)
+
+def server_side_apply(client, objects):
+    try:
+        client.apply_many(sorted(objects, key=apply_order), FIELD_MANAGER)
+    except K8sApiError as e:
+        print_error(f"Server-side apply failed: {e}")
         sys.exit(1)
 
-    if env_vars:
-        with open(abs_path, 'r') as f:
-            content = f.read()
-        for key, value in env_vars.items():
-            placeholder = f"${{{key}}}"
-            if placeholder in content:
-                content = content.replace(placeholder, str(value))
-            else:
-                pattern = re.compile(r'\$' + re.escape(key) + r'(?![a-zA-Z0-9_])')
-                content = pattern.sub(str(value), content)
-
-        tmp = f"{abs_path}.tmp"
-        try:
-            with open(tmp, 'w') as f:
-                f.write(content)
-            success, _, stderr = run_kubectl(f"apply -f {tmp}")
-            if not success:
-                print_error(f"Failed: {stderr}")
-                sys.exit(1)
-            print_success(f"Applied: {os.path.basename(file_path)}")
-        finally:
-            if os.path.exists(tmp):
-                os.remove(tmp)
+def reconcile(client, namespace, desired, ecr_builder=None, create_only=False):
+    """
+    변경된 객체만 server-side apply로 반영하고, 반영된 객체 목록을 반환.
+    create_only면 클러스터에 없는 객체와 pull secret 갱신만 반영하고 기존 객체의 변경은 보류한다
+    """
+    desired = [stamp_hash(obj) for obj in desired]
+    try:
+        live = client.get_many(namespace, desired)
+        ecr_live = client.get('Secret', ECR_SECRET_NAME, namespace) if ecr_builder else None
+    except K8sApiError as e:
+        print_error(f"Failed to fetch live objects: {e}")
+        sys.exit(1)
+
+    ecr_secret = None
+    if ecr_builder and not ecr_secret_is_fresh(ecr_live, int(time.time())):
+        ecr_secret = stamp_hash(ecr_builder())
+        desired.append(ecr_secret)
+
+    changed = diff_objects(desired, live)
+    deferred = [obj for obj in changed if create_only and obj is not ecr_secret and object_ref(obj) in live]
+    for obj in desired:
+        status = 'deferred' if obj in deferred else 'changed' if obj in changed else 'unchanged'
+        print_info(f"{object_ref(obj)}: {status}")
+    changed = [obj for obj in changed if obj not in deferred]
+
+    if changed:
+        server_side_apply(client, changed)
+        print_success(f"Applied {len(changed)} object(s) with server-side apply")
     else:
-        success, _, stderr = run_kubectl(f"apply -f {abs_path}")
-        if not success:
-            print_error(f"Failed: {stderr}")
+        print_success("Cluster already up to date, nothing to apply")
+    return changed
+
+def resolve_image_uri():
+    image_uri = os.getenv('IMAGE_URI')
+    if not image_uri:
+        script_dir = Path(__file__).parent
+        image_uri_file = script_dir.parent / '.image_uri'
+        if image_uri_file.exists():
+            line = image_uri_file.read_text().strip()
+            if '=' in line:
+                image_uri = line.split('=', 1)[1].strip().strip('"').strip("'")
+    return image_uri
+
+def print_pods(client, namespace):
+    for pod in client.list('Pod', namespace, 'app=quiznox-api'):
+        print_info(f"{pod['metadata']['name']}: {pod.get('status', {}).get('phase', 'Unknown')}")
+
+def wait_for_rollout(client, namespace, name='quiznox-api', service_name='quiznox-api', label_selector=None,
+                     exit_on_failure=True):
+    """롤아웃과 Service ingress를 watch로 동시에 기다리고 Pod별 Ready 소요 시간을 출력"""
+    print_info(f"Waiting for deployment/{name}...")
+    result = wait_for_ready(
+        client, namespace, name, service_name=service_name, label_selector=label_selector,
+        timeout=ROLLOUT_TIMEOUT_SECONDS, service_timeout=SERVICE_READY_TIMEOUT_SECONDS,
+    )
+    for error in result['errors']:
+        print_error(error)
+    if not result['rollout_ready']:
+        print_error(f"Deployment {name} not ready")
+        print_pods(client, namespace)
+        if exit_on_failure:
             sys.exit(1)
-        print_success(f"Applied: {os.path.basename(file_path)}")
+        return False
+
+    print_success(f"Rollout completed in {result['rollout_seconds']}s")
+    if result['service_address']:
+        print_success(f"Service address: {result['service_address']} ({result['service_seconds']}s)")
+    elif service_name:
+        print_info("Service has no LoadBalancer address yet")
+    for pod_name, timings in result['pods'].items():
+        print_info(
+            f"{pod_name}: scheduled {timings['scheduled']}s, started {timings['started']}s, ready {timings['ready']}s"
+        )
+    return True
+
+def print_canary_report(report):
+    for track, results in report['results'].items():
+        for path, summary in results.items():
+            print_info(
+                f"{track:<6} {path}: p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, "
+                f"errors {summary['errors']}/{summary['requests']}"
+            )
+    for check in report['checks']:
+        status = 'ok' if check['passed'] else 'FAILED'
+        print_info(f"{check['path']} {check['metric']}: canary {check['canary']} (limit {check['limit']}) {status}")
+
+def canary_deploy(client, namespace, stable, jwt_secret, settings=None, release_objects=()):
+    """
+    카나리 Deployment를 띄워 stable Pod와 지연/오류율을 비교한 뒤 승격 또는 롤백.
+    승격: release_objects(설정, Service, HPA 등)의 변경과 stable Deployment의 새 이미지를 반영하고 롤아웃
+    롤백: stable과 release_objects는 건드리지 않음 (카나리는 live 설정으로 실행된다)
+    어느 경우든(비교 중 예외 포함) 카나리는 삭제한다.
+    반환: 보고서 dict (verdict, results, checks, ...)
+    """
+    canary = build_canary_deployment(stable)
+    canary_ref = canary['metadata']['name']
+    app_label = stable['spec']['template']['metadata']['labels']['app']
+    image = stable['spec']['template']['spec']['containers'][0]['image']
+
+    try:
+        server_side_apply(client, [canary])
+        print_success(f"Applied deployment/{canary_ref} ({image})")
+        ready = wait_for_rollout(
+            client, namespace, canary_ref, service_name=None,
+            label_selector=f"app={app_label},track=canary", exit_on_failure=False,
+        )
+
+        report = {'image': image, 'verdict': 'rollback', 'reason': 'canary rollout not ready', 'results': {}, 'checks': []}
+        if ready:
+            tracks = track_endpoints(client, namespace, app_label)
+            print_info(f"Probing {len(tracks['canary'])} canary / {len(tracks['stable'])} stable pod(s)...")
+            report = {'image': image, **evaluate(tracks, jwt_secret, settings)}
+            print_canary_report(report)
+
+        if report['verdict'] == 'promote':
+            print_success("Canary within thresholds, promoting")
+            # 설정이 Deployment보다 먼저 apply되도록 한 번에 reconcile (APPLY_ORDER)
+            reconcile(client, namespace, [*release_objects, stable])
+            report['promoted'] = wait_for_rollout(
+                client, namespace, stable['metadata']['name'],
+                label_selector=stable_selector(app_label), exit_on_failure=False,
+            )
+        else:
+            print_error(f"Canary rejected: {report['reason']}")
+    finally:
+        client.delete('Deployment', canary_ref, namespace)
+        print_info(f"Deleted deployment/{canary_ref}")
+    return report
+
+def replace_object(client, obj):
+    """기존 객체를 지우고 다시 생성 (non-reconcile 모드의 secret/configmap 갱신 방식)"""
+    metadata = obj['metadata']
+    client.delete(obj['kind'], metadata['name'], metadata.get('namespace'))
+    client.apply(obj, FIELD_MANAGER)
+
+def print_timing_report(client):
+    for line in client.format_timing_report():
+        print_info(line)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Deploy QuizNox API to Kubernetes')
+    parser.add_argument(
+        '--reconcile', action='store_true',
+        default=os.getenv('DEPLOY_MODE', '') == 'reconcile',
+        help='렌더링한 객체를 live 상태와 비교해 변경분만 server-side apply',
+    )
+    parser.add_argument(
+        '--canary', action='store_true',
+        default=os.getenv('DEPLOY_MODE', '') == 'canary',
+        help='새 이미지를 1개 replica 카나리로 먼저 띄워 stable과 지연/오류율을 비교한 뒤 승격 또는 롤백',
+    )
+    parser.add_argument('--canary-report', default=os.getenv('CANARY_REPORT'), help='카나리 비교 보고서 JSON 경로')
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
     print("🚀 Deploying QuizNox to Kubernetes...")
 
     kubeconfig = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
@@ -154,7 +488,7 @@ def main():
 
     questions_table = os.getenv('DYNAMODB_TABLE_NAME', 'QuizNox_Questions')
 
-    jwt_secret = get_jwt_secret(environment, aws_region)
+    jwt_secret = get_jwt_secret(environment)
     if not jwt_secret:
         print_error("JWT_SECRET not found. Set JWT_SECRET env or configure Secrets Manager.")
         sys.exit(1)
@@ -165,61 +499,111 @@ def main():
 
     os.environ['KUBECONFIG'] = kubeconfig
 
-    success, _, _ = run_kubectl("cluster-info", check=False)
-    if not success:
-        print_error("Cannot connect to Kubernetes cluster")
+    client = get_cluster_client(kubeconfig)
+    try:
+        client.version()
+    except K8sApiError as e:
+        print_error(f"Cannot connect to Kubernetes cluster: {e}")
         sys.exit(1)
-    print_success("Connected to cluster")
+    print_success(f"Connected to cluster ({client.backend} client)")
 
-    create_namespace(namespace)
+    image_uri = resolve_image_uri()
+    if not image_uri:
+        print_error("IMAGE_URI not found")
+        sys.exit(1)
+
+    print_info(f"Using image: {image_uri}")
 
+    project_root = Path(__file__).parent.parent
+    config_data = get_config_data(aws_region, environment, questions_table)
     ecr_repo_url = os.getenv('ECR_REPOSITORY_URI', '')
+    autoscaling = get_autoscaling_settings()
+
+    if args.canary:
+        desired = release_replicas(render_manifests(project_root / 'k8s', namespace, {'IMAGE_URI': image_uri}), autoscaling)
+        desired += [build_secret(namespace, jwt_secret), build_configmap(namespace, config_data)]
+        desired += build_autoscaling(namespace, autoscaling)
+        stamp_config_hash(desired)
+        stable = next(obj for obj in desired if obj['kind'] == 'Deployment')
+        ecr_builder = (lambda: build_ecr_secret(namespace, ecr_repo_url)) if ecr_repo_url else None
+        release_objects = [obj for obj in desired if obj is not stable]
+        # 카나리 전에는 아직 없는 객체(첫 배포의 설정, Service)와 pull secret만 만들고,
+        # 기존 객체의 변경은 승격 때 반영해 롤백하면 클러스터가 배포 전 상태로 남게 한다
+        reconcile(client, namespace, release_objects, ecr_builder, create_only=True)
+        report = canary_deploy(client, namespace, stable, jwt_secret, canary_settings(), release_objects)
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        print(output)
+        if args.canary_report:
+            Path(args.canary_report).write_text(output + '\n')
+            print_info(f"Canary report written to {args.canary_report}")
+        print_timing_report(client)
+        if report['verdict'] != 'promote':
+            print_error("Canary deployment rolled back")
+            sys.exit(1)
+        if not report['promoted']:
+            print_error("Promoted deployment did not become ready")
+            sys.exit(1)
+        print_success("Canary promoted, deployment completed!")
+        return
+
+    if args.reconcile:
+        desired = release_replicas(render_manifests(project_root / 'k8s', namespace, {'IMAGE_URI': image_uri}), autoscaling)
+        desired += [build_secret(namespace, jwt_secret), build_configmap(namespace, config_data)]
+        desired += build_autoscaling(namespace, autoscaling)
+        stamp_config_hash(desired)
+        ecr_builder = (lambda: build_ecr_secret(namespace, ecr_repo_url)) if ecr_repo_url else None
+        changed = reconcile(client, namespace, desired, ecr_builder)
+        if any(obj['kind'] == 'Deployment' for obj in changed):
+            wait_for_rollout(client, namespace)
+        else:
+            print_info("Deployment unchanged, skipping rollout wait")
+        print_success("Deployment completed!")
+        print_timing_report(client)
+        return
+
+    if client.ensure_namespace(namespace):
+        print_success(f"Namespace '{namespace}' created")
+    else:
+        print_info(f"Namespace '{namespace}' already exists")
+
     if ecr_repo_url:
-        create_ecr_secret(namespace, aws_region, ecr_repo_url)
+        try:
+            replace_object(client, build_ecr_secret(namespace, ecr_repo_url))
+            print_success("ECR imagePullSecret created")
+        except Exception as e:
+            print_error(f"Failed to create ECR secret: {e}")
 
-    run_kubectl(f"delete secret quiznox-secrets -n {namespace} --ignore-not-found=true", check=False)
-    escaped = str(jwt_secret).replace('"', '\\"').replace("'", "\\'").replace('$', '\\$')
-    run_kubectl(f'create secret generic quiznox-secrets --from-literal=JWT_SECRET="{escaped}" --namespace={namespace}')
+    config_objects = [build_secret(namespace, jwt_secret), build_configmap(namespace, config_data)]
+    replace_object(client, config_objects[0])
     print_success("Secret created")
 
-    run_kubectl(f"delete configmap quiznox-config -n {namespace} --ignore-not-found=true", check=False)
-    run_kubectl(
-        f"create configmap quiznox-config --namespace={namespace}"
-        f" --from-literal=AWS_REGION={aws_region}"
-        f" --from-literal=NODE_ENV={environment}"
-        f" --from-literal=DYNAMODB_TABLE_NAME={questions_table}"
-        f" --from-literal=DYNAMODB_REVIEWS_TABLE_NAME=QuizNox_Reviews"
-    )
+    replace_object(client, config_objects[1])
     print_success("ConfigMap created")
 
-    image_uri = os.getenv('IMAGE_URI')
-    if not image_uri:
-        script_dir = Path(__file__).parent
-        image_uri_file = script_dir.parent / '.image_uri'
-        if image_uri_file.exists():
-            line = image_uri_file.read_text().strip()
-            if '=' in line:
-                image_uri = line.split('=', 1)[1].strip().strip('"').strip("'")
-    if not image_uri:
-        print_error("IMAGE_URI not found")
-        sys.exit(1)
+    manifests = [('deployment.yaml', {'IMAGE_URI': image_uri}), ('service.yaml', None)]
+    for file_name, env_vars in manifests:
+        try:
+            objects = release_replicas(render_manifest(project_root / 'k8s' / file_name, namespace, env_vars), autoscaling)
+            stamp_config_hash(objects + config_objects)
+            client.apply_many(objects, FIELD_MANAGER)
+        except K8sApiError as e:
+            print_error(f"Failed: {e}")
+            sys.exit(1)
+        print_success(f"Applied: {file_name}")
 
-    print_info(f"Using image: {image_uri}")
+    for obj in build_autoscaling(namespace, autoscaling):
+        try:
+            client.apply(obj, FIELD_MANAGER)
+        except K8sApiError as e:
+            print_error(f"Failed: {e}")
+            sys.exit(1)
+        print_success(f"Applied: {object_ref(obj)}")
 
-    project_root = Path(__file__).parent.parent
-    apply_manifest(str(project_root / 'k8s' / 'deployment.yaml'), {'IMAGE_URI': image_uri})
-    apply_manifest(str(project_root / 'k8s' / 'service.yaml'))
-
-    print_info("Waiting for deployment...")
-    success, _, _ = run_kubectl(f"rollout status deployment/quiznox-api -n {namespace} --timeout=300s", check=False)
-    if not success:
-        print_error("Deployment not ready")
-        run_kubectl(f"get pods -n {namespace} -l app=quiznox-api", check=False)
-        sys.exit(1)
+    wait_for_rollout(client, namespace)
 
     print_success("Deployment completed!")
-    run_kubectl(f"get pods -n {namespace}")
-    run_kubectl(f"get svc -n {namespace}")
+    print_pods(client, namespace)
+    print_timing_report(client)
 
 if __name__ == '__main__':
     try:
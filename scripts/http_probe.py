@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+HTTP 측정 공용 유틸리티
+
+loadtest.py, canary.py, measure_startup.py가 함께 쓰는 asyncio keep-alive HTTP 연결 풀,
+auth 플러그인용 JWT 발급, 백분위수 계산. 표준 라이브러리만 사용하므로 boto3 등 없이 import할 수 있다.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlparse
+
+
+def base64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def mint_jwt(secret, user_id, username='loadtest', expires_in=3600):
+    """auth.js의 jwt.verify(HS256)가 받아들이는 토큰 발급"""
+    now = int(time.time())
+    header = base64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = base64url(json.dumps(
+        {'user_id': user_id, 'username': username, 'iat': now, 'exp': now + expires_in},
+        separators=(',', ':'),
+    ).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{base64url(signature)}"
+
+
+class HttpConnectionPool:
+    """keep-alive HTTP/1.1 연결 풀 (Content-Length / chunked 응답 지원)"""
+
+    def __init__(self, base_url, size):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.idle = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(None)
+
+    async def request(self, method, path, headers=None, body=None):
+        connection = await self.idle.get()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(self.host, self.port)
+            status, response_body, keep_alive = await self.send(connection, method, path, headers or {}, body)
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+            return status, response_body
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            if connection:
+                connection[1].close()
+            connection = None
+            raise
+        finally:
+            self.idle.put_nowait(connection)
+
+    async def send(self, connection, method, path, headers, body=None):
+        reader, writer = connection
+        payload = json.dumps(body).encode() if body is not None else b''
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", 'Accept-Encoding: identity']
+        if body is not None:
+            lines += ['Content-Type: application/json', f"Content-Length: {len(payload)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            body = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await reader.read()
+            return status, body, False
+        return status, body, response_headers.get('connection', '').lower() != 'close'
+
+    async def close(self):
+        while not self.idle.empty():
+            connection = self.idle.get_nowait()
+            if connection:
+                connection[1].close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return round(sorted_values[index], 3)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+배포 스크립트 공용 Kubernetes 클라이언트
+
+kubeconfig(setup_k8s.py가 복사해 둔 파일)를 직접 읽어 API 서버와 하나의
+keep-alive HTTPS 커넥션 풀로 통신한다. kubeconfig가 exec 플러그인 등
+지원하지 않는 인증 방식을 쓰면 kubectl 서브프로세스 구현으로 폴백한다.
+모든 호출은 작업별로 소요 시간이 기록되어 timing report로 출력할 수 있다.
+"""
+
+import atexit
+import base64
+import json
+import os
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlparse
+
+import yaml
+
+# kind -> (기본 apiVersion, 리소스 복수형, namespaced 여부)
+RESOURCES = {
+    'Namespace': ('v1', 'namespaces', False),
+    'Node': ('v1', 'nodes', False),
+    'Pod': ('v1', 'pods', True),
+    'Service': ('v1', 'services', True),
+    'Secret': ('v1', 'secrets', True),
+    'ConfigMap': ('v1', 'configmaps', True),
+    'Deployment': ('apps/v1', 'deployments', True),
+    'HorizontalPodAutoscaler': ('autoscaling/v2', 'horizontalpodautoscalers', True),
+    'PodDisruptionBudget': ('policy/v1', 'poddisruptionbudgets', True),
+}
+
+DEFAULT_KUBECONFIG = '~/.kube/config'
+CONNECT_TIMEOUT_SECONDS = 5
+READ_TIMEOUT_SECONDS = 30
+POOL_MAXSIZE = 4
+WATCH_WINDOW_SECONDS = 60
+POLL_INTERVAL_SECONDS = 2
+
+
+class K8sApiError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class UnsupportedKubeconfig(Exception):
+    pass
+
+
+def object_ref(obj):
+    return f"{obj['kind'].lower()}/{obj['metadata']['name']}"
+
+
+def selector_params(label_selector=None, field_selector=None):
+    params = {}
+    if label_selector:
+        params['labelSelector'] = label_selector
+    if field_selector:
+        params['fieldSelector'] = field_selector
+    return params
+
+
+def resource_path(kind, name=None, namespace=None, api_version=None):
+    default_version, plural, namespaced = RESOURCES[kind]
+    version = api_version or default_version
+    prefix = '/api/v1' if version == 'v1' else f'/apis/{version}'
+    path = prefix
+    if namespaced and namespace:
+        path += f'/namespaces/{namespace}'
+    path += f'/{plural}'
+    if name:
+        path += f'/{name}'
+    return path
+
+
+class ClusterClient:
+    """네이티브/kubectl 구현이 공유하는 타이밍 기록과 고수준 헬퍼"""
+
+    backend = 'base'
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def timed(self, operation):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((operation, time.perf_counter() - start))
+
+    def timing_report(self):
+        """작업별 (호출 수, 총 ms, 최대 ms) 집계"""
+        report = {}
+        for operation, seconds in self.timings:
+            count, total, slowest = report.get(operation, (0, 0.0, 0.0))
+            report[operation] = (count + 1, total + seconds * 1000, max(slowest, seconds * 1000))
+        return report
+
+    def format_timing_report(self):
+        lines = [f"Kubernetes client timings ({self.backend})"]
+        for operation, (count, total_ms, max_ms) in sorted(self.timing_report().items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {operation:<28} {count:>3} call(s)  total {total_ms:8.1f} ms  max {max_ms:8.1f} ms")
+        return lines
+
+    def ensure_namespace(self, namespace):
+        """네임스페이스가 없으면 생성하고, 새로 만들었는지 여부를 반환"""
+        if self.get('Namespace', namespace):
+            return False
+        self.apply({'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': namespace}}, 'quiznox-deploy')
+        return True
+
+    def list(self, kind, namespace=None, label_selector=None, field_selector=None):
+        return self.list_resource(kind, namespace, label_selector, field_selector).get('items', [])
+
+    def watch(self, kind, namespace=None, resource_version=None, label_selector=None, field_selector=None, timeout_seconds=WATCH_WINDOW_SECONDS):
+        """watch API를 쓸 수 없는 구현을 위한 폴링 폴백: 한 주기마다 현재 객체를 MODIFIED 이벤트로 내보낸다"""
+        time.sleep(min(POLL_INTERVAL_SECONDS, timeout_seconds))
+        for item in self.list(kind, namespace, label_selector, field_selector):
+            yield {'type': 'MODIFIED', 'object': item}
+
+    def close(self):
+        pass
+
+
+class NativeClusterClient(ClusterClient):
+    """kubeconfig 인증서를 사용해 API 서버에 keep-alive 커넥션으로 직접 요청"""
+
+    backend = 'native'
+
+    def __init__(self, kubeconfig_path=None, maxsize=POOL_MAXSIZE):
+        import urllib3
+
+        super().__init__()
+        self._temp_files = []
+        try:
+            config = self._load_kubeconfig(kubeconfig_path or os.getenv('KUBECONFIG', DEFAULT_KUBECONFIG))
+            server = urlparse(config['server'])
+            if server.scheme not in ('https', 'http'):
+                raise UnsupportedKubeconfig(f"Unsupported server scheme: {server.scheme}")
+        except Exception:
+            self.close()
+            raise
+
+        self._headers = {'Accept': 'application/json'}
+        if config.get('token'):
+            self._headers['Authorization'] = f"Bearer {config['token']}"
+
+        timeout = urllib3.Timeout(connect=CONNECT_TIMEOUT_SECONDS, read=READ_TIMEOUT_SECONDS)
+        if server.scheme == 'http':
+            # kubectl proxy 등 로컬 평문 엔드포인트
+            self._pool = urllib3.HTTPConnectionPool(
+                server.hostname, port=server.port or 80, maxsize=maxsize, timeout=timeout, retries=False,
+            )
+        else:
+            tls = {
+                'cert_reqs': 'CERT_NONE' if config.get('insecure') else 'CERT_REQUIRED',
+                'ca_certs': config.get('ca_file'),
+                'cert_file': config.get('cert_file'),
+                'key_file': config.get('key_file'),
+            }
+            if config.get('insecure'):
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            self._pool = urllib3.HTTPSConnectionPool(
+                server.hostname, port=server.port or 443, maxsize=maxsize, timeout=timeout,
+                retries=False, **{k: v for k, v in tls.items() if v},
+            )
+        atexit.register(self.close)
+
+    def _materialize(self, data_b64):
+        """kubeconfig의 *-data 필드는 파일 경로가 필요한 ssl 모듈을 위해 임시 파일로 기록"""
+        handle = tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.pem')
+        with handle:
+            handle.write(base64.b64decode(data_b64))
+        os.chmod(handle.name, 0o600)
+        self._temp_files.append(handle.name)
+        return handle.name
+
+    def _load_kubeconfig(self, path):
+        with open(os.path.expanduser(path)) as f:
+            kubeconfig = yaml.safe_load(f)
+
+        context_name = kubeconfig.get('current-context')
+        contexts = {c['name']: c['context'] for c in kubeconfig.get('contexts', [])}
+        context = contexts.get(context_name) or next(iter(contexts.values()))
+        cluster = {c['name']: c['cluster'] for c in kubeconfig.get('clusters', [])}[context['cluster']]
+        user = {u['name']: u.get('user') or {} for u in kubeconfig.get('users', [])}.get(context.get('user'), {})
+
+        if 'exec' in user or 'auth-provider' in user:
+            raise UnsupportedKubeconfig("exec/auth-provider credentials require kubectl")
+
+        config = {'server': cluster['server'], 'insecure': cluster.get('insecure-skip-tls-verify', False)}
+        if cluster.get('certificate-authority-data'):
+            config['ca_file'] = self._materialize(cluster['certificate-authority-data'])
+        elif cluster.get('certificate-authority'):
+            config['ca_file'] = cluster['certificate-authority']
+
+        if user.get('client-certificate-data'):
+            config['cert_file'] = self._materialize(user['client-certificate-data'])
+            config['key_file'] = self._materialize(user['client-key-data'])
+        elif user.get('client-certificate'):
+            config['cert_file'] = user['client-certificate']
+            config['key_file'] = user['client-key']
+        config['token'] = user.get('token')
+        return config
+
+    def request(self, method, path, body=None, params=None, content_type='application/json', operation=None):
+        import urllib3
+
+        url = path + (f"?{urlencode(params)}" if params else '')
+        headers = dict(self._headers)
+        payload = None
+        if body is not None:
+            headers['Content-Type'] = content_type
+            payload = json.dumps(body).encode()
+
+        try:
+            with self.timed(operation or f"{method} {path}"):
+                response = self._pool.request(method, url, body=payload, headers=headers)
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            # 연결 거부/타임아웃 등 응답 자체가 없으면 status 없이 K8sApiError로 통일
+            raise K8sApiError(f"{method} {path} failed: {e}") from e
+
+        try:
+            data = json.loads(response.data) if response.data else {}
+        except ValueError:
+            # 앞단 프록시/로드밸런서의 HTML 오류 페이지 등 JSON이 아닌 응답
+            data = None
+        if response.status >= 400:
+            if isinstance(data, dict):
+                message = data.get('message', '')
+            else:
+                message = response.data.decode('utf-8', errors='replace').strip()[:200]
+            raise K8sApiError(f"{method} {path} failed ({response.status}): {message}", response.status)
+        if data is None:
+            raise K8sApiError(f"{method} {path} returned a non-JSON response", response.status)
+        return data
+
+    def version(self):
+        return self.request('GET', '/version', operation='version')
+
+    def get(self, kind, name, namespace=None):
+        try:
+            return self.request('GET', resource_path(kind, name, namespace), operation=f"get {kind.lower()}")
+        except K8sApiError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def get_many(self, namespace, objects):
+        live = {}
+        for obj in objects:
+            item = self.get(obj['kind'], obj['metadata']['name'], namespace)
+            if item:
+                live[object_ref(obj)] = item
+        return live
+
+    def list_resource(self, kind, namespace=None, label_selector=None, field_selector=None):
+        params = selector_params(label_selector, field_selector)
+        return self.request('GET', resource_path(kind, namespace=namespace), params=params or None, operation=f"list {kind.lower()}")
+
+    def watch(self, kind, namespace=None, resource_version=None, label_selector=None, field_selector=None, timeout_seconds=WATCH_WINDOW_SECONDS):
+        """watch 스트림의 이벤트를 도착하는 대로 내보낸다 (서버가 timeoutSeconds 후 스트림을 닫으면 종료)"""
+        import urllib3
+
+        params = {
+            'watch': '1',
+            'allowWatchBookmarks': 'true',
+            'timeoutSeconds': str(int(timeout_seconds)),
+            **selector_params(label_selector, field_selector),
+        }
+        if resource_version:
+            params['resourceVersion'] = resource_version
+        url = resource_path(kind, namespace=namespace) + f"?{urlencode(params)}"
+
+        start = time.perf_counter()
+        try:
+            response = self._pool.request(
+                'GET', url, headers=self._headers, preload_content=False,
+                timeout=urllib3.Timeout(connect=CONNECT_TIMEOUT_SECONDS, read=timeout_seconds + CONNECT_TIMEOUT_SECONDS),
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise ConnectionError(f"watch {kind.lower()} connection failed: {e}") from e
+        try:
+            if response.status >= 400:
+                raise K8sApiError(f"watch {kind.lower()} failed ({response.status})", response.status)
+            buffer = b''
+            for chunk in response.stream(decode_content=True):
+                buffer += chunk
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    if line.strip():
+                        yield json.loads(line)
+        except urllib3.exceptions.HTTPError as e:
+            # 호출 측이 마지막 resourceVersion부터 다시 watch할 수 있도록 OSError 계열로 변환
+            raise ConnectionError(f"watch {kind.lower()} stream interrupted: {e}") from e
+        finally:
+            # 스트림을 끝까지 읽지 않고 빠져나온 커넥션은 재사용할 수 없으므로 닫는다
+            response.close()
+            response.release_conn()
+            self.timings.append((f"watch {kind.lower()}", time.perf_counter() - start))
+
+    def apply(self, obj, field_manager):
+        path = resource_path(obj['kind'], obj['metadata']['name'], obj['metadata'].get('namespace'), obj.get('apiVersion'))
+        # JSON은 YAML의 부분집합이므로 apply-patch+yaml로 그대로 보낼 수 있다
+        return self.request(
+            'PATCH', path, body=obj, params={'fieldManager': field_manager, 'force': 'true'},
+            content_type='application/apply-patch+yaml', operation=f"apply {obj['kind'].lower()}",
+        )
+
+    def apply_many(self, objects, field_manager):
+        for obj in objects:
+            self.apply(obj, field_manager)
+
+    def delete(self, kind, name, namespace=None):
+        try:
+            self.request('DELETE', resource_path(kind, name, namespace), operation=f"delete {kind.lower()}")
+        except K8sApiError as e:
+            if e.status != 404:
+                raise
+
+    def close(self):
+        pool = getattr(self, '_pool', None)
+        if pool:
+            pool.close()
+        for path in self._temp_files:
+            if os.path.exists(path):
+                os.remove(path)
+        self._temp_files = []
+
+
+class KubectlClusterClient(ClusterClient):
+    """kubectl 서브프로세스 기반 폴백 구현"""
+
+    backend = 'kubectl'
+
+    def __init__(self, kubeconfig_path=None):
+        super().__init__()
+        self._env = os.environ.copy()
+        self._env['KUBECONFIG'] = os.path.expanduser(kubeconfig_path or os.getenv('KUBECONFIG', DEFAULT_KUBECONFIG))
+
+    def run(self, args, operation, input=None):
+        with self.timed(operation):
+            result = subprocess.run(['kubectl', *args], capture_output=True, text=True, env=self._env, input=input)
+        if result.returncode != 0:
+            raise K8sApiError(f"kubectl {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def version(self):
+        return json.loads(self.run(['version', '-o', 'json'], 'version')).get('serverVersion', {})
+
+    def get(self, kind, name, namespace=None):
+        args = ['get', f"{kind.lower()}/{name}", '-o', 'json', '--ignore-not-found']
+        if namespace and RESOURCES[kind][2]:
+            args += ['-n', namespace]
+        stdout = self.run(args, f"get {kind.lower()}")
+        return json.loads(stdout) if stdout else None
+
+    def get_many(self, namespace, objects):
+        refs = [object_ref(obj) for obj in objects]
+        stdout = self.run(['get', *refs, '-n', namespace, '-o', 'json', '--ignore-not-found'], 'get batch')
+        if not stdout:
+            return {}
+        live = json.loads(stdout)
+        items = live.get('items', []) if live.get('kind') == 'List' else [live]
+        return {object_ref(item): item for item in items}
+
+    def list_resource(self, kind, namespace=None, label_selector=None, field_selector=None):
+        args = ['get', RESOURCES[kind][1], '-o', 'json']
+        if namespace:
+            args += ['-n', namespace]
+        if label_selector:
+            args += ['-l', label_selector]
+        if field_selector:
+            args += ['--field-selector', field_selector]
+        return json.loads(self.run(args, f"list {kind.lower()}"))
+
+    def apply(self, obj, field_manager):
+        self.apply_many([obj], field_manager)
+
+    def apply_many(self, objects, field_manager):
+        manifest = json.dumps({'apiVersion': 'v1', 'kind': 'List', 'items': objects})
+        self.run(
+            ['apply', '--server-side', '--force-conflicts', f"--field-manager={field_manager}", '-f', '-'],
+            'apply', input=manifest,
+        )
+
+    def delete(self, kind, name, namespace=None):
+        args = ['delete', f"{kind.lower()}/{name}", '--ignore-not-found=true']
+        if namespace:
+            args += ['-n', namespace]
+        self.run(args, f"delete {kind.lower()}")
+
+
+def get_cluster_client(kubeconfig_path=None):
+    """네이티브 클라이언트를 우선 사용하고, 불가능하면 kubectl로 폴백 (K8S_CLIENT=kubectl로 강제 가능)"""
+    if os.getenv('K8S_CLIENT', 'native') == 'kubectl':
+        return KubectlClusterClient(kubeconfig_path)
+    try:
+        return NativeClusterClient(kubeconfig_path)
+    except (UnsupportedKubeconfig, ImportError, KeyError, StopIteration) as e:
+        print(f"Native Kubernetes client unavailable ({e}), falling back to kubectl")
+        return KubectlClusterClient(kubeconfig_path)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Kubernetes watch API 기반 대기 유틸리티
+
+고정 간격 폴링 대신 list + watch(resourceVersion 이어받기)로 Deployment 롤아웃과
+Service LoadBalancer ingress를 동시에 기다리고, 둘 다 준비되는 즉시 반환한다.
+롤아웃이 끝나면 Pod별 생성→Ready 소요 시간을 함께 보고한다.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from k8s_client import WATCH_WINDOW_SECONDS, K8sApiError
+
+RESOURCE_VERSION_EXPIRED = 410
+RECONNECT_DELAY_SECONDS = 1
+PROGRESS_DEADLINE_EXCEEDED = 'ProgressDeadlineExceeded'
+
+
+class RolloutFailed(Exception):
+    """Deployment가 progressDeadlineSeconds 안에 진행하지 못함 (기다려도 완료되지 않는다)"""
+
+
+def rollout_complete(deployment):
+    """kubectl rollout status와 같은 기준으로 Deployment 롤아웃 완료 여부 판단.
+    Progressing 조건이 ProgressDeadlineExceeded면 RolloutFailed를 던진다."""
+    if not deployment:
+        return False
+    spec = deployment.get('spec', {})
+    status = deployment.get('status', {})
+    desired = spec.get('replicas', 1)
+    if status.get('observedGeneration', 0) < deployment['metadata'].get('generation', 0):
+        return False
+    for condition in status.get('conditions', []):
+        if condition.get('type') == 'Progressing' and condition.get('reason') == PROGRESS_DEADLINE_EXCEEDED:
+            raise RolloutFailed(
+                f"deployment {deployment['metadata']['name']} exceeded its progress deadline: "
+                f"{condition.get('message', '')}"
+            )
+    updated = status.get('updatedReplicas', 0)
+    return (
+        updated == desired
+        and status.get('replicas', 0) == updated
+        and status.get('availableReplicas', 0) == updated
+    )
+
+
+def load_balancer_address(service):
+    """Service status에서 LoadBalancer ingress 주소(hostname 우선, 없으면 ip)를 추출"""
+    ingress = (service or {}).get('status', {}).get('loadBalancer', {}).get('ingress') or []
+    if not ingress:
+        return ''
+    return ingress[0].get('hostname') or ingress[0].get('ip') or ''
+
+
+def watch_until(client, kind, namespace, predicate, deadline, field_selector=None, label_selector=None,
+                watch_window=WATCH_WINDOW_SECONDS, stop=None):
+    """
+    list로 현재 상태와 resourceVersion을 얻은 뒤 watch로 변경을 따라가며
+    predicate(obj)가 참이 되는 객체를 반환한다. 스트림이 끊기면 마지막
+    resourceVersion부터 이어받고, 410 Gone이면 다시 list한다. 기한 초과 시 None.
+    """
+    resource_version = None
+    while time.monotonic() < deadline and not (stop and stop.is_set()):
+        if resource_version is None:
+            listing = client.list_resource(kind, namespace, label_selector, field_selector)
+            for item in listing.get('items', []):
+                if predicate(item):
+                    return item
+            resource_version = listing.get('metadata', {}).get('resourceVersion')
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            events = client.watch(
+                kind, namespace, resource_version, label_selector, field_selector,
+                timeout_seconds=max(1, int(min(remaining, watch_window))),
+            )
+            for event in events:
+                obj = event.get('object', {})
+                if event.get('type') == 'ERROR':
+                    if obj.get('code') == RESOURCE_VERSION_EXPIRED:
+                        resource_version = None
+                        break
+                    raise K8sApiError(f"watch {kind.lower()} error: {obj.get('message', '')}", obj.get('code'))
+                resource_version = obj.get('metadata', {}).get('resourceVersion') or resource_version
+                if event.get('type') in ('ADDED', 'MODIFIED') and predicate(obj):
+                    return obj
+                if stop and stop.is_set():
+                    return None
+        except K8sApiError as e:
+            if e.status == RESOURCE_VERSION_EXPIRED:
+                resource_version = None
+                continue
+            raise
+        except OSError:
+            # 네트워크 단절 등: 잠시 후 같은 resourceVersion부터 다시 watch
+            time.sleep(RECONNECT_DELAY_SECONDS)
+    return None
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+def pod_readiness_timings(pod):
+    """Pod 생성 시각 기준 스케줄링/컨테이너 시작/Ready까지 걸린 초 (서버 타임스탬프 기준)"""
+    created = parse_timestamp(pod['metadata'].get('creationTimestamp'))
+    status = pod.get('status', {})
+    conditions = {c['type']: c for c in status.get('conditions', [])}
+
+    def since_created(timestamp):
+        moment = parse_timestamp(timestamp)
+        return round((moment - created).total_seconds(), 3) if moment and created else None
+
+    started = [
+        c.get('state', {}).get('running', {}).get('startedAt')
+        for c in status.get('containerStatuses', [])
+    ]
+    started = [value for value in started if value]
+    ready = conditions.get('Ready', {})
+    return {
+        'scheduled': since_created(conditions.get('PodScheduled', {}).get('lastTransitionTime')),
+        'started': since_created(max(started)) if started else None,
+        'ready': since_created(ready.get('lastTransitionTime')) if ready.get('status') == 'True' else None,
+    }
+
+
+def deployment_selector(deployment):
+    """Deployment의 spec.selector.matchLabels를 label selector 문자열로 (없으면 app=<이름>)"""
+    match_labels = deployment.get('spec', {}).get('selector', {}).get('matchLabels') or {}
+    if not match_labels:
+        return f"app={deployment['metadata']['name']}"
+    return ','.join(f"{key}={value}" for key, value in sorted(match_labels.items()))
+
+
+def wait_for_ready(client, namespace, deployment_name, service_name=None, timeout=300, service_timeout=None,
+                   label_selector=None, watch_window=WATCH_WINDOW_SECONDS):
+    """
+    Deployment 롤아웃과 Service ingress를 동시에 watch하여 둘 다 준비되면 반환.
+    Service는 LoadBalancer 컨트롤러가 없을 수 있으므로 별도 service_timeout을 두고,
+    시간 내에 주소가 없으면 빈 문자열로 보고한다(롤아웃 실패로 보지 않음).
+    ProgressDeadlineExceeded면 timeout까지 기다리지 않고 errors에 기록한 뒤 바로 반환한다.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    results = {'rollout_ready': False, 'service_address': '', 'errors': []}
+    stop = threading.Event()
+
+    def watch_deployment():
+        try:
+            deployment = watch_until(
+                client, 'Deployment', namespace, rollout_complete, deadline,
+                field_selector=f"metadata.name={deployment_name}", watch_window=watch_window, stop=stop,
+            )
+            results['rollout_ready'] = deployment is not None
+            results['deployment'] = deployment
+            results['rollout_seconds'] = round(time.monotonic() - start, 3)
+        except Exception as e:
+            results['errors'].append(f"deployment: {e}")
+            stop.set()
+
+    def watch_service():
+        service_deadline = min(deadline, start + (service_timeout or timeout))
+        try:
+            service = watch_until(
+                client, 'Service', namespace, lambda obj: bool(load_balancer_address(obj)), service_deadline,
+                field_selector=f"metadata.name={service_name}", watch_window=watch_window, stop=stop,
+            )
+            results['service_address'] = load_balancer_address(service)
+            results['service_seconds'] = round(time.monotonic() - start, 3)
+        except Exception as e:
+            results['errors'].append(f"service: {e}")
+
+    threads = [threading.Thread(target=watch_deployment, daemon=True)]
+    if service_name:
+        threads.append(threading.Thread(target=watch_service, daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()) + 1)
+    stop.set()
+
+    results['elapsed_seconds'] = round(time.monotonic() - start, 3)
+    results['pods'] = {}
+    deployment = results.pop('deployment', None)
+    if results['rollout_ready']:
+        selector = label_selector or deployment_selector(deployment)
+        for pod in client.list('Pod', namespace, selector):
+            if pod['metadata'].get('deletionTimestamp'):
+                continue
+            results['pods'][pod['metadata']['name']] = pod_readiness_timings(pod)
+    return results
+
+
+def watch_service_address(client, namespace, service_name, timeout):
+    """Service에 LoadBalancer 주소가 할당될 때까지 watch (없으면 빈 문자열)"""
+    service = watch_until(
+        client, 'Service', namespace, lambda obj: bool(load_balancer_address(obj)), time.monotonic() + timeout,
+        field_selector=f"metadata.name={service_name}", watch_window=timeout,
+    )
+    return load_balancer_address(service)
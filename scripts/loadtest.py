@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+QuizNox API 부하 테스트
+
+로컬 DynamoDB 대체 서버(local_dynamodb.py)를 띄워 합성 문제/후기 데이터를 채우고,
+auth 플러그인이 검증할 수 있는 JWT를 발급한 뒤 Fastify 서버(node src/index.js)에
+open-loop(고정 도착률) asyncio HTTP 부하를 건다. 시나리오별 지연 히스토그램,
+백분위수, RPS, 서버 RSS와 서버 /metrics 구간 요약(scrape_metrics.py)을 JSON으로 출력하여
+커밋 간 비교에 사용한다.
+
+사용 예:
+    python scripts/loadtest.py --rate 200 --duration 20 --output benchmark.json
+    python scripts/loadtest.py --base-url http://127.0.0.1:4000 --scenarios questions
+    python scripts/loadtest.py --baseline benchmark-main.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import boto3
+from botocore.config import Config
+
+from backfill_review_feed import REVIEW_FEED
+from http_probe import HttpConnectionPool, mint_jwt, percentile
+from local_dynamodb import BATCH_WRITE_LIMIT, TABLES, LocalDynamoDBServer
+from scrape_metrics import fetch_metrics, parse_metrics, summarize as summarize_metrics
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_FILE = ROOT_DIR / 'tests' / 'fixtures' / 'questionFixtures.js'
+QUESTIONS_TABLE = 'QuizNox_Questions'
+REVIEWS_TABLE = 'QuizNox_Reviews'
+JWT_SECRET = 'loadtest-jwt-secret'
+SERVER_START_TIMEOUT_SECONDS = 30
+RSS_SAMPLE_INTERVAL_SECONDS = 0.2
+# 1-2-5 간격의 지연 히스토그램 경계 (ms)
+HISTOGRAM_BOUNDS_MS = [
+    base * scale for scale in (0.1, 1, 10, 100, 1000, 10000) for base in (1, 2, 5)
+]
+
+# 시나리오: (가중치, 요청 생성 함수) 목록. 생성 함수는 (method, path) 또는 (method, path, json_body)를 반환
+SCENARIOS = {
+    'questions': [(1, lambda ctx: ('GET', f"/questions?topicId={random.choice(ctx['topics'])}"))],
+    'reviews': [(1, lambda ctx: ('GET', '/reviews?limit=50'))],
+    'sample': [(1, lambda ctx: ('GET', f"/questions/sample?topicId={random.choice(ctx['topics'])}&n=20"))],
+    'mixed': [
+        (9, lambda ctx: ('GET', f"/questions?topicId={random.choice(ctx['topics'])}")),
+        (1, lambda ctx: ('GET', '/reviews?limit=50')),
+    ],
+    'review-writes': [
+        (4, lambda ctx: ('POST', '/reviews', {'content': f"loadtest review {random.random():.6f}"})),
+        (1, lambda ctx: ('GET', '/reviews?limit=50')),
+    ],
+}
+
+
+class Colors:
+    GREEN = '\033[0;32m'
+    RED = '\033[0;31m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'
+
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}", file=sys.stderr)
+
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}", file=sys.stderr)
+
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}", file=sys.stderr)
+
+
+def print_step(msg):
+    print(f"{Colors.BLUE}🔄 {msg}{Colors.NC}", file=sys.stderr)
+
+
+def load_question_templates():
+    """tests/fixtures/questionFixtures.js의 mockQuestions를 node로 읽어 문제 모양의 기준으로 사용"""
+    script = f"process.stdout.write(JSON.stringify(require({json.dumps(str(FIXTURES_FILE))}).mockQuestions))"
+    try:
+        result = subprocess.run(['node', '-e', script], capture_output=True, text=True, timeout=10, check=True)
+        templates = json.loads(result.stdout)
+        if templates:
+            return templates
+    except (OSError, subprocess.SubprocessError, ValueError):
+        pass
+    print_info("Could not load question fixtures with node, using synthetic text")
+    return [{
+        'question_text': 'A company is running an application on Amazon EC2 instances. ' * 8,
+        'choices': [f"{letter}. Use an AWS managed service to meet the requirement. " * 4 for letter in 'ABCD'],
+        'most_voted_answer': 'C',
+    }]
+
+
+def synthetic_questions(topic_id, count, templates):
+    for number in range(1, count + 1):
+        template = templates[(number - 1) % len(templates)]
+        yield {
+            'topic_id': topic_id,
+            'question_number': f"{number:04d}",
+            'question_text': f"[{topic_id} #{number}] {template['question_text']}",
+            'choices': list(template['choices']),
+            'most_voted_answer': template['most_voted_answer'],
+        }
+
+
+def synthetic_reviews(count):
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    for index in range(count):
+        yield {
+            'review_id': str(uuid.uuid4()),
+            'user_id': f"user-{index % 50}",
+            'username': f"tester{index % 50}",
+            'content': f"Review #{index}: 문제 해설이 도움이 되었습니다. " * 3,
+            'created_at': (start + timedelta(minutes=index)).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'review_feed': REVIEW_FEED,
+        }
+
+
+def dynamodb_resource(endpoint):
+    return boto3.resource(
+        'dynamodb', endpoint_url=endpoint, region_name='ap-northeast-2',
+        aws_access_key_id='local', aws_secret_access_key='local',
+        config=Config(retries={'mode': 'standard'}),
+    )
+
+
+def seed_tables(endpoint, topics, questions_per_topic, reviews):
+    """테이블을 만들고 batch_writer(BatchWriteItem 25개 단위)로 합성 데이터를 채운다"""
+    dynamodb = dynamodb_resource(endpoint)
+    existing = set(dynamodb.meta.client.list_tables()['TableNames'])
+    for name, definition in TABLES.items():
+        if name not in existing:
+            dynamodb.create_table(TableName=name, BillingMode='PAY_PER_REQUEST', **definition)
+
+    templates = load_question_templates()
+    with dynamodb.Table(QUESTIONS_TABLE).batch_writer() as batch:
+        for topic_id in topics:
+            for question in synthetic_questions(topic_id, questions_per_topic, templates):
+                batch.put_item(Item=question)
+    with dynamodb.Table(REVIEWS_TABLE).batch_writer() as batch:
+        for review in synthetic_reviews(reviews):
+            batch.put_item(Item=review)
+    total = len(topics) * questions_per_topic + reviews
+    print_success(f"Seeded {total} items ({len(topics)} topics x {questions_per_topic} questions, "
+                  f"{reviews} reviews) in batches of {BATCH_WRITE_LIMIT}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(dynamodb_endpoint, log_path, extra_env=None):
+    """node src/index.js를 로컬 DynamoDB를 바라보도록 띄우고 /health가 응답할 때까지 대기"""
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        HOST='127.0.0.1',
+        NODE_ENV='production',
+        JWT_SECRET=JWT_SECRET,
+        AWS_REGION='ap-northeast-2',
+        AWS_ACCESS_KEY_ID='local',
+        AWS_SECRET_ACCESS_KEY='local',
+        AWS_ENDPOINT_URL_DYNAMODB=dynamodb_endpoint,
+        DYNAMODB_TABLE_NAME=QUESTIONS_TABLE,
+        DYNAMODB_REVIEWS_TABLE_NAME=REVIEWS_TABLE,
+        **(extra_env or {}),
+    )
+    env.pop('DISABLE_JWT_AUTH', None)
+    log_file = open(log_path, 'w')
+    process = subprocess.Popen(['node', 'src/index.js'], cwd=ROOT_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} (see {log_path})")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                break
+        except OSError:
+            time.sleep(0.1)
+    else:
+        process.kill()
+        raise RuntimeError(f"Server did not start within {SERVER_START_TIMEOUT_SECONDS}s (see {log_path})")
+    return process, base_url
+
+
+def process_rss_mb(pid):
+    """/proc/<pid>/status의 VmRSS (MB). 읽을 수 없으면 None"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def latency_histogram(latencies_ms):
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for value in latencies_ms:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if value <= bound), len(HISTOGRAM_BOUNDS_MS))
+        counts[index] += 1
+    buckets = [{'le_ms': bound, 'count': count} for bound, count in zip(HISTOGRAM_BOUNDS_MS, counts)]
+    buckets.append({'le_ms': None, 'count': counts[-1]})
+    return [bucket for bucket in buckets if bucket['count']]
+
+
+def summarize(samples, elapsed, rss_samples, dropped):
+    latencies = sorted(latency for latency, _, _ in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok = sum(1 for _, status, _ in samples if isinstance(status, int) and status < 400)
+    rss = [value for value in rss_samples if value is not None]
+    return {
+        'requests': len(samples),
+        'dropped': dropped,
+        'duration_seconds': round(elapsed, 3),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else 0,
+        'success_rps': round(ok / elapsed, 1) if elapsed else 0,
+        'error_rate': round(1 - ok / len(samples), 4) if samples else 0,
+        'status_codes': statuses,
+        'bytes_received': sum(size for _, _, size in samples),
+        'latency_ms': {
+            'min': round(latencies[0], 3) if latencies else None,
+            'p50': percentile(latencies, 0.50),
+            'p90': percentile(latencies, 0.90),
+            'p99': percentile(latencies, 0.99),
+            'p999': percentile(latencies, 0.999),
+            'max': round(latencies[-1], 3) if latencies else None,
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+        },
+        'histogram': latency_histogram(latencies),
+        'server_rss_mb': {
+            'start': rss[0] if rss else None,
+            'peak': max(rss) if rss else None,
+            'end': rss[-1] if rss else None,
+        },
+    }
+
+
+async def sample_rss(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(process_rss_mb(pid) if pid else None)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_scenario(base_url, scenario, context, rate, duration, connections, max_inflight, server_pid=None):
+    """
+    open-loop 부하: 응답을 기다리지 않고 1/rate 간격으로 요청을 예약한다.
+    지연은 예약 시각부터 측정하므로 서버가 밀려 대기열이 생기면 그대로 지연에 반영된다
+    (coordinated omission 방지). 동시 요청이 max_inflight를 넘으면 보내지 않고 dropped로 센다.
+    """
+    pool = HttpConnectionPool(base_url, connections)
+    weighted = [make for weight, make in SCENARIOS[scenario] for _ in range(weight)]
+    headers = {'Authorization': f"Bearer {context['token']}"}
+    samples, rss_samples = [], []
+    inflight = set()
+    dropped = 0
+    stop = asyncio.Event()
+    rss_task = asyncio.create_task(sample_rss(server_pid, rss_samples, stop))
+
+    async def fire(scheduled, method, path, body=None):
+        try:
+            status, response = await pool.request(method, path, headers, body)
+            size = len(response)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            status, size = type(e).__name__, 0
+        samples.append(((time.perf_counter() - scheduled) * 1000, status, size))
+
+    start = time.perf_counter()
+    total = int(rate * duration)
+    for index in range(total):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(inflight) >= max_inflight:
+            dropped += 1
+            continue
+        task = asyncio.create_task(fire(scheduled, *random.choice(weighted)(context)))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+    if inflight:
+        await asyncio.wait(inflight)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await rss_task
+    await pool.close()
+    return summarize(samples, elapsed, rss_samples, dropped)
+
+
+def scrape_server_metrics(base_url):
+    """서버 /metrics 스냅샷 (메트릭이 없는 서버면 None)"""
+    try:
+        return parse_metrics(fetch_metrics(base_url.rstrip('/') + '/metrics'))
+    except OSError:
+        return None
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    """baseline JSON과 시나리오별 RPS/p50/p99 비교 출력"""
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        parts = []
+        for label, now, before in (
+            ('rps', current['success_rps'], previous['success_rps']),
+            ('p50', current['latency_ms']['p50'], previous['latency_ms']['p50']),
+            ('p99', current['latency_ms']['p99'], previous['latency_ms']['p99']),
+        ):
+            change = f" ({(now - before) / before * 100:+.1f}%)" if now is not None and before else ''
+            parts.append(f"{label} {before} -> {now}{change}")
+        print_info(f"{name}: " + ', '.join(parts))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Open-loop load test for the QuizNox API')
+    parser.add_argument('--scenarios', nargs='+', default=['questions', 'reviews'], choices=sorted(SCENARIOS))
+    parser.add_argument('--rate', type=float, default=100, help='초당 요청 수 (도착률)')
+    parser.add_argument('--duration', type=float, default=15, help='시나리오별 측정 시간(초)')
+    parser.add_argument('--warmup', type=float, default=3, help='측정 전 워밍업 시간(초)')
+    parser.add_argument('--connections', type=int, default=32, help='keep-alive 연결 수')
+    parser.add_argument('--max-inflight', type=int, default=1000, help='초과 시 요청을 보내지 않고 dropped로 집계')
+    parser.add_argument('--topics', type=int, default=5)
+    parser.add_argument('--questions-per-topic', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=500)
+    parser.add_argument('--dynamodb-latency-ms', type=float, default=0, help='로컬 DynamoDB 요청마다 추가할 지연')
+    parser.add_argument('--dynamodb-unprocessed-rate', type=float, default=0,
+                        help='로컬 DynamoDB BatchWriteItem 항목 중 UnprocessedItems로 돌려줄 비율')
+    parser.add_argument('--write-behind', action='store_true', help='서버를 REVIEW_WRITE_BEHIND=true로 실행')
+    parser.add_argument('--dynamodb-endpoint', help='이미 떠 있는 DynamoDB 호환 endpoint 사용 (예: DynamoDB Local)')
+    parser.add_argument('--base-url', help='이미 떠 있는 API 서버 사용 (서버를 띄우지 않음)')
+    parser.add_argument('--server-pid', type=int, help='--base-url 사용 시 RSS를 측정할 서버 PID')
+    parser.add_argument('--no-seed', action='store_true', help='데이터 시딩 생략')
+    parser.add_argument('--seed', type=int, default=42, help='요청 선택용 난수 시드')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본: stdout)')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--server-log', default=str(ROOT_DIR / 'loadtest-server.log'))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+    topics = [f"BENCH_TOPIC_{index:02d}" for index in range(args.topics)]
+    context = {'topics': topics, 'token': mint_jwt(JWT_SECRET, 'loadtest-user')}
+
+    local_db = None
+    server = None
+    try:
+        endpoint = args.dynamodb_endpoint
+        if not args.base_url and not endpoint:
+            local_db = LocalDynamoDBServer(latency_ms=args.dynamodb_latency_ms,
+                                           unprocessed_rate=args.dynamodb_unprocessed_rate).start()
+            endpoint = local_db.endpoint
+            print_success(f"Local DynamoDB: {endpoint}")
+        if endpoint and not args.no_seed:
+            print_step("Seeding tables...")
+            seed_tables(endpoint, topics, args.questions_per_topic, args.reviews)
+
+        base_url, server_pid = args.base_url, args.server_pid
+        if not base_url:
+            print_step("Starting API server...")
+            extra_env = {'REVIEW_WRITE_BEHIND': 'true'} if args.write_behind else None
+            server, base_url = start_server(endpoint, args.server_log, extra_env)
+            server_pid = server.pid
+            print_success(f"API server: {base_url} (pid {server_pid})")
+
+        results = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': {
+                'rate': args.rate, 'duration': args.duration, 'warmup': args.warmup,
+                'connections': args.connections, 'topics': args.topics,
+                'questions_per_topic': args.questions_per_topic, 'reviews': args.reviews,
+                'dynamodb_latency_ms': args.dynamodb_latency_ms,
+                'dynamodb_unprocessed_rate': args.dynamodb_unprocessed_rate,
+                'write_behind': args.write_behind,
+            },
+            'scenarios': {},
+        }
+        for scenario in args.scenarios:
+            if args.warmup:
+                asyncio.run(run_scenario(base_url, scenario, context, args.rate, args.warmup,
+                                         args.connections, args.max_inflight))
+            print_step(f"Running {scenario}: {args.rate:g} req/s for {args.duration:g}s...")
+            metrics_before = scrape_server_metrics(base_url)
+            summary = asyncio.run(run_scenario(base_url, scenario, context, args.rate, args.duration,
+                                               args.connections, args.max_inflight, server_pid))
+            metrics_after = scrape_server_metrics(base_url)
+            if metrics_before is not None and metrics_after is not None:
+                # 서버 측 라우트/DynamoDB/이벤트 루프 지연 (클라이언트 지연과 비교용)
+                summary['server_metrics'] = summarize_metrics(metrics_before, metrics_after)
+            results['scenarios'][scenario] = summary
+            latency = summary['latency_ms']
+            print_info(f"{scenario}: {summary['success_rps']} ok req/s, p50 {latency['p50']} ms, "
+                       f"p99 {latency['p99']} ms, errors {summary['error_rate']:.2%}, "
+                       f"peak RSS {summary['server_rss_mb']['peak']} MB")
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if local_db:
+            local_db.stop()
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+        print_success(f"Results written to {args.output}")
+    else:
+        print(output)
+    if args.baseline:
+        print_comparison(results, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print_error("Interrupted")
+        sys.exit(130)
+    except Exception as e:
+        print_error(f"Load test failed: {e}")
+        sys.exit(1)
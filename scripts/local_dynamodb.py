@@ -0,0 +1,816 @@
+#!/usr/bin/env python3
+"""
+로컬 DynamoDB 대체 서버 (벤치마크/로컬 개발용)
+
+DynamoDB JSON 1.0 프로토콜(X-Amz-Target 헤더)을 그대로 받아 메모리에 저장하므로
+AWS SDK(Node/boto3)를 endpoint만 바꿔 연결할 수 있다. 서명은 검증하지 않는다.
+지원 연산: CreateTable, DescribeTable, ListTables, DeleteTable, PutItem, GetItem,
+UpdateItem(SET/REMOVE), DeleteItem, Query(GSI 포함), Scan(Segment 포함),
+BatchWriteItem, BatchGetItem. 쓰기 연산은 ConditionExpression을 평가한다.
+Query/Scan은 실제 서비스처럼 1MB 단위로 잘라 LastEvaluatedKey를 돌려주고,
+FilterExpression은 페이지를 읽은 뒤에 적용한다.
+ReturnConsumedCapacity를 요청하면 항목 크기로 근사한 ConsumedCapacity를 돌려준다.
+--unprocessed-rate를 주면 BatchWriteItem 일부를 UnprocessedItems로 돌려준다 (재시도 확인용).
+
+사용 예:
+    python scripts/local_dynamodb.py --port 8000
+    AWS_ENDPOINT_URL_DYNAMODB=http://127.0.0.1:8000 npm run dev
+"""
+
+import argparse
+import base64
+import bisect
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TARGET_PREFIX = 'DynamoDB_20120810.'
+ERROR_PREFIX = 'com.amazonaws.dynamodb.v20120810#'
+PAGE_SIZE_BYTES = 1024 * 1024
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+
+# QuizNox 서비스가 사용하는 테이블 정의 (cluster-infra의 테이블과 같은 키 구성)
+TABLES = {
+    'QuizNox_Questions': {
+        'KeySchema': [
+            {'AttributeName': 'topic_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'question_number', 'KeyType': 'RANGE'},
+        ],
+        'AttributeDefinitions': [
+            {'AttributeName': 'topic_id', 'AttributeType': 'S'},
+            {'AttributeName': 'question_number', 'AttributeType': 'S'},
+        ],
+    },
+    'QuizNox_Reviews': {
+        'KeySchema': [{'AttributeName': 'review_id', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'review_id', 'AttributeType': 'S'},
+            {'AttributeName': 'review_feed', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'},
+        ],
+        # 최신순 후기 목록용 GSI (review_feed는 상수 파티션 키)
+        'GlobalSecondaryIndexes': [{
+            'IndexName': 'review_feed-created_at-index',
+            'KeySchema': [
+                {'AttributeName': 'review_feed', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'},
+            ],
+            'Projection': {'ProjectionType': 'ALL'},
+        }],
+    },
+}
+
+
+class DynamoError(Exception):
+    def __init__(self, error_type, message, status=400, extra=None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.status = status
+        # 오류 응답 본문에 함께 실을 필드 (예: 조건 실패 시 Item)
+        self.extra = extra or {}
+
+
+def validation_error(message):
+    return DynamoError('ValidationException', message)
+
+
+def conditional_check_failed(item=None):
+    extra = {'Item': item} if item else None
+    return DynamoError('ConditionalCheckFailedException', 'The conditional request failed', extra=extra)
+
+
+def key_value(attribute):
+    """정렬/비교용 파이썬 값 (S → str, N → Decimal, B → bytes)"""
+    if 'S' in attribute:
+        return attribute['S']
+    if 'N' in attribute:
+        return Decimal(attribute['N'])
+    if 'B' in attribute:
+        return base64.b64decode(attribute['B'])
+    raise validation_error('Key attributes must be of type S, N or B')
+
+
+def item_size(item):
+    return len(json.dumps(item, separators=(',', ':')))
+
+
+def key_schema(definition):
+    schema = {entry['KeyType']: entry['AttributeName'] for entry in definition['KeySchema']}
+    return schema['HASH'], schema.get('RANGE')
+
+
+class Index:
+    """GSI: index hash 값 → (index range 값, 테이블 키) 정렬 목록"""
+
+    def __init__(self, definition):
+        self.name = definition['IndexName']
+        self.definition = definition
+        self.hash_key, self.range_key = key_schema(definition)
+        self.partitions = {}
+
+    def entry(self, item, table_key):
+        """item이 인덱스 키를 모두 가지면 (hash 값, 정렬 키), 아니면 None (sparse index)"""
+        if self.hash_key not in item or (self.range_key and self.range_key not in item):
+            return None
+        range_value = key_value(item[self.range_key]) if self.range_key else ''
+        return key_value(item[self.hash_key]), (range_value, table_key)
+
+    def add(self, item, table_key):
+        entry = self.entry(item, table_key)
+        if entry:
+            bisect.insort(self.partitions.setdefault(entry[0], []), entry[1])
+
+    def remove(self, item, table_key):
+        entry = self.entry(item, table_key)
+        if entry:
+            order = self.partitions[entry[0]]
+            order.pop(bisect.bisect_left(order, entry[1]))
+            if not order:
+                del self.partitions[entry[0]]
+
+
+class Table:
+    def __init__(self, name, definition):
+        self.name = name
+        self.definition = definition
+        self.hash_key, self.range_key = key_schema(definition)
+        # hash 값 → (정렬된 range 값 목록, range 값 → item)
+        self.partitions = {}
+        self.indexes = {
+            index['IndexName']: Index(index) for index in definition.get('GlobalSecondaryIndexes', [])
+        }
+        self.created_at = time.time()
+
+    def describe(self):
+        description = {
+            'TableName': self.name,
+            'TableStatus': 'ACTIVE',
+            'KeySchema': self.definition['KeySchema'],
+            'AttributeDefinitions': self.definition['AttributeDefinitions'],
+            'ItemCount': sum(len(items) for _, items in self.partitions.values()),
+            'CreationDateTime': self.created_at,
+        }
+        if self.indexes:
+            description['GlobalSecondaryIndexes'] = [
+                {'IndexName': index.name, 'KeySchema': index.definition['KeySchema'], 'IndexStatus': 'ACTIVE'}
+                for index in self.indexes.values()
+            ]
+        return description
+
+    def key_names(self):
+        return [self.hash_key] + ([self.range_key] if self.range_key else [])
+
+    def key_of(self, item):
+        missing = [name for name in self.key_names() if name not in item]
+        if missing:
+            raise validation_error(f"One of the required keys was not given a value: {', '.join(missing)}")
+        return key_value(item[self.hash_key]), key_value(item[self.range_key]) if self.range_key else ''
+
+    def key_attributes(self, item):
+        return {name: item[name] for name in self.key_names()}
+
+    def get(self, key):
+        return self.get_by_key(self.key_of(key))
+
+    def get_by_key(self, table_key):
+        partition = self.partitions.get(table_key[0])
+        return partition[1].get(table_key[1]) if partition else None
+
+    def put(self, item):
+        table_key = self.key_of(item)
+        hash_value, range_value = table_key
+        order, items = self.partitions.setdefault(hash_value, ([], {}))
+        previous = items.get(range_value)
+        if previous is None:
+            bisect.insort(order, range_value)
+        for index in self.indexes.values():
+            if previous is not None:
+                index.remove(previous, table_key)
+            index.add(item, table_key)
+        items[range_value] = item
+        return previous
+
+    def delete(self, key):
+        table_key = self.key_of(key)
+        hash_value, range_value = table_key
+        partition = self.partitions.get(hash_value)
+        if not partition or range_value not in partition[1]:
+            return None
+        order, items = partition
+        order.pop(bisect.bisect_left(order, range_value))
+        previous = items.pop(range_value)
+        for index in self.indexes.values():
+            index.remove(previous, table_key)
+        if not items:
+            del self.partitions[hash_value]
+        return previous
+
+    def partition_items(self, hash_value):
+        partition = self.partitions.get(hash_value)
+        if not partition:
+            return []
+        order, items = partition
+        return [items[key] for key in order]
+
+
+def resolve_name(token, names):
+    return names.get(token, token) if token.startswith('#') else token
+
+
+def resolve_value(token, values):
+    if token not in values:
+        raise validation_error(f"Value provided in ExpressionAttributeValues unused in expressions: {token}")
+    return values[token]
+
+
+KEY_CONDITION = re.compile(
+    r'^\s*(?P<name>[#\w]+)\s*(?P<op>=|<=|>=|<|>)\s*(?P<value>:\w+)\s*$'
+    r'|^\s*(?P<between_name>[#\w]+)\s+BETWEEN\s+(?P<low>:\w+)\s+AND\s+(?P<high>:\w+)\s*$'
+    r'|^\s*begins_with\s*\(\s*(?P<prefix_name>[#\w]+)\s*,\s*(?P<prefix>:\w+)\s*\)\s*$',
+    re.IGNORECASE,
+)
+COMPARATORS = {
+    '=': lambda a, b: a == b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def parse_key_condition(expression, names, values):
+    """
+    'pk = :v [AND sk op :v2 | sk BETWEEN :a AND :b | begins_with(sk, :p)]'를
+    {attribute: (predicate, equals, lower_bound)}로 변환
+    (equals는 '=' 조건의 피연산자, lower_bound는 정렬 키 탐색 시작점)
+    """
+    merged = []
+    for part in re.split(r'\s+AND\s+', expression.strip(), flags=re.IGNORECASE):
+        # boto3 등은 '(#n0 = :v0 AND #n1 BETWEEN :v1 AND :v2)'처럼 괄호로 감싸 보낸다
+        part = part.strip().lstrip('(').strip()
+        while part.count(')') > part.count('('):
+            part = part[:-1].strip()
+        # 'sk BETWEEN :a AND :b'의 AND는 조건 구분자가 아니므로 다시 합친다
+        if merged and re.search(r'\bBETWEEN\s+:\w+$', merged[-1], re.IGNORECASE):
+            merged[-1] = f"{merged[-1]} AND {part}"
+        else:
+            merged.append(part)
+
+    conditions = {}
+    for part in merged:
+        match = KEY_CONDITION.match(part)
+        if not match:
+            raise validation_error(f"Unsupported KeyConditionExpression: {part}")
+        if match.group('name'):
+            operand = key_value(resolve_value(match.group('value'), values))
+            op = match.group('op')
+            conditions[resolve_name(match.group('name'), names)] = (
+                lambda v, compare=COMPARATORS[op], o=operand: compare(v, o),
+                operand if op == '=' else None,
+            )
+        elif match.group('between_name'):
+            low = key_value(resolve_value(match.group('low'), values))
+            high = key_value(resolve_value(match.group('high'), values))
+            conditions[resolve_name(match.group('between_name'), names)] = (lambda v, lo=low, hi=high: lo <= v <= hi, None)
+        else:
+            prefix = key_value(resolve_value(match.group('prefix'), values))
+            conditions[resolve_name(match.group('prefix_name'), names)] = (lambda v, p=prefix: v.startswith(p), None)
+    return conditions
+
+
+TOKEN = re.compile(r'\s*(?:(?P<op><>|<=|>=|=|<|>)|(?P<punct>[(),])|(?P<value>:\w+)|(?P<name>#?[\w.]+))')
+CONDITION_FUNCTIONS = {'attribute_exists', 'attribute_not_exists', 'begins_with', 'contains', 'if_not_exists'}
+
+
+def tokenize(expression):
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise validation_error(f"Invalid expression: {expression}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class ConditionParser:
+    """
+    ConditionExpression 평가기: 비교 연산(= <> < <= > >=), BETWEEN, AND/OR/NOT, 괄호,
+    attribute_exists/attribute_not_exists/begins_with/contains 지원
+    """
+
+    def __init__(self, expression, names, values):
+        self.tokens = tokenize(expression)
+        self.position = 0
+        self.names = names
+        self.values = values
+        self.evaluate = self.parse_or()
+        if self.position != len(self.tokens):
+            raise validation_error(f"Invalid ConditionExpression: {expression}")
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token[0] is None or (expected and token[1].upper() != expected):
+            raise validation_error(f"Invalid ConditionExpression near {token[1]!r}")
+        self.position += 1
+        return token
+
+    def keyword(self, word):
+        kind, text = self.peek()
+        return kind == 'name' and text.upper() == word
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.keyword('OR'):
+            self.take()
+            right = self.parse_and()
+            left = lambda item, a=left, b=right: a(item) or b(item)
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+        while self.keyword('AND'):
+            self.take()
+            right = self.parse_not()
+            left = lambda item, a=left, b=right: a(item) and b(item)
+        return left
+
+    def parse_not(self):
+        if self.keyword('NOT'):
+            self.take()
+            inner = self.parse_not()
+            return lambda item: not inner(item)
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, text = self.peek()
+        if text == '(':
+            self.take()
+            inner = self.parse_or()
+            self.take(')')
+            return inner
+        if kind == 'name' and text in CONDITION_FUNCTIONS:
+            return self.parse_function()
+
+        left = self.parse_operand()
+        if self.keyword('BETWEEN'):
+            self.take()
+            low = self.parse_operand()
+            self.take('AND')
+            high = self.parse_operand()
+            return lambda item: compare_attributes(low(item), left(item), '<=') and compare_attributes(left(item), high(item), '<=')
+        op = self.take()
+        if op[0] != 'op':
+            raise validation_error(f"Invalid ConditionExpression near {op[1]!r}")
+        right = self.parse_operand()
+        return lambda item: compare_attributes(left(item), right(item), op[1])
+
+    def parse_function(self):
+        name = self.take()[1]
+        self.take('(')
+        path = self.parse_operand()
+        argument = None
+        if self.peek()[1] == ',':
+            self.take()
+            argument = self.parse_operand()
+        self.take(')')
+        if name == 'attribute_exists':
+            return lambda item: path(item) is not None
+        if name == 'attribute_not_exists':
+            return lambda item: path(item) is None
+        if name == 'begins_with':
+            return lambda item: compare_attributes(path(item), argument(item), 'begins_with')
+        if name == 'contains':
+            return lambda item: compare_attributes(path(item), argument(item), 'contains')
+        raise validation_error(f"{name} is not allowed in a condition")
+
+    def parse_operand(self):
+        kind, text = self.take()
+        if kind == 'value':
+            value = resolve_value(text, self.values)
+            return lambda item: value
+        if kind == 'name':
+            attribute = resolve_name(text, self.names)
+            return lambda item: item.get(attribute)
+        raise validation_error(f"Invalid operand {text!r}")
+
+
+def attribute_python_value(attribute):
+    kind, value = next(iter(attribute.items()))
+    return kind, Decimal(value) if kind == 'N' else value
+
+
+def compare_attributes(left, right, op):
+    if left is None or right is None:
+        return op == '<>' and (left is None) != (right is None)
+    left_kind, left_value = attribute_python_value(left)
+    right_kind, right_value = attribute_python_value(right)
+    if op == 'contains':
+        if left_kind in ('SS', 'NS', 'L'):
+            return right in [{left_kind[0]: v} for v in left_value] if left_kind != 'L' else right in left_value
+        return left_kind == right_kind == 'S' and right_value in left_value
+    if left_kind != right_kind:
+        return op == '<>'
+    if op == 'begins_with':
+        return left_kind == 'S' and left_value.startswith(right_value)
+    return COMPARATORS[op](left_value, right_value)
+
+
+def check_condition(request, item):
+    expression = request.get('ConditionExpression')
+    if expression is None:
+        return
+    parser = ConditionParser(expression, request.get('ExpressionAttributeNames', {}),
+                             request.get('ExpressionAttributeValues', {}))
+    if not parser.evaluate(item or {}):
+        # ReturnValuesOnConditionCheckFailure=ALL_OLD면 실패 원인 확인용으로 기존 항목을 돌려준다
+        returns_old = request.get('ReturnValuesOnConditionCheckFailure') == 'ALL_OLD'
+        raise conditional_check_failed(item if returns_old else None)
+
+
+def apply_update(item, expression, names, values):
+    """UpdateExpression의 SET(= :v, if_not_exists(a, :v))과 REMOVE 절 적용"""
+    updated = dict(item)
+    clauses = re.split(r'\b(SET|REMOVE)\b', expression.strip(), flags=re.IGNORECASE)
+    if clauses[0].strip():
+        raise validation_error(f"Unsupported UpdateExpression: {expression}")
+    for action, body in zip(clauses[1::2], clauses[2::2]):
+        for assignment in split_top_level(body):
+            if action.upper() == 'REMOVE':
+                updated.pop(resolve_name(assignment.strip(), names), None)
+                continue
+            target, _, source = assignment.partition('=')
+            target = resolve_name(target.strip(), names)
+            source = source.strip()
+            match = re.match(r'^if_not_exists\s*\(\s*([#\w]+)\s*,\s*(:\w+)\s*\)$', source)
+            if match:
+                existing = updated.get(resolve_name(match.group(1), names))
+                updated[target] = existing if existing is not None else resolve_value(match.group(2), values)
+            elif source.startswith(':'):
+                updated[target] = resolve_value(source, values)
+            else:
+                raise validation_error(f"Unsupported UpdateExpression: {assignment}")
+    return updated
+
+
+def split_top_level(body):
+    parts, depth, current = [], 0, ''
+    for char in body:
+        depth += char == '('
+        depth -= char == ')'
+        if char == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current)
+    return parts
+
+
+def project(item, projection, names):
+    if not projection:
+        return item
+    attributes = [resolve_name(part.strip(), names) for part in projection.split(',')]
+    return {name: item[name] for name in attributes if name in item}
+
+
+def ordered_range(order, forward, start=None):
+    """정렬된 목록을 start 다음부터 순방향/역방향으로 순회 (bisect로 시작 위치를 찾음)"""
+    if forward:
+        first = bisect.bisect_right(order, start) if start is not None else 0
+        for position in range(first, len(order)):
+            yield order[position]
+    else:
+        first = bisect.bisect_left(order, start) if start is not None else len(order)
+        for position in range(first - 1, -1, -1):
+            yield order[position]
+
+
+def take_page(candidates, limit, key_attributes):
+    """Limit/1MB 한도까지 item을 모으고, 남은 후보가 있으면 마지막 item의 키를 LastEvaluatedKey로"""
+    page, size = [], 0
+    for item in candidates:
+        if (limit and len(page) >= limit) or size >= PAGE_SIZE_BYTES:
+            return page, key_attributes(page[-1])
+        page.append(item)
+        size += item_size(item)
+    return page, None
+
+
+def capacity_units(size, unit_bytes):
+    return max(1, -(-size // unit_bytes))
+
+
+def consumed_capacity(operation, request, response):
+    """
+    대략적인 소비 용량 (읽기: 4KB당 0.5 RCU(eventually consistent), 쓰기: 1KB당 1 WCU).
+    실제 서비스는 읽은 항목 전체 크기 기준이지만 여기서는 반환된 항목으로 근사한다.
+    """
+    if operation in ('BatchWriteItem', 'BatchGetItem'):
+        totals = {}
+        for table_name, entries in request['RequestItems'].items():
+            if operation == 'BatchWriteItem':
+                units = sum(capacity_units(item_size(entry.get('PutRequest', {}).get('Item', {})), 1024)
+                            for entry in entries)
+            else:
+                read = response.get('Responses', {}).get(table_name, [])
+                units = 0.5 * capacity_units(sum(item_size(item) for item in read), 4096)
+            totals[table_name] = totals.get(table_name, 0) + units
+        return [{'TableName': name, 'CapacityUnits': units} for name, units in totals.items()]
+
+    if operation in ('Query', 'Scan', 'GetItem'):
+        items = response.get('Items') or ([response['Item']] if 'Item' in response else [])
+        units = 0.5 * capacity_units(sum(item_size(item) for item in items), 4096)
+    else:
+        item = request.get('Item') or response.get('Attributes') or request.get('Key', {})
+        units = capacity_units(item_size(item), 1024)
+    return {'TableName': request['TableName'], 'CapacityUnits': units}
+
+
+class LocalDynamoDB:
+    def __init__(self, unprocessed_rate=0, seed=None):
+        self.tables = {}
+        self.lock = threading.RLock()
+        self.operations = {}
+        # BatchWriteItem 항목 중 이 비율만큼을 UnprocessedItems로 돌려준다 (재시도 경로 확인용)
+        self.unprocessed_rate = unprocessed_rate
+        self.random = random.Random(seed)
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            raise DynamoError('ResourceNotFoundException', f"Requested resource not found: Table: {name} not found")
+        return table
+
+    def handle(self, operation, request):
+        handler = getattr(self, f"op_{operation}", None)
+        if handler is None:
+            raise DynamoError('UnknownOperationException', f"Unsupported operation: {operation}")
+        with self.lock:
+            self.operations[operation] = self.operations.get(operation, 0) + 1
+            response = handler(request)
+        if request.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = consumed_capacity(operation, request, response)
+        return response
+
+    def create_tables(self, definitions=TABLES):
+        for name, definition in definitions.items():
+            if name not in self.tables:
+                self.tables[name] = Table(name, definition)
+
+    def op_CreateTable(self, request):
+        name = request['TableName']
+        if name in self.tables:
+            raise DynamoError('ResourceInUseException', f"Table already exists: {name}")
+        self.tables[name] = Table(name, request)
+        return {'TableDescription': self.tables[name].describe()}
+
+    def op_DescribeTable(self, request):
+        return {'Table': self.table(request['TableName']).describe()}
+
+    def op_ListTables(self, request):
+        return {'TableNames': sorted(self.tables)}
+
+    def op_DeleteTable(self, request):
+        table = self.table(request['TableName'])
+        del self.tables[table.name]
+        return {'TableDescription': table.describe()}
+
+    def op_PutItem(self, request):
+        table = self.table(request['TableName'])
+        check_condition(request, table.get(request['Item']))
+        previous = table.put(request['Item'])
+        if request.get('ReturnValues') == 'ALL_OLD' and previous:
+            return {'Attributes': previous}
+        return {}
+
+    def op_GetItem(self, request):
+        item = self.table(request['TableName']).get(request['Key'])
+        if item is None:
+            return {}
+        return {'Item': project(item, request.get('ProjectionExpression'), request.get('ExpressionAttributeNames', {}))}
+
+    def op_UpdateItem(self, request):
+        table = self.table(request['TableName'])
+        existing = table.get(request['Key'])
+        check_condition(request, existing)
+        updated = apply_update(
+            existing or dict(request['Key']), request.get('UpdateExpression', ''),
+            request.get('ExpressionAttributeNames', {}), request.get('ExpressionAttributeValues', {}),
+        )
+        table.put(updated)
+        return_values = request.get('ReturnValues', 'NONE')
+        if return_values == 'ALL_NEW':
+            return {'Attributes': updated}
+        if return_values == 'ALL_OLD' and existing:
+            return {'Attributes': existing}
+        return {}
+
+    def op_DeleteItem(self, request):
+        table = self.table(request['TableName'])
+        check_condition(request, table.get(request['Key']))
+        previous = table.delete(request['Key'])
+        if request.get('ReturnValues') == 'ALL_OLD' and previous:
+            return {'Attributes': previous}
+        return {}
+
+    def op_Query(self, request):
+        table = self.table(request['TableName'])
+        names = request.get('ExpressionAttributeNames', {})
+        values = request.get('ExpressionAttributeValues', {})
+        index = None
+        if request.get('IndexName'):
+            index = table.indexes.get(request['IndexName'])
+            if index is None:
+                raise validation_error('The table does not have the specified index: ' + request['IndexName'])
+        hash_key, range_key = (index.hash_key, index.range_key) if index else (table.hash_key, table.range_key)
+
+        conditions = parse_key_condition(request['KeyConditionExpression'], names, values)
+        if set(conditions) - {hash_key, range_key}:
+            raise validation_error('Query key condition not supported')
+        _, hash_value = conditions.get(hash_key, (None, None))
+        if hash_value is None:
+            raise validation_error('Query condition missed key schema element: ' + hash_key)
+        range_condition = conditions[range_key][0] if range_key in conditions else None
+        forward = request.get('ScanIndexForward', True)
+        start_key = request.get('ExclusiveStartKey')
+
+        if index:
+            order = index.partitions.get(hash_value, [])
+            start = index.entry(start_key, table.key_of(start_key))[1] if start_key else None
+            candidates = (table.get_by_key(table_key) for range_value, table_key in ordered_range(order, forward, start)
+                          if not range_condition or range_condition(range_value))
+
+            def key_attributes(item):
+                return {**table.key_attributes(item), **{name: item[name] for name in (hash_key, range_key) if name}}
+        else:
+            partition = table.partitions.get(hash_value)
+            order, items = partition if partition else ([], {})
+            start = table.key_of(start_key)[1] if start_key else None
+            candidates = (items[range_value] for range_value in ordered_range(order, forward, start)
+                          if not range_condition or range_condition(range_value))
+            key_attributes = table.key_attributes
+
+        page, last_key = take_page(candidates, request.get('Limit'), key_attributes)
+        return self.page_response(page, last_key, request, names)
+
+    def op_Scan(self, request):
+        table = self.table(request['TableName'])
+        total_segments = request.get('TotalSegments')
+        items = []
+        for hash_value in table.partitions:
+            if total_segments and zlib.crc32(repr(hash_value).encode()) % total_segments != request.get('Segment', 0):
+                continue
+            items.extend(table.partition_items(hash_value))
+        start = 0
+        if request.get('ExclusiveStartKey'):
+            start_key = table.key_of(request['ExclusiveStartKey'])
+            start = next((i + 1 for i, item in enumerate(items) if table.key_of(item) == start_key), len(items))
+        page, last_key = take_page(iter(items[start:]), request.get('Limit'), table.key_attributes)
+        return self.page_response(page, last_key, request, request.get('ExpressionAttributeNames', {}))
+
+    def page_response(self, page, last_key, request, names):
+        scanned = len(page)
+        # FilterExpression은 실제 서비스처럼 Limit/페이지를 읽은 뒤에 적용
+        if request.get('FilterExpression'):
+            matches = ConditionParser(request['FilterExpression'], names,
+                                      request.get('ExpressionAttributeValues', {})).evaluate
+            page = [item for item in page if matches(item)]
+        response = {'Count': len(page), 'ScannedCount': scanned}
+        if request.get('Select') != 'COUNT':
+            response['Items'] = [project(item, request.get('ProjectionExpression'), names) for item in page]
+        if last_key:
+            response['LastEvaluatedKey'] = last_key
+        return response
+
+    def op_BatchWriteItem(self, request):
+        requests = request['RequestItems']
+        if sum(len(entries) for entries in requests.values()) > BATCH_WRITE_LIMIT:
+            raise validation_error(f"Too many items requested for the BatchWriteItem call (max {BATCH_WRITE_LIMIT})")
+        unprocessed = {}
+        for table_name, entries in requests.items():
+            table = self.table(table_name)
+            for entry in entries:
+                if self.unprocessed_rate and self.random.random() < self.unprocessed_rate:
+                    unprocessed.setdefault(table_name, []).append(entry)
+                elif 'PutRequest' in entry:
+                    table.put(entry['PutRequest']['Item'])
+                else:
+                    table.delete(entry['DeleteRequest']['Key'])
+        return {'UnprocessedItems': unprocessed}
+
+    def op_BatchGetItem(self, request):
+        requests = request['RequestItems']
+        if sum(len(spec['Keys']) for spec in requests.values()) > BATCH_GET_LIMIT:
+            raise validation_error(f"Too many items requested for the BatchGetItem call (max {BATCH_GET_LIMIT})")
+        responses = {}
+        for table_name, spec in requests.items():
+            table = self.table(table_name)
+            names = spec.get('ExpressionAttributeNames', {})
+            found = (table.get(key) for key in spec['Keys'])
+            responses[table_name] = [project(item, spec.get('ProjectionExpression'), names) for item in found if item]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    database = None
+    latency_seconds = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('x-amzn-RequestId', uuid.uuid4().hex)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b'{}'
+        target = self.headers.get('X-Amz-Target', '')
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        try:
+            if not target.startswith(TARGET_PREFIX):
+                raise DynamoError('UnknownOperationException', f"Unknown target: {target}")
+            response = self.database.handle(target[len(TARGET_PREFIX):], json.loads(body))
+        except DynamoError as e:
+            return self.send_json(e.status, {'__type': ERROR_PREFIX + e.error_type, 'message': str(e), **e.extra})
+        except (KeyError, TypeError, ValueError) as e:
+            return self.send_json(400, {'__type': ERROR_PREFIX + 'ValidationException', 'message': f"Invalid request: {e}"})
+        self.send_json(200, response)
+
+
+class LocalDynamoDBServer:
+    """LocalDynamoDB를 백그라운드 스레드의 HTTP 서버로 띄운다 (port=0이면 임의 포트)"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, database=None, unprocessed_rate=0):
+        self.database = database or LocalDynamoDB(unprocessed_rate)
+        handler = type('Handler', (RequestHandler,), {
+            'database': self.database,
+            'latency_seconds': latency_ms / 1000,
+        })
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-memory DynamoDB stand-in for local development and benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency-ms', type=float, default=0, help='요청마다 추가할 지연 (실제 DynamoDB 왕복 흉내)')
+    parser.add_argument('--unprocessed-rate', type=float, default=0,
+                        help='BatchWriteItem 항목 중 UnprocessedItems로 돌려줄 비율 (0~1)')
+    args = parser.parse_args()
+
+    server = LocalDynamoDBServer(args.host, args.port, args.latency_ms, unprocessed_rate=args.unprocessed_rate)
+    server.database.create_tables()
+    print(f"Local DynamoDB listening on {server.endpoint} (tables: {', '.join(sorted(server.database.tables))})")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
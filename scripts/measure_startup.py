@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Pod 기동 시간 측정 스크립트
+
+quiznox-api Deployment를 N번 재시작(kubectl rollout restart와 같은 template annotation 변경)하고,
+매번 새로 생긴 Pod의 생성 → 스케줄링 → 컨테이너 시작 → Ready 소요 시간을 API 서버 타임스탬프로 모아
+단계별 p50/p95/최대값을 출력한다. 앱 내부 단계(require/plugins/listen/warmup/preload)는
+/ready 응답과 기동 로그(`Startup complete`)에 기록된다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from canary import stable_selector
+from k8s_client import K8sApiError, get_cluster_client
+from k8s_watch import wait_for_ready
+from http_probe import percentile
+
+RESTART_ANNOTATION = 'kubectl.kubernetes.io/restartedAt'
+FIELD_MANAGER = 'quiznox-startup-bench'
+PHASES = ['scheduled', 'started', 'ready', 'app']
+
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    NC = '\033[0m'
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+
+def restart_patch(namespace, name, restarted_at):
+    """Pod template annotation만 소유하는 server-side apply 객체 (배포 스크립트의 필드와 충돌하지 않음)"""
+    return {
+        'apiVersion': 'apps/v1',
+        'kind': 'Deployment',
+        'metadata': {'name': name, 'namespace': namespace},
+        'spec': {'template': {'metadata': {'annotations': {RESTART_ANNOTATION: restarted_at}}}},
+    }
+
+def new_pod_timings(pods, seen):
+    """이전 라운드에 없던 Pod의 타이밍 (app = 컨테이너 시작 → Ready, 앱과 probe가 좌우하는 구간)"""
+    samples = {}
+    for name, timings in pods.items():
+        if name in seen:
+            continue
+        seen.add(name)
+        started, ready = timings['started'], timings['ready']
+        app = round(ready - started, 3) if started is not None and ready is not None else None
+        samples[name] = {**timings, 'app': app}
+    return samples
+
+def summarize(rounds):
+    """단계별 {p50, p95, max} (초)"""
+    summary = {}
+    for phase in PHASES:
+        values = sorted(
+            timings[phase] for entry in rounds for timings in entry['pods'].values()
+            if timings[phase] is not None
+        )
+        summary[phase] = {
+            'p50': percentile(values, 0.50),
+            'p95': percentile(values, 0.95),
+            'max': values[-1] if values else None,
+        }
+    return summary
+
+def measure(client, namespace, name, restarts, timeout=300, pause=0):
+    """
+    restarts번 재시작하며 라운드마다 롤아웃 시간과 새 Pod 타이밍을 기록한다.
+    반환: {'rounds': [{'rollout_seconds', 'pods'}], 'summary': {phase: {p50, p95, max}}}
+    """
+    # 카나리 Pod(track=canary)는 같은 app 라벨이어도 재시작 대상이 아니므로 제외
+    selector = stable_selector(name)
+    seen = {pod['metadata']['name'] for pod in client.list('Pod', namespace, selector)}
+    rounds = []
+    for index in range(restarts):
+        restarted_at = datetime.now(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z')
+        client.apply(restart_patch(namespace, name, restarted_at), FIELD_MANAGER)
+        result = wait_for_ready(client, namespace, name, timeout=timeout, label_selector=selector)
+        if not result['rollout_ready']:
+            raise RuntimeError(f"Rollout {index + 1} not ready after {timeout}s: {'; '.join(result['errors'])}")
+        pods = new_pod_timings(result['pods'], seen)
+        rounds.append({'rollout_seconds': result['rollout_seconds'], 'pods': pods})
+        print_info(f"Restart {index + 1}/{restarts}: rollout {result['rollout_seconds']}s, {len(pods)} new pod(s)")
+        for pod_name, timings in pods.items():
+            print_info(
+                f"  {pod_name}: scheduled {timings['scheduled']}s, started {timings['started']}s, "
+                f"ready {timings['ready']}s (app {timings['app']}s)"
+            )
+        if pause and index + 1 < restarts:
+            time.sleep(pause)
+    return {'rounds': rounds, 'summary': summarize(rounds)}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Measure QuizNox API pod start-to-ready time across restarts')
+    parser.add_argument('--restarts', type=int, default=5, help='재시작 횟수')
+    parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'quiznox'))
+    parser.add_argument('--deployment', default='quiznox-api')
+    parser.add_argument('--timeout', type=float, default=300, help='라운드별 롤아웃 대기 시간(초)')
+    parser.add_argument('--pause', type=float, default=0, help='라운드 사이 대기 시간(초)')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    client = get_cluster_client(os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config')))
+    try:
+        client.version()
+    except K8sApiError as e:
+        print_error(f"Cannot connect to Kubernetes cluster: {e}")
+        sys.exit(1)
+
+    print(f"⏱️  Restarting deployment/{args.deployment} {args.restarts} time(s)...")
+    report = measure(client, args.namespace, args.deployment, args.restarts, args.timeout, args.pause)
+
+    for phase, stats in report['summary'].items():
+        print_success(f"{phase:<9} p50 {stats['p50']}s  p95 {stats['p95']}s  max {stats['max']}s")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+        print_info(f"Report written to {args.output}")
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+QuizNox 문제 은행 가져오기/내보내기
+
+import: JSON(배열 또는 {"items": [...]}), NDJSON(.ndjson/.jsonl, .gz 가능), CSV 파일을 읽어
+        questionFixtures.js와 같은 모양(topic_id, question_number, question_text, choices,
+        most_voted_answer)인지 검증하고, topic_id+question_number 기준으로 중복을 제거한 뒤
+        스레드 풀에서 BatchWriteItem(25개 단위)으로 기록한다.
+        스로틀링/UnprocessedItems가 나오면 전송 속도를 절반으로 줄이고, 성공하면 조금씩 올린다(AIMD).
+export: 병렬 세그먼트 Scan(TotalSegments)으로 세그먼트마다 gzip NDJSON 파일을 쓴다.
+        Scan 페이지 하나를 gzip member 하나로 덧붙이므로 테이블 크기와 관계없이 메모리는 페이지 하나 분량이다.
+
+둘 다 체크포인트 파일에 진행 상황을 기록하므로, 중단 후 같은 명령을 다시 실행하면 이어서 진행한다.
+- import: --checkpoint 파일에 완료된 배치 번호 (입력 내용이 바뀌면 처음부터)
+- export: 출력 디렉토리의 checkpoint.json에 세그먼트별 LastEvaluatedKey와 파일 크기
+  (마지막 체크포인트 이후에 쓴 내용은 재시작 시 잘라낸다)
+
+사용 예:
+    python scripts/question_bank.py import data/AWS_DVA.json data/extra.ndjson --dry-run
+    python scripts/question_bank.py import data/*.csv --workers 8 --checkpoint .import-checkpoint.json
+    python scripts/question_bank.py export --output dump/ --segments 8
+    python scripts/question_bank.py import dump/   # 내보낸 파일을 다른 환경으로 가져오기
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from aws_session import get_client
+
+BATCH_WRITE_LIMIT = 25
+DEFAULT_WORKERS = 8
+DEFAULT_SEGMENTS = 8
+DEFAULT_RATE = 50.0
+MAX_ATTEMPTS = 10
+QUESTION_FIELDS = ('topic_id', 'question_number', 'question_text', 'choices', 'most_voted_answer')
+THROTTLE_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+}
+EXPORT_CHECKPOINT = 'checkpoint.json'
+ANSWER_RE = re.compile(r'^[A-Z]+$')
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    NC = '\033[0m'
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+
+# ---------------------------------------------------------------- 입력 파일
+
+def open_text(path):
+    if path.suffix == '.gz':
+        return io.TextIOWrapper(gzip.open(path), encoding='utf-8')
+    return open(path, encoding='utf-8', newline='')
+
+def read_csv_rows(handle):
+    for row in csv.DictReader(handle):
+        choices = (row.get('choices') or '').strip()
+        # choices 열은 JSON 배열 또는 '|' 구분 문자열
+        if choices.startswith('['):
+            row['choices'] = json.loads(choices)
+        else:
+            row['choices'] = [choice.strip() for choice in choices.split('|') if choice.strip()]
+        yield row
+
+def read_records(path):
+    """파일 하나의 (위치, 레코드) 목록. 디렉토리면 안의 데이터 파일 전체"""
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(path.iterdir()):
+            if child.name != EXPORT_CHECKPOINT and child.is_file():
+                yield from read_records(child)
+        return
+
+    kind = path.name[:-3] if path.name.endswith('.gz') else path.name
+    with open_text(path) as handle:
+        if kind.endswith(('.ndjson', '.jsonl')):
+            for line_number, line in enumerate(handle, 1):
+                if line.strip():
+                    yield f"{path}:{line_number}", json.loads(line)
+        elif kind.endswith('.csv'):
+            for row_number, row in enumerate(read_csv_rows(handle), 2):
+                yield f"{path}:{row_number}", row
+        elif kind.endswith('.json'):
+            data = json.load(handle)
+            items = data.get('items', data.get('mockQuestions')) if isinstance(data, dict) else data
+            if not isinstance(items, list):
+                raise ValueError(f"{path}: expected a JSON array or an object with 'items'")
+            for index, item in enumerate(items):
+                yield f"{path}[{index}]", item
+        else:
+            raise ValueError(f"{path}: unsupported file type (json, ndjson, jsonl, csv, optionally .gz)")
+
+# ---------------------------------------------------------------- 검증 / 중복 제거
+
+def normalize_question(record):
+    """레코드 → (문제, 오류 목록). 숫자만 있는 question_number는 0001 형식으로 맞춘다 (정렬 키가 문자열이므로)"""
+    if not isinstance(record, dict):
+        return None, ['not an object']
+    errors = []
+    question = {field: record.get(field) for field in QUESTION_FIELDS}
+
+    number = question['question_number']
+    if isinstance(number, int) and not isinstance(number, bool):
+        number = str(number)
+    if isinstance(number, str) and number.strip().isdigit():
+        number = number.strip().zfill(4)
+    question['question_number'] = number
+
+    for field in ('topic_id', 'question_number', 'question_text'):
+        if not isinstance(question[field], str) or not question[field].strip():
+            errors.append(f"{field} must be a non-empty string")
+
+    choices = question['choices']
+    if not isinstance(choices, list) or len(choices) < 2 or \
+            not all(isinstance(choice, str) and choice.strip() for choice in choices):
+        errors.append('choices must be a list of at least 2 non-empty strings')
+        choices = []
+
+    # 정답은 보기 글자(A, B, ...)의 조합 (복수 정답은 "AC")
+    answer = question['most_voted_answer']
+    if not isinstance(answer, str) or not ANSWER_RE.match(answer):
+        errors.append('most_voted_answer must be choice letters such as "C" or "AD"')
+    elif choices and any(ord(letter) - ord('A') >= len(choices) for letter in answer):
+        errors.append(f"most_voted_answer {answer} is out of range for {len(choices)} choices")
+
+    return (None if errors else question), errors
+
+def load_questions(paths):
+    """입력 파일 전체를 읽어 (topic_id, question_number) 순으로 정렬된 문제, 오류, 중복 수를 반환.
+    같은 키가 여러 번 나오면 나중에 나온 것이 이긴다."""
+    questions, errors, duplicates = {}, [], 0
+    for path in paths:
+        for location, record in read_records(path):
+            question, problems = normalize_question(record)
+            if problems:
+                errors.extend(f"{location}: {problem}" for problem in problems)
+                continue
+            key = (question['topic_id'], question['question_number'])
+            if key in questions:
+                duplicates += 1
+            questions[key] = question
+    return [questions[key] for key in sorted(questions)], errors, duplicates
+
+def fingerprint(questions):
+    """입력 내용 해시 (체크포인트가 같은 입력에 대한 것인지 확인용)"""
+    digest = hashlib.sha256()
+    for question in questions:
+        digest.update(json.dumps(question, sort_keys=True, ensure_ascii=False).encode())
+    return digest.hexdigest()
+
+# ---------------------------------------------------------------- 체크포인트
+
+class Checkpoint:
+    """JSON 체크포인트 (임시 파일에 쓴 뒤 교체하므로 중간에 죽어도 이전 내용이 남는다)"""
+
+    def __init__(self, path, meta):
+        self.path = Path(path) if path else None
+        self.meta = meta
+        self.state = {}
+        self.lock = threading.Lock()
+        if self.path and self.path.exists():
+            saved = json.loads(self.path.read_text())
+            if saved.get('meta') == meta:
+                self.state = saved.get('state', {})
+            else:
+                print_info(f"Checkpoint {self.path} is for a different run, starting over")
+
+    @property
+    def resumed(self):
+        return bool(self.state)
+
+    def update(self, change):
+        """state를 change(state)로 갱신하고 저장"""
+        with self.lock:
+            change(self.state)
+            if not self.path:
+                return
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            tmp.write_text(json.dumps({'meta': self.meta, 'state': self.state}, indent=2))
+            os.replace(tmp, self.path)
+
+# ---------------------------------------------------------------- import
+
+class AdaptiveThrottle:
+    """초당 배치 수를 AIMD로 조절하는 스레드 공유 속도 제한기.
+    스로틀링/UnprocessedItems가 나오면 속도를 절반으로, 배치가 한 번에 성공하면 increase만큼 올린다."""
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=1.0, max_rate=1000.0, increase=1.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.throttles = 0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + 1 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.throttles += 1
+
+def backoff(attempt, base=0.05, cap=5.0):
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+def write_batch(client, table_name, questions, throttle, max_attempts=MAX_ATTEMPTS):
+    """25개 이하 문제를 BatchWriteItem으로 기록 (UnprocessedItems/스로틀링은 재시도)"""
+    requests = [{'PutRequest': {'Item': {k: serializer.serialize(v) for k, v in q.items()}}} for q in questions]
+    for attempt in range(max_attempts):
+        throttle.acquire()
+        try:
+            resp = client.batch_write_item(RequestItems={table_name: requests})
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLE_CODES:
+                raise
+            throttle.on_throttle()
+            backoff(attempt)
+            continue
+        requests = resp.get('UnprocessedItems', {}).get(table_name, [])
+        if not requests:
+            throttle.on_success()
+            return
+        throttle.on_throttle()
+        backoff(attempt)
+    raise RuntimeError(f"{len(requests)} items still unprocessed after {max_attempts} attempts")
+
+def import_questions(client, table_name, questions, workers=DEFAULT_WORKERS, checkpoint=None,
+                     throttle=None):
+    """문제를 배치로 나눠 병렬 기록하고 {'batches', 'skipped', 'written', 'throttles'}를 반환"""
+    throttle = throttle or AdaptiveThrottle()
+    checkpoint = checkpoint or Checkpoint(None, {})
+    batches = [questions[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(questions), BATCH_WRITE_LIMIT)]
+    done = set(checkpoint.state.get('done', []))
+    todo = [index for index in range(len(batches)) if index not in done]
+
+    def run(index):
+        write_batch(client, table_name, batches[index], throttle)
+        checkpoint.update(lambda state: state.setdefault('done', []).append(index))
+        return len(batches[index])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        written = sum(pool.map(run, todo))
+    return {
+        'batches': len(batches),
+        'skipped': len(batches) - len(todo),
+        'written': written,
+        'throttles': throttle.throttles,
+        'final_rate': round(throttle.rate, 1),
+    }
+
+# ---------------------------------------------------------------- export
+
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return int(o) if o == o.to_integral_value() else float(o)
+        return super().default(o)
+
+def segment_path(output_dir, table_name, segment, total_segments):
+    return Path(output_dir) / f"{table_name}-{segment:04d}-of-{total_segments:04d}.ndjson.gz"
+
+def export_segment(client, table_name, output_dir, segment, total_segments, checkpoint, page_size=None):
+    """한 세그먼트를 Scan해 페이지마다 gzip member로 덧붙이고 체크포인트를 갱신. 내보낸 항목 수를 반환"""
+    key = str(segment)
+    state = checkpoint.state.get(key, {'items': 0, 'bytes': 0, 'last_key': None, 'done': False})
+    if state['done']:
+        return state['items']
+
+    path = segment_path(output_dir, table_name, segment, total_segments)
+    params = {'TableName': table_name, 'Segment': segment, 'TotalSegments': total_segments}
+    if page_size:
+        params['Limit'] = page_size
+    if state['last_key']:
+        params['ExclusiveStartKey'] = state['last_key']
+
+    with open(path, 'ab') as output:
+        # 마지막 체크포인트 이후에 쓴 내용(중단된 페이지)은 버린다
+        output.truncate(state['bytes'])
+        output.seek(state['bytes'])
+        items = state['items']
+        while True:
+            resp = client.scan(**params)
+            page = resp.get('Items', [])
+            if page:
+                lines = ''.join(
+                    json.dumps({k: deserializer.deserialize(v) for k, v in item.items()},
+                               cls=DecimalEncoder, ensure_ascii=False) + '\n'
+                    for item in page
+                )
+                output.write(gzip.compress(lines.encode('utf-8')))
+                output.flush()
+                items += len(page)
+            last_key = resp.get('LastEvaluatedKey')
+            snapshot = {'items': items, 'bytes': output.tell(), 'last_key': last_key, 'done': not last_key}
+            checkpoint.update(lambda state: state.__setitem__(key, snapshot))
+            if not last_key:
+                return items
+            params['ExclusiveStartKey'] = last_key
+
+def export_table(client, table_name, output_dir, segments=DEFAULT_SEGMENTS, page_size=None):
+    """세그먼트별 병렬 Scan → gzip NDJSON. ({세그먼트: 항목 수}, 이어서 진행했는지)를 반환"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = Checkpoint(output_dir / EXPORT_CHECKPOINT, {'table': table_name, 'segments': segments})
+    resumed = checkpoint.resumed
+
+    def run(segment):
+        return segment, export_segment(client, table_name, output_dir, segment, segments, checkpoint, page_size)
+
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        counts = dict(pool.map(run, range(segments)))
+    return counts, resumed
+
+# ---------------------------------------------------------------- CLI
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Import or export QuizNox question banks')
+    parser.add_argument('--table', default=os.getenv('DYNAMODB_TABLE_NAME', 'QuizNox_Questions'))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='JSON/NDJSON/CSV 파일을 테이블에 기록')
+    importer.add_argument('paths', nargs='+', help='입력 파일 또는 export 디렉토리')
+    importer.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='BatchWriteItem 동시 실행 수')
+    importer.add_argument('--rate', type=float, default=DEFAULT_RATE, help='초기 초당 배치 수 (스로틀링에 따라 조절됨)')
+    importer.add_argument('--checkpoint', help='진행 상황 파일 (다시 실행하면 완료된 배치는 건너뜀)')
+    importer.add_argument('--skip-invalid', action='store_true', help='검증 실패 항목만 빼고 계속')
+    importer.add_argument('--dry-run', action='store_true', help='검증/중복 제거 결과만 출력')
+
+    exporter = commands.add_parser('export', help='테이블을 gzip NDJSON 파일로 내보내기')
+    exporter.add_argument('--output', required=True, help='출력 디렉토리 (세그먼트별 파일 + checkpoint.json)')
+    exporter.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS, help='병렬 Scan 세그먼트 수')
+    exporter.add_argument('--page-size', type=int, help='Scan Limit (기본: 1MB 페이지)')
+    return parser.parse_args()
+
+def run_import(args):
+    questions, errors, duplicates = load_questions(args.paths)
+    for error in errors[:20]:
+        print_error(error)
+    if len(errors) > 20:
+        print_error(f"... and {len(errors) - 20} more")
+    topics = len({q['topic_id'] for q in questions})
+    print_info(f"{len(questions)} valid questions in {topics} topics "
+               f"({duplicates} duplicates merged, {len(errors)} problems)")
+    if errors and not args.skip_invalid:
+        print_error("Fix the input or pass --skip-invalid")
+        sys.exit(1)
+    if args.dry_run or not questions:
+        return
+
+    checkpoint = Checkpoint(args.checkpoint, {'table': args.table, 'input': fingerprint(questions)})
+    if checkpoint.resumed:
+        print_info(f"Resuming from {args.checkpoint} ({len(checkpoint.state.get('done', []))} batches done)")
+    start = time.perf_counter()
+    stats = import_questions(get_client('dynamodb'), args.table, questions, args.workers, checkpoint,
+                             AdaptiveThrottle(rate=args.rate))
+    elapsed = time.perf_counter() - start
+    print_success(f"Wrote {stats['written']} questions in {stats['batches'] - stats['skipped']} batches "
+                  f"({elapsed:.2f}s, {stats['throttles']} throttled, final rate {stats['final_rate']}/s)")
+
+def run_export(args):
+    start = time.perf_counter()
+    counts, resumed = export_table(get_client('dynamodb'), args.table, args.output, args.segments, args.page_size)
+    elapsed = time.perf_counter() - start
+    if resumed:
+        print_info("Resumed from checkpoint")
+    print_success(f"Exported {sum(counts.values())} items from {args.table} to {args.output} "
+                  f"in {args.segments} segments ({elapsed:.2f}s)")
+
+def main():
+    args = parse_args()
+    print("=" * 60)
+    print(f"📚 QuizNox Question Bank {args.command.capitalize()}")
+    print("=" * 60)
+    if args.command == 'import':
+        run_import(args)
+    else:
+        run_export(args)
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+QuizNox API /metrics 스크레이퍼
+
+벤치마크 구간 전후로 /metrics를 읽어 차이를 요약한다.
+- 라우트별 요청 수/지연 백분위수(히스토그램 버킷 보간), 처리 단계별 평균 시간
+- DynamoDB 연산별 호출 수/오류/지연/재시도/소비 용량
+- 이벤트 루프 지연(스크레이프 간격 기준), 처리 중 요청 수
+임계값(--max-*)을 넘으면 종료 코드 1로 끝나므로 CI 벤치마크에서 검사용으로 쓸 수 있다.
+scripts/loadtest.py는 시나리오마다 이 모듈로 서버 메트릭을 함께 기록한다.
+
+사용 예:
+    python scripts/scrape_metrics.py --url http://127.0.0.1:4000/metrics --duration 30
+    python scripts/scrape_metrics.py --duration 20 --max-eventloop-lag-ms 100 --max-dynamodb-error-rate 0.01
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+DEFAULT_URL = 'http://127.0.0.1:4000/metrics'
+SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)')
+LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    NC = '\033[0m'
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}", file=sys.stderr)
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}", file=sys.stderr)
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}", file=sys.stderr)
+
+def fetch_metrics(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.read().decode('utf-8')
+
+def parse_value(text):
+    if text == '+Inf':
+        return math.inf
+    if text == '-Inf':
+        return -math.inf
+    return float(text)
+
+def unescape_label(raw):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), raw)
+
+def parse_metrics(text):
+    """Prometheus 텍스트 형식 → {(이름, ((라벨, 값), ...)): 값}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        label_items = tuple(sorted(
+            (key, unescape_label(raw)) for key, raw in LABEL_RE.findall(labels or '')
+        ))
+        samples[(name, label_items)] = parse_value(value)
+    return samples
+
+def delta(before, after):
+    """누적 값(counter/histogram)의 구간 차이. before에 없던 시계열은 0에서 시작한 것으로 본다"""
+    return {key: value - before.get(key, 0) for key, value in after.items()}
+
+def series(samples, name):
+    """이름이 name인 시계열의 (라벨 dict, 값) 목록"""
+    return [(dict(labels), value) for (metric, labels), value in samples.items() if metric == name]
+
+def histogram_quantile(quantile, buckets):
+    """(le, 누적 개수) 목록에서 Prometheus histogram_quantile과 같은 방식으로 선형 보간"""
+    buckets = sorted(buckets)
+    if not buckets or buckets[-1][1] == 0:
+        return None
+    total = buckets[-1][1]
+    rank = quantile * total
+    previous_bound, previous_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if math.isinf(bound):
+                return previous_bound
+            if count == previous_count:
+                return bound
+            return previous_bound + (bound - previous_bound) * (rank - previous_count) / (count - previous_count)
+        previous_bound, previous_count = bound, count
+    return previous_bound
+
+def histograms(samples, name, group_labels):
+    """히스토그램을 group_labels 조합별 {'buckets': [...], 'sum': s, 'count': n}로 묶는다"""
+    grouped = {}
+    for labels, value in series(samples, f"{name}_bucket"):
+        key = tuple(labels.get(label, '') for label in group_labels)
+        grouped.setdefault(key, {'buckets': [], 'sum': 0.0, 'count': 0.0})
+        grouped[key]['buckets'].append((parse_value(labels['le']), value))
+    for suffix in ('sum', 'count'):
+        for labels, value in series(samples, f"{name}_{suffix}"):
+            key = tuple(labels.get(label, '') for label in group_labels)
+            grouped.setdefault(key, {'buckets': [], 'sum': 0.0, 'count': 0.0})
+            grouped[key][suffix] += value
+    # 같은 그룹에 여러 시계열(예: status_code별)이 있으면 버킷 경계별로 합친다
+    for entry in grouped.values():
+        merged = {}
+        for bound, count in entry['buckets']:
+            merged[bound] = merged.get(bound, 0) + count
+        entry['buckets'] = sorted(merged.items())
+    return grouped
+
+def ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+def latency_summary(entry):
+    count = entry['count']
+    return {
+        'count': int(count),
+        'mean_ms': ms(entry['sum'] / count) if count else None,
+        'p50_ms': ms(histogram_quantile(0.5, entry['buckets'])),
+        'p99_ms': ms(histogram_quantile(0.99, entry['buckets'])),
+    }
+
+def summarize(before, after):
+    """두 스크레이프 사이의 서버 메트릭 요약"""
+    window = delta(before, after)
+
+    routes = {}
+    for (method, route), entry in histograms(window, 'quiznox_http_request_duration_seconds',
+                                             ('method', 'route')).items():
+        if entry['count']:
+            routes[f"{method} {route}"] = latency_summary(entry)
+    errors = {}
+    for labels, value in series(window, 'quiznox_http_request_duration_seconds_count'):
+        if value and labels.get('status_code', '').startswith('5'):
+            key = f"{labels['method']} {labels['route']}"
+            errors[key] = errors.get(key, 0) + int(value)
+    for key, count in errors.items():
+        routes.setdefault(key, {})['errors_5xx'] = count
+
+    phases = {}
+    for (route, phase), entry in histograms(window, 'quiznox_http_request_phase_seconds',
+                                            ('route', 'phase')).items():
+        if entry['count']:
+            phases.setdefault(route, {})[phase] = ms(entry['sum'] / entry['count'])
+
+    dynamodb = {}
+    for (operation, table), entry in histograms(window, 'quiznox_dynamodb_request_duration_seconds',
+                                                ('operation', 'table')).items():
+        if entry['count']:
+            dynamodb[f"{operation} {table}"] = {**latency_summary(entry), 'errors': 0, 'retries': 0,
+                                                'capacity_units': 0.0}
+    for labels, value in series(window, 'quiznox_dynamodb_requests_total'):
+        key = f"{labels['operation']} {labels['table']}"
+        if key in dynamodb and labels.get('outcome') != 'ok':
+            dynamodb[key]['errors'] += int(value)
+    for metric, field in (('quiznox_dynamodb_retries_total', 'retries'),
+                          ('quiznox_dynamodb_consumed_capacity_units_total', 'capacity_units')):
+        for labels, value in series(window, metric):
+            key = f"{labels['operation']} {labels['table']}"
+            if key in dynamodb:
+                dynamodb[key][field] += value
+
+    # gauge는 차이가 아니라 마지막 스크레이프 값 (이벤트 루프 지연은 스크레이프마다 초기화됨)
+    lag = {labels['stat']: ms(value) for labels, value in series(after, 'quiznox_eventloop_lag_seconds')}
+    in_flight = next((value for _, value in series(after, 'quiznox_http_requests_in_flight')), None)
+    return {
+        'routes': routes,
+        'phases_mean_ms': phases,
+        'dynamodb': dynamodb,
+        'eventloop_lag_ms': lag,
+        'in_flight': in_flight,
+    }
+
+def check(summary, max_lag_ms=None, max_error_rate=None):
+    """임계값을 넘은 항목의 메시지 목록"""
+    failures = []
+    lag = summary['eventloop_lag_ms'].get('p99')
+    if max_lag_ms is not None and lag is not None and lag > max_lag_ms:
+        failures.append(f"event loop lag p99 {lag} ms > {max_lag_ms} ms")
+    if max_error_rate is not None:
+        for key, stats in summary['dynamodb'].items():
+            rate = stats['errors'] / stats['count'] if stats['count'] else 0
+            if rate > max_error_rate:
+                failures.append(f"DynamoDB {key} error rate {rate:.2%} > {max_error_rate:.2%}")
+    return failures
+
+def scrape_window(url, duration, interval=None):
+    """duration초 동안의 구간 요약. interval을 주면 중간 상태(지연/처리 중 요청)를 출력"""
+    # 시작 스크레이프가 이벤트 루프 지연 측정 구간의 시작점이 된다
+    before = parse_metrics(fetch_metrics(url))
+    deadline = time.monotonic() + duration
+    while interval and time.monotonic() + interval < deadline:
+        time.sleep(interval)
+        current = parse_metrics(fetch_metrics(url))
+        lag = {labels['stat']: ms(value) for labels, value in series(current, 'quiznox_eventloop_lag_seconds')}
+        in_flight = next((value for _, value in series(current, 'quiznox_http_requests_in_flight')), None)
+        print_info(f"event loop lag p99 {lag.get('p99')} ms, in flight {in_flight}")
+    time.sleep(max(0, deadline - time.monotonic()))
+    return summarize(before, parse_metrics(fetch_metrics(url)))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Scrape and summarize QuizNox API metrics')
+    parser.add_argument('--url', default=DEFAULT_URL)
+    parser.add_argument('--duration', type=float, default=10, help='측정 구간(초)')
+    parser.add_argument('--interval', type=float, help='중간 상태 출력 간격(초)')
+    parser.add_argument('--max-eventloop-lag-ms', type=float, help='이벤트 루프 지연 p99 상한')
+    parser.add_argument('--max-dynamodb-error-rate', type=float, help='DynamoDB 연산별 오류율 상한 (0~1)')
+    parser.add_argument('--output', help='요약 JSON 파일 경로 (기본: stdout)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print_info(f"Scraping {args.url} for {args.duration:g}s...")
+    summary = scrape_window(args.url, args.duration, args.interval)
+
+    output = json.dumps(summary, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+        print_success(f"Summary written to {args.output}")
+    else:
+        print(output)
+
+    failures = check(summary, args.max_eventloop_lag_ms, args.max_dynamodb_error_rate)
+    for failure in failures:
+        print_error(failure)
+    if failures:
+        sys.exit(1)
+    print_success("Metrics within limits")
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
@@ -10,6 +10,8 @@ import sys
 import tempfile
 from pathlib import Path
 
+from k8s_client import K8sApiError, get_cluster_client
+
 class Colors:
     RED = '\033[0;31m'
     GREEN = '\033[0;32m'
@@ -97,20 +99,21 @@ def main():
         f.write(content)
     print_info(f"Kubeconfig server set to https://{ec2_ip}:6443")
 
-    env = os.environ.copy()
-    env['KUBECONFIG'] = kubeconfig_path
-    success, _, err = run_command("kubectl cluster-info", check=False, env=env)
-    if success:
-        print_success("Connected to cluster!")
-        run_command("kubectl get nodes", check=False, env=env)
-    else:
+    client = get_cluster_client(kubeconfig_path)
+    try:
+        version = client.version()
+        print_success(f"Connected to cluster! ({version.get('gitVersion', 'unknown version')}, {client.backend} client)")
+        for node in client.list('Node'):
+            print_info(f"Node: {node['metadata']['name']}")
+    except K8sApiError as e:
         print_error("Failed to connect to cluster")
-        if err:
-            print_error(err)
+        print_error(str(e))
         sys.exit(1)
 
     print_success("Kubernetes setup completed!")
     print_info(f"kubeconfig: {kubeconfig_path}")
+    for line in client.format_timing_report():
+        print_info(line)
 
 if __name__ == '__main__':
     try:
@@ -3,11 +3,27 @@
 Kubernetes Service 엔드포인트를 API Gateway 백엔드로 연결하는 스크립트
 """
 
+import argparse
 import os
 import sys
-import boto3
-import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aws_session import get_client, resolve_value
+from k8s_client import get_cluster_client
+from k8s_watch import watch_service_address
+
+LOAD_BALANCER_TIMEOUT_SECONDS = 15
+DESIRED_ROUTE_KEYS = ['$default', 'ANY /{proxy+}', 'GET /health']
+INTEGRATION_SETTINGS = {
+    'IntegrationMethod': 'ANY',
+    'PayloadFormatVersion': '2.0',
+    'ConnectionType': 'INTERNET',
+}
+# API Gateway 관리 API 호출 한도를 넘지 않도록 route 변경의 동시성과 초당 호출 수를 제한
+MAX_CONCURRENT_MUTATIONS = 3
+MUTATIONS_PER_SECOND = 2
 
 class Colors:
     RED = '\033[0;31m'
@@ -28,36 +44,21 @@ def print_info(msg):
 def print_step(msg):
     print(f"{Colors.BLUE}🚀 {msg}{Colors.NC}")
 
-def get_k8s_backend_url(namespace='quiznox', service_name='quiznox-api'):
-    kubeconfig = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
-    env = {'KUBECONFIG': kubeconfig, **os.environ}
+def get_k8s_backend_url(namespace='quiznox', service_name='quiznox-api', client=None):
+    client = client or get_cluster_client()
 
-    start = time.time()
-    while True:
-        for field in ['hostname', 'ip']:
-            cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.status.loadBalancer.ingress[0].{field}}}'"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, env=env)
-            val = result.stdout.strip()
-            if val and val not in ['None', '<pending>', '']:
-                url = val if val.startswith('http') else f"http://{val}"
-                print_success(f"LoadBalancer URL: {url}")
-                return url
-
-        if int(time.time() - start) > 15:
-            break
-        time.sleep(3)
-
-    cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].nodePort}}'"
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, env=env)
-    nodeport = result.stdout.strip()
-
-    if not nodeport or nodeport == 'None':
-        cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].port}}'"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, env=env)
-        nodeport = result.stdout.strip()
+    val = watch_service_address(client, namespace, service_name, timeout=LOAD_BALANCER_TIMEOUT_SECONDS)
+    if val:
+        url = val if val.startswith('http') else f"http://{val}"
+        print_success(f"LoadBalancer URL: {url}")
+        return url
+
+    service = client.get('Service', service_name, namespace)
+    ports = (service or {}).get('spec', {}).get('ports') or [{}]
+    nodeport = ports[0].get('nodePort') or ports[0].get('port')
 
     ec2_ip = os.getenv('EC2_PUBLIC_IP', '')
-    if nodeport and nodeport != 'None' and ec2_ip:
+    if nodeport and ec2_ip:
         url = f"http://{ec2_ip}:{nodeport}"
         print_success(f"Backend URL: {url}")
         return url
@@ -65,87 +66,173 @@ def get_k8s_backend_url(namespace='quiznox', service_name='quiznox-api'):
     print_error("Could not determine backend URL")
     return ""
 
+class RateLimiter:
+    """스레드 간 공유되는 최소 호출 간격 제한"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0.0, self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay:
+            time.sleep(delay)
+
+def list_all(call, **params):
+    """NextToken을 따라 모든 페이지의 Items를 모은다"""
+    items = []
+    while True:
+        resp = call(**params)
+        items.extend(resp.get('Items', []))
+        if not resp.get('NextToken'):
+            return items
+        params['NextToken'] = resp['NextToken']
+
+def plan_integration(integrations, backend_url):
+    """HTTP_PROXY integration을 backend_url로 맞추기 위한 작업 (create/update/noop)"""
+    existing = next((item for item in integrations if item.get('IntegrationType') == 'HTTP_PROXY'), None)
+    if not existing:
+        return {'action': 'create', 'integration_id': None, 'uri': backend_url}
+    if existing.get('IntegrationUri') == backend_url:
+        return {'action': 'noop', 'integration_id': existing['IntegrationId'], 'uri': backend_url}
+    return {
+        'action': 'update',
+        'integration_id': existing['IntegrationId'],
+        'uri': backend_url,
+        'previous_uri': existing.get('IntegrationUri'),
+    }
+
+def plan_routes(routes, integration_id):
+    """DESIRED_ROUTE_KEYS가 모두 integration을 가리키도록 하는 route 작업 목록"""
+    target = f"integrations/{integration_id or '<new>'}"
+    existing_by_key = {route['RouteKey']: route for route in routes}
+    actions = []
+    for key in DESIRED_ROUTE_KEYS:
+        existing = existing_by_key.get(key)
+        if not existing:
+            actions.append({'action': 'create', 'route_key': key, 'target': target})
+        elif existing.get('Target') != target:
+            actions.append({
+                'action': 'update', 'route_key': key, 'route_id': existing['RouteId'],
+                'target': target, 'previous_target': existing.get('Target'),
+            })
+        else:
+            actions.append({'action': 'noop', 'route_key': key, 'target': target})
+    return actions
+
+def print_plan(integration_action, route_actions):
+    action = integration_action['action']
+    if action == 'update':
+        print_info(f"Integration: update {integration_action['previous_uri']} -> {integration_action['uri']}")
+    else:
+        print_info(f"Integration: {action} ({integration_action['uri']})")
+    for route in route_actions:
+        detail = f" (was: {route['previous_target']})" if route['action'] == 'update' else ''
+        print_info(f"Route {route['route_key']}: {route['action']} -> {route['target']}{detail}")
+
+def apply_integration(client, api_id, integration_action):
+    """integration 변경을 적용하고 최종 integration id를 반환"""
+    action = integration_action['action']
+    if action == 'create':
+        resp = client.create_integration(
+            ApiId=api_id, IntegrationType='HTTP_PROXY', IntegrationUri=integration_action['uri'], **INTEGRATION_SETTINGS,
+        )
+        print_success(f"Integration created: {resp['IntegrationId']}")
+        return resp['IntegrationId']
+    if action == 'update':
+        client.update_integration(
+            ApiId=api_id, IntegrationId=integration_action['integration_id'],
+            IntegrationUri=integration_action['uri'], **INTEGRATION_SETTINGS,
+        )
+        print_success("Integration updated")
+    else:
+        print_info("Backend URL unchanged, skipping")
+    return integration_action['integration_id']
+
+def apply_route_action(client, api_id, route, limiter):
+    limiter.wait()
+    if route['action'] == 'create':
+        client.create_route(ApiId=api_id, RouteKey=route['route_key'], Target=route['target'])
+        return f"Route created: {route['route_key']}"
+    client.update_route(ApiId=api_id, RouteId=route['route_id'], Target=route['target'])
+    return f"Route updated: {route['route_key']} -> {route['target']} (was: {route['previous_target']})"
+
+def apply_routes(client, api_id, route_actions):
+    """서로 독립적인 route 변경을 호출 한도 안에서 동시에 적용"""
+    pending = [route for route in route_actions if route['action'] != 'noop']
+    for route in route_actions:
+        if route['action'] == 'noop':
+            print_info(f"Route already points to integration: {route['route_key']}")
+    if not pending:
+        return
+    limiter = RateLimiter(MUTATIONS_PER_SECOND)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_MUTATIONS) as pool:
+        for message in pool.map(lambda route: apply_route_action(client, api_id, route, limiter), pending):
+            print_success(message)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Point API Gateway routes at the Kubernetes backend')
+    parser.add_argument('--plan', action='store_true', help='변경 계획만 출력하고 적용하지 않음')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("=" * 60)
     print("🔗 QuizNox API Gateway Backend Update")
     print("=" * 60)
 
-    aws_region = os.getenv('AWS_REGION', 'ap-northeast-2')
-
-    api_gateway_id = os.getenv('API_GATEWAY_ID', '')
+    api_gateway_id = os.getenv('API_GATEWAY_ID', '') or resolve_value('api_gateway_id')
     if not api_gateway_id:
         print_error("API_GATEWAY_ID not set.")
         sys.exit(1)
     print_success(f"API Gateway ID: {api_gateway_id}")
 
     print_step("Getting Kubernetes backend URL...")
-    backend_url = get_k8s_backend_url()
+    k8s_client = get_cluster_client()
+    backend_url = get_k8s_backend_url(client=k8s_client)
+    for line in k8s_client.format_timing_report():
+        print_info(line)
     if not backend_url:
         print_error("Failed to get backend URL")
         sys.exit(1)
 
-    client = boto3.client('apigatewayv2', region_name=aws_region)
+    client = get_client('apigatewayv2')
+    timings = {}
 
-    print_step("Getting or creating Integration...")
-    integrations = client.get_integrations(ApiId=api_gateway_id)
-    integration_id = None
-    for item in integrations.get('Items', []):
-        if item.get('IntegrationType') == 'HTTP_PROXY':
-            integration_id = item.get('IntegrationId')
-            break
+    print_step("Fetching current integrations and routes...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        integrations_future = pool.submit(list_all, client.get_integrations, ApiId=api_gateway_id)
+        routes_future = pool.submit(list_all, client.get_routes, ApiId=api_gateway_id)
+        integrations, routes = integrations_future.result(), routes_future.result()
+    timings['fetch'] = time.perf_counter() - start
 
-    if integration_id:
-        integration = client.get_integration(ApiId=api_gateway_id, IntegrationId=integration_id)
-        if integration.get('IntegrationUri') == backend_url:
-            print_info("Backend URL unchanged, skipping")
-        else:
-            client.update_integration(
-                ApiId=api_gateway_id, IntegrationId=integration_id,
-                IntegrationUri=backend_url, IntegrationMethod='ANY',
-                PayloadFormatVersion='2.0', ConnectionType='INTERNET',
-            )
-            print_success("Integration updated")
-    else:
-        resp = client.create_integration(
-            ApiId=api_gateway_id, IntegrationType='HTTP_PROXY',
-            IntegrationUri=backend_url, IntegrationMethod='ANY',
-            PayloadFormatVersion='2.0', ConnectionType='INTERNET',
-        )
-        integration_id = resp['IntegrationId']
-        print_success(f"Integration created: {integration_id}")
-
-    print_step("Ensuring routes...")
-    routes_resp = client.get_routes(ApiId=api_gateway_id)
-    routes = routes_resp.get('Items', [])
-    existing_by_key = {r['RouteKey']: r for r in routes}
+    integration_action = plan_integration(integrations, backend_url)
+    route_actions = plan_routes(routes, integration_action['integration_id'])
+    print_plan(integration_action, route_actions)
 
-    desired_keys = ['$default', 'ANY /{proxy+}', 'GET /health']
-    target_integration = f"integrations/{integration_id}"
+    if args.plan:
+        print_info("Plan mode: no changes applied")
+    else:
+        print_step("Applying changes...")
+        start = time.perf_counter()
+        integration_id = apply_integration(client, api_gateway_id, integration_action)
+        if integration_action['action'] == 'create':
+            # 새 integration id로 target을 다시 계산
+            route_actions = plan_routes(routes, integration_id)
+        timings['integration'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        apply_routes(client, api_gateway_id, route_actions)
+        timings['routes'] = time.perf_counter() - start
+        print_success("API Gateway backend configured!")
 
-    for key in desired_keys:
-        existing = existing_by_key.get(key)
-        if existing:
-            route_id = existing['RouteId']
-            old_target = existing.get('Target')
-            if old_target == target_integration:
-                print_info(f"Route already points to new integration: {key}")
-            else:
-                client.update_route(
-                    ApiId=api_gateway_id,
-                    RouteId=route_id,
-                    Target=target_integration,
-                )
-                print_success(f"Route updated: {key} -> {target_integration} (was: {old_target})")
-        else:
-            client.create_route(
-                ApiId=api_gateway_id,
-                RouteKey=key,
-                Target=target_integration,
-            )
-            print_success(f"Route created: {key}")
-
-    print_success("API Gateway backend configured!")
     print_info(f"Backend URL: {backend_url}")
+    print_info("API Gateway timings: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,145 @@
+/**
+ * 워커 클러스터 모드
+ * CLUSTER_WORKERS=auto(컨테이너 CPU quota 기준) 또는 워커 수를 지정하면 primary 프로세스가
+ * 워커를 fork하고 같은 포트를 공유시킨다. 워커가 1개 이하로 계산되면 클러스터 없이 단일 프로세스로 실행한다.
+ *
+ * SIGTERM을 받으면 primary는 새 워커를 띄우지 않고 각 워커에 SIGTERM을 전달한다. 워커는
+ * index.js의 종료 처리(app.close → 처리 중 요청 완료, 후기 버퍼 기록)를 마친 뒤 종료하고,
+ * 제한 시간 안에 끝나지 않은 워커만 SIGKILL로 정리한다.
+ */
+
+const cluster = require("cluster");
+const fs = require("fs");
+const os = require("os");
+
+const { CLUSTER_WORKERS = "", SHUTDOWN_TIMEOUT_MS = "20000" } = process.env;
+
+const CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max";
+const CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us";
+const CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us";
+// 연속으로 죽는 워커가 CPU를 태우지 않도록 재시작 사이에 두는 간격
+const RESTART_DELAY_MS = 1000;
+
+const readText = (path) => fs.readFileSync(path, "utf8").trim();
+
+/**
+ * cgroup에 설정된 CPU 제한(코어 수, 소수 가능). 제한이 없거나 읽을 수 없으면 null
+ * - v2: cpu.max = "<quota> <period>" 또는 "max <period>"
+ * - v1: cpu.cfs_quota_us(-1이면 무제한) / cpu.cfs_period_us
+ * @param {Function} [read] - 파일 내용을 반환하는 함수 (테스트용)
+ * @returns {number|null}
+ */
+function readCpuQuota(read = readText) {
+  try {
+    const [quota, period] = read(CGROUP_V2_CPU_MAX).split(/\s+/);
+    return quota === "max" ? null : Number(quota) / Number(period);
+  } catch (error) {
+    // cgroup v2가 아니면 v1 경로 확인
+  }
+  try {
+    const quota = Number(read(CGROUP_V1_CPU_QUOTA));
+    return quota > 0 ? quota / Number(read(CGROUP_V1_CPU_PERIOD)) : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * CLUSTER_WORKERS 값을 워커 수로 변환 (0이면 클러스터 모드 비활성화)
+ * - "" / "0" / "false": 0
+ * - "auto": CPU quota의 정수 부분 (quota가 없으면 사용 가능한 CPU 수), 최소 1
+ * - 숫자: 그 값
+ * @param {string} setting
+ * @param {Object} [options]
+ * @param {number|null} [options.cpuQuota]
+ * @param {number} [options.availableCpus]
+ * @returns {number}
+ */
+function resolveWorkerCount(setting, options = {}) {
+  const { cpuQuota = readCpuQuota(), availableCpus = os.availableParallelism() } = options;
+  const value = String(setting || "").trim().toLowerCase();
+  if (!value || value === "false") return 0;
+  if (value === "auto") {
+    const cpus = cpuQuota ? Math.min(cpuQuota, availableCpus) : availableCpus;
+    return Math.max(1, Math.floor(cpus));
+  }
+  const count = parseInt(value, 10);
+  if (!Number.isFinite(count) || count < 0) {
+    throw new Error(`Invalid CLUSTER_WORKERS: ${setting}`);
+  }
+  return count;
+}
+
+/**
+ * primary 프로세스: 워커를 fork하고, 예기치 않게 죽은 워커는 다시 띄우며,
+ * 종료 시그널을 받으면 워커에 전달하고 모두 종료될 때까지 기다린다.
+ * @param {number} workers
+ * @param {Object} [options]
+ * @param {number} [options.shutdownTimeoutMs]
+ */
+function runPrimary(workers, options = {}) {
+  const { shutdownTimeoutMs = parseInt(SHUTDOWN_TIMEOUT_MS, 10) } = options;
+  const live = new Set();
+  let shuttingDown = false;
+
+  const log = (message) => console.log(`[cluster ${process.pid}] ${message}`);
+  const fork = () => live.add(cluster.fork().id);
+
+  for (let i = 0; i < workers; i++) {
+    fork();
+  }
+  log(`Started ${workers} worker(s)`);
+
+  cluster.on("exit", (worker, code, signal) => {
+    live.delete(worker.id);
+    if (shuttingDown) {
+      if (live.size === 0) {
+        log("All workers exited");
+        process.exit(0);
+      }
+      return;
+    }
+    log(`Worker ${worker.process.pid} exited (${signal || code}), restarting`);
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, RESTART_DELAY_MS);
+  });
+
+  for (const signal of ["SIGTERM", "SIGINT"]) {
+    process.once(signal, () => {
+      shuttingDown = true;
+      log(`Received ${signal}, draining ${live.size} worker(s)`);
+      if (live.size === 0) process.exit(0);
+      for (const id of live) {
+        cluster.workers[id]?.process.kill("SIGTERM");
+      }
+
+      setTimeout(() => {
+        for (const id of live) {
+          log(`Worker ${id} did not exit in ${shutdownTimeoutMs}ms, killing`);
+          cluster.workers[id]?.process.kill("SIGKILL");
+        }
+        process.exit(1);
+      }, shutdownTimeoutMs).unref();
+    });
+  }
+}
+
+/**
+ * CLUSTER_WORKERS 설정에 따라 start를 단일 프로세스 또는 워커마다 실행
+ * @param {Function} start - 서버를 띄우는 함수 (워커/단일 프로세스에서 호출)
+ * @param {Object} [options]
+ * @param {string} [options.workers] - CLUSTER_WORKERS 값
+ */
+function runWithCluster(start, options = {}) {
+  const { workers: setting = CLUSTER_WORKERS } = options;
+  if (cluster.isPrimary) {
+    const workers = resolveWorkerCount(setting);
+    if (workers > 1) {
+      return runPrimary(workers, options);
+    }
+  }
+  return start();
+}
+
+module.exports = { readCpuQuota, resolveWorkerCount, runPrimary, runWithCluster };
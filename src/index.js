@@ -1,44 +1,182 @@
+// 기동 단계 측정: 이 시점까지가 Node 부트스트랩, 아래 require까지가 모듈 로드(SDK 포함) 시간
+const requireStart = performance.now();
+
 require("dotenv").config();
 
+const cluster = require("cluster");
 const fastify = require("fastify");
 const cors = require("@fastify/cors");
 const authPlugin = require("./plugins/auth");
+const metricsPlugin = require("./plugins/metrics");
+const requestLogPlugin = require("./plugins/requestLog");
 const routes = require("./routes");
+const { runWithCluster } = require("./cluster");
+const {
+  drainReviewWrites,
+  warmDynamoDBClient,
+  preloadQuestionTopics,
+  setLogger,
+} = require("./services/dynamodbService");
+const { BufferedLogStream } = require("./services/logStream");
+
+const requireEnd = performance.now();
+
+const {
+  SHUTDOWN_DELAY_MS = "0",
+  SHUTDOWN_TIMEOUT_MS = "20000",
+  LOG_LEVEL = "info",
+  LOG_ASYNC = "false",
+  LOG_BUFFER_BYTES = "4096",
+  LOG_FLUSH_MS = "1000",
+  LOG_SAMPLE_RATE = "1",
+  LOG_ROUTE_SAMPLE_RATES = "",
+} = process.env;
+
+const roundMs = (ms) => Math.round(ms * 10) / 10;
+
+// LOG_ASYNC=true면 로그를 버퍼에 모아 비동기로 stdout에 쓴다 (프로세스당 하나)
+let logStream = null;
+function getLogStream() {
+  if (!logStream && LOG_ASYNC === "true") {
+    logStream = new BufferedLogStream({
+      minLength: parseInt(LOG_BUFFER_BYTES, 10),
+      flushMs: parseInt(LOG_FLUSH_MS, 10),
+    });
+  }
+  return logStream;
+}
 
 function createServer() {
-  const app = fastify({ logger: true });
+  const stream = getLogStream();
+  const app = fastify({
+    logger: { level: LOG_LEVEL, ...(stream && { stream }) },
+    // 요청 로그는 requestLogPlugin이 샘플링해서 한 줄로 남긴다
+    disableRequestLogging: true,
+  });
+  app.decorate("logStream", stream);
+  setLogger(app.log);
+
+  // starting → ready(연결 준비/캐시 preload 완료) → draining(종료 시그널 수신)
+  app.decorate("readiness", {
+    state: "starting",
+    phases: { bootstrap: roundMs(requireStart), require: roundMs(requireEnd - requireStart) },
+  });
+
+  // 잘못된 비율은 플러그인이 경고를 남기고 기본값으로 대체한다
+  app.register(requestLogPlugin, {
+    sampleRate: LOG_SAMPLE_RATE,
+    routeSampleRates: LOG_ROUTE_SAMPLE_RATES,
+  });
 
   app.register(cors, {
     origin: "*",
     methods: ["GET", "POST", "PUT", "DELETE"],
+    exposedHeaders: ["X-Next-Cursor"],
   });
 
+  // liveness/startupProbe용: 프로세스가 요청을 받을 수 있는지만 확인
   app.get("/health", { config: { skipAuth: true } }, async () => {
     return { status: "ok", service: "quiznox-api" };
   });
 
+  // readinessProbe용: 준비가 끝난 뒤에만 200 (종료 중에는 다시 503이 되어 endpoint에서 빠진다)
+  app.get("/ready", { config: { skipAuth: true } }, async (request, reply) => {
+    const { state, phases } = app.readiness;
+    return reply.code(state === "ready" ? 200 : 503).send({ status: state, startup: phases });
+  });
+
+  // 요청 단계 측정이 인증보다 먼저 시작되도록 auth보다 먼저 등록 (/metrics는 skipAuth)
+  app.register(metricsPlugin);
   app.register(authPlugin);
   app.register(routes);
 
+  // write-behind 버퍼에 남은 후기를 종료 전에 기록
+  app.addHook("onClose", async () => {
+    await drainReviewWrites();
+  });
+
   return app;
 }
 
-async function start() {
+/**
+ * 서버 기동: 플러그인 준비 → listen → DynamoDB 연결/캐시 preload → ready
+ * 클러스터 워커는 primary가 listen 중인 워커에만 연결을 나눠 주므로, 준비를 먼저 끝낸 뒤 listen해
+ * 아직 warmup 중인 워커로 연결이 가지 않게 한다 (Pod의 /ready는 어느 워커든 준비된 워커가 응답).
+ * @param {Object} [options]
+ * @param {boolean} [options.warmBeforeListen] - 기본: 클러스터 워커일 때만 true
+ */
+async function start({ warmBeforeListen = cluster.isWorker } = {}) {
   const app = createServer();
+  const { phases } = app.readiness;
+  const timed = async (phase, fn) => {
+    const started = performance.now();
+    try {
+      return await fn();
+    } finally {
+      phases[phase] = roundMs(performance.now() - started);
+    }
+  };
+  // DynamoDB 연결(TLS 포함)을 미리 맺고 자주 쓰는 topic을 캐시에 채운다.
+  // 둘 다 실패해도 기동은 계속하며, 첫 요청이 그 비용을 낸다.
+  const warmUp = async () => {
+    await timed("warmup", () => warmDynamoDBClient());
+    await timed("preload", () => preloadQuestionTopics());
+  };
 
   try {
-    await app.listen({
-      port: process.env.PORT || 4000,
-      host: process.env.HOST || "0.0.0.0",
-    });
+    await timed("plugins", () => app.ready());
+  } catch (err) {
+    app.log.error(err);
+    process.exit(1);
+  }
+  if (warmBeforeListen) {
+    await warmUp();
+  }
+  try {
+    await timed("listen", () =>
+      app.listen({
+        port: process.env.PORT || 4000,
+        host: process.env.HOST || "0.0.0.0",
+      })
+    );
   } catch (err) {
     app.log.error(err);
     process.exit(1);
   }
+
+  // SIGTERM(롤링 업데이트, 스케일 다운 등)에서 onClose 훅이 실행되도록 서버를 닫고 종료.
+  // Service endpoint에서 빠지기 전에 들어오는 요청을 위해 SHUTDOWN_DELAY_MS 동안은 계속 받고,
+  // 처리 중인 요청이 SHUTDOWN_TIMEOUT_MS 안에 끝나지 않으면 강제 종료한다.
+  for (const signal of ["SIGTERM", "SIGINT"]) {
+    process.once(signal, async () => {
+      app.readiness.state = "draining";
+      app.log.info(`Received ${signal}, closing server in ${SHUTDOWN_DELAY_MS}ms`);
+      setTimeout(() => {
+        app.log.error("Graceful shutdown timed out, exiting");
+        process.exit(1);
+      }, parseInt(SHUTDOWN_TIMEOUT_MS, 10)).unref();
+      await new Promise((resolve) => setTimeout(resolve, parseInt(SHUTDOWN_DELAY_MS, 10)));
+      await app.close();
+      await app.logStream?.flush();
+      process.exit(0);
+    });
+  }
+
+  // 단일 프로세스는 listen 후(/health는 응답, /ready는 503) 준비하고 ready로 전환한다
+  if (!warmBeforeListen) {
+    await warmUp();
+  }
+  phases.total = roundMs(performance.now());
+  if (app.readiness.state === "starting") {
+    app.readiness.state = "ready";
+  }
+  app.log.info({ startup: phases }, "Startup complete, ready to serve");
+  return app;
 }
 
 if (require.main === module) {
-  start();
+  // CLUSTER_WORKERS가 설정되면 CPU quota에 맞춰 워커마다 start 실행
+  runWithCluster(start);
 }
 
 module.exports = { createServer, start };
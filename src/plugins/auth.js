@@ -7,6 +7,7 @@
 
 const fp = require("fastify-plugin");
 const jwt = require("jsonwebtoken");
+const { VerifiedTokenCache } = require("../services/tokenCache");
 
 async function authPlugin(fastify, options) {
   // 로컬 개발 등에서 JWT 인증을 완전히 비활성화할 수 있는 플래그
@@ -27,8 +28,17 @@ async function authPlugin(fastify, options) {
     fastify.log.warn("DISABLE_JWT_AUTH=true 이므로 JWT 인증이 비활성화되었습니다.");
   }
 
+  // 검증된 토큰 캐시: 같은 토큰의 반복 요청에서 HMAC 검증을 생략 (AUTH_TOKEN_CACHE_SIZE=0이면 비활성화)
+  const tokenCache =
+    options.tokenCache ||
+    new VerifiedTokenCache({
+      maxEntries: parseInt(process.env.AUTH_TOKEN_CACHE_SIZE || "1000", 10),
+      ttlMs: parseInt(process.env.AUTH_TOKEN_CACHE_TTL_MS || "300000", 10),
+    });
+
   // 라우트 레벨에서 인증 비활성화 여부를 참조할 수 있도록 fastify 인스턴스에 노출
   fastify.decorate("isAuthDisabled", isAuthDisabled);
+  fastify.decorate("authTokenCache", tokenCache);
 
   fastify.decorateRequest("user", null);
 
@@ -49,25 +59,15 @@ async function authPlugin(fastify, options) {
       return;
     }
 
-    let authHeader = null;
-    const headerKeys = Object.keys(request.headers);
+    // Node HTTP 파서가 헤더 이름을 소문자로 정규화하므로 직접 조회
+    const authHeader = request.headers.authorization;
 
-    // 대소문자 구분 없이 authorization 헤더 찾기
-    for (const key of headerKeys) {
-      if (key.toLowerCase() === "authorization") {
-        authHeader = request.headers[key];
-        break;
-      }
+    // 요청마다 남기는 디버그 로그는 debug 레벨이 켜져 있을 때만 만든다
+    const debugEnabled = request.log.isLevelEnabled?.("debug") === true;
+    if (debugEnabled) {
+      request.log.debug({ msg: "Auth header check", hasAuthHeader: !!authHeader });
     }
 
-    // 디버깅: 헤더 확인
-    fastify.log.info({
-      msg: "Auth header check",
-      hasAuthHeader: !!authHeader,
-      headerKeys: headerKeys,
-      authHeaderValue: authHeader ? authHeader.substring(0, 20) + "..." : null,
-    });
-
     if (!authHeader) {
       fastify.log.warn("Authorization header is missing");
       return reply.status(401).send({
@@ -96,6 +96,12 @@ async function authPlugin(fastify, options) {
 
     const token = parts[1];
 
+    const cachedUser = tokenCache.get(token);
+    if (cachedUser) {
+      request.user = { ...cachedUser };
+      return;
+    }
+
     try {
       // JWT 토큰 검증 및 디코딩
       const decoded = jwt.verify(token, jwtSecret);
@@ -116,13 +122,14 @@ async function authPlugin(fastify, options) {
 
       const username = decoded.username || null;
       request.user = { userId, username };
+      tokenCache.set(token, request.user, decoded.exp);
 
-      // 디버깅: userId 추출 확인
-      fastify.log.info({
-        msg: "User authenticated",
-        userId: String(userId).substring(0, 20) + "...",
-        userIdLength: String(userId).length,
-      });
+      if (debugEnabled) {
+        request.log.debug({
+          msg: "User authenticated",
+          userId: String(userId).substring(0, 20) + "...",
+        });
+      }
     } catch (error) {
       // JWT 검증 실패 처리
       if (error.name === "JsonWebTokenError") {
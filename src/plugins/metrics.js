@@ -0,0 +1,180 @@
+/**
+ * Fastify 메트릭 플러그인
+ * - 라우트별 요청 지연 히스토그램과 처리 단계별(인증·파싱 / 핸들러 / 직렬화) 소요 시간
+ * - 처리 중 요청 수, 이벤트 루프 지연, 프로세스 메모리
+ * - 문제 캐시 / 토큰 캐시 / 후기 write-behind 버퍼 / DynamoDB 연결 풀 상태
+ * - 기동 단계별 소요 시간 (index.js의 readiness.phases), 버퍼링 로그 스트림 상태
+ * GET /metrics(skipAuth)로 Prometheus 텍스트 형식을 노출한다.
+ * 단계 측정이 인증 훅보다 먼저 시작되도록 auth 플러그인보다 먼저 등록해야 한다.
+ */
+
+const fp = require("fastify-plugin");
+const { monitorEventLoopDelay } = require("perf_hooks");
+const { registry, CONTENT_TYPE } = require("../services/metrics");
+const {
+  getQuestionCacheStats,
+  getReviewWriteStats,
+  getDynamoDBPoolStats,
+} = require("../services/dynamodbService");
+
+const METRICS_PATH = "/metrics";
+
+const requestDuration = registry.histogram(
+  "quiznox_http_request_duration_seconds",
+  "HTTP request latency by route",
+  ["method", "route", "status_code"]
+);
+const phaseDuration = registry.histogram(
+  "quiznox_http_request_phase_seconds",
+  "Time spent per request phase (pre_handler = auth + body parsing)",
+  ["route", "phase"]
+);
+const requestsInFlight = registry.gauge(
+  "quiznox_http_requests_in_flight",
+  "Requests currently being handled"
+);
+
+const toSeconds = (start, end) => Number(end - start) / 1e9;
+
+async function metricsPlugin(fastify, options) {
+  const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+  eventLoopDelay.enable();
+
+  // 이벤트 루프 지연은 스크레이프 간격 동안의 값 (스크레이프마다 초기화)
+  registry.gauge(
+    "quiznox_eventloop_lag_seconds",
+    "Event loop delay since the previous scrape",
+    ["stat"],
+    (gauge) => {
+      gauge.set({ stat: "p50" }, eventLoopDelay.percentile(50) / 1e9);
+      gauge.set({ stat: "p99" }, eventLoopDelay.percentile(99) / 1e9);
+      gauge.set({ stat: "max" }, eventLoopDelay.max / 1e9);
+      eventLoopDelay.reset();
+    }
+  );
+  registry.gauge("quiznox_process_memory_bytes", "Process memory usage", ["type"], (gauge) => {
+    const usage = process.memoryUsage();
+    gauge.set({ type: "rss" }, usage.rss);
+    gauge.set({ type: "heap_used" }, usage.heapUsed);
+    gauge.set({ type: "external" }, usage.external);
+  });
+  registry.gauge("quiznox_question_cache", "Question cache counters and size", ["stat"], (gauge) => {
+    const stats = getQuestionCacheStats();
+    for (const stat of ["hits", "misses", "coalesced", "evictions", "size", "inflight"]) {
+      gauge.set({ stat }, stats[stat]);
+    }
+  });
+  registry.gauge("quiznox_review_write_buffer", "Review write-behind buffer state", ["stat"], (gauge) => {
+    const stats = getReviewWriteStats();
+    if (!stats.enabled) return;
+    for (const stat of ["depth", "queued", "written", "failed", "retries", "batches"]) {
+      gauge.set({ stat }, stats[stat]);
+    }
+    gauge.set({ stat: "flush_latency_max_seconds" }, stats.flushLatencyMs.max / 1000);
+  });
+  registry.gauge("quiznox_dynamodb_pool_sockets", "DynamoDB keep-alive pool sockets", ["state"], (gauge) => {
+    const stats = getDynamoDBPoolStats();
+    gauge.set({ state: "active" }, stats.active);
+    gauge.set({ state: "idle" }, stats.idle);
+    gauge.set({ state: "queued" }, stats.queued);
+    gauge.set({ state: "max" }, stats.maxSockets);
+  });
+  registry.gauge("quiznox_auth_token_cache", "Verified token cache counters and size", ["stat"], (gauge) => {
+    const stats = fastify.authTokenCache?.stats();
+    if (!stats) return;
+    for (const stat of ["hits", "misses", "evictions", "size"]) {
+      gauge.set({ stat }, stats[stat]);
+    }
+  });
+  registry.gauge("quiznox_log_stream", "Buffered log stream state (LOG_ASYNC=true)", ["stat"], (gauge) => {
+    const stats = fastify.logStream?.stats();
+    if (!stats) return;
+    for (const stat of ["buffered", "written", "flushes", "dropped", "errors"]) {
+      gauge.set({ stat }, stats[stat]);
+    }
+  });
+  registry.gauge("quiznox_startup_phase_seconds", "Time spent in each startup phase", ["phase"], (gauge) => {
+    const phases = fastify.readiness?.phases;
+    if (!phases) return;
+    for (const [phase, ms] of Object.entries(phases)) {
+      gauge.set({ phase }, ms / 1000);
+    }
+  });
+
+  fastify.decorateRequest("metricsTimings", null);
+
+  fastify.addHook("onRequest", async (request) => {
+    request.metricsTimings = {
+      start: process.hrtime.bigint(),
+      preHandler: null,
+      serialize: null,
+      inFlight: true,
+    };
+    requestsInFlight.inc();
+  });
+
+  // 클라이언트가 응답 전에 연결을 끊으면 onResponse가 호출되지 않을 수 있으므로 여기서도 감소
+  fastify.addHook("onRequestAbort", async (request) => {
+    releaseInFlight(request.metricsTimings);
+  });
+
+  fastify.addHook("preHandler", async (request) => {
+    if (request.metricsTimings) request.metricsTimings.preHandler = process.hrtime.bigint();
+  });
+
+  fastify.addHook("preSerialization", async (request, reply, payload) => {
+    if (request.metricsTimings) request.metricsTimings.serialize = process.hrtime.bigint();
+    return payload;
+  });
+
+  fastify.addHook("onSend", async (request, reply, payload) => {
+    const timings = request.metricsTimings;
+    if (timings?.preHandler) {
+      const now = process.hrtime.bigint();
+      const route = routeOf(request);
+      phaseDuration.observe({ route, phase: "pre_handler" }, toSeconds(timings.start, timings.preHandler));
+      phaseDuration.observe(
+        { route, phase: "handler" },
+        toSeconds(timings.preHandler, timings.serialize ?? now)
+      );
+      if (timings.serialize) {
+        phaseDuration.observe({ route, phase: "serialization" }, toSeconds(timings.serialize, now));
+      }
+    }
+    return payload;
+  });
+
+  fastify.addHook("onResponse", async (request, reply) => {
+    const timings = request.metricsTimings;
+    if (!timings) return;
+    releaseInFlight(timings);
+    const route = routeOf(request);
+    if (route === METRICS_PATH) return;
+    requestDuration.observe(
+      { method: request.method, route, status_code: reply.statusCode },
+      toSeconds(timings.start, process.hrtime.bigint())
+    );
+  });
+
+  fastify.addHook("onClose", async () => {
+    eventLoopDelay.disable();
+  });
+
+  fastify.get(METRICS_PATH, { config: { skipAuth: true } }, async (request, reply) => {
+    return reply.type(CONTENT_TYPE).send(registry.render());
+  });
+}
+
+// onRequestAbort와 onResponse가 모두 호출돼도 요청당 한 번만 감소
+function releaseInFlight(timings) {
+  if (!timings?.inFlight) return;
+  timings.inFlight = false;
+  requestsInFlight.dec();
+}
+
+// 라벨 폭증을 막기 위해 실제 URL 대신 라우트 패턴 사용 (매칭 실패는 하나로 묶음)
+function routeOf(request) {
+  return request.routeOptions?.url || request.routerPath || "unmatched";
+}
+
+module.exports = fp(metricsPlugin);
@@ -0,0 +1,93 @@
+/**
+ * 샘플링 요청 로그 플러그인
+ * Fastify 기본 요청 로그(요청마다 "incoming request"/"request completed" 두 줄) 대신 응답 시 한 줄만 남긴다.
+ * 성공(2xx/3xx) 응답은 라우트별 비율로 샘플링하고, 4xx(warn)와 5xx(error)는 항상 남긴다.
+ * createServer에서 disableRequestLogging과 함께 등록한다.
+ */
+
+const fp = require("fastify-plugin");
+
+/**
+ * 샘플링 비율 (0~1). 숫자가 아니거나 범위를 벗어나면 경고를 남기고 fallback을 쓴다
+ * (Number("abc")의 NaN이 그대로 쓰이면 성공 응답 로그가 조용히 모두 꺼진다)
+ * @param {string|number|undefined} value
+ * @param {number} [fallback=1]
+ * @param {Function} [warn] - 경고 메시지를 받는 함수
+ * @returns {number}
+ */
+function parseSampleRate(value, fallback = 1, warn = () => {}) {
+  if (value === undefined || value === null || value === "") return fallback;
+  const rate = Number(value);
+  if (!Number.isFinite(rate) || rate < 0 || rate > 1) {
+    warn(`Invalid LOG_SAMPLE_RATE "${value}", using ${fallback}`);
+    return fallback;
+  }
+  return rate;
+}
+
+/**
+ * "route=rate,route=rate" 형식의 라우트별 샘플링 비율 (라우트는 /questions/:id 같은 패턴)
+ * 잘못된 항목은 경고 후 건너뛰어 해당 라우트는 기본 비율을 쓴다
+ * @param {string} value
+ * @param {Function} [warn] - 경고 메시지를 받는 함수
+ * @returns {Map<string, number>}
+ */
+function parseSampleRates(value, warn = () => {}) {
+  const rates = new Map();
+  for (const entry of String(value || "").split(",")) {
+    if (!entry.trim()) continue;
+    const index = entry.lastIndexOf("=");
+    const rate = index > 0 ? parseSampleRate(entry.slice(index + 1).trim(), NaN) : NaN;
+    if (Number.isNaN(rate)) {
+      warn(`Ignoring invalid LOG_ROUTE_SAMPLE_RATES entry "${entry.trim()}"`);
+      continue;
+    }
+    rates.set(entry.slice(0, index).trim(), rate);
+  }
+  return rates;
+}
+
+/**
+ * @param {Object} options
+ * @param {number|string} [options.sampleRate=1] - 성공 응답 기본 샘플링 비율 (0~1, 환경변수 문자열 가능)
+ * @param {Map<string, number>|string} [options.routeSampleRates] - 라우트별 비율 (기본값보다 우선)
+ * @param {Function} [options.random=Math.random]
+ */
+async function requestLogPlugin(fastify, options) {
+  const { random = Math.random } = options;
+  const warn = (message) => fastify.log.warn(message);
+  const sampleRate = parseSampleRate(options.sampleRate, 1, warn);
+  const routeSampleRates =
+    typeof options.routeSampleRates === "string"
+      ? parseSampleRates(options.routeSampleRates, warn)
+      : options.routeSampleRates || new Map();
+
+  fastify.addHook("onResponse", async (request, reply) => {
+    const statusCode = reply.statusCode;
+    let rate = 1;
+    if (statusCode < 400) {
+      rate = routeSampleRates.get(routeOf(request)) ?? sampleRate;
+      if (rate <= 0 || (rate < 1 && random() >= rate)) return;
+      if (request.log.isLevelEnabled?.("info") === false) return;
+    }
+    const level = statusCode >= 500 ? "error" : statusCode >= 400 ? "warn" : "info";
+    request.log[level](
+      {
+        req: request,
+        res: reply,
+        responseTime: reply.elapsedTime ?? reply.getResponseTime(),
+        // 샘플링된 로그의 건수를 집계할 때 1/sampleRate를 곱한다
+        ...(rate < 1 && { sampleRate: rate }),
+      },
+      "request completed"
+    );
+  });
+}
+
+function routeOf(request) {
+  return request.routeOptions?.url || request.routerPath || "unmatched";
+}
+
+module.exports = fp(requestLogPlugin);
+module.exports.parseSampleRate = parseSampleRate;
+module.exports.parseSampleRates = parseSampleRates;
@@ -0,0 +1,50 @@
+const os = require("os");
+const {
+  invalidateQuestionCache,
+  getQuestionCacheStats,
+  getReviewWriteStats,
+} = require("../services/dynamodbService");
+
+// 관리자 user_id 목록 (쉼표 구분). 비어 있으면 관리자 API는 모두 403
+const ADMIN_USER_IDS = (process.env.ADMIN_USER_IDS || "")
+  .split(",")
+  .map((id) => id.trim())
+  .filter(Boolean);
+
+async function adminRoutes(fastify, options) {
+  // 인증(auth 플러그인) 이후 관리자 여부 확인
+  fastify.addHook("preHandler", async (request, reply) => {
+    if (fastify.isAuthDisabled === true) return;
+    const userId = request.user?.userId;
+    if (!userId || !ADMIN_USER_IDS.includes(String(userId))) {
+      return reply.status(403).send({ message: "Forbidden" });
+    }
+  });
+
+  fastify.get("/admin/cache/questions", async (request, reply) => {
+    return reply.status(200).send(getQuestionCacheStats());
+  });
+
+  // 문제 데이터 변경 후 캐시 무효화: topicId가 없으면 전체 무효화
+  // 캐시는 프로세스 메모리에 있으므로 이 요청을 받은 Pod(클러스터 모드면 워커) 하나만 비운다.
+  // 다른 Pod/워커는 각 항목의 TTL이 지날 때까지(최대 maxStaleMs) 이전 데이터를 응답할 수 있다
+  fastify.delete("/admin/cache/questions", async (request, reply) => {
+    const topicId = request.query.topicId;
+    const removed = invalidateQuestionCache(topicId);
+    const stats = getQuestionCacheStats();
+    return reply.status(200).send({
+      removed,
+      topicId: topicId || null,
+      scope: "process",
+      instance: `${os.hostname()}/${process.pid}`,
+      maxStaleMs: Math.max(stats.ttlMs, stats.keyIndex.ttlMs),
+    });
+  });
+
+  // 후기 write-behind 버퍼 상태 (대기 건수, flush 지연, 재시도/실패 수)
+  fastify.get("/admin/reviews/writes", async (request, reply) => {
+    return reply.status(200).send(getReviewWriteStats());
+  });
+}
+
+module.exports = adminRoutes;
@@ -1,9 +1,11 @@
 const questionsRoutes = require("./questions");
 const reviewsRoutes = require("./reviews");
+const adminRoutes = require("./admin");
 
 async function routes(fastify, options) {
   fastify.register(questionsRoutes);
   fastify.register(reviewsRoutes);
+  fastify.register(adminRoutes);
 }
 
 module.exports = routes;
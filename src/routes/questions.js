@@ -1,9 +1,209 @@
-const { getAllQuestionsByTopic } = require("../services/dynamodbService");
+const { Readable } = require("stream");
+const {
+  getQuestionPayloadByTopic,
+  getQuestionsPage,
+  streamQuestionPayloadsByTopics,
+  batchGetQuestions,
+  sampleQuestionsByTopic,
+  streamQuestionsByTopic,
+} = require("../services/dynamodbService");
 
 // 환경 변수에서 테이블명 가져오기
 const { DYNAMODB_TABLE_NAME = "QuizNox_Questions" } = process.env;
 
+const DEFAULT_PAGE_LIMIT = 50;
+const MAX_PAGE_LIMIT = 100;
+const PAGE_PARAMS = ["limit", "cursor", "from", "to", "fields"];
+const MAX_BATCH_TOPICS = 20;
+const MAX_BATCH_KEYS = 100;
+// 스트리밍 응답의 내부 버퍼 크기. 이만큼 쌓이면 소켓이 비워질 때까지 다음 페이지를 조회하지 않는다
+const STREAM_HIGH_WATER_MARK = 64 * 1024;
+const NDJSON_TYPE = "application/x-ndjson";
+const DEFAULT_SAMPLE_SIZE = 10;
+const MAX_SAMPLE_SIZE = 100;
+
+/**
+ * 쉼표 구분 목록 파라미터 (같은 파라미터가 여러 번 와도 합친다, 중복 제거)
+ * @returns {Array<string>}
+ */
+function parseListParam(value) {
+  const values = [].concat(value ?? []).flatMap((part) => String(part).split(","));
+  return [...new Set(values.map((part) => part.trim()).filter(Boolean))];
+}
+
+/**
+ * "TOPIC:0001" 형식의 키 목록 → [{ topic_id, question_number }] (형식이 틀리면 null)
+ * topic ID에 ':'가 들어갈 수 있으므로 마지막 ':'로 나눈다.
+ */
+function parseQuestionKeys(values) {
+  const keys = [];
+  for (const value of values) {
+    const separator = value.lastIndexOf(":");
+    if (separator <= 0 || separator === value.length - 1) return null;
+    keys.push({
+      topic_id: value.slice(0, separator),
+      question_number: value.slice(separator + 1),
+    });
+  }
+  return keys;
+}
+
+/**
+ * 여러 topic의 문제를 { "topics": { "<topicId>": [...], ... } }로 스트리밍
+ * topic은 조회가 끝나는 순서대로 쓰며, 각 topic 본문은 캐시된 직렬화 결과를 그대로 사용한다.
+ */
+async function sendTopicsStream(reply, topicIds) {
+  const results = streamQuestionPayloadsByTopics(DYNAMODB_TABLE_NAME, topicIds);
+  // 첫 결과 전의 오류는 일반 오류 응답으로 처리 (이후 오류는 응답을 중단)
+  const first = await results.next();
+
+  async function* body() {
+    yield '{"topics":{';
+    let separator = "";
+    for (let result = first; !result.done; result = await results.next()) {
+      const { topicId, payload } = result.value;
+      yield `${separator}${JSON.stringify(topicId)}:`;
+      yield payload.body;
+      separator = ",";
+    }
+    yield "}}";
+  }
+
+  return reply
+    .status(200)
+    .type("application/json; charset=utf-8")
+    .header("Cache-Control", "private, no-cache")
+    .send(Readable.from(body()));
+}
+
+/**
+ * 페이지 조회: { items, nextCursor } (nextCursor가 null이면 마지막 페이지)
+ */
+async function sendQuestionsPage(request, reply, topicId) {
+  // 같은 파라미터가 여러 번 오면 배열이 되므로 거부
+  if (PAGE_PARAMS.some((param) => Array.isArray(request.query[param]))) {
+    return reply.status(400).send({ message: "Invalid pagination parameters" });
+  }
+  const { cursor, from, to, fields } = request.query;
+  const limit = Math.min(
+    parseInt(request.query.limit, 10) || DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT
+  );
+  if (limit < 1) {
+    return reply.status(400).send({ message: "Invalid limit parameter" });
+  }
+
+  const page = await getQuestionsPage(DYNAMODB_TABLE_NAME, topicId, {
+    limit,
+    cursor,
+    from,
+    to,
+    fields: fields
+      ? fields.split(",").map((field) => field.trim()).filter(Boolean)
+      : undefined,
+  });
+  return reply.status(200).send(page);
+}
+
+/**
+ * topic 전체를 DynamoDB 페이지가 도착하는 대로 스트리밍 (JSON 배열, Accept가 NDJSON이면 한 줄에 한 문제)
+ * 응답은 페이지 하나 분량만 메모리에 두며, 첫 페이지가 오면 바로 전송을 시작한다.
+ */
+async function sendQuestionsStream(request, reply, topicId) {
+  const ndjson = (request.headers.accept || "").includes(NDJSON_TYPE);
+  const pages = streamQuestionsByTopic(DYNAMODB_TABLE_NAME, topicId);
+
+  // 내용이 있는 첫 페이지까지 받은 뒤 응답 시작 (빈 topic은 404, 그 전의 오류는 일반 오류 응답)
+  let first = await pages.next();
+  while (!first.done && first.value.length === 0) {
+    first = await pages.next();
+  }
+  if (first.done) {
+    return reply.status(404).send({ message: "No items found" });
+  }
+
+  async function* body() {
+    if (!ndjson) yield "[";
+    let separator = "";
+    for (let page = first; !page.done; page = await pages.next()) {
+      if (page.value.length === 0) continue;
+      if (ndjson) {
+        yield page.value.map((item) => `${JSON.stringify(item)}\n`).join("");
+      } else {
+        // 페이지 배열의 대괄호를 떼어 하나의 배열로 이어 붙인다
+        yield separator + JSON.stringify(page.value).slice(1, -1);
+        separator = ",";
+      }
+    }
+    if (!ndjson) yield "]";
+  }
+
+  return reply
+    .status(200)
+    .type(ndjson ? `${NDJSON_TYPE}; charset=utf-8` : "application/json; charset=utf-8")
+    .header("Cache-Control", "private, no-cache")
+    .send(Readable.from(body(), { objectMode: false, highWaterMark: STREAM_HIGH_WATER_MARK }));
+}
+
 async function questionsRoutes(fastify, options) {
+  // topic에서 무작위 n문제 (선택된 문제만 조회)
+  fastify.get("/questions/sample", async (request, reply) => {
+    try {
+      const { topicId } = request.query;
+      if (!topicId || typeof topicId !== "string") {
+        return reply.status(400).send({ message: "Missing topicId parameter" });
+      }
+      const n =
+        request.query.n === undefined ? DEFAULT_SAMPLE_SIZE : Number(request.query.n);
+      if (!Number.isInteger(n) || n < 1 || n > MAX_SAMPLE_SIZE) {
+        return reply.status(400).send({ message: "Invalid n parameter" });
+      }
+
+      const items = await sampleQuestionsByTopic(DYNAMODB_TABLE_NAME, topicId, n);
+      if (items.length === 0) {
+        return reply.status(404).send({ message: "No items found" });
+      }
+      return reply.status(200).header("Cache-Control", "no-store").send({ items });
+    } catch (error) {
+      fastify.log.error(error);
+      return reply.status(500).send({ message: "Internal Server Error" });
+    }
+  });
+
+  // 여러 topic(topicIds=A,B) 또는 특정 문제(keys=A:0001,B:0002)를 한 번의 요청으로 조회
+  fastify.get("/questions/batch", async (request, reply) => {
+    try {
+      const topicIds = parseListParam(request.query.topicIds);
+      const keyValues = parseListParam(request.query.keys);
+
+      if (topicIds.length > 0 && keyValues.length > 0) {
+        return reply.status(400).send({ message: "Use either topicIds or keys" });
+      }
+      if (topicIds.length > MAX_BATCH_TOPICS) {
+        return reply.status(400).send({ message: `At most ${MAX_BATCH_TOPICS} topicIds are allowed` });
+      }
+      if (topicIds.length > 0) {
+        return await sendTopicsStream(reply, topicIds);
+      }
+
+      if (keyValues.length === 0) {
+        return reply.status(400).send({ message: "Missing topicIds or keys parameter" });
+      }
+      if (keyValues.length > MAX_BATCH_KEYS) {
+        return reply.status(400).send({ message: `At most ${MAX_BATCH_KEYS} keys are allowed` });
+      }
+      const keys = parseQuestionKeys(keyValues);
+      if (!keys) {
+        return reply.status(400).send({ message: "Invalid keys parameter" });
+      }
+      const items = await batchGetQuestions(DYNAMODB_TABLE_NAME, keys);
+      return reply.status(200).send({ items });
+    } catch (error) {
+      fastify.log.error(error);
+      return reply.status(500).send({ message: "Internal Server Error" });
+    }
+  });
+
   fastify.get("/questions", async (request, reply) => {
     try {
       const topicId = request.query.topicId;
@@ -11,20 +211,54 @@ async function questionsRoutes(fastify, options) {
         return reply.status(400).send({ message: "Missing topicId parameter" });
       }
 
-      const questions = await getAllQuestionsByTopic(DYNAMODB_TABLE_NAME, topicId);
+      // limit/cursor/from/to/fields 중 하나라도 있으면 페이지 단위로 응답
+      if (PAGE_PARAMS.some((param) => request.query[param] !== undefined)) {
+        return await sendQuestionsPage(request, reply, topicId);
+      }
+
+      // stream=true 또는 NDJSON 요청은 전체 목록을 모으지 않고 페이지 단위로 전송
+      if (request.query.stream === "true" || (request.headers.accept || "").includes(NDJSON_TYPE)) {
+        return await sendQuestionsStream(request, reply, topicId);
+      }
+
+      const payload = await getQuestionPayloadByTopic(DYNAMODB_TABLE_NAME, topicId);
 
-      if (questions.length === 0) {
+      if (payload.items.length === 0) {
         return reply.status(404).send({ message: "No items found" });
       }
 
-      return reply.status(200).send(questions);
+      // topic 버전별로 미리 직렬화/압축된 본문과 ETag 사용
+      const encoding = payload.selectEncoding(request.headers["accept-encoding"]);
+      reply
+        .header("ETag", payload.etag(encoding))
+        .header("Vary", "Accept-Encoding")
+        .header("Cache-Control", "private, no-cache");
+
+      if (payload.matches(request.headers["if-none-match"])) {
+        return reply.status(304).send();
+      }
+
+      const body = await payload.encode(encoding);
+      if (encoding !== "identity") {
+        reply.header("Content-Encoding", encoding);
+      }
+      return reply
+        .status(200)
+        .type("application/json; charset=utf-8")
+        .send(body);
     } catch (error) {
-      console.error("DynamoDB Error:", error);
+      fastify.log.error(error);
       
       // 에러 타입에 따른 구체적인 응답
       if (error.message.includes("topicId must be a non-empty string")) {
         return reply.status(400).send({ message: "Invalid topicId parameter" });
       }
+      if (error.message === "Invalid cursor") {
+        return reply.status(400).send({ message: "Invalid cursor parameter" });
+      }
+      if (error.message === "Invalid fields") {
+        return reply.status(400).send({ message: "Invalid fields parameter" });
+      }
       
       return reply.status(500).send({ message: "Internal Server Error" });
     }
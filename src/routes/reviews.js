@@ -1,9 +1,20 @@
-const { putReview, listReviews, getReview, updateReview, deleteReview } = require("../services/dynamodbService");
+const { putReview, listReviews, updateReview, deleteReview } = require("../services/dynamodbService");
 const { randomUUID } = require("crypto");
 
 const DYNAMODB_REVIEWS_TABLE_NAME =
   process.env.DYNAMODB_REVIEWS_TABLE_NAME || "QuizNox_Reviews";
 
+// 서비스의 조건부 쓰기 실패를 404/403 응답으로 변환 (해당 없으면 null)
+function ownershipErrorReply(reply, error) {
+  if (error.message === "Review not found") {
+    return reply.status(404).send({ message: "Review not found" });
+  }
+  if (error.message === "Forbidden") {
+    return reply.status(403).send({ message: "Forbidden" });
+  }
+  return null;
+}
+
 async function reviewsRoutes(fastify, options) {
   // GET 목록: 인증 없이 조회 (기존 questions와 동일하게 옵션 없이 등록, skipAuth는 auth 플러그인 경로 폴백으로 처리)
   fastify.get("/reviews", { config: { skipAuth: true } }, async (request, reply) => {
@@ -12,12 +23,24 @@ async function reviewsRoutes(fastify, options) {
         parseInt(request.query.limit, 10) || 50,
         100
       );
-      const items = await listReviews({
+      const cursor = request.query.cursor;
+      if (cursor !== undefined && typeof cursor !== "string") {
+        return reply.status(400).send({ message: "Invalid cursor parameter" });
+      }
+      const { items, nextCursor } = await listReviews({
         limit,
+        cursor,
         tableName: DYNAMODB_REVIEWS_TABLE_NAME,
       });
+      // 응답 본문은 기존처럼 배열로 유지하고, 다음 페이지 커서는 헤더로 전달
+      if (nextCursor) {
+        reply.header("X-Next-Cursor", nextCursor);
+      }
       return reply.status(200).send(items);
     } catch (error) {
+      if (error.message === "Invalid cursor") {
+        return reply.status(400).send({ message: "Invalid cursor parameter" });
+      }
       fastify.log.error(error);
       return reply.status(500).send({ message: "Internal Server Error" });
     }
@@ -73,16 +96,6 @@ async function reviewsRoutes(fastify, options) {
         return reply.status(400).send({ message: "review_id is required" });
       }
 
-      const existing = await getReview(review_id, {
-        tableName: DYNAMODB_REVIEWS_TABLE_NAME,
-      });
-      if (!existing) {
-        return reply.status(404).send({ message: "Review not found" });
-      }
-      if (!isAuthDisabled && existing.user_id !== userId) {
-        return reply.status(403).send({ message: "Forbidden" });
-      }
-
       const body = request.body || {};
       const content =
         typeof body.content === "string" ? body.content.trim() : "";
@@ -95,11 +108,15 @@ async function reviewsRoutes(fastify, options) {
         });
       }
 
+      // 존재/소유자 확인은 서비스의 조건부 UpdateCommand에서 한 번에 처리
       const updated = await updateReview(review_id, content, {
+        userId: isAuthDisabled ? undefined : userId,
         tableName: DYNAMODB_REVIEWS_TABLE_NAME,
       });
       return reply.status(200).send(updated);
     } catch (error) {
+      const ownershipReply = ownershipErrorReply(reply, error);
+      if (ownershipReply) return ownershipReply;
       fastify.log.error(error);
       return reply.status(500).send({ message: "Internal Server Error" });
     }
@@ -118,21 +135,14 @@ async function reviewsRoutes(fastify, options) {
         return reply.status(400).send({ message: "review_id is required" });
       }
 
-      const existing = await getReview(review_id, {
-        tableName: DYNAMODB_REVIEWS_TABLE_NAME,
-      });
-      if (!existing) {
-        return reply.status(404).send({ message: "Review not found" });
-      }
-      if (!isAuthDisabled && existing.user_id !== userId) {
-        return reply.status(403).send({ message: "Forbidden" });
-      }
-
       await deleteReview(review_id, {
+        userId: isAuthDisabled ? undefined : userId,
         tableName: DYNAMODB_REVIEWS_TABLE_NAME,
       });
       return reply.status(204).send();
     } catch (error) {
+      const ownershipReply = ownershipErrorReply(reply, error);
+      if (ownershipReply) return ownershipReply;
       fastify.log.error(error);
       return reply.status(500).send({ message: "Internal Server Error" });
     }
@@ -0,0 +1,113 @@
+/**
+ * DynamoDB 호출 계측
+ * DocumentClient의 send를 감싸 연산별 호출 수/지연/재시도/소비 용량을 기록한다.
+ * 요청에 ReturnConsumedCapacity가 없으면 TOTAL을 붙여 응답의 ConsumedCapacity를 집계한다.
+ */
+
+const { registry } = require("./metrics");
+
+// ReturnConsumedCapacity를 받는 연산
+const CAPACITY_OPERATIONS = new Set([
+  "Query",
+  "Scan",
+  "Get",
+  "Put",
+  "Update",
+  "Delete",
+  "BatchGet",
+  "BatchWrite",
+]);
+
+const requestsTotal = registry.counter(
+  "quiznox_dynamodb_requests_total",
+  "DynamoDB calls by operation, table and outcome",
+  ["operation", "table", "outcome"]
+);
+const requestDuration = registry.histogram(
+  "quiznox_dynamodb_request_duration_seconds",
+  "DynamoDB call latency including SDK retries",
+  ["operation", "table"]
+);
+const retriesTotal = registry.counter(
+  "quiznox_dynamodb_retries_total",
+  "DynamoDB SDK retry attempts",
+  ["operation", "table"]
+);
+const consumedCapacity = registry.counter(
+  "quiznox_dynamodb_consumed_capacity_units_total",
+  "Capacity units reported by DynamoDB (ReturnConsumedCapacity=TOTAL)",
+  ["operation", "table"]
+);
+const pagesPerCall = registry.histogram(
+  "quiznox_dynamodb_pages_per_call",
+  "Query/Scan pages fetched by one service call",
+  ["call"],
+  [1, 2, 3, 5, 10, 20, 50]
+);
+
+function operationName(command) {
+  return command.constructor.name.replace(/Command$/, "");
+}
+
+function tableNameOf(input) {
+  if (input.TableName) return input.TableName;
+  // Batch 연산은 RequestItems의 키가 테이블 이름
+  const tables = Object.keys(input.RequestItems || {});
+  return tables.length === 1 ? tables[0] : tables.length ? "multiple" : "";
+}
+
+function recordCapacity(operation, table, capacity) {
+  if (!capacity) return;
+  for (const entry of Array.isArray(capacity) ? capacity : [capacity]) {
+    if (typeof entry.CapacityUnits === "number") {
+      consumedCapacity.inc({ operation, table: entry.TableName || table }, entry.CapacityUnits);
+    }
+  }
+}
+
+/**
+ * DynamoDB 클라이언트의 send를 계측 래퍼로 교체 (같은 객체를 반환)
+ * @param {Object} client - DynamoDBDocumentClient
+ * @returns {Object}
+ */
+function instrumentDynamoDBClient(client) {
+  const send = client.send.bind(client);
+
+  client.send = async (command, ...args) => {
+    const operation = operationName(command);
+    const input = command.input || {};
+    const table = tableNameOf(input);
+    if (CAPACITY_OPERATIONS.has(operation) && input.ReturnConsumedCapacity === undefined) {
+      input.ReturnConsumedCapacity = "TOTAL";
+    }
+
+    const end = requestDuration.startTimer({ operation, table });
+    try {
+      const response = await send(command, ...args);
+      end();
+      requestsTotal.inc({ operation, table, outcome: "ok" });
+      recordCapacity(operation, table, response.ConsumedCapacity);
+      const attempts = response.$metadata?.attempts ?? 1;
+      if (attempts > 1) retriesTotal.inc({ operation, table }, attempts - 1);
+      return response;
+    } catch (error) {
+      end();
+      requestsTotal.inc({ operation, table, outcome: error.name || "Error" });
+      const attempts = error.$metadata?.attempts ?? 1;
+      if (attempts > 1) retriesTotal.inc({ operation, table }, attempts - 1);
+      throw error;
+    }
+  };
+  return client;
+}
+
+/**
+ * 페이지를 이어 읽는 서비스 함수 한 번에 몇 페이지를 읽었는지 기록
+ * @param {string} call - 서비스 함수 이름
+ * @param {number} pages
+ */
+function observePages(call, pages) {
+  pagesPerCall.observe({ call }, pages);
+}
+
+module.exports = { instrumentDynamoDBClient, observePages };
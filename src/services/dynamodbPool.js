@@ -0,0 +1,62 @@
+/**
+ * DynamoDB 클라이언트용 keep-alive HTTP(S) 연결 풀
+ * SDK 기본 요청 핸들러 대신 이 에이전트를 넘겨 소켓 재사용/최대 소켓 수를 명시적으로 관리하고,
+ * 에이전트의 소켓 상태로 풀 사용률을 집계한다.
+ */
+
+const http = require("http");
+const https = require("https");
+
+function countSockets(table) {
+  return Object.values(table).reduce((sum, list) => sum + list.length, 0);
+}
+
+class ConnectionPool {
+  /**
+   * @param {Object} options
+   * @param {number} [options.maxSockets=64] - origin당 최대 소켓 수 (초과 요청은 에이전트 큐에서 대기)
+   * @param {number} [options.keepAliveMs=15000] - 유휴 소켓 TCP keep-alive 간격이자 유휴 소켓 유지 시간
+   */
+  constructor({ maxSockets = 64, keepAliveMs = 15000 } = {}) {
+    this.maxSockets = maxSockets;
+    const agentOptions = {
+      keepAlive: true,
+      keepAliveMsecs: keepAliveMs,
+      maxSockets,
+      maxFreeSockets: maxSockets,
+      // 유휴 소켓을 서버보다 먼저 닫아, 서버가 끊은 소켓을 재사용하다 실패하는 일을 줄인다
+      timeout: keepAliveMs,
+      scheduling: "lifo",
+    };
+    this.httpAgent = new http.Agent(agentOptions);
+    this.httpsAgent = new https.Agent(agentOptions);
+  }
+
+  /**
+   * @returns {{maxSockets: number, active: number, idle: number, queued: number, utilization: number}}
+   */
+  stats() {
+    let active = 0;
+    let idle = 0;
+    let queued = 0;
+    for (const agent of [this.httpAgent, this.httpsAgent]) {
+      active += countSockets(agent.sockets);
+      idle += countSockets(agent.freeSockets);
+      queued += countSockets(agent.requests);
+    }
+    return {
+      maxSockets: this.maxSockets,
+      active,
+      idle,
+      queued,
+      utilization: this.maxSockets ? active / this.maxSockets : 0,
+    };
+  }
+
+  destroy() {
+    this.httpAgent.destroy();
+    this.httpsAgent.destroy();
+  }
+}
+
+module.exports = { ConnectionPool };
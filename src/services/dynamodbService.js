@@ -4,34 +4,101 @@ const {
   ScanCommand,
   PutCommand,
   GetCommand,
+  UpdateCommand,
   DeleteCommand,
+  BatchGetCommand,
 } = require("@aws-sdk/lib-dynamodb");
 const { DynamoDBClient } = require("@aws-sdk/client-dynamodb");
+const { QuestionCache } = require("./questionCache");
+const { QuestionPayload } = require("./questionPayload");
+const { ReviewWriteBuffer } = require("./reviewWriteBuffer");
+const { instrumentDynamoDBClient, observePages } = require("./dynamodbMetrics");
+const { ConnectionPool } = require("./dynamodbPool");
 
 const {
   DYNAMODB_TABLE_NAME = "QuizNox_Questions",
   DYNAMODB_REVIEWS_TABLE_NAME = "QuizNox_Reviews",
+  DYNAMODB_REVIEWS_INDEX_NAME = "review_feed-created_at-index",
   AWS_REGION = "ap-northeast-2",
+  QUESTION_CACHE_TTL_MS = "300000",
+  QUESTION_CACHE_MAX_TOPICS = "50",
+  REVIEW_WRITE_BEHIND = "false",
+  REVIEW_WRITE_FLUSH_MS = "100",
+  REVIEW_WRITE_MAX_PENDING = "1000",
+  DYNAMODB_MAX_SOCKETS = "64",
+  DYNAMODB_KEEP_ALIVE_MS = "15000",
+  DYNAMODB_CONNECTION_TIMEOUT_MS = "1000",
+  DYNAMODB_REQUEST_TIMEOUT_MS = "3000",
+  DYNAMODB_MAX_ATTEMPTS = "3",
+  DYNAMODB_RETRY_MODE = "adaptive",
+  DYNAMODB_WARM_CONNECTIONS = "2",
+  QUESTION_BATCH_CONCURRENCY = "4",
+  QUESTION_INDEX_TTL_MS = "600000",
+  QUESTION_INDEX_MAX_TOPICS = "200",
+  PRELOAD_TOPICS = "",
 } = process.env;
 
-// 로깅 설정
-const logger = {
+// 로깅 설정: 서버가 setLogger로 Fastify(pino) 로거를 연결하기 전(스크립트, 테스트)에는 console
+const consoleLogger = {
+  debug: () => {},
   info: (message) => console.log(`[INFO] ${message}`),
   error: (message) => console.error(`[ERROR] ${message}`),
+  isLevelEnabled: (level) => level !== "debug",
+};
+let baseLogger = consoleLogger;
+
+// 요청 경로의 로그는 debug 레벨이므로 문자열을 만들기 전에 isLevelEnabled("debug")로 확인한다
+const logger = {
+  debug: (message) => baseLogger.debug(message),
+  info: (message) => baseLogger.info(message),
+  error: (message) => baseLogger.error(message),
+  isLevelEnabled: (level) => baseLogger.isLevelEnabled(level),
 };
 
 /**
- * DynamoDB 클라이언트 생성
+ * 서비스 로그를 구조화 로거(Fastify app.log)로 보낸다 (null이면 console로 되돌림)
+ * @param {Object|null} target - pino 호환 로거
+ */
+function setLogger(target) {
+  baseLogger = target ? target.child({ module: "dynamodb" }) : consoleLogger;
+}
+
+// 프로세스 전체가 공유하는 keep-alive 연결 풀 (지연 초기화)
+let connectionPool = null;
+
+function getConnectionPool() {
+  if (!connectionPool) {
+    connectionPool = new ConnectionPool({
+      maxSockets: parseInt(DYNAMODB_MAX_SOCKETS, 10),
+      keepAliveMs: parseInt(DYNAMODB_KEEP_ALIVE_MS, 10),
+    });
+  }
+  return connectionPool;
+}
+
+/**
+ * DynamoDB 클라이언트 생성 (send는 /metrics용 계측 래퍼로 감싼다)
+ * keep-alive 연결 풀, 연결/요청 타임아웃, 재시도 모드는 환경변수(ConfigMap)로 설정한다.
  * @param {Object} options - DynamoDB 클라이언트 옵션
  * @returns {DynamoDBDocumentClient}
  */
 function createDynamoDBClient(options = {}) {
   try {
+    const pool = getConnectionPool();
     const client = new DynamoDBClient({
       region: AWS_REGION,
+      maxAttempts: parseInt(DYNAMODB_MAX_ATTEMPTS, 10),
+      // adaptive: 스로틀링 응답을 받으면 클라이언트 측 전송 속도도 낮춘다
+      retryMode: DYNAMODB_RETRY_MODE,
+      requestHandler: {
+        httpAgent: pool.httpAgent,
+        httpsAgent: pool.httpsAgent,
+        connectionTimeout: parseInt(DYNAMODB_CONNECTION_TIMEOUT_MS, 10),
+        requestTimeout: parseInt(DYNAMODB_REQUEST_TIMEOUT_MS, 10),
+      },
       ...options,
     });
-    return DynamoDBDocumentClient.from(client);
+    return instrumentDynamoDBClient(DynamoDBDocumentClient.from(client));
   } catch (error) {
     logger.error(`Failed to create DynamoDB client: ${error.message}`);
     throw new Error("Failed to initialize DynamoDB client");
@@ -48,6 +115,48 @@ function getDynamoDBClient() {
   return dynamoDB;
 }
 
+/**
+ * 시작 시 DynamoDB 연결을 미리 맺어 둔다 (첫 요청이 DNS/TLS 연결 비용을 내지 않도록).
+ * 존재하지 않는 키를 동시에 GetItem 하므로 데이터는 읽지 않으며, 실패해도 예외를 던지지 않는다.
+ * @param {Object} options - { connections, tableName, dynamoDBClient }
+ * @returns {Promise<{connections: number, failed: number, ms: number}>}
+ */
+async function warmDynamoDBClient(options = {}) {
+  const {
+    connections = parseInt(DYNAMODB_WARM_CONNECTIONS, 10),
+    tableName = DYNAMODB_TABLE_NAME,
+    dynamoDBClient = getDynamoDBClient(),
+  } = options;
+
+  const started = Date.now();
+  const results = await Promise.allSettled(
+    Array.from({ length: connections }, () =>
+      dynamoDBClient.send(
+        new GetCommand({
+          TableName: tableName,
+          Key: { topic_id: "__warmup__", question_number: "0" },
+        })
+      )
+    )
+  );
+  const failed = results.filter((r) => r.status === "rejected");
+  const ms = Date.now() - started;
+  if (failed.length) {
+    logger.error(`DynamoDB warmup failed for ${failed.length}/${connections} connections: ${failed[0].reason.message}`);
+  } else {
+    logger.info(`DynamoDB warmup opened ${connections} connections in ${ms}ms`);
+  }
+  return { connections, failed: failed.length, ms };
+}
+
+/**
+ * DynamoDB 연결 풀 사용 현황 (활성/유휴/대기 소켓 수, 사용률)
+ * @returns {Object}
+ */
+function getDynamoDBPoolStats() {
+  return getConnectionPool().stats();
+}
+
 /**
  * 주어진 topic_id로 문제 리스트를 조회하고 question_number 기준으로 정렬해서 반환
  * @param {string} topicId - 조회할 topic ID
@@ -68,7 +177,9 @@ async function getQuestionsByTopic(topicId, options = {}) {
   }
 
   try {
-    logger.info(`Querying questions for topic: ${topicId}`);
+    if (logger.isLevelEnabled("debug")) {
+      logger.debug(`Querying questions for topic: ${topicId}`);
+    }
 
     const { Items } = await dynamoDBClient.send(
       new QueryCommand({
@@ -82,7 +193,9 @@ async function getQuestionsByTopic(topicId, options = {}) {
     );
 
     const result = Items ?? [];
-    logger.info(`Found ${result.length} questions for topic: ${topicId}`);
+    if (logger.isLevelEnabled("debug")) {
+      logger.debug(`Found ${result.length} questions for topic: ${topicId}`);
+    }
     return result;
   } catch (error) {
     logger.error(`Failed to query questions: ${error.message}`);
@@ -90,6 +203,35 @@ async function getQuestionsByTopic(topicId, options = {}) {
   }
 }
 
+/**
+ * topic의 문제를 DynamoDB 페이지(LastEvaluatedKey) 단위로 내보낸다
+ * 다음 페이지는 소비자가 다음 값을 꺼낼 때 조회하므로 소비 속도에 맞춰 진행된다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {DynamoDBDocumentClient} dynamoDBClient - DynamoDB 클라이언트 (선택사항)
+ * @returns {AsyncGenerator<Array>} - 페이지별 문제 목록
+ */
+async function* queryQuestionPages(tableName, topicId, dynamoDBClient = null) {
+  const client = dynamoDBClient || getDynamoDBClient();
+  let ExclusiveStartKey = undefined;
+
+  do {
+    const response = await client.send(
+      new QueryCommand({
+        TableName: tableName,
+        KeyConditionExpression: "topic_id = :tid",
+        ExpressionAttributeValues: {
+          ":tid": topicId,
+        },
+        ExclusiveStartKey,
+        ScanIndexForward: true,
+      })
+    );
+    ExclusiveStartKey = response.LastEvaluatedKey;
+    yield response.Items ?? [];
+  } while (ExclusiveStartKey);
+}
+
 /**
  * DynamoDB의 Query나 Scan은 응답 크기 제한(기본 1MB)
  * LastEvaluatedKey가 있는 한 계속 QueryCommand를 반복해서 호출하여 모든 데이터 조회
@@ -103,29 +245,19 @@ async function getAllQuestionsByTopic(
   topicId,
   dynamoDBClient = null
 ) {
-  const client = dynamoDBClient || getDynamoDBClient();
   const allItems = [];
-  let ExclusiveStartKey = undefined;
+  let pages = 0;
 
   try {
-    do {
-      const response = await client.send(
-        new QueryCommand({
-          TableName: tableName,
-          KeyConditionExpression: "topic_id = :tid",
-          ExpressionAttributeValues: {
-            ":tid": topicId,
-          },
-          ExclusiveStartKey,
-          ScanIndexForward: true,
-        })
-      );
+    for await (const items of queryQuestionPages(tableName, topicId, dynamoDBClient)) {
+      pages += 1;
+      allItems.push(...items);
+    }
 
-      allItems.push(...(response.Items ?? []));
-      ExclusiveStartKey = response.LastEvaluatedKey;
-    } while (ExclusiveStartKey);
-
-    logger.info(`Retrieved ${allItems.length} questions for topic: ${topicId}`);
+    observePages("getAllQuestionsByTopic", pages);
+    if (logger.isLevelEnabled("debug")) {
+      logger.debug(`Retrieved ${allItems.length} questions for topic: ${topicId}`);
+    }
     return allItems;
   } catch (error) {
     logger.error(
@@ -136,46 +268,729 @@ async function getAllQuestionsByTopic(
 }
 
 /**
- * 이용 후기 저장
+ * 응답 스트리밍용: topic의 문제를 페이지 단위로 내보낸다 (전체 목록을 메모리에 모으지 않음)
+ * 문제 캐시에 있으면 캐시된 목록을 한 번에, 없으면 DynamoDB 페이지가 도착하는 대로 내보내며 캐시는 채우지 않는다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {DynamoDBDocumentClient} dynamoDBClient - DynamoDB 클라이언트 (선택사항)
+ * @returns {AsyncGenerator<Array>} - 페이지별 문제 목록 (캐시된 배열은 변경 금지)
+ */
+async function* streamQuestionsByTopic(tableName, topicId, dynamoDBClient = null) {
+  if (!topicId || typeof topicId !== "string") {
+    throw new Error("topicId must be a non-empty string");
+  }
+
+  const cached = questionCache.peek(questionCacheKey(tableName, topicId));
+  if (cached) {
+    yield cached.items;
+    return;
+  }
+
+  let pages = 0;
+  try {
+    for await (const items of queryQuestionPages(tableName, topicId, dynamoDBClient)) {
+      pages += 1;
+      yield items;
+    }
+  } catch (error) {
+    logger.error(`Failed to stream questions for topic ${topicId}: ${error.message}`);
+    throw new Error(`Failed to query questions: ${error.message}`);
+  }
+  observePages("streamQuestionsByTopic", pages);
+}
+
+// topic별 문제 목록 캐시 (문제 은행은 거의 바뀌지 않으므로 TTL 동안 메모리에서 응답)
+const questionCache = new QuestionCache({
+  ttlMs: parseInt(QUESTION_CACHE_TTL_MS, 10) || 0,
+  maxEntries: parseInt(QUESTION_CACHE_MAX_TOPICS, 10) || 0,
+});
+
+function questionCacheKey(tableName, topicId) {
+  return `${tableName}:${topicId}`;
+}
+
+/**
+ * 캐시를 거쳐 topic의 직렬화/압축 payload를 조회 (캐시 miss 시 getAllQuestionsByTopic)
+ * 같은 topic의 동시 요청은 하나의 DynamoDB 조회로 합쳐지며, 빈 결과는 캐시하지 않는다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {DynamoDBDocumentClient} dynamoDBClient - DynamoDB 클라이언트 (선택사항)
+ * @returns {Promise<QuestionPayload>} - 문제 목록(items), JSON 본문, ETag (공유 객체이므로 변경 금지)
+ */
+async function getQuestionPayloadByTopic(
+  tableName,
+  topicId,
+  dynamoDBClient = null
+) {
+  if (!topicId || typeof topicId !== "string") {
+    throw new Error("topicId must be a non-empty string");
+  }
+
+  return questionCache.get(
+    questionCacheKey(tableName, topicId),
+    async () =>
+      new QuestionPayload(
+        await getAllQuestionsByTopic(tableName, topicId, dynamoDBClient)
+      ),
+    { shouldCache: (payload) => payload.items.length > 0 }
+  );
+}
+
+/**
+ * 시작 시 자주 조회되는 topic을 문제 캐시에 미리 채운다 (readiness 전에 호출).
+ * 실패한 topic은 건너뛰며 예외를 던지지 않는다.
+ * @param {Object} options - { topicIds, tableName, dynamoDBClient }
+ * @returns {Promise<{topics: number, loaded: number, failed: number, ms: number}>}
+ */
+async function preloadQuestionTopics(options = {}) {
+  const {
+    topicIds = PRELOAD_TOPICS.split(",").map((topicId) => topicId.trim()).filter(Boolean),
+    tableName = DYNAMODB_TABLE_NAME,
+    dynamoDBClient = null,
+  } = options;
+
+  const started = Date.now();
+  const results = await Promise.allSettled(
+    topicIds.map((topicId) => getQuestionPayloadByTopic(tableName, topicId, dynamoDBClient))
+  );
+  const failed = results.filter((r) => r.status === "rejected");
+  const loaded = results.filter((r) => r.status === "fulfilled" && r.value.items.length > 0).length;
+  const ms = Date.now() - started;
+  if (failed.length) {
+    logger.error(`Question preload failed for ${failed.length}/${topicIds.length} topics: ${failed[0].reason.message}`);
+  }
+  if (topicIds.length) {
+    logger.info(`Preloaded ${loaded}/${topicIds.length} topics in ${ms}ms`);
+  }
+  return { topics: topicIds.length, loaded, failed: failed.length, ms };
+}
+
+/**
+ * 캐시를 거쳐 topic의 모든 문제를 조회
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {DynamoDBDocumentClient} dynamoDBClient - DynamoDB 클라이언트 (선택사항)
+ * @returns {Promise<Array>} - 조회된 모든 문제 리스트 (공유 객체이므로 변경 금지)
+ */
+async function getCachedQuestionsByTopic(
+  tableName,
+  topicId,
+  dynamoDBClient = null
+) {
+  const payload = await getQuestionPayloadByTopic(
+    tableName,
+    topicId,
+    dynamoDBClient
+  );
+  return payload.items;
+}
+
+// 여러 topic/키 묶음을 조회할 때 동시에 보내는 DynamoDB 요청 수 상한
+const questionBatchConcurrency = parseInt(QUESTION_BATCH_CONCURRENCY, 10) || 4;
+
+// BatchGetItem 요청당 최대 키 수
+const BATCH_GET_LIMIT = 100;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * values마다 fn을 최대 concurrency개씩 동시에 실행하고, 끝나는 순서대로 결과를 내보낸다.
+ * 소비자가 다음 결과를 꺼낼 때 새 작업을 시작하므로 느린 소비자(응답 스트림)보다 앞서 나가지 않는다.
+ * 하나라도 실패하면 그 오류를 던진다 (이미 실행 중인 작업은 결과를 버린다).
+ * @param {Array} values
+ * @param {number} concurrency
+ * @param {Function} fn - async (value) => result
+ * @returns {AsyncGenerator}
+ */
+async function* mapConcurrent(values, concurrency, fn) {
+  const running = new Map();
+  let next = 0;
+
+  while (next < values.length || running.size > 0) {
+    while (running.size < Math.max(concurrency, 1) && next < values.length) {
+      const index = next++;
+      running.set(
+        index,
+        Promise.resolve(values[index])
+          .then(fn)
+          .then(
+            (value) => ({ index, value }),
+            (error) => ({ index, error })
+          )
+      );
+    }
+    const { index, value, error } = await Promise.race(running.values());
+    running.delete(index);
+    if (error) throw error;
+    yield value;
+  }
+}
+
+/**
+ * 여러 topic의 payload를 병렬로(최대 concurrency개) 조회해 끝나는 순서대로 내보낸다.
+ * topic별 조회는 문제 캐시를 거치므로 캐시된 topic은 DynamoDB를 호출하지 않는다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {Array<string>} topicIds - 조회할 topic ID 목록 (중복 제거된 상태)
+ * @param {Object} [options] - { concurrency, dynamoDBClient }
+ * @returns {AsyncGenerator<{topicId: string, payload: QuestionPayload}>}
+ */
+async function* streamQuestionPayloadsByTopics(tableName, topicIds, options = {}) {
+  const { concurrency = questionBatchConcurrency, dynamoDBClient = null } = options;
+
+  yield* mapConcurrent(topicIds, concurrency, async (topicId) => ({
+    topicId,
+    payload: await getQuestionPayloadByTopic(tableName, topicId, dynamoDBClient),
+  }));
+}
+
+function questionKeyId({ topic_id, question_number }) {
+  return `${topic_id}\u0001${question_number}`;
+}
+
+async function batchGetQuestionChunk(client, tableName, keys, maxAttempts) {
+  const items = [];
+  let pending = keys;
+
+  for (let attempt = 1; pending.length > 0; attempt += 1) {
+    if (attempt > 1) {
+      if (attempt > maxAttempts) {
+        throw new Error(`${pending.length} keys unprocessed after ${maxAttempts} attempts`);
+      }
+      // UnprocessedKeys는 처리량 초과 신호이므로 지터를 준 지수 백오프 후 재시도
+      await sleep(Math.random() * Math.min(1000, 25 * 2 ** (attempt - 2)));
+    }
+    const response = await client.send(
+      new BatchGetCommand({ RequestItems: { [tableName]: { Keys: pending } } })
+    );
+    items.push(...(response.Responses?.[tableName] ?? []));
+    pending = response.UnprocessedKeys?.[tableName]?.Keys ?? [];
+  }
+  return items;
+}
+
+/**
+ * topic_id/question_number 키 목록으로 문제를 BatchGetItem 조회
+ * 키는 100개 단위로 나눠 최대 concurrency개 요청을 병렬로 보내고, 없는 키는 결과에서 빠진다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {Array<{topic_id: string, question_number: string}>} keys - 조회할 키 (중복은 한 번만 조회)
+ * @param {Object} [options] - { concurrency, maxAttempts, dynamoDBClient }
+ * @returns {Promise<Array>} - 요청한 키 순서대로 정렬된 문제 목록
+ * @throws {Error} - DynamoDB 호출 실패 또는 재시도 후에도 처리되지 않은 키가 남은 경우
+ */
+async function batchGetQuestions(tableName, keys, options = {}) {
+  const {
+    concurrency = questionBatchConcurrency,
+    maxAttempts = 5,
+    dynamoDBClient = null,
+  } = options;
+
+  // BatchGetItem은 한 요청 안의 중복 키를 ValidationException으로 거부한다
+  const unique = new Map(
+    keys.map(({ topic_id, question_number }) => [
+      questionKeyId({ topic_id, question_number }),
+      { topic_id, question_number },
+    ])
+  );
+  const requested = [...unique.values()];
+  const chunks = [];
+  for (let i = 0; i < requested.length; i += BATCH_GET_LIMIT) {
+    chunks.push(requested.slice(i, i + BATCH_GET_LIMIT));
+  }
+
+  const found = new Map();
+  try {
+    const client = dynamoDBClient || getDynamoDBClient();
+    const results = mapConcurrent(chunks, concurrency, (chunk) =>
+      batchGetQuestionChunk(client, tableName, chunk, maxAttempts)
+    );
+    for await (const items of results) {
+      for (const item of items) {
+        found.set(questionKeyId(item), item);
+      }
+    }
+  } catch (error) {
+    logger.error(`Failed to batch get questions: ${error.message}`);
+    throw new Error(`Failed to batch get questions: ${error.message}`);
+  }
+
+  return [...unique.keys()].filter((id) => found.has(id)).map((id) => found.get(id));
+}
+
+// topic별 question_number 목록 (무작위 추출용 키 인덱스). 문제 본문 없이 키만 보관하므로 더 많은 topic을 더 오래 둔다
+const questionKeyIndex = new QuestionCache({
+  ttlMs: parseInt(QUESTION_INDEX_TTL_MS, 10) || 0,
+  maxEntries: parseInt(QUESTION_INDEX_MAX_TOPICS, 10) || 0,
+});
+
+/**
+ * topic의 question_number 목록 조회 (키 인덱스 캐시를 거침)
+ * 전체 문제가 이미 문제 캐시에 있으면 그것을 쓰고, 없으면 question_number만 projection해 Query한다.
+ * @returns {Promise<Array<string>>}
+ */
+async function getQuestionNumbersByTopic(tableName, topicId, dynamoDBClient = null) {
+  const cached = questionCache.peek(questionCacheKey(tableName, topicId));
+  if (cached) {
+    return cached.items.map((item) => item.question_number);
+  }
+
+  return questionKeyIndex.get(
+    questionCacheKey(tableName, topicId),
+    async () => {
+      const client = dynamoDBClient || getDynamoDBClient();
+      const numbers = [];
+      let ExclusiveStartKey = undefined;
+      let pages = 0;
+      try {
+        do {
+          pages += 1;
+          const response = await client.send(
+            new QueryCommand({
+              TableName: tableName,
+              KeyConditionExpression: "topic_id = :tid",
+              ExpressionAttributeValues: { ":tid": topicId },
+              ProjectionExpression: "question_number",
+              ExclusiveStartKey,
+            })
+          );
+          for (const item of response.Items ?? []) {
+            numbers.push(item.question_number);
+          }
+          ExclusiveStartKey = response.LastEvaluatedKey;
+        } while (ExclusiveStartKey);
+      } catch (error) {
+        logger.error(`Failed to load question index for ${topicId}: ${error.message}`);
+        throw new Error(`Failed to query questions: ${error.message}`);
+      }
+      observePages("getQuestionNumbersByTopic", pages);
+      if (logger.isLevelEnabled("debug")) {
+        logger.debug(`Indexed ${numbers.length} question keys for topic: ${topicId}`);
+      }
+      return numbers;
+    },
+    { shouldCache: (numbers) => numbers.length > 0 }
+  );
+}
+
+/**
+ * 배열에서 n개를 비복원 균등 추출 (부분 Fisher-Yates, 결과 순서도 무작위)
+ * @param {Array} values
+ * @param {number} n
+ * @param {Function} [random=Math.random]
+ * @returns {Array}
+ */
+function sampleWithoutReplacement(values, n, random = Math.random) {
+  const pool = [...values];
+  const count = Math.min(n, pool.length);
+  for (let i = 0; i < count; i += 1) {
+    const j = i + Math.floor(random() * (pool.length - i));
+    [pool[i], pool[j]] = [pool[j], pool[i]];
+  }
+  return pool.slice(0, count);
+}
+
+/**
+ * topic에서 문제 n개를 무작위로 조회
+ * 키 인덱스에서 question_number를 뽑은 뒤 선택된 문제만 BatchGetItem으로 읽는다
+ * (전체 topic이 문제 캐시에 있으면 DynamoDB를 호출하지 않는다).
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {number} n - 문제 수 (topic의 문제 수보다 크면 전체)
+ * @param {Object} [options] - { dynamoDBClient, random }
+ * @returns {Promise<Array>} - 무작위 순서의 문제 목록 (topic이 없으면 빈 배열)
+ */
+async function sampleQuestionsByTopic(tableName, topicId, n, options = {}) {
+  const { dynamoDBClient = null, random = Math.random } = options;
+
+  if (!topicId || typeof topicId !== "string") {
+    throw new Error("topicId must be a non-empty string");
+  }
+
+  const cached = questionCache.peek(questionCacheKey(tableName, topicId));
+  if (cached) {
+    return sampleWithoutReplacement(cached.items, n, random);
+  }
+
+  const numbers = await getQuestionNumbersByTopic(tableName, topicId, dynamoDBClient);
+  const keys = sampleWithoutReplacement(numbers, n, random).map((question_number) => ({
+    topic_id: topicId,
+    question_number,
+  }));
+  if (keys.length === 0) return [];
+
+  // 인덱스 이후 삭제된 문제는 결과에서 빠진다 (다음 인덱스 갱신 때 반영)
+  return batchGetQuestions(tableName, keys, { dynamoDBClient });
+}
+
+// 페이지 조회에서 projection으로 고를 수 있는 문제 필드
+const QUESTION_FIELDS = [
+  "topic_id",
+  "question_number",
+  "question_text",
+  "choices",
+  "most_voted_answer",
+];
+
+/**
+ * LastEvaluatedKey를 클라이언트에 넘길 불투명 커서로 인코딩
+ * @param {Object} [key]
+ * @returns {string|null}
+ */
+function encodeQuestionCursor(key) {
+  return key ? Buffer.from(JSON.stringify(key)).toString("base64url") : null;
+}
+
+/**
+ * 커서를 ExclusiveStartKey로 디코딩 (다른 topic의 커서이거나 형식이 잘못되면 에러)
+ * @param {string} cursor
+ * @param {string} topicId
+ * @returns {Object}
+ */
+function decodeQuestionCursor(cursor, topicId) {
+  let key;
+  try {
+    key = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+  } catch (error) {
+    throw new Error("Invalid cursor");
+  }
+  if (
+    !key ||
+    key.topic_id !== topicId ||
+    typeof key.question_number !== "string" ||
+    Object.keys(key).length !== 2
+  ) {
+    throw new Error("Invalid cursor");
+  }
+  return key;
+}
+
+function projectQuestion(item, fields) {
+  if (!fields) return item;
+  const projected = {};
+  for (const field of fields) {
+    if (item[field] !== undefined) projected[field] = item[field];
+  }
+  return projected;
+}
+
+/**
+ * 캐시된 topic 전체 목록에서 페이지를 잘라낸다 (DynamoDB 조회 없음)
+ */
+function sliceQuestionsPage(items, topicId, { limit, startKey, from, to, fields }) {
+  const page = [];
+  let hasMore = false;
+  for (const item of items) {
+    const number = item.question_number;
+    if (startKey && number <= startKey.question_number) continue;
+    if (from && number < from) continue;
+    if (to && number > to) break;
+    if (page.length === limit) {
+      hasMore = true;
+      break;
+    }
+    page.push(item);
+  }
+  const last = page[page.length - 1];
+  return {
+    items: page.map((item) => projectQuestion(item, fields)),
+    nextCursor:
+      hasMore && last
+        ? encodeQuestionCursor({ topic_id: topicId, question_number: last.question_number })
+        : null,
+  };
+}
+
+/**
+ * topic의 문제를 question_number 순으로 한 페이지만 조회
+ * topic 전체가 캐시되어 있으면 메모리에서, 아니면 Limit을 건 QueryCommand 한 번으로 응답한다.
+ * @param {string} tableName - DynamoDB 테이블 이름
+ * @param {string} topicId - 조회할 topic ID
+ * @param {Object} options
+ * @param {number} [options.limit=50] - 페이지 크기
+ * @param {string} [options.cursor] - 이전 페이지의 nextCursor
+ * @param {string} [options.from] - question_number 하한 (포함)
+ * @param {string} [options.to] - question_number 상한 (포함)
+ * @param {Array<string>} [options.fields] - 반환할 필드 (question_number는 항상 포함)
+ * @param {DynamoDBDocumentClient} [options.dynamoDBClient]
+ * @returns {Promise<{items: Array, nextCursor: string|null}>}
+ * @throws {Error} - 파라미터 오류("Invalid cursor", "Invalid fields") 또는 DynamoDB 쿼리 실패 시
+ */
+async function getQuestionsPage(tableName, topicId, options = {}) {
+  const { limit = 50, cursor, from, to, dynamoDBClient = null } = options;
+
+  if (!topicId || typeof topicId !== "string") {
+    throw new Error("topicId must be a non-empty string");
+  }
+  const fields = options.fields
+    ? [...new Set(["question_number", ...options.fields])]
+    : null;
+  if (fields && fields.some((field) => !QUESTION_FIELDS.includes(field))) {
+    throw new Error("Invalid fields");
+  }
+  const startKey = cursor ? decodeQuestionCursor(cursor, topicId) : undefined;
+
+  const cached = questionCache.peek(questionCacheKey(tableName, topicId));
+  if (cached) {
+    return sliceQuestionsPage(cached.items, topicId, { limit, startKey, from, to, fields });
+  }
+
+  let keyCondition = "topic_id = :tid";
+  const values = { ":tid": topicId };
+  if (from && to) {
+    keyCondition += " AND question_number BETWEEN :from AND :to";
+    values[":from"] = from;
+    values[":to"] = to;
+  } else if (from) {
+    keyCondition += " AND question_number >= :from";
+    values[":from"] = from;
+  } else if (to) {
+    keyCondition += " AND question_number <= :to";
+    values[":to"] = to;
+  }
+
+  const projection = {};
+  if (fields) {
+    projection.ProjectionExpression = fields.map((_, i) => `#f${i}`).join(", ");
+    projection.ExpressionAttributeNames = Object.fromEntries(
+      fields.map((field, i) => [`#f${i}`, field])
+    );
+  }
+
+  try {
+    const client = dynamoDBClient || getDynamoDBClient();
+    const response = await client.send(
+      new QueryCommand({
+        TableName: tableName,
+        KeyConditionExpression: keyCondition,
+        ExpressionAttributeValues: values,
+        ExclusiveStartKey: startKey,
+        Limit: limit,
+        ScanIndexForward: true,
+        ...projection,
+      })
+    );
+
+    return {
+      items: response.Items ?? [],
+      nextCursor: encodeQuestionCursor(response.LastEvaluatedKey),
+    };
+  } catch (error) {
+    logger.error(`Failed to query question page for ${topicId}: ${error.message}`);
+    throw new Error(`Failed to query questions: ${error.message}`);
+  }
+}
+
+/**
+ * 문제 캐시 무효화 (문제 데이터 변경 후 호출)
+ * @param {string} [topicId] - 무효화할 topic ID (생략 시 전체)
+ * @param {Object} options - { tableName }
+ * @returns {number} 제거된 항목 수
+ */
+function invalidateQuestionCache(topicId, options = {}) {
+  const { tableName = DYNAMODB_TABLE_NAME } = options;
+  const key = topicId ? questionCacheKey(tableName, topicId) : undefined;
+  const removed = questionCache.invalidate(key);
+  questionKeyIndex.invalidate(key);
+  logger.info(
+    `Invalidated question cache (${topicId || "all topics"}): ${removed} entries`
+  );
+  return removed;
+}
+
+/**
+ * 문제 캐시 통계 (hit/miss/coalesced/eviction 등, keyIndex는 무작위 추출용 키 인덱스)
+ * @returns {Object}
+ */
+function getQuestionCacheStats() {
+  return { ...questionCache.stats(), keyIndex: questionKeyIndex.stats() };
+}
+
+// 최신순 목록 GSI의 파티션 키 값 (모든 후기가 같은 값 → created_at 순으로 정렬된 하나의 목록)
+const REVIEW_FEED = "ALL";
+const REVIEW_CURSOR_KEYS = ["review_id", "review_feed", "created_at"];
+
+// GSI가 아직 없는 테이블(마이그레이션 전)에 대한 경고는 한 번만 남긴다
+let reviewIndexMissingLogged = false;
+
+// write-behind 모드(REVIEW_WRITE_BEHIND=true)에서 사용하는 기본 후기 테이블 버퍼 (지연 초기화)
+let reviewWriteBuffer = null;
+
+function getReviewWriteBuffer() {
+  if (REVIEW_WRITE_BEHIND !== "true") {
+    return null;
+  }
+  if (!reviewWriteBuffer) {
+    reviewWriteBuffer = new ReviewWriteBuffer({
+      tableName: DYNAMODB_REVIEWS_TABLE_NAME,
+      dynamoDBClient: getDynamoDBClient(),
+      flushIntervalMs: parseInt(REVIEW_WRITE_FLUSH_MS, 10),
+      maxPending: parseInt(REVIEW_WRITE_MAX_PENDING, 10),
+      logger,
+    });
+  }
+  return reviewWriteBuffer;
+}
+
+// 버퍼가 해당 테이블용일 때만 사용 (다른 테이블은 직접 기록)
+function writeBufferFor(tableName, writeBuffer) {
+  return writeBuffer && writeBuffer.tableName === tableName ? writeBuffer : null;
+}
+
+/**
+ * 이용 후기 저장 (목록 GSI용 review_feed 속성을 함께 기록)
+ * write-behind 버퍼가 있으면 버퍼에 넣고 바로 반환하며, 실제 기록은 BatchWriteItem으로 모아서 한다.
  * @param {Object} review - { review_id, user_id, content, created_at }
- * @param {Object} options - { tableName, dynamoDBClient }
+ * @param {Object} options - { tableName, dynamoDBClient, writeBuffer }
  * @returns {Promise<Object>}
  */
 async function putReview(review, options = {}) {
   const {
     tableName = DYNAMODB_REVIEWS_TABLE_NAME,
     dynamoDBClient = getDynamoDBClient(),
+    writeBuffer = getReviewWriteBuffer(),
   } = options;
 
   if (!review?.review_id || !review?.user_id || !review?.content || !review?.created_at) {
     throw new Error("review_id, user_id, content, created_at are required");
   }
 
+  const buffer = writeBufferFor(tableName, writeBuffer);
+  if (buffer) {
+    await buffer.add({ ...review, review_feed: REVIEW_FEED });
+    return review;
+  }
+
   await dynamoDBClient.send(
     new PutCommand({
       TableName: tableName,
-      Item: review,
+      Item: { ...review, review_feed: REVIEW_FEED },
     })
   );
   return review;
 }
 
+function encodeReviewCursor(key) {
+  return key ? Buffer.from(JSON.stringify(key)).toString("base64url") : null;
+}
+
+function decodeReviewCursor(cursor) {
+  let key;
+  try {
+    key = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+  } catch (error) {
+    throw new Error("Invalid cursor");
+  }
+  const valid =
+    key &&
+    Object.keys(key).length === REVIEW_CURSOR_KEYS.length &&
+    REVIEW_CURSOR_KEYS.every((name) => typeof key[name] === "string") &&
+    key.review_feed === REVIEW_FEED;
+  if (!valid) {
+    throw new Error("Invalid cursor");
+  }
+  return key;
+}
+
+function withoutFeed({ review_feed, ...review }) {
+  return review;
+}
+
+function isMissingIndexError(error) {
+  return error.name === "ValidationException" && /index/i.test(error.message);
+}
+
 /**
- * 이용 후기 목록 조회 (Scan 후 created_at 내림차순 정렬, limit)
- * @param {Object} options - { limit = 50, tableName, dynamoDBClient }
- * @returns {Promise<Array>}
+ * 아직 기록되지 않은 write-behind 항목 중 이 페이지 범위(created_at)에 속하는 것을 합친다.
+ * 범위: 이전 페이지 마지막 항목(cursor)보다 오래되고, 이 페이지 마지막 항목(nextKey)보다 최신
+ * 병합된 페이지는 limit보다 길어질 수 있다.
+ */
+function mergeUnflushedReviews(items, unflushed, startKey, nextKey) {
+  const seen = new Set(items.map((r) => r.review_id));
+  const extra = unflushed.filter(
+    (r) =>
+      !seen.has(r.review_id) &&
+      (!startKey || r.created_at < startKey.created_at) &&
+      (!nextKey || r.created_at >= nextKey.created_at)
+  );
+  if (extra.length === 0) {
+    return items;
+  }
+  return [...items, ...extra].sort((a, b) =>
+    b.created_at > a.created_at ? 1 : b.created_at < a.created_at ? -1 : 0
+  );
+}
+
+/**
+ * 이용 후기 목록 조회 (created_at GSI를 최신순으로 한 페이지만 Query)
+ * write-behind 버퍼에 남아 있는 새 후기도 해당 페이지에 포함한다.
+ * @param {Object} options - { limit = 50, cursor, tableName, indexName, dynamoDBClient, writeBuffer }
+ * @returns {Promise<{items: Array, nextCursor: string|null}>}
+ * @throws {Error} - 커서 형식 오류("Invalid cursor") 또는 DynamoDB 조회 실패 시
  */
 async function listReviews(options = {}) {
   const {
     limit = 50,
+    cursor,
     tableName = DYNAMODB_REVIEWS_TABLE_NAME,
+    indexName = DYNAMODB_REVIEWS_INDEX_NAME,
     dynamoDBClient = getDynamoDBClient(),
+    writeBuffer = getReviewWriteBuffer(),
   } = options;
 
+  const ExclusiveStartKey = cursor ? decodeReviewCursor(cursor) : undefined;
+  const buffer = writeBufferFor(tableName, writeBuffer);
+  const unflushed = buffer ? buffer.pendingItems() : [];
+
+  let response;
+  try {
+    response = await dynamoDBClient.send(
+      new QueryCommand({
+        TableName: tableName,
+        IndexName: indexName,
+        KeyConditionExpression: "review_feed = :feed",
+        ExpressionAttributeValues: { ":feed": REVIEW_FEED },
+        ScanIndexForward: false,
+        Limit: limit,
+        ExclusiveStartKey,
+      })
+    );
+  } catch (error) {
+    if (!isMissingIndexError(error)) {
+      throw error;
+    }
+    // fallback을 선택하는 이곳에서만 원인을 한 번 남긴다 (Scan 실패는 호출 측이 기록)
+    if (!reviewIndexMissingLogged) {
+      logger.error(
+        `Index ${indexName} not found on ${tableName} (${error.message}); falling back to Scan (run scripts/backfill_review_feed.py after adding the index)`
+      );
+      reviewIndexMissingLogged = true;
+    }
+    const scanned = await scanLatestReviews(limit, tableName, dynamoDBClient);
+    const items = mergeUnflushedReviews(scanned, unflushed.map(withoutFeed)).slice(0, limit);
+    return { items, nextCursor: null };
+  }
+
+  const items = mergeUnflushedReviews(
+    response.Items ?? [],
+    unflushed,
+    ExclusiveStartKey,
+    response.LastEvaluatedKey
+  );
+  return {
+    items: items.map(withoutFeed),
+    nextCursor: encodeReviewCursor(response.LastEvaluatedKey),
+  };
+}
+
+/**
+ * GSI가 없는 테이블용 이전 방식 (Scan 후 created_at 내림차순 정렬, limit)
+ */
+async function scanLatestReviews(limit, tableName, dynamoDBClient) {
   const allItems = [];
   let ExclusiveStartKey = undefined;
+  let pages = 0;
 
   do {
+    pages += 1;
     const response = await dynamoDBClient.send(
       new ScanCommand({
         TableName: tableName,
@@ -185,13 +1000,13 @@ async function listReviews(options = {}) {
     allItems.push(...(response.Items ?? []));
     ExclusiveStartKey = response.LastEvaluatedKey;
   } while (ExclusiveStartKey && allItems.length < limit * 2);
+  observePages("scanLatestReviews", pages);
 
-  const sorted = allItems
+  return allItems
     .filter((i) => i.created_at)
     .sort((a, b) => (b.created_at > a.created_at ? 1 : -1))
-    .slice(0, limit);
-
-  return sorted;
+    .slice(0, limit)
+    .map(withoutFeed);
 }
 
 /**
@@ -219,66 +1034,151 @@ async function getReview(reviewId, options = {}) {
   return Item ?? null;
 }
 
+// 방금 작성되어 아직 버퍼에 있는 후기는 조건부 쓰기 전에 먼저 기록한다
+async function flushBufferedReview(reviewId, tableName, writeBuffer) {
+  const buffer = writeBufferFor(tableName, writeBuffer);
+  if (buffer && buffer.has(reviewId)) {
+    await buffer.flush();
+  }
+}
+
+/**
+ * 소유자 조건(ConditionExpression) 실패를 404/403 의미의 에러로 변환
+ * ReturnValuesOnConditionCheckFailure=ALL_OLD로 받은 기존 항목 유무로 구분한다.
+ */
+function toOwnershipError(error) {
+  if (error.name !== "ConditionalCheckFailedException") {
+    return error;
+  }
+  return new Error(error.Item ? "Forbidden" : "Review not found");
+}
+
+function ownershipCondition(userId) {
+  return userId === undefined
+    ? { ConditionExpression: "attribute_exists(review_id)" }
+    : {
+        ConditionExpression: "attribute_exists(review_id) AND user_id = :user_id",
+        ExpressionAttributeValues: { ":user_id": userId },
+      };
+}
+
 /**
  * 이용 후기 수정 (content, updated_at만 변경)
+ * 존재/소유자 확인과 수정을 조건부 UpdateCommand 한 번으로 처리한다.
  * @param {string} reviewId
  * @param {string} content
- * @param {Object} options - { tableName, dynamoDBClient }
+ * @param {Object} options - { userId, tableName, dynamoDBClient } (userId가 없으면 소유자 확인 생략)
  * @returns {Promise<Object>} 수정된 후기
+ * @throws {Error} - "Review not found" 또는 "Forbidden"
  */
 async function updateReview(reviewId, content, options = {}) {
   const {
+    userId,
     tableName = DYNAMODB_REVIEWS_TABLE_NAME,
     dynamoDBClient = getDynamoDBClient(),
+    writeBuffer = getReviewWriteBuffer(),
   } = options;
 
-  const existing = await getReview(reviewId, { tableName, dynamoDBClient });
-  if (!existing) {
-    throw new Error("Review not found");
-  }
+  await flushBufferedReview(reviewId, tableName, writeBuffer);
 
-  const updated = {
-    ...existing,
-    content: content.trim(),
-    updated_at: new Date().toISOString(),
-  };
-  await dynamoDBClient.send(
-    new PutCommand({
-      TableName: tableName,
-      Item: updated,
-    })
-  );
-  return updated;
+  const condition = ownershipCondition(userId);
+  try {
+    const { Attributes } = await dynamoDBClient.send(
+      new UpdateCommand({
+        TableName: tableName,
+        Key: { review_id: reviewId },
+        UpdateExpression: "SET content = :content, updated_at = :updated_at",
+        ConditionExpression: condition.ConditionExpression,
+        ExpressionAttributeValues: {
+          ...condition.ExpressionAttributeValues,
+          ":content": content.trim(),
+          ":updated_at": new Date().toISOString(),
+        },
+        ReturnValues: "ALL_NEW",
+        ReturnValuesOnConditionCheckFailure: "ALL_OLD",
+      })
+    );
+    return withoutFeed(Attributes);
+  } catch (error) {
+    throw toOwnershipError(error);
+  }
 }
 
 /**
- * 이용 후기 삭제
+ * 이용 후기 삭제 (존재/소유자 확인과 삭제를 조건부 DeleteCommand 한 번으로 처리)
  * @param {string} reviewId
- * @param {Object} options - { tableName, dynamoDBClient }
+ * @param {Object} options - { userId, tableName, dynamoDBClient } (userId가 없으면 소유자 확인 생략)
+ * @throws {Error} - "Review not found" 또는 "Forbidden"
  */
 async function deleteReview(reviewId, options = {}) {
   const {
+    userId,
     tableName = DYNAMODB_REVIEWS_TABLE_NAME,
     dynamoDBClient = getDynamoDBClient(),
+    writeBuffer = getReviewWriteBuffer(),
   } = options;
 
-  await dynamoDBClient.send(
-    new DeleteCommand({
-      TableName: tableName,
-      Key: { review_id: reviewId },
-    })
-  );
+  await flushBufferedReview(reviewId, tableName, writeBuffer);
+
+  try {
+    await dynamoDBClient.send(
+      new DeleteCommand({
+        TableName: tableName,
+        Key: { review_id: reviewId },
+        ...ownershipCondition(userId),
+        ReturnValuesOnConditionCheckFailure: "ALL_OLD",
+      })
+    );
+  } catch (error) {
+    throw toOwnershipError(error);
+  }
+}
+
+/**
+ * write-behind 버퍼의 남은 후기를 모두 기록 (서버 종료 시 호출, 버퍼가 없으면 즉시 반환)
+ * @returns {Promise<void>}
+ */
+async function drainReviewWrites() {
+  if (reviewWriteBuffer) {
+    await reviewWriteBuffer.drain();
+  }
+}
+
+/**
+ * write-behind 버퍼 통계 (대기 건수, flush 지연 등). 비활성화 시 { enabled: false }
+ * @returns {Object}
+ */
+function getReviewWriteStats() {
+  const buffer = getReviewWriteBuffer();
+  return buffer ? { enabled: true, ...buffer.stats() } : { enabled: false };
 }
 
 module.exports = {
   getQuestionsByTopic,
   createDynamoDBClient,
   getDynamoDBClient,
+  warmDynamoDBClient,
+  getDynamoDBPoolStats,
   logger,
+  setLogger,
   getAllQuestionsByTopic,
+  streamQuestionsByTopic,
+  getCachedQuestionsByTopic,
+  getQuestionPayloadByTopic,
+  preloadQuestionTopics,
+  getQuestionsPage,
+  streamQuestionPayloadsByTopics,
+  batchGetQuestions,
+  sampleQuestionsByTopic,
+  QUESTION_FIELDS,
+  invalidateQuestionCache,
+  getQuestionCacheStats,
   putReview,
   listReviews,
+  REVIEW_FEED,
   getReview,
   updateReview,
   deleteReview,
+  drainReviewWrites,
+  getReviewWriteStats,
 };
@@ -0,0 +1,132 @@
+/**
+ * 버퍼링 비동기 로그 출력 스트림 (pino/Fastify logger의 stream으로 사용)
+ * 로그 한 줄마다 stdout에 동기 write(syscall)하는 대신 메모리에 모았다가 minLength가 차거나
+ * flushMs가 지나면 fs.write(libuv 스레드 풀)로 한 번에 내보낸다.
+ * 쓰기가 밀려 maxLength를 넘으면 이벤트 루프를 막지 않도록 새 로그를 버리고 dropped로 집계한다.
+ * 프로세스 종료 시에는 flush()를 기다리고, 예기치 않은 exit에서는 남은 버퍼를 동기로 쓴다.
+ */
+
+const fs = require("fs");
+
+class BufferedLogStream {
+  /**
+   * @param {Object} options
+   * @param {number} [options.fd=1] - 출력 파일 디스크립터 (기본 stdout)
+   * @param {number} [options.minLength=4096] - 이 바이트 수가 모이면 즉시 flush
+   * @param {number} [options.flushMs=1000] - 덜 찼어도 이 시간이 지나면 flush
+   * @param {number} [options.maxLength=1048576] - 버퍼 상한 (초과한 로그는 버림)
+   */
+  constructor({ fd = 1, minLength = 4096, flushMs = 1000, maxLength = 1024 * 1024 } = {}) {
+    this.fd = fd;
+    this.minLength = minLength;
+    this.flushMs = flushMs;
+    this.maxLength = maxLength;
+    this.chunks = [];
+    this.length = 0;
+    this.writing = false;
+    this.timer = null;
+    this.waiters = [];
+    this.counters = { written: 0, flushes: 0, dropped: 0, errors: 0 };
+    this.onExit = () => this.flushSync();
+    process.on("exit", this.onExit);
+  }
+
+  write(chunk) {
+    if (this.length + chunk.length > this.maxLength) {
+      this.counters.dropped += 1;
+      return true;
+    }
+    this.chunks.push(chunk);
+    this.length += chunk.length;
+    if (this.length >= this.minLength) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.flushMs);
+      this.timer.unref();
+    }
+    return true;
+  }
+
+  /**
+   * 모인 로그를 비동기로 쓴다. 쓰기가 끝나 버퍼가 빌 때 resolve (실패해도 reject하지 않음)
+   * @returns {Promise<void>}
+   */
+  flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    const done = new Promise((resolve) => this.waiters.push(resolve));
+    if (!this.writing) this.writeNext();
+    return done;
+  }
+
+  writeNext() {
+    if (!this.length) {
+      this.writing = false;
+      for (const resolve of this.waiters.splice(0)) resolve();
+      return;
+    }
+    this.writing = true;
+    const buffer = Buffer.from(this.chunks.join(""));
+    this.chunks = [];
+    this.length = 0;
+    this.counters.flushes += 1;
+    this.writeBuffer(buffer);
+  }
+
+  writeBuffer(buffer) {
+    fs.write(this.fd, buffer, 0, buffer.length, null, (error, written) => {
+      if (error?.code === "EAGAIN") {
+        // non-blocking 파이프가 가득 찬 경우: 잠시 후 같은 내용을 다시 쓴다
+        setTimeout(() => this.writeBuffer(buffer), 10);
+        return;
+      }
+      if (error) {
+        this.counters.errors += 1;
+      } else {
+        this.counters.written += written;
+        if (written < buffer.length) {
+          this.writeBuffer(buffer.subarray(written));
+          return;
+        }
+      }
+      this.writeNext();
+    });
+  }
+
+  /**
+   * 아직 쓰기 시작하지 않은 버퍼를 동기로 쓴다 (exit 핸들러용, 진행 중인 비동기 쓰기는 기다리지 않음)
+   */
+  flushSync() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (!this.length) return;
+    let buffer = Buffer.from(this.chunks.join(""));
+    this.chunks = [];
+    this.length = 0;
+    while (buffer.length) {
+      try {
+        const written = fs.writeSync(this.fd, buffer);
+        this.counters.written += written;
+        buffer = buffer.subarray(written);
+      } catch (error) {
+        if (error.code === "EAGAIN") continue;
+        this.counters.errors += 1;
+        return;
+      }
+    }
+  }
+
+  /**
+   * @returns {{buffered: number, written: number, flushes: number, dropped: number, errors: number}}
+   */
+  stats() {
+    return { buffered: this.length, ...this.counters };
+  }
+
+  async close() {
+    await this.flush();
+    process.removeListener("exit", this.onExit);
+  }
+}
+
+module.exports = { BufferedLogStream };
@@ -0,0 +1,217 @@
+/**
+ * Prometheus 텍스트 형식(0.0.4) 메트릭 레지스트리
+ * prom-client 없이 이 서비스에 필요한 최소 기능만 구현한다.
+ * - Counter / Gauge / Histogram, 라벨 지원
+ * - Gauge는 collect 함수로 스크레이프 시점에 값을 채울 수 있다
+ */
+
+// 초 단위 지연 히스토그램 기본 경계 (1ms ~ 10s)
+const DEFAULT_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+function escapeLabelValue(value) {
+  return String(value).replace(/\\/g, "\\\\").replace(/\n/g, "\\n").replace(/"/g, '\\"');
+}
+
+function formatLabels(labelNames, labelValues, extra = "") {
+  const parts = labelNames.map((name, i) => `${name}="${escapeLabelValue(labelValues[i])}"`);
+  if (extra) parts.push(extra);
+  return parts.length ? `{${parts.join(",")}}` : "";
+}
+
+function formatValue(value) {
+  if (value === Infinity) return "+Inf";
+  if (value === -Infinity) return "-Inf";
+  return String(value);
+}
+
+class Metric {
+  constructor(type, name, help, labelNames = []) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    // 라벨 값 조합(\u0001로 연결) → 시계열
+    this.series = new Map();
+  }
+
+  seriesFor(labels, create) {
+    const values = this.labelNames.map((name) => (labels[name] === undefined ? "" : labels[name]));
+    const key = values.join("\u0001");
+    let series = this.series.get(key);
+    if (!series) {
+      series = create(values);
+      this.series.set(key, series);
+    }
+    return series;
+  }
+
+  header() {
+    return `# HELP ${this.name} ${this.help}\n# TYPE ${this.name} ${this.type}\n`;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+}
+
+class Counter extends Metric {
+  constructor(name, help, labelNames) {
+    super("counter", name, help, labelNames);
+  }
+
+  inc(labels = {}, amount = 1) {
+    this.seriesFor(labels, (values) => ({ values, value: 0 })).value += amount;
+  }
+
+  render() {
+    let out = this.header();
+    for (const { values, value } of this.series.values()) {
+      out += `${this.name}${formatLabels(this.labelNames, values)} ${formatValue(value)}\n`;
+    }
+    return out;
+  }
+}
+
+class Gauge extends Metric {
+  /**
+   * @param {Function} [collect] - 스크레이프 직전에 호출 (gauge.set으로 값 갱신)
+   */
+  constructor(name, help, labelNames, collect) {
+    super("gauge", name, help, labelNames);
+    this.collect = collect;
+  }
+
+  set(labels, value) {
+    this.seriesFor(labels, (values) => ({ values, value: 0 })).value = value;
+  }
+
+  inc(labels = {}, amount = 1) {
+    this.seriesFor(labels, (values) => ({ values, value: 0 })).value += amount;
+  }
+
+  dec(labels = {}, amount = 1) {
+    this.inc(labels, -amount);
+  }
+
+  render() {
+    if (this.collect) this.collect(this);
+    let out = this.header();
+    for (const { values, value } of this.series.values()) {
+      out += `${this.name}${formatLabels(this.labelNames, values)} ${formatValue(value)}\n`;
+    }
+    return out;
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, labelNames, buckets = DEFAULT_BUCKETS) {
+    super("histogram", name, help, labelNames);
+    this.buckets = [...buckets].sort((a, b) => a - b);
+  }
+
+  observe(labels, value) {
+    const series = this.seriesFor(labels, (values) => ({
+      values,
+      counts: new Array(this.buckets.length).fill(0),
+      sum: 0,
+      count: 0,
+    }));
+    // 누적 카운트는 render에서 계산하고, 여기서는 해당 구간 하나만 증가
+    const index = this.buckets.findIndex((bound) => value <= bound);
+    if (index >= 0) series.counts[index] += 1;
+    series.sum += value;
+    series.count += 1;
+  }
+
+  /**
+   * 경과 시간을 초 단위로 기록하는 함수를 반환
+   * @param {Object} labels
+   * @returns {Function} end(extraLabels)
+   */
+  startTimer(labels = {}) {
+    const start = process.hrtime.bigint();
+    return (extraLabels = {}) => {
+      const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+      this.observe({ ...labels, ...extraLabels }, seconds);
+      return seconds;
+    };
+  }
+
+  render() {
+    let out = this.header();
+    for (const { values, counts, sum, count } of this.series.values()) {
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += counts[i];
+        out += `${this.name}_bucket${formatLabels(this.labelNames, values, `le="${bound}"`)} ${cumulative}\n`;
+      });
+      out += `${this.name}_bucket${formatLabels(this.labelNames, values, 'le="+Inf"')} ${count}\n`;
+      out += `${this.name}_sum${formatLabels(this.labelNames, values)} ${sum}\n`;
+      out += `${this.name}_count${formatLabels(this.labelNames, values)} ${count}\n`;
+    }
+    return out;
+  }
+}
+
+class Registry {
+  constructor() {
+    this.metrics = new Map();
+  }
+
+  register(metric) {
+    // 같은 이름은 한 번만 등록 (모듈이 여러 번 로드되거나 플러그인이 다시 등록되는 경우)
+    const existing = this.metrics.get(metric.name);
+    if (existing) return existing;
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+
+  counter(name, help, labelNames = []) {
+    return this.register(new Counter(name, help, labelNames));
+  }
+
+  gauge(name, help, labelNames = [], collect) {
+    const gauge = this.register(new Gauge(name, help, labelNames, collect));
+    // 다시 등록하는 경우(앱 재생성 등) 최신 collect 함수를 사용
+    if (collect) gauge.collect = collect;
+    return gauge;
+  }
+
+  histogram(name, help, labelNames = [], buckets) {
+    return this.register(new Histogram(name, help, labelNames, buckets));
+  }
+
+  get(name) {
+    return this.metrics.get(name);
+  }
+
+  /**
+   * @returns {string} Prometheus 텍스트 형식
+   */
+  render() {
+    let out = "";
+    for (const metric of this.metrics.values()) {
+      out += metric.render();
+    }
+    return out;
+  }
+
+  resetAll() {
+    for (const metric of this.metrics.values()) {
+      metric.reset();
+    }
+  }
+}
+
+// 프로세스 전역 레지스트리
+const registry = new Registry();
+
+module.exports = {
+  Registry,
+  Counter,
+  Gauge,
+  Histogram,
+  registry,
+  DEFAULT_BUCKETS,
+  CONTENT_TYPE: "text/plain; version=0.0.4; charset=utf-8",
+};
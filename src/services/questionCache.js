@@ -0,0 +1,139 @@
+/**
+ * topic별 문제 목록 인메모리 캐시
+ * - Map의 삽입 순서를 이용한 LRU (최대 항목 수 초과 시 가장 오래 쓰이지 않은 항목 제거)
+ * - 항목별 TTL
+ * - 같은 키에 대한 동시 miss는 하나의 조회로 합친다 (single-flight)
+ * 캐시된 배열은 요청 간에 공유되므로 호출 측에서 변경하지 않아야 한다.
+ */
+class QuestionCache {
+  /**
+   * @param {Object} options
+   * @param {number} [options.maxEntries=50] - 최대 캐시 항목 수
+   * @param {number} [options.ttlMs=300000] - 항목 유효 시간 (0이면 캐시 비활성화)
+   * @param {Function} [options.now=Date.now] - 현재 시각 함수 (테스트용)
+   */
+  constructor({ maxEntries = 50, ttlMs = 300000, now = Date.now } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.now = now;
+    this.entries = new Map();
+    // 진행 중인 조회. 무효화 시 해당 키의 항목을 지워, 무효화 이전에 시작된 조회에
+    // 새 호출이 합류하거나 그 결과가 캐시에 들어가지 않게 한다
+    this.inflight = new Map();
+    this.counters = {
+      hits: 0,
+      misses: 0,
+      coalesced: 0,
+      evictions: 0,
+      expirations: 0,
+      invalidations: 0,
+    };
+  }
+
+  get enabled() {
+    return this.ttlMs > 0 && this.maxEntries > 0;
+  }
+
+  /**
+   * 캐시된 값을 반환하고, 없으면 loader를 한 번만 호출해 채운다
+   * @param {string} key
+   * @param {Function} loader - 값을 조회하는 async 함수
+   * @param {Object} [options]
+   * @param {Function} [options.shouldCache] - false를 반환하면 결과를 캐시하지 않음
+   * @returns {Promise<*>}
+   */
+  async get(key, loader, { shouldCache = () => true } = {}) {
+    if (!this.enabled) {
+      return loader();
+    }
+
+    const entry = this.entries.get(key);
+    if (entry) {
+      if (entry.expiresAt > this.now()) {
+        // 최근 사용 항목을 Map의 끝으로 이동
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        this.counters.hits += 1;
+        return entry.value;
+      }
+      this.entries.delete(key);
+      this.counters.expirations += 1;
+    }
+
+    const pending = this.inflight.get(key);
+    if (pending) {
+      this.counters.coalesced += 1;
+      return pending;
+    }
+
+    this.counters.misses += 1;
+    const isCurrent = () => this.inflight.get(key) === promise;
+    const promise = (async () => {
+      const value = await loader();
+      if (isCurrent() && shouldCache(value)) {
+        this.set(key, value);
+      }
+      return value;
+    })();
+    this.inflight.set(key, promise);
+    // 무효화 후 같은 키로 시작된 새 조회의 항목은 지우지 않는다
+    const settle = () => {
+      if (isCurrent()) {
+        this.inflight.delete(key);
+      }
+    };
+    promise.then(settle, settle);
+    return promise;
+  }
+
+  /**
+   * 유효한 캐시 값이 있으면 반환 (조회를 일으키지 않으며 통계/LRU 순서에 영향 없음)
+   * @param {string} key
+   * @returns {*|undefined}
+   */
+  peek(key) {
+    const entry = this.entries.get(key);
+    return entry && entry.expiresAt > this.now() ? entry.value : undefined;
+  }
+
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      this.entries.delete(oldestKey);
+      this.counters.evictions += 1;
+    }
+  }
+
+  /**
+   * 항목 무효화 (key가 없으면 전체). 진행 중인 조회는 그 키만 끊으며 다른 키의 조회에는 영향이 없다
+   * @param {string} [key]
+   * @returns {number} 제거된 항목 수
+   */
+  invalidate(key) {
+    this.counters.invalidations += 1;
+    if (key === undefined) {
+      const removed = this.entries.size;
+      this.entries.clear();
+      this.inflight.clear();
+      return removed;
+    }
+    this.inflight.delete(key);
+    return this.entries.delete(key) ? 1 : 0;
+  }
+
+  stats() {
+    const lookups = this.counters.hits + this.counters.misses + this.counters.coalesced;
+    return {
+      ...this.counters,
+      size: this.entries.size,
+      inflight: this.inflight.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttlMs,
+      hitRatio: lookups ? (this.counters.hits + this.counters.coalesced) / lookups : 0,
+    };
+  }
+}
+
+module.exports = { QuestionCache };
@@ -0,0 +1,136 @@
+/**
+ * topic 문제 목록의 직렬화/압축 결과를 topic 버전(캐시 항목)마다 한 번만 만든다.
+ * - JSON 본문과 strong ETag(본문 해시)는 생성 시점에 계산
+ * - gzip/brotli 변형은 처음 요청될 때 한 번 압축한 뒤 재사용
+ * 같은 내용의 인코딩별 표현은 서로 다른 ETag(접미사)를 갖는다.
+ */
+
+const { createHash } = require("crypto");
+const zlib = require("zlib");
+const { promisify } = require("util");
+
+const gzip = promisify(zlib.gzip);
+const brotliCompress = promisify(zlib.brotliCompress);
+
+// 이보다 작은 본문은 압축 이득보다 비용이 커서 그대로 보낸다
+const MIN_COMPRESS_BYTES = 1024;
+
+// 선호 순서 (q 값이 같으면 앞쪽 우선)
+const SUPPORTED_ENCODINGS = ["br", "gzip"];
+
+const ETAG_SUFFIX = {
+  identity: "",
+  gzip: "-gzip",
+  br: "-br",
+};
+
+const ENCODERS = {
+  br: (body) =>
+    brotliCompress(body, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 9,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length,
+      },
+    }),
+  gzip: (body) => gzip(body, { level: 9 }),
+};
+
+/**
+ * Accept-Encoding 헤더에서 사용할 인코딩 선택 (q 값 반영, 없으면 identity)
+ * @param {string} [acceptEncoding]
+ * @returns {string} "br" | "gzip" | "identity"
+ */
+function negotiateEncoding(acceptEncoding) {
+  if (!acceptEncoding) return "identity";
+
+  const weights = new Map();
+  for (const part of acceptEncoding.split(",")) {
+    const [name, ...params] = part.trim().toLowerCase().split(";");
+    if (!name) continue;
+    const qParam = params.map((p) => p.trim()).find((p) => p.startsWith("q="));
+    const q = qParam ? parseFloat(qParam.slice(2)) : 1;
+    weights.set(name, Number.isNaN(q) ? 0 : q);
+  }
+
+  let selected = "identity";
+  let best = 0;
+  for (const encoding of SUPPORTED_ENCODINGS) {
+    const q = weights.has(encoding) ? weights.get(encoding) : weights.get("*") ?? 0;
+    if (q > best) {
+      selected = encoding;
+      best = q;
+    }
+  }
+  return selected;
+}
+
+class QuestionPayload {
+  /**
+   * @param {Array} items - topic의 문제 목록
+   */
+  constructor(items) {
+    this.items = items;
+    this.body = Buffer.from(JSON.stringify(items));
+    this.hash = createHash("sha256")
+      .update(this.body)
+      .digest("base64url")
+      .slice(0, 32);
+    this.variants = new Map();
+  }
+
+  /**
+   * 요청의 Accept-Encoding에 맞는 인코딩 (작은 본문은 항상 identity)
+   * @param {string} [acceptEncoding]
+   * @returns {string}
+   */
+  selectEncoding(acceptEncoding) {
+    if (this.body.length < MIN_COMPRESS_BYTES) return "identity";
+    return negotiateEncoding(acceptEncoding);
+  }
+
+  /**
+   * @param {string} [encoding="identity"]
+   * @returns {string} strong ETag
+   */
+  etag(encoding = "identity") {
+    return `"${this.hash}${ETAG_SUFFIX[encoding]}"`;
+  }
+
+  /**
+   * If-None-Match가 이 버전의 어느 표현과든 일치하는지 (weak 비교)
+   * @param {string} [ifNoneMatch]
+   * @returns {boolean}
+   */
+  matches(ifNoneMatch) {
+    if (!ifNoneMatch) return false;
+    if (ifNoneMatch.trim() === "*") return true;
+    const current = Object.keys(ETAG_SUFFIX).map((encoding) => this.etag(encoding));
+    return ifNoneMatch
+      .split(",")
+      .map((tag) => tag.trim().replace(/^W\//, ""))
+      .some((tag) => current.includes(tag));
+  }
+
+  /**
+   * 인코딩된 본문 (압축 결과는 메모이즈하여 재사용)
+   * @param {string} encoding
+   * @returns {Promise<Buffer>}
+   */
+  async encode(encoding) {
+    if (encoding === "identity") return this.body;
+    if (!this.variants.has(encoding)) {
+      const pending = ENCODERS[encoding](this.body);
+      // 실패한 압축은 다음 요청에서 다시 시도
+      pending.catch(() => this.variants.delete(encoding));
+      this.variants.set(encoding, pending);
+    }
+    return this.variants.get(encoding);
+  }
+}
+
+module.exports = {
+  QuestionPayload,
+  negotiateEncoding,
+  MIN_COMPRESS_BYTES,
+};
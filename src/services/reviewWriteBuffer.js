@@ -0,0 +1,224 @@
+/**
+ * 이용 후기 write-behind 버퍼
+ * - add()로 받은 항목을 메모리에 모았다가 BatchWriteItem(최대 25건)으로 기록
+ * - 25건이 모이거나 flushIntervalMs가 지나면 flush
+ * - UnprocessedItems/일시적 오류는 지수 백오프(full jitter)로 재시도
+ * - 아직 기록되지 않은 항목은 pendingItems()로 조회할 수 있다 (목록 조회 병합용)
+ * 프로세스가 비정상 종료되면 버퍼의 항목은 유실되므로, 종료 시 drain()을 호출해야 한다.
+ */
+
+const { BatchWriteCommand } = require("@aws-sdk/lib-dynamodb");
+
+// BatchWriteItem 한 번에 보낼 수 있는 최대 항목 수
+const BATCH_WRITE_LIMIT = 25;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+class ReviewWriteBuffer {
+  /**
+   * @param {Object} options
+   * @param {string} options.tableName
+   * @param {Object} options.dynamoDBClient
+   * @param {string} [options.keyName="review_id"] - 항목 식별(중복 제거)에 쓸 키 속성
+   * @param {number} [options.flushIntervalMs=100] - 첫 항목이 들어온 뒤 flush까지 최대 대기 시간
+   * @param {number} [options.maxPending=1000] - 초과 시 add()가 flush를 기다린다 (backpressure)
+   * @param {number} [options.maxAttempts=8] - 배치당 최대 시도 횟수
+   * @param {number} [options.baseDelayMs=25] - 재시도 백오프 기본 지연
+   * @param {number} [options.maxDelayMs=1000] - 재시도 백오프 최대 지연
+   * @param {Object} [options.logger=console]
+   */
+  constructor({
+    tableName,
+    dynamoDBClient,
+    keyName = "review_id",
+    flushIntervalMs = 100,
+    maxPending = 1000,
+    maxAttempts = 8,
+    baseDelayMs = 25,
+    maxDelayMs = 1000,
+    logger = console,
+  }) {
+    this.tableName = tableName;
+    this.dynamoDBClient = dynamoDBClient;
+    this.keyName = keyName;
+    this.flushIntervalMs = flushIntervalMs;
+    this.maxPending = maxPending;
+    this.maxAttempts = maxAttempts;
+    this.baseDelayMs = baseDelayMs;
+    this.maxDelayMs = maxDelayMs;
+    this.logger = logger;
+
+    // 아직 전송하지 않은 항목 / 전송 중인 항목 (키 → 항목)
+    this.pending = new Map();
+    this.writing = new Map();
+    this.flushes = new Set();
+    this.timer = null;
+    this.counters = {
+      queued: 0,
+      written: 0,
+      failed: 0,
+      batches: 0,
+      retries: 0,
+      flushes: 0,
+    };
+    this.flushLatency = { lastMs: 0, maxMs: 0, totalMs: 0 };
+  }
+
+  get depth() {
+    return this.pending.size + this.writing.size;
+  }
+
+  /**
+   * 항목을 버퍼에 추가 (버퍼가 가득 차 있으면 flush가 끝날 때까지 대기)
+   * @param {Object} item
+   * @returns {Promise<void>}
+   */
+  async add(item) {
+    if (this.depth >= this.maxPending) {
+      await this.flush();
+    }
+    this.pending.set(item[this.keyName], item);
+    this.counters.queued += 1;
+
+    if (this.pending.size >= BATCH_WRITE_LIMIT) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.flushIntervalMs);
+      this.timer.unref?.();
+    }
+  }
+
+  /**
+   * 아직 테이블에 기록되지 않은(대기/전송 중) 항목
+   * @returns {Array<Object>}
+   */
+  pendingItems() {
+    return [...this.writing.values(), ...this.pending.values()];
+  }
+
+  has(key) {
+    return this.pending.has(key) || this.writing.has(key);
+  }
+
+  /**
+   * 대기 중인 항목을 25건 단위 배치로 기록. 반환된 Promise는 실패하지 않는다
+   * (최대 재시도 후에도 남은 항목은 failed로 집계하고 로그를 남긴다).
+   * @returns {Promise<void>}
+   */
+  flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.pending.size === 0) {
+      return Promise.all(this.flushes).then(() => undefined);
+    }
+
+    const items = [...this.pending.values()];
+    this.pending.clear();
+    for (const item of items) {
+      this.writing.set(item[this.keyName], item);
+    }
+
+    const started = Date.now();
+    const batches = [];
+    for (let i = 0; i < items.length; i += BATCH_WRITE_LIMIT) {
+      batches.push(this.writeBatch(items.slice(i, i + BATCH_WRITE_LIMIT)));
+    }
+    const flush = Promise.all(batches).then(() => {
+      const elapsed = Date.now() - started;
+      this.counters.flushes += 1;
+      this.flushLatency.lastMs = elapsed;
+      this.flushLatency.maxMs = Math.max(this.flushLatency.maxMs, elapsed);
+      this.flushLatency.totalMs += elapsed;
+      this.flushes.delete(flush);
+    });
+    this.flushes.add(flush);
+    return flush;
+  }
+
+  async writeBatch(items) {
+    let requests = items.map((item) => ({ PutRequest: { Item: item } }));
+
+    for (let attempt = 1; ; attempt += 1) {
+      try {
+        const response = await this.dynamoDBClient.send(
+          new BatchWriteCommand({ RequestItems: { [this.tableName]: requests } })
+        );
+        this.counters.batches += 1;
+        const unprocessed = response.UnprocessedItems?.[this.tableName] ?? [];
+        this.markWritten(this.difference(requests, unprocessed));
+        requests = unprocessed;
+      } catch (error) {
+        // 요청 자체가 잘못된 경우는 재시도해도 성공할 수 없다
+        if (error.name === "ValidationException" || attempt >= this.maxAttempts) {
+          this.logger.error(`Review batch write failed: ${error.message}`);
+          this.markFailed(requests, attempt);
+          return;
+        }
+      }
+
+      if (requests.length === 0) return;
+      if (attempt >= this.maxAttempts) {
+        this.markFailed(requests, attempt);
+        return;
+      }
+      this.counters.retries += 1;
+      const ceiling = Math.min(this.maxDelayMs, this.baseDelayMs * 2 ** (attempt - 1));
+      await sleep(Math.random() * ceiling);
+    }
+  }
+
+  difference(requests, unprocessed) {
+    if (unprocessed.length === 0) return requests;
+    const remaining = new Set(unprocessed.map((r) => r.PutRequest.Item[this.keyName]));
+    return requests.filter((r) => !remaining.has(r.PutRequest.Item[this.keyName]));
+  }
+
+  markWritten(requests) {
+    for (const { PutRequest } of requests) {
+      this.writing.delete(PutRequest.Item[this.keyName]);
+    }
+    this.counters.written += requests.length;
+  }
+
+  markFailed(requests, attempts) {
+    const keys = requests.map(({ PutRequest }) => PutRequest.Item[this.keyName]);
+    for (const key of keys) {
+      this.writing.delete(key);
+    }
+    this.counters.failed += keys.length;
+    this.logger.error(
+      `Dropped ${keys.length} reviews after ${attempts} attempts: ${keys.join(", ")}`
+    );
+  }
+
+  /**
+   * 남은 항목을 모두 기록할 때까지 대기 (종료 시 호출)
+   * @returns {Promise<void>}
+   */
+  async drain() {
+    while (this.depth > 0) {
+      await this.flush();
+    }
+  }
+
+  stats() {
+    return {
+      ...this.counters,
+      depth: this.depth,
+      pending: this.pending.size,
+      writing: this.writing.size,
+      inflightFlushes: this.flushes.size,
+      flushLatencyMs: {
+        last: this.flushLatency.lastMs,
+        max: this.flushLatency.maxMs,
+        avg: this.counters.flushes
+          ? Math.round(this.flushLatency.totalMs / this.counters.flushes)
+          : 0,
+      },
+      flushIntervalMs: this.flushIntervalMs,
+      maxPending: this.maxPending,
+    };
+  }
+}
+
+module.exports = { ReviewWriteBuffer, BATCH_WRITE_LIMIT };
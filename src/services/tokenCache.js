@@ -0,0 +1,96 @@
+/**
+ * 검증이 끝난 JWT의 인메모리 캐시
+ * - 토큰 원문 대신 SHA-256 해시를 키로 사용 (메모리에 토큰을 남기지 않음)
+ * - 항목은 토큰의 exp와 ttlMs 중 빠른 시각에 만료
+ * - Map의 삽입 순서를 이용한 LRU (최대 항목 수 초과 시 가장 오래 쓰이지 않은 항목 제거)
+ * 같은 토큰으로 반복되는 요청에서 HMAC 검증/페이로드 디코딩을 생략하기 위한 것이다.
+ */
+
+const { createHash } = require("crypto");
+
+class VerifiedTokenCache {
+  /**
+   * @param {Object} options
+   * @param {number} [options.maxEntries=1000] - 최대 캐시 항목 수 (0이면 캐시 비활성화)
+   * @param {number} [options.ttlMs=300000] - 항목 최대 유효 시간 (exp가 없거나 더 먼 토큰에도 적용)
+   * @param {Function} [options.now=Date.now] - 현재 시각 함수 (테스트용)
+   */
+  constructor({ maxEntries = 1000, ttlMs = 300000, now = Date.now } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.now = now;
+    this.entries = new Map();
+    this.counters = { hits: 0, misses: 0, evictions: 0, expirations: 0 };
+  }
+
+  get enabled() {
+    return this.ttlMs > 0 && this.maxEntries > 0;
+  }
+
+  static keyOf(token) {
+    return createHash("sha256").update(token).digest("base64url");
+  }
+
+  /**
+   * 캐시된 사용자 정보 (없거나 만료되었으면 undefined)
+   * @param {string} token
+   * @returns {Object|undefined}
+   */
+  get(token) {
+    if (!this.enabled) return undefined;
+
+    const key = VerifiedTokenCache.keyOf(token);
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.counters.misses += 1;
+      return undefined;
+    }
+    this.entries.delete(key);
+    if (entry.expiresAt <= this.now()) {
+      this.counters.expirations += 1;
+      this.counters.misses += 1;
+      return undefined;
+    }
+    // 최근 사용 항목을 Map의 끝으로 이동
+    this.entries.set(key, entry);
+    this.counters.hits += 1;
+    return entry.user;
+  }
+
+  /**
+   * @param {string} token
+   * @param {Object} user - 요청에 주입할 사용자 정보
+   * @param {number} [exp] - 토큰의 exp 클레임 (초)
+   */
+  set(token, user, exp) {
+    if (!this.enabled) return;
+
+    const now = this.now();
+    const expiresAt = Math.min(
+      now + this.ttlMs,
+      typeof exp === "number" ? exp * 1000 : Infinity
+    );
+    if (expiresAt <= now) return;
+
+    const key = VerifiedTokenCache.keyOf(token);
+    this.entries.delete(key);
+    this.entries.set(key, { user, expiresAt });
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.counters.evictions += 1;
+    }
+  }
+
+  stats() {
+    const lookups = this.counters.hits + this.counters.misses;
+    return {
+      ...this.counters,
+      size: this.entries.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttlMs,
+      hitRatio: lookups ? this.counters.hits / lookups : 0,
+    };
+  }
+}
+
+module.exports = { VerifiedTokenCache };
@@ -312,4 +312,23 @@ describe("QuizNox API Integration Tests", () => {
       expect([404, 500]).toContain(response.statusCode);
     });
   });
+
+  describe("/admin/cache/questions", () => {
+    it("should return 401 without auth", async () => {
+      const response = await app.inject({
+        method: "GET",
+        url: "/admin/cache/questions",
+      });
+      expect(response.statusCode).toBe(401);
+    });
+
+    it("should return 403 for non-admin users", async () => {
+      const response = await app.inject({
+        method: "DELETE",
+        url: "/admin/cache/questions?topicId=AWS_DVA",
+        headers: { authorization: authHeader },
+      });
+      expect(response.statusCode).toBe(403);
+    });
+  });
 });
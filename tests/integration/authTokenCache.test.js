@@ -0,0 +1,80 @@
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const authPlugin = require("../../src/plugins/auth");
+const { VerifiedTokenCache } = require("../../src/services/tokenCache");
+
+describe("VerifiedTokenCache", () => {
+  it("should expire entries at the token exp even when ttl is longer", () => {
+    let now = 1_000_000;
+    const cache = new VerifiedTokenCache({ ttlMs: 60000, now: () => now });
+
+    cache.set("token", { userId: "u1" }, now / 1000 + 10);
+    expect(cache.get("token")).toEqual({ userId: "u1" });
+
+    now += 10000;
+    expect(cache.get("token")).toBeUndefined();
+    expect(cache.stats()).toMatchObject({ hits: 1, misses: 1, expirations: 1, size: 0 });
+  });
+
+  it("should evict the least recently used token", () => {
+    const cache = new VerifiedTokenCache({ maxEntries: 2 });
+
+    cache.set("a", { userId: "a" });
+    cache.set("b", { userId: "b" });
+    cache.get("a");
+    cache.set("c", { userId: "c" });
+
+    expect(cache.get("b")).toBeUndefined();
+    expect(cache.get("a")).toEqual({ userId: "a" });
+    expect(cache.stats().evictions).toBe(1);
+  });
+});
+
+describe("auth plugin token cache", () => {
+  let app;
+
+  beforeEach(async () => {
+    app = fastify();
+    await app.register(authPlugin, { tokenCache: new VerifiedTokenCache() });
+    app.get("/me", async (request) => request.user);
+    await app.ready();
+  });
+
+  afterEach(async () => {
+    await app.close();
+  });
+
+  it("should verify a token once and reuse the result", async () => {
+    const token = jwt.sign({ user_id: "u1", username: "tester" }, process.env.JWT_SECRET, {
+      expiresIn: "1h",
+    });
+    const verify = jest.spyOn(jwt, "verify");
+
+    for (let i = 0; i < 3; i += 1) {
+      const response = await app.inject({
+        method: "GET",
+        url: "/me",
+        headers: { authorization: `Bearer ${token}` },
+      });
+      expect(response.statusCode).toBe(200);
+      expect(response.json()).toEqual({ userId: "u1", username: "tester" });
+    }
+
+    expect(verify).toHaveBeenCalledTimes(1);
+    expect(app.authTokenCache.stats()).toMatchObject({ hits: 2, size: 1 });
+  });
+
+  it("should not cache rejected tokens", async () => {
+    const token = jwt.sign({ user_id: "u1" }, "wrong-secret");
+
+    for (let i = 0; i < 2; i += 1) {
+      const response = await app.inject({
+        method: "GET",
+        url: "/me",
+        headers: { authorization: `Bearer ${token}` },
+      });
+      expect(response.statusCode).toBe(401);
+    }
+    expect(app.authTokenCache.stats().size).toBe(0);
+  });
+});
@@ -0,0 +1,44 @@
+const { readCpuQuota, resolveWorkerCount } = require("../../src/cluster");
+
+// 경로 → 파일 내용 (없는 경로는 ENOENT처럼 throw)
+function fakeCgroup(files) {
+  return (path) => {
+    if (!(path in files)) throw new Error(`ENOENT: ${path}`);
+    return files[path];
+  };
+}
+
+describe("readCpuQuota", () => {
+  it("should read the cgroup v2 cpu.max quota", () => {
+    expect(readCpuQuota(fakeCgroup({ "/sys/fs/cgroup/cpu.max": "200000 100000" }))).toBe(2);
+    expect(readCpuQuota(fakeCgroup({ "/sys/fs/cgroup/cpu.max": "20000 100000" }))).toBe(0.2);
+    expect(readCpuQuota(fakeCgroup({ "/sys/fs/cgroup/cpu.max": "max 100000" }))).toBeNull();
+  });
+
+  it("should fall back to cgroup v1 cfs quota and period", () => {
+    const read = fakeCgroup({
+      "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "150000",
+      "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000",
+    });
+    expect(readCpuQuota(read)).toBe(1.5);
+    expect(readCpuQuota(fakeCgroup({ "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1" }))).toBeNull();
+    expect(readCpuQuota(fakeCgroup({}))).toBeNull();
+  });
+});
+
+describe("resolveWorkerCount", () => {
+  it("should size auto mode to the CPU quota, capped by available CPUs", () => {
+    expect(resolveWorkerCount("auto", { cpuQuota: 2.5, availableCpus: 8 })).toBe(2);
+    expect(resolveWorkerCount("auto", { cpuQuota: 0.2, availableCpus: 8 })).toBe(1);
+    expect(resolveWorkerCount("auto", { cpuQuota: 16, availableCpus: 4 })).toBe(4);
+    expect(resolveWorkerCount("auto", { cpuQuota: null, availableCpus: 4 })).toBe(4);
+  });
+
+  it("should disable cluster mode when unset and accept explicit counts", () => {
+    const options = { cpuQuota: 2, availableCpus: 8 };
+    expect(resolveWorkerCount("", options)).toBe(0);
+    expect(resolveWorkerCount("false", options)).toBe(0);
+    expect(resolveWorkerCount("3", options)).toBe(3);
+    expect(() => resolveWorkerCount("many", options)).toThrow("Invalid CLUSTER_WORKERS");
+  });
+});
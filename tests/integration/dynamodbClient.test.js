@@ -0,0 +1,59 @@
+const http = require("http");
+const { warmDynamoDBClient } = require("../../src/services/dynamodbService");
+const { ConnectionPool } = require("../../src/services/dynamodbPool");
+
+describe("warmDynamoDBClient", () => {
+  it("should open the requested number of connections without throwing on failure", async () => {
+    const dynamoDBClient = {
+      send: jest
+        .fn()
+        .mockResolvedValueOnce({})
+        .mockRejectedValueOnce(new Error("network down"))
+        .mockResolvedValueOnce({}),
+    };
+
+    const result = await warmDynamoDBClient({ connections: 3, dynamoDBClient });
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(3);
+    expect(dynamoDBClient.send.mock.calls[0][0].input.Key).toEqual({
+      topic_id: "__warmup__",
+      question_number: "0",
+    });
+    expect(result).toMatchObject({ connections: 3, failed: 1 });
+  });
+});
+
+describe("ConnectionPool", () => {
+  let server;
+  let port;
+
+  beforeAll(async () => {
+    server = http.createServer((req, res) => setTimeout(() => res.end("ok"), 50));
+    await new Promise((resolve) => server.listen(0, "127.0.0.1", resolve));
+    port = server.address().port;
+  });
+
+  afterAll(async () => {
+    await new Promise((resolve) => server.close(resolve));
+  });
+
+  it("should report active, queued and idle keep-alive sockets", async () => {
+    const pool = new ConnectionPool({ maxSockets: 2, keepAliveMs: 1000 });
+    const get = () =>
+      new Promise((resolve) =>
+        http.get({ host: "127.0.0.1", port, agent: pool.httpAgent }, (res) => {
+          res.resume();
+          res.on("end", resolve);
+        })
+      );
+
+    const requests = Promise.all([get(), get(), get()]);
+    await new Promise((resolve) => setTimeout(resolve, 10));
+    expect(pool.stats()).toMatchObject({ active: 2, queued: 1, utilization: 1 });
+
+    await requests;
+    await new Promise((resolve) => setTimeout(resolve, 10));
+    expect(pool.stats()).toMatchObject({ active: 0, idle: 2, queued: 0 });
+    pool.destroy();
+  });
+});
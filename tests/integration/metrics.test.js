@@ -0,0 +1,127 @@
+const net = require("net");
+const fastify = require("fastify");
+const { QueryCommand } = require("@aws-sdk/lib-dynamodb");
+const metricsPlugin = require("../../src/plugins/metrics");
+const authPlugin = require("../../src/plugins/auth");
+const { Registry, registry } = require("../../src/services/metrics");
+const { instrumentDynamoDBClient } = require("../../src/services/dynamodbMetrics");
+
+describe("metrics registry", () => {
+  it("should render cumulative histogram buckets in Prometheus text format", () => {
+    const local = new Registry();
+    const histogram = local.histogram("test_seconds", "test", ["route"], [0.1, 1]);
+    histogram.observe({ route: "/a" }, 0.05);
+    histogram.observe({ route: "/a" }, 0.5);
+    histogram.observe({ route: "/a" }, 5);
+
+    const text = local.render();
+
+    expect(text).toContain('test_seconds_bucket{route="/a",le="0.1"} 1');
+    expect(text).toContain('test_seconds_bucket{route="/a",le="1"} 2');
+    expect(text).toContain('test_seconds_bucket{route="/a",le="+Inf"} 3');
+    expect(text).toContain('test_seconds_count{route="/a"} 3');
+  });
+});
+
+describe("DynamoDB instrumentation", () => {
+  it("should request consumed capacity and count retries per operation", async () => {
+    const client = instrumentDynamoDBClient({
+      send: jest.fn().mockResolvedValue({
+        Items: [],
+        ConsumedCapacity: { TableName: "MetricsTable", CapacityUnits: 2.5 },
+        $metadata: { attempts: 3 },
+      }),
+    });
+
+    const command = new QueryCommand({ TableName: "MetricsTable" });
+    await client.send(command);
+
+    expect(command.input.ReturnConsumedCapacity).toBe("TOTAL");
+    const text = registry.render();
+    expect(text).toContain(
+      'quiznox_dynamodb_requests_total{operation="Query",table="MetricsTable",outcome="ok"} 1'
+    );
+    expect(text).toContain('quiznox_dynamodb_retries_total{operation="Query",table="MetricsTable"} 2');
+    expect(text).toContain(
+      'quiznox_dynamodb_consumed_capacity_units_total{operation="Query",table="MetricsTable"} 2.5'
+    );
+  });
+});
+
+describe("GET /metrics", () => {
+  let app;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(metricsPlugin);
+    await app.register(authPlugin);
+    app.get("/ping", { config: { skipAuth: true } }, async () => ({ ok: true }));
+    await app.ready();
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should expose route latency and event loop lag without auth", async () => {
+    await app.inject({ method: "GET", url: "/ping" });
+
+    const response = await app.inject({ method: "GET", url: "/metrics" });
+
+    expect(response.statusCode).toBe(200);
+    expect(response.headers["content-type"]).toContain("text/plain");
+    expect(response.body).toContain(
+      'quiznox_http_request_duration_seconds_count{method="GET",route="/ping",status_code="200"}'
+    );
+    expect(response.body).toContain('quiznox_http_request_phase_seconds_count{route="/ping",phase="handler"}');
+    expect(response.body).toContain('quiznox_eventloop_lag_seconds{stat="p99"}');
+  });
+});
+
+describe("in-flight gauge", () => {
+  let app;
+  let release;
+
+  const inFlight = () => {
+    const match = registry.render().match(/^quiznox_http_requests_in_flight (\S+)$/m);
+    return match ? Number(match[1]) : 0;
+  };
+  const waitFor = async (predicate) => {
+    for (let i = 0; i < 100 && !predicate(); i += 1) {
+      await new Promise((resolve) => setTimeout(resolve, 10));
+    }
+  };
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(metricsPlugin);
+    app.get("/slow", async () => {
+      await new Promise((resolve) => {
+        release = resolve;
+      });
+      return { ok: true };
+    });
+    await app.listen({ port: 0, host: "127.0.0.1" });
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should decrement once when the client aborts before the response", async () => {
+    const before = inFlight();
+    const socket = net.connect(app.server.address().port, "127.0.0.1");
+    socket.write("GET /slow HTTP/1.1\r\nHost: localhost\r\n\r\n");
+    await waitFor(() => release);
+    expect(inFlight()).toBe(before + 1);
+
+    socket.destroy();
+    await waitFor(() => inFlight() === before);
+    expect(inFlight()).toBe(before);
+
+    // 핸들러가 뒤늦게 끝나도 다시 감소하지 않는다
+    release();
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    expect(inFlight()).toBe(before);
+  });
+});
@@ -0,0 +1,164 @@
+const os = require("os");
+const fastify = require("fastify");
+const { QuestionCache } = require("../../src/services/questionCache");
+const {
+  getCachedQuestionsByTopic,
+  invalidateQuestionCache,
+  getQuestionCacheStats,
+} = require("../../src/services/dynamodbService");
+const adminRoutes = require("../../src/routes/admin");
+const { mockQuestions } = require("../fixtures/questionFixtures");
+
+function deferred() {
+  let resolve;
+  const promise = new Promise((r) => {
+    resolve = r;
+  });
+  return { promise, resolve };
+}
+
+describe("QuestionCache", () => {
+  it("should serve repeated lookups from memory until the TTL expires", async () => {
+    let now = 0;
+    const cache = new QuestionCache({ ttlMs: 1000, now: () => now });
+    const loader = jest.fn().mockResolvedValue(mockQuestions);
+
+    await cache.get("AWS_DVA", loader);
+    await cache.get("AWS_DVA", loader);
+    expect(loader).toHaveBeenCalledTimes(1);
+
+    now = 1001;
+    await cache.get("AWS_DVA", loader);
+    expect(loader).toHaveBeenCalledTimes(2);
+    expect(cache.stats()).toMatchObject({ hits: 1, misses: 2, expirations: 1 });
+  });
+
+  it("should collapse concurrent misses into a single load", async () => {
+    const cache = new QuestionCache();
+    const pending = deferred();
+    const loader = jest.fn(() => pending.promise);
+
+    const results = Promise.all([
+      cache.get("AWS_DVA", loader),
+      cache.get("AWS_DVA", loader),
+      cache.get("AWS_DVA", loader),
+    ]);
+    pending.resolve(mockQuestions);
+
+    expect(await results).toEqual([mockQuestions, mockQuestions, mockQuestions]);
+    expect(loader).toHaveBeenCalledTimes(1);
+    expect(cache.stats()).toMatchObject({ misses: 1, coalesced: 2, inflight: 0 });
+  });
+
+  it("should evict the least recently used topic when full", async () => {
+    const cache = new QuestionCache({ maxEntries: 2 });
+    const loader = (value) => async () => value;
+
+    await cache.get("A", loader(["a"]));
+    await cache.get("B", loader(["b"]));
+    await cache.get("A", loader(["a"]));
+    await cache.get("C", loader(["c"]));
+
+    expect([...cache.entries.keys()]).toEqual(["A", "C"]);
+    expect(cache.stats().evictions).toBe(1);
+  });
+
+  it("should not cache failures or results loaded before an invalidation", async () => {
+    const cache = new QuestionCache();
+    await expect(
+      cache.get("AWS_DVA", async () => {
+        throw new Error("DynamoDB connection failed");
+      })
+    ).rejects.toThrow("DynamoDB connection failed");
+    expect(cache.stats().size).toBe(0);
+
+    const pending = deferred();
+    const result = cache.get("AWS_DVA", () => pending.promise);
+    cache.invalidate("AWS_DVA");
+    pending.resolve(mockQuestions);
+    await result;
+    expect(cache.stats().size).toBe(0);
+  });
+
+  it("should only drop the in-flight load of the invalidated key", async () => {
+    const cache = new QuestionCache();
+    const stale = deferred();
+    const other = deferred();
+    const staleResult = cache.get("AWS_DVA", () => stale.promise);
+    const otherResult = cache.get("AWS_SAA", () => other.promise);
+
+    cache.invalidate("AWS_DVA");
+    // 무효화 이후의 호출은 이전 조회에 합류하지 않고 새로 조회한다
+    const fresh = cache.get("AWS_DVA", async () => ["fresh"]);
+    expect(await fresh).toEqual(["fresh"]);
+
+    stale.resolve(["stale"]);
+    other.resolve(["other"]);
+    await Promise.all([staleResult, otherResult]);
+
+    expect(cache.peek("AWS_DVA")).toEqual(["fresh"]);
+    expect(cache.peek("AWS_SAA")).toEqual(["other"]);
+    expect(cache.stats()).toMatchObject({ inflight: 0, coalesced: 0 });
+  });
+});
+
+describe("getCachedQuestionsByTopic", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should query DynamoDB once per topic and honor invalidation", async () => {
+    const dynamoDBClient = {
+      send: jest.fn().mockResolvedValue({ Items: mockQuestions }),
+    };
+
+    const first = await getCachedQuestionsByTopic("QuizNox_Questions", "AWS_DVA", dynamoDBClient);
+    const second = await getCachedQuestionsByTopic("QuizNox_Questions", "AWS_DVA", dynamoDBClient);
+    expect(second).toBe(first);
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+
+    expect(invalidateQuestionCache("AWS_DVA", { tableName: "QuizNox_Questions" })).toBe(1);
+    await getCachedQuestionsByTopic("QuizNox_Questions", "AWS_DVA", dynamoDBClient);
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(2);
+    expect(getQuestionCacheStats().hits).toBeGreaterThanOrEqual(1);
+  });
+
+  it("should not cache empty topics", async () => {
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({ Items: [] }) };
+
+    await getCachedQuestionsByTopic("QuizNox_Questions", "EMPTY", dynamoDBClient);
+    await getCachedQuestionsByTopic("QuizNox_Questions", "EMPTY", dynamoDBClient);
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(2);
+  });
+});
+
+describe("DELETE /admin/cache/questions", () => {
+  it("should report that only the serving process was invalidated", async () => {
+    const app = fastify();
+    app.decorate("isAuthDisabled", true);
+    await app.register(adminRoutes);
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({ Items: mockQuestions }) };
+    await getCachedQuestionsByTopic("QuizNox_Questions", "AWS_DVA", dynamoDBClient);
+
+    try {
+      const response = await app.inject({
+        method: "DELETE",
+        url: "/admin/cache/questions?topicId=AWS_DVA",
+      });
+
+      expect(response.statusCode).toBe(200);
+      // 다른 Pod/워커의 캐시는 TTL이 지나야 갱신되므로 범위와 최대 지연을 함께 알려준다
+      expect(response.json()).toEqual({
+        removed: 1,
+        topicId: "AWS_DVA",
+        scope: "process",
+        instance: `${os.hostname()}/${process.pid}`,
+        maxStaleMs: Math.max(getQuestionCacheStats().ttlMs, getQuestionCacheStats().keyIndex.ttlMs),
+      });
+    } finally {
+      invalidateQuestionCache();
+      await app.close();
+    }
+  });
+});
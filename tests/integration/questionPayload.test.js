@@ -0,0 +1,97 @@
+const zlib = require("zlib");
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const {
+  QuestionPayload,
+  negotiateEncoding,
+} = require("../../src/services/questionPayload");
+const { mockQuestions } = require("../fixtures/questionFixtures");
+
+jest.mock("../../src/services/dynamodbService", () => ({
+  ...jest.requireActual("../../src/services/dynamodbService"),
+  getQuestionPayloadByTopic: jest.fn(),
+}));
+
+const { getQuestionPayloadByTopic } = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+
+describe("negotiateEncoding", () => {
+  it.each([
+    ["gzip, deflate, br", "br"],
+    ["gzip;q=1.0, br;q=0.5", "gzip"],
+    ["br;q=0, *;q=0.5", "gzip"],
+    ["identity", "identity"],
+    [undefined, "identity"],
+  ])("should select an encoding for %p", (header, expected) => {
+    expect(negotiateEncoding(header)).toBe(expected);
+  });
+});
+
+describe("QuestionPayload", () => {
+  it("should derive a strong ETag per encoding from the serialized body", () => {
+    const payload = new QuestionPayload(mockQuestions);
+    const same = new QuestionPayload(JSON.parse(JSON.stringify(mockQuestions)));
+
+    expect(payload.body.toString()).toBe(JSON.stringify(mockQuestions));
+    expect(payload.etag()).toBe(same.etag());
+    expect(payload.etag("gzip")).not.toBe(payload.etag("br"));
+    expect(payload.matches(`W/${payload.etag("gzip")}, "other"`)).toBe(true);
+    expect(payload.matches('"other"')).toBe(false);
+  });
+
+  it("should compress each variant only once", async () => {
+    const payload = new QuestionPayload(mockQuestions);
+
+    const first = await payload.encode("br");
+    expect(await payload.encode("br")).toBe(first);
+    expect(zlib.brotliDecompressSync(first).equals(payload.body)).toBe(true);
+  });
+});
+
+describe("GET /questions payload", () => {
+  let app;
+  let authHeader;
+  const payload = new QuestionPayload(mockQuestions);
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+    authHeader = `Bearer ${jwt.sign({ user_id: "test-user" }, process.env.JWT_SECRET)}`;
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  beforeEach(() => {
+    getQuestionPayloadByTopic.mockResolvedValue(payload);
+  });
+
+  it("should serve the negotiated pre-compressed variant", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=AWS_DVA",
+      headers: { authorization: authHeader, "accept-encoding": "gzip, br" },
+    });
+
+    expect(response.statusCode).toBe(200);
+    expect(response.headers["content-encoding"]).toBe("br");
+    expect(response.headers.etag).toBe(payload.etag("br"));
+    expect(response.headers.vary).toContain("Accept-Encoding");
+    expect(JSON.parse(zlib.brotliDecompressSync(response.rawPayload))).toEqual(mockQuestions);
+  });
+
+  it("should return 304 when If-None-Match matches", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=AWS_DVA",
+      headers: { authorization: authHeader, "if-none-match": payload.etag() },
+    });
+
+    expect(response.statusCode).toBe(304);
+    expect(response.payload).toBe("");
+  });
+});
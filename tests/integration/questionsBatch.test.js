@@ -0,0 +1,135 @@
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const {
+  streamQuestionPayloadsByTopics,
+  batchGetQuestions,
+  getQuestionPayloadByTopic,
+  invalidateQuestionCache,
+} = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+const { sampleQuestion } = require("../fixtures/questionFixtures");
+
+const TABLE = "QuizNox_Questions";
+
+function question(topicId, questionNumber) {
+  return { ...sampleQuestion, topic_id: topicId, question_number: questionNumber };
+}
+
+// topic마다 문제 하나를 돌려주고 동시 요청 수를 기록하는 클라이언트
+function topicClient() {
+  const client = {
+    inflight: 0,
+    maxInflight: 0,
+    send: jest.fn(async ({ input }) => {
+      client.inflight += 1;
+      client.maxInflight = Math.max(client.maxInflight, client.inflight);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      client.inflight -= 1;
+      return { Items: [question(input.ExpressionAttributeValues[":tid"], "0001")] };
+    }),
+  };
+  return client;
+}
+
+describe("streamQuestionPayloadsByTopics", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should query topics concurrently up to the limit", async () => {
+    const dynamoDBClient = topicClient();
+    const topicIds = ["T1", "T2", "T3", "T4", "T5"];
+
+    const seen = [];
+    for await (const { topicId, payload } of streamQuestionPayloadsByTopics(TABLE, topicIds, {
+      concurrency: 2,
+      dynamoDBClient,
+    })) {
+      seen.push(topicId);
+      expect(payload.items[0].topic_id).toBe(topicId);
+    }
+
+    expect(seen.sort()).toEqual(topicIds);
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(5);
+    expect(dynamoDBClient.maxInflight).toBe(2);
+  });
+});
+
+describe("batchGetQuestions", () => {
+  it("should dedupe keys, retry unprocessed keys and keep request order", async () => {
+    const dynamoDBClient = {
+      send: jest
+        .fn()
+        .mockResolvedValueOnce({
+          Responses: { [TABLE]: [question("A", "0002")] },
+          UnprocessedKeys: { [TABLE]: { Keys: [{ topic_id: "A", question_number: "0001" }] } },
+        })
+        .mockResolvedValueOnce({ Responses: { [TABLE]: [question("A", "0001")] } }),
+    };
+
+    const items = await batchGetQuestions(
+      TABLE,
+      [
+        { topic_id: "A", question_number: "0001" },
+        { topic_id: "A", question_number: "0002" },
+        { topic_id: "A", question_number: "0001" },
+        { topic_id: "B", question_number: "9999" },
+      ],
+      { dynamoDBClient }
+    );
+
+    expect(items.map((item) => item.question_number)).toEqual(["0001", "0002"]);
+    expect(dynamoDBClient.send.mock.calls[0][0].input.RequestItems[TABLE].Keys).toHaveLength(3);
+    expect(dynamoDBClient.send.mock.calls[1][0].input.RequestItems[TABLE].Keys).toEqual([
+      { topic_id: "A", question_number: "0001" },
+    ]);
+  });
+});
+
+describe("GET /questions/batch", () => {
+  let app;
+  let authHeader;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+    authHeader = `Bearer ${jwt.sign({ user_id: "test-user" }, process.env.JWT_SECRET)}`;
+  });
+
+  afterAll(async () => {
+    invalidateQuestionCache();
+    await app.close();
+  });
+
+  it("should stream every requested topic in one response", async () => {
+    const dynamoDBClient = topicClient();
+    await getQuestionPayloadByTopic(TABLE, "BATCH_A", dynamoDBClient);
+    await getQuestionPayloadByTopic(TABLE, "BATCH_B", dynamoDBClient);
+
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions/batch?topicIds=BATCH_A,BATCH_B,BATCH_A",
+      headers: { authorization: authHeader },
+    });
+
+    expect(response.statusCode).toBe(200);
+    const { topics } = JSON.parse(response.payload);
+    expect(Object.keys(topics).sort()).toEqual(["BATCH_A", "BATCH_B"]);
+    expect(topics.BATCH_B[0].topic_id).toBe("BATCH_B");
+  });
+
+  it("should validate the parameters", async () => {
+    const tooMany = Array.from({ length: 21 }, (_, i) => `T${i}`).join(",");
+    for (const query of ["", `topicIds=${tooMany}`, "keys=NO_NUMBER", "topicIds=A&keys=A:0001"]) {
+      const response = await app.inject({
+        method: "GET",
+        url: `/questions/batch?${query}`,
+        headers: { authorization: authHeader },
+      });
+      expect(response.statusCode).toBe(400);
+    }
+  });
+});
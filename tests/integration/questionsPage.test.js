@@ -0,0 +1,148 @@
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const {
+  getQuestionsPage,
+  getQuestionPayloadByTopic,
+  invalidateQuestionCache,
+} = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+const { sampleQuestion } = require("../fixtures/questionFixtures");
+
+const TABLE = "QuizNox_Questions";
+const questions = Array.from({ length: 7 }, (_, i) => ({
+  ...sampleQuestion,
+  topic_id: "PAGED",
+  question_number: String(i + 1).padStart(4, "0"),
+}));
+
+// ExclusiveStartKey/Limit만 흉내 내는 DynamoDB 클라이언트
+function pagingClient() {
+  return {
+    send: jest.fn(async ({ input }) => {
+      const start = input.ExclusiveStartKey
+        ? questions.findIndex((q) => q.question_number === input.ExclusiveStartKey.question_number) + 1
+        : 0;
+      const page = questions.slice(start, start + (input.Limit || questions.length));
+      const last = page[page.length - 1];
+      return {
+        Items: page,
+        LastEvaluatedKey:
+          start + page.length < questions.length
+            ? { topic_id: "PAGED", question_number: last.question_number }
+            : undefined,
+      };
+    }),
+  };
+}
+
+describe("getQuestionsPage", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should query one page at a time with an opaque cursor", async () => {
+    const dynamoDBClient = pagingClient();
+
+    const first = await getQuestionsPage(TABLE, "PAGED", { limit: 3, dynamoDBClient });
+    const second = await getQuestionsPage(TABLE, "PAGED", {
+      limit: 3,
+      cursor: first.nextCursor,
+      dynamoDBClient,
+    });
+
+    expect(first.items.map((q) => q.question_number)).toEqual(["0001", "0002", "0003"]);
+    expect(second.items.map((q) => q.question_number)).toEqual(["0004", "0005", "0006"]);
+    expect(dynamoDBClient.send.mock.calls[1][0].input).toMatchObject({
+      Limit: 3,
+      ExclusiveStartKey: { topic_id: "PAGED", question_number: "0003" },
+    });
+  });
+
+  it("should push range and projection down to DynamoDB", async () => {
+    const dynamoDBClient = pagingClient();
+
+    await getQuestionsPage(TABLE, "PAGED", {
+      from: "0002",
+      to: "0005",
+      fields: ["most_voted_answer"],
+      dynamoDBClient,
+    });
+
+    expect(dynamoDBClient.send.mock.calls[0][0].input).toMatchObject({
+      KeyConditionExpression: "topic_id = :tid AND question_number BETWEEN :from AND :to",
+      ExpressionAttributeValues: { ":tid": "PAGED", ":from": "0002", ":to": "0005" },
+      ProjectionExpression: "#f0, #f1",
+      ExpressionAttributeNames: { "#f0": "question_number", "#f1": "most_voted_answer" },
+    });
+  });
+
+  it("should page from the cached topic without querying DynamoDB", async () => {
+    await getQuestionPayloadByTopic(TABLE, "PAGED", pagingClient());
+    const dynamoDBClient = pagingClient();
+
+    const pages = [];
+    let cursor;
+    do {
+      const page = await getQuestionsPage(TABLE, "PAGED", {
+        limit: 4,
+        cursor,
+        from: "0002",
+        fields: ["most_voted_answer"],
+        dynamoDBClient,
+      });
+      pages.push(page.items);
+      cursor = page.nextCursor;
+    } while (cursor);
+
+    expect(dynamoDBClient.send).not.toHaveBeenCalled();
+    expect(pages.map((items) => items.length)).toEqual([4, 2]);
+    expect(pages[1][1]).toEqual({ question_number: "0007", most_voted_answer: "C" });
+  });
+
+  it("should reject cursors from another topic and unknown fields", async () => {
+    const { nextCursor } = await getQuestionsPage(TABLE, "PAGED", {
+      limit: 1,
+      dynamoDBClient: pagingClient(),
+    });
+
+    await expect(getQuestionsPage(TABLE, "OTHER", { cursor: nextCursor })).rejects.toThrow("Invalid cursor");
+    await expect(getQuestionsPage(TABLE, "PAGED", { fields: ["password"] })).rejects.toThrow("Invalid fields");
+  });
+});
+
+describe("GET /questions pagination", () => {
+  let app;
+  let authHeader;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+    authHeader = `Bearer ${jwt.sign({ user_id: "test-user" }, process.env.JWT_SECRET)}`;
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should return 400 for an invalid cursor", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=AWS_DVA&cursor=not-a-cursor",
+      headers: { authorization: authHeader },
+    });
+    expect(response.statusCode).toBe(400);
+    expect(JSON.parse(response.payload)).toEqual({ message: "Invalid cursor parameter" });
+  });
+
+  it("should return 400 for unknown projection fields", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=AWS_DVA&fields=question_number,secret",
+      headers: { authorization: authHeader },
+    });
+    expect(response.statusCode).toBe(400);
+  });
+});
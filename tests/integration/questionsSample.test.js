@@ -0,0 +1,103 @@
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const {
+  sampleQuestionsByTopic,
+  getQuestionPayloadByTopic,
+  invalidateQuestionCache,
+  getQuestionCacheStats,
+} = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+const { sampleQuestion } = require("../fixtures/questionFixtures");
+
+const TABLE = "QuizNox_Questions";
+const numbers = Array.from({ length: 150 }, (_, i) => String(i + 1).padStart(4, "0"));
+
+// 키만 projection한 Query(100개씩 페이지)와 BatchGetItem을 흉내 내는 클라이언트
+function indexClient(topicId) {
+  return {
+    send: jest.fn(async ({ input }) => {
+      if (input.RequestItems) {
+        const keys = input.RequestItems[TABLE].Keys;
+        return { Responses: { [TABLE]: keys.map((key) => ({ ...sampleQuestion, ...key })) } };
+      }
+      const start = input.ExclusiveStartKey
+        ? numbers.indexOf(input.ExclusiveStartKey.question_number) + 1
+        : 0;
+      const page = numbers.slice(start, start + 100);
+      return {
+        Items: page.map((question_number) => ({ question_number })),
+        LastEvaluatedKey:
+          start + page.length < numbers.length
+            ? { topic_id: topicId, question_number: page[page.length - 1] }
+            : undefined,
+      };
+    }),
+  };
+}
+
+describe("sampleQuestionsByTopic", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should fetch only the sampled questions and reuse the key index", async () => {
+    const dynamoDBClient = indexClient("SAMPLED");
+
+    const first = await sampleQuestionsByTopic(TABLE, "SAMPLED", 20, { dynamoDBClient });
+    const queries = dynamoDBClient.send.mock.calls.map(([command]) => command.input);
+
+    expect(first).toHaveLength(20);
+    expect(new Set(first.map((q) => q.question_number)).size).toBe(20);
+    expect(queries.filter((input) => input.ProjectionExpression === "question_number")).toHaveLength(2);
+    expect(queries[2].RequestItems[TABLE].Keys).toHaveLength(20);
+
+    dynamoDBClient.send.mockClear();
+    await sampleQuestionsByTopic(TABLE, "SAMPLED", 5, { dynamoDBClient });
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+    expect(getQuestionCacheStats().keyIndex.hits).toBeGreaterThanOrEqual(1);
+  });
+
+  it("should sample from a cached topic without calling DynamoDB", async () => {
+    await getQuestionPayloadByTopic(TABLE, "SAMPLED", {
+      send: jest.fn().mockResolvedValue({
+        Items: numbers.slice(0, 3).map((question_number) => ({ ...sampleQuestion, question_number })),
+      }),
+    });
+    const dynamoDBClient = indexClient("SAMPLED");
+
+    const items = await sampleQuestionsByTopic(TABLE, "SAMPLED", 10, { dynamoDBClient });
+
+    expect(items.map((q) => q.question_number).sort()).toEqual(["0001", "0002", "0003"]);
+    expect(dynamoDBClient.send).not.toHaveBeenCalled();
+  });
+});
+
+describe("GET /questions/sample", () => {
+  let app;
+  let authHeader;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+    authHeader = `Bearer ${jwt.sign({ user_id: "test-user" }, process.env.JWT_SECRET)}`;
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should reject a missing topicId or an out-of-range n", async () => {
+    for (const query of ["n=5", "topicId=AWS_DVA&n=0", "topicId=AWS_DVA&n=101", "topicId=AWS_DVA&n=abc"]) {
+      const response = await app.inject({
+        method: "GET",
+        url: `/questions/sample?${query}`,
+        headers: { authorization: authHeader },
+      });
+      expect(response.statusCode).toBe(400);
+    }
+  });
+});
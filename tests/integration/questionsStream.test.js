@@ -0,0 +1,114 @@
+const fastify = require("fastify");
+const jwt = require("jsonwebtoken");
+const {
+  streamQuestionsByTopic,
+  getQuestionPayloadByTopic,
+  invalidateQuestionCache,
+} = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+const { sampleQuestion } = require("../fixtures/questionFixtures");
+
+const TABLE = "QuizNox_Questions";
+const questions = Array.from({ length: 5 }, (_, i) => ({
+  ...sampleQuestion,
+  topic_id: "STREAMED",
+  question_number: String(i + 1).padStart(4, "0"),
+}));
+
+// 두 문제씩 페이지를 나눠 돌려주는 클라이언트
+function pagingClient() {
+  return {
+    send: jest.fn(async ({ input }) => {
+      const start = input.ExclusiveStartKey
+        ? questions.findIndex((q) => q.question_number === input.ExclusiveStartKey.question_number) + 1
+        : 0;
+      const page = questions.slice(start, start + 2);
+      return {
+        Items: page,
+        LastEvaluatedKey:
+          start + page.length < questions.length
+            ? { topic_id: "STREAMED", question_number: page[page.length - 1].question_number }
+            : undefined,
+      };
+    }),
+  };
+}
+
+describe("streamQuestionsByTopic", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should query the next page only when the consumer asks for it", async () => {
+    const dynamoDBClient = pagingClient();
+    const pages = streamQuestionsByTopic(TABLE, "STREAMED", dynamoDBClient);
+
+    const first = await pages.next();
+    expect(first.value.map((q) => q.question_number)).toEqual(["0001", "0002"]);
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+
+    const rest = [];
+    for await (const page of pages) rest.push(page.length);
+    expect(rest).toEqual([2, 1]);
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(3);
+  });
+
+  it("should stream a cached topic without calling DynamoDB", async () => {
+    await getQuestionPayloadByTopic(TABLE, "STREAMED", pagingClient());
+    const dynamoDBClient = pagingClient();
+
+    const pages = [];
+    for await (const page of streamQuestionsByTopic(TABLE, "STREAMED", dynamoDBClient)) {
+      pages.push(page);
+    }
+
+    expect(pages).toHaveLength(1);
+    expect(pages[0]).toHaveLength(5);
+    expect(dynamoDBClient.send).not.toHaveBeenCalled();
+  });
+});
+
+describe("GET /questions streaming", () => {
+  let app;
+  let authHeader;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+    authHeader = `Bearer ${jwt.sign({ user_id: "test-user" }, process.env.JWT_SECRET)}`;
+    await getQuestionPayloadByTopic(TABLE, "STREAMED", pagingClient());
+  });
+
+  afterAll(async () => {
+    invalidateQuestionCache();
+    await app.close();
+  });
+
+  it("should stream a JSON array with stream=true", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=STREAMED&stream=true",
+      headers: { authorization: authHeader },
+    });
+
+    expect(response.statusCode).toBe(200);
+    expect(response.headers["content-type"]).toContain("application/json");
+    expect(JSON.parse(response.payload)).toEqual(questions);
+  });
+
+  it("should stream NDJSON when the client accepts it", async () => {
+    const response = await app.inject({
+      method: "GET",
+      url: "/questions?topicId=STREAMED",
+      headers: { authorization: authHeader, accept: "application/x-ndjson" },
+    });
+
+    expect(response.statusCode).toBe(200);
+    expect(response.headers["content-type"]).toContain("application/x-ndjson");
+    const lines = response.payload.trim().split("\n").map((line) => JSON.parse(line));
+    expect(lines).toEqual(questions);
+  });
+});
@@ -0,0 +1,70 @@
+const { createServer } = require("../../src/index");
+const {
+  preloadQuestionTopics,
+  getQuestionCacheStats,
+  invalidateQuestionCache,
+} = require("../../src/services/dynamodbService");
+const { sampleQuestion } = require("../fixtures/questionFixtures");
+
+describe("GET /ready", () => {
+  let app;
+
+  beforeAll(async () => {
+    app = createServer();
+    await app.ready();
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should return 503 until startup completes while /health is already ok", async () => {
+    const health = await app.inject({ method: "GET", url: "/health" });
+    const ready = await app.inject({ method: "GET", url: "/ready" });
+
+    expect(health.statusCode).toBe(200);
+    expect(ready.statusCode).toBe(503);
+    expect(ready.json().status).toBe("starting");
+    expect(ready.json().startup).toHaveProperty("require");
+  });
+
+  it("should report ready with startup phases and flip back to 503 while draining", async () => {
+    app.readiness.state = "ready";
+    app.readiness.phases.warmup = 12.5;
+
+    const ready = await app.inject({ method: "GET", url: "/ready" });
+    expect(ready.statusCode).toBe(200);
+    expect(ready.json()).toMatchObject({ status: "ready", startup: { warmup: 12.5 } });
+
+    const metrics = await app.inject({ method: "GET", url: "/metrics" });
+    expect(metrics.body).toContain('quiznox_startup_phase_seconds{phase="warmup"} 0.0125');
+
+    app.readiness.state = "draining";
+    const draining = await app.inject({ method: "GET", url: "/ready" });
+    expect(draining.statusCode).toBe(503);
+  });
+});
+
+describe("preloadQuestionTopics", () => {
+  afterEach(() => {
+    invalidateQuestionCache();
+  });
+
+  it("should fill the question cache and skip topics that fail", async () => {
+    const dynamoDBClient = {
+      send: jest.fn(async ({ input }) => {
+        const topicId = input.ExpressionAttributeValues[":tid"];
+        if (topicId === "BROKEN") throw new Error("throttled");
+        return { Items: [{ ...sampleQuestion, topic_id: topicId }] };
+      }),
+    };
+
+    const result = await preloadQuestionTopics({
+      topicIds: ["AWS_DVA", "AWS_SAA", "BROKEN"],
+      dynamoDBClient,
+    });
+
+    expect(result).toMatchObject({ topics: 3, loaded: 2, failed: 1 });
+    expect(getQuestionCacheStats().size).toBe(2);
+  });
+});
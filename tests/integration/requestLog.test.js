@@ -0,0 +1,158 @@
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+const { Writable } = require("stream");
+const fastify = require("fastify");
+const requestLogPlugin = require("../../src/plugins/requestLog");
+const { BufferedLogStream } = require("../../src/services/logStream");
+
+const { parseSampleRate, parseSampleRates } = requestLogPlugin;
+
+function captureLines() {
+  const lines = [];
+  const stream = new Writable({
+    write(chunk, encoding, callback) {
+      lines.push(JSON.parse(chunk.toString()));
+      callback();
+    },
+  });
+  return { lines, stream };
+}
+
+describe("requestLogPlugin", () => {
+  let app;
+  let lines;
+
+  beforeAll(async () => {
+    const capture = captureLines();
+    lines = capture.lines;
+    // 0.25, 0.75, 0.25, ... 순서로 반환해 비율 0.5 라우트는 두 번에 한 번 기록
+    let calls = 0;
+    app = fastify({ logger: { level: "info", stream: capture.stream }, disableRequestLogging: true });
+    await app.register(requestLogPlugin, {
+      sampleRate: 0,
+      routeSampleRates: parseSampleRates("/sampled=0.5,/always=1"),
+      random: () => (calls++ % 2 === 0 ? 0.25 : 0.75),
+    });
+    app.get("/quiet", async () => ({ ok: true }));
+    app.get("/sampled", async () => ({ ok: true }));
+    app.get("/always", async () => ({ ok: true }));
+    app.get("/broken", async () => {
+      throw new Error("boom");
+    });
+    await app.ready();
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  beforeEach(() => {
+    lines.length = 0;
+  });
+
+  const completed = () => lines.filter((line) => line.msg === "request completed");
+
+  it("should sample success responses per route", async () => {
+    for (let i = 0; i < 4; i += 1) {
+      await app.inject({ method: "GET", url: "/quiet" });
+      await app.inject({ method: "GET", url: "/sampled" });
+    }
+    await app.inject({ method: "GET", url: "/always" });
+
+    const logged = completed();
+    expect(logged.map((line) => line.req.url)).toEqual(["/sampled", "/sampled", "/always"]);
+    expect(logged[0]).toMatchObject({ level: 30, sampleRate: 0.5, res: { statusCode: 200 } });
+    expect(logged[2]).not.toHaveProperty("sampleRate");
+    expect(typeof logged[2].responseTime).toBe("number");
+  });
+
+  it("should always log client and server errors", async () => {
+    await app.inject({ method: "GET", url: "/broken" });
+    await app.inject({ method: "GET", url: "/nowhere" });
+
+    const logged = completed();
+    expect(logged.map((line) => [line.req.url, line.level, line.res.statusCode])).toEqual([
+      ["/broken", 50, 500],
+      ["/nowhere", 40, 404],
+    ]);
+  });
+
+  it("should skip invalid per-route sample rates with a warning", () => {
+    const warn = jest.fn();
+    expect(parseSampleRates("")).toEqual(new Map());
+    expect(parseSampleRates("/health=0, /questions=0.01").get("/questions")).toBe(0.01);
+    expect(parseSampleRates("/health,/a=2,/b=abc,/c=0.5", warn)).toEqual(new Map([["/c", 0.5]]));
+    expect(warn).toHaveBeenCalledTimes(3);
+    expect(warn.mock.calls[2][0]).toContain("/b=abc");
+  });
+
+  it("should fall back to the default for non-numeric sample rates", () => {
+    const warn = jest.fn();
+    expect(parseSampleRate("0.1", 1, warn)).toBe(0.1);
+    expect(parseSampleRate(undefined, 1, warn)).toBe(1);
+    expect(parseSampleRate("abc", 1, warn)).toBe(1);
+    expect(parseSampleRate("-1", 1, warn)).toBe(1);
+    expect(warn).toHaveBeenCalledTimes(2);
+    expect(warn.mock.calls[0][0]).toContain('Invalid LOG_SAMPLE_RATE "abc"');
+  });
+
+  it("should keep logging success responses when LOG_SAMPLE_RATE is not a number", async () => {
+    const capture = captureLines();
+    const misconfigured = fastify({ logger: { level: "info", stream: capture.stream }, disableRequestLogging: true });
+    await misconfigured.register(requestLogPlugin, { sampleRate: "abc", routeSampleRates: "/ok=oops" });
+    misconfigured.get("/ok", async () => ({ ok: true }));
+    await misconfigured.ready();
+
+    await misconfigured.inject({ method: "GET", url: "/ok" });
+    await misconfigured.close();
+
+    expect(capture.lines.filter((line) => line.level === 40).map((line) => line.msg)).toEqual([
+      'Invalid LOG_SAMPLE_RATE "abc", using 1',
+      'Ignoring invalid LOG_ROUTE_SAMPLE_RATES entry "/ok=oops"',
+    ]);
+    expect(capture.lines.filter((line) => line.msg === "request completed")).toHaveLength(1);
+  });
+});
+
+describe("BufferedLogStream", () => {
+  let dir;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), "quiznox-log-"));
+  });
+
+  afterEach(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  it("should batch lines into few writes and flush on demand", async () => {
+    const file = path.join(dir, "out.log");
+    const fd = fs.openSync(file, "w");
+    const stream = new BufferedLogStream({ fd, minLength: 64, flushMs: 10000 });
+
+    for (let i = 0; i < 20; i += 1) {
+      stream.write(`{"line":${i}}\n`);
+    }
+    await stream.close();
+    fs.closeSync(fd);
+
+    const lines = fs.readFileSync(file, "utf8").trim().split("\n");
+    expect(lines).toHaveLength(20);
+    expect(lines[19]).toBe('{"line":19}');
+    expect(stream.stats().flushes).toBeLessThan(20);
+    expect(stream.stats()).toMatchObject({ buffered: 0, dropped: 0, errors: 0 });
+  });
+
+  it("should drop lines instead of growing past maxLength", async () => {
+    const fd = fs.openSync(path.join(dir, "out.log"), "w");
+    const stream = new BufferedLogStream({ fd, minLength: 1000, flushMs: 10000, maxLength: 30 });
+
+    for (let i = 0; i < 5; i += 1) {
+      stream.write("0123456789\n");
+    }
+    expect(stream.stats()).toMatchObject({ buffered: 22, dropped: 3 });
+    await stream.close();
+    fs.closeSync(fd);
+  });
+});
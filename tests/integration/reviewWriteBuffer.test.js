@@ -0,0 +1,117 @@
+const { ReviewWriteBuffer } = require("../../src/services/reviewWriteBuffer");
+const { putReview, listReviews, REVIEW_FEED } = require("../../src/services/dynamodbService");
+
+const TABLE = "QuizNox_Reviews";
+
+const review = (n) => ({
+  review_id: `review-${n}`,
+  user_id: "test-user",
+  content: `후기 ${n}`,
+  created_at: `2024-01-01T00:00:${String(n).padStart(2, "0")}.000Z`,
+});
+
+const silentLogger = { info: () => {}, error: () => {} };
+
+function createBuffer(dynamoDBClient, options = {}) {
+  return new ReviewWriteBuffer({
+    tableName: TABLE,
+    dynamoDBClient,
+    flushIntervalMs: 10,
+    baseDelayMs: 0,
+    logger: silentLogger,
+    ...options,
+  });
+}
+
+const batchSizes = (send) =>
+  send.mock.calls.map(([command]) => command.input.RequestItems[TABLE].length);
+
+describe("ReviewWriteBuffer", () => {
+  it("should write in BatchWriteItem groups of 25", async () => {
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({ UnprocessedItems: {} }) };
+    const buffer = createBuffer(dynamoDBClient, { flushIntervalMs: 60000 });
+
+    for (let n = 0; n < 60; n += 1) {
+      await buffer.add(review(n));
+    }
+    await buffer.drain();
+
+    expect(batchSizes(dynamoDBClient.send)).toEqual([25, 25, 10]);
+    expect(buffer.stats()).toMatchObject({ queued: 60, written: 60, depth: 0, failed: 0 });
+  });
+
+  it("should flush on the interval when fewer than 25 are queued", async () => {
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({}) };
+    const buffer = createBuffer(dynamoDBClient);
+
+    await buffer.add(review(1));
+    expect(buffer.pendingItems()).toHaveLength(1);
+    await new Promise((resolve) => setTimeout(resolve, 50));
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+    expect(buffer.stats().depth).toBe(0);
+  });
+
+  it("should retry UnprocessedItems until they are written", async () => {
+    const leftover = [{ PutRequest: { Item: review(2) } }];
+    const dynamoDBClient = {
+      send: jest
+        .fn()
+        .mockResolvedValueOnce({ UnprocessedItems: { [TABLE]: leftover } })
+        .mockRejectedValueOnce(Object.assign(new Error("throttled"), { name: "ProvisionedThroughputExceededException" }))
+        .mockResolvedValueOnce({ UnprocessedItems: {} }),
+    };
+    const buffer = createBuffer(dynamoDBClient);
+
+    await buffer.add(review(1));
+    await buffer.add(review(2));
+    await buffer.drain();
+
+    expect(batchSizes(dynamoDBClient.send)).toEqual([2, 1, 1]);
+    expect(buffer.stats()).toMatchObject({ written: 2, retries: 2, failed: 0 });
+  });
+
+  it("should give up after maxAttempts and count the items as failed", async () => {
+    const dynamoDBClient = {
+      send: jest.fn().mockRejectedValue(Object.assign(new Error("throttled"), { name: "ThrottlingException" })),
+    };
+    const buffer = createBuffer(dynamoDBClient, { maxAttempts: 3 });
+
+    await buffer.add(review(1));
+    await buffer.drain();
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(3);
+    expect(buffer.stats()).toMatchObject({ failed: 1, depth: 0 });
+  });
+});
+
+describe("write-behind reviews", () => {
+  it("should queue new reviews and include them in the first list page", async () => {
+    const dynamoDBClient = {
+      send: jest.fn().mockResolvedValue({ Items: [{ ...review(5), review_feed: REVIEW_FEED }] }),
+    };
+    const writeBuffer = createBuffer(dynamoDBClient, { flushIntervalMs: 60000 });
+
+    await putReview(review(9), { dynamoDBClient, writeBuffer });
+    expect(dynamoDBClient.send).not.toHaveBeenCalled();
+
+    const { items } = await listReviews({ dynamoDBClient, writeBuffer });
+
+    expect(items.map((r) => r.review_id)).toEqual(["review-9", "review-5"]);
+    expect(items[0]).not.toHaveProperty("review_feed");
+  });
+
+  it("should not repeat unflushed reviews on later pages", async () => {
+    const lastKey = { review_id: "review-5", review_feed: REVIEW_FEED, created_at: review(5).created_at };
+    const dynamoDBClient = {
+      send: jest.fn().mockResolvedValue({ Items: [{ ...review(4), review_feed: REVIEW_FEED }] }),
+    };
+    const writeBuffer = createBuffer(dynamoDBClient, { flushIntervalMs: 60000 });
+    await writeBuffer.add({ ...review(9), review_feed: REVIEW_FEED });
+
+    const cursor = Buffer.from(JSON.stringify(lastKey)).toString("base64url");
+    const { items } = await listReviews({ cursor, dynamoDBClient, writeBuffer });
+
+    expect(items.map((r) => r.review_id)).toEqual(["review-4"]);
+  });
+});
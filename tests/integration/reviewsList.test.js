@@ -0,0 +1,96 @@
+const fastify = require("fastify");
+const { listReviews, putReview, setLogger, REVIEW_FEED } = require("../../src/services/dynamodbService");
+const routes = require("../../src/routes");
+const authPlugin = require("../../src/plugins/auth");
+
+const review = (n) => ({
+  review_id: `review-${n}`,
+  user_id: "test-user",
+  content: `후기 ${n}`,
+  created_at: `2024-01-01T00:00:${String(n).padStart(2, "0")}.000Z`,
+  review_feed: REVIEW_FEED,
+});
+
+describe("listReviews", () => {
+  it("should query the created_at index newest-first one page at a time", async () => {
+    const lastKey = { review_id: "review-8", review_feed: REVIEW_FEED, created_at: review(8).created_at };
+    const dynamoDBClient = {
+      send: jest.fn().mockResolvedValue({ Items: [review(9), review(8)], LastEvaluatedKey: lastKey }),
+    };
+
+    const first = await listReviews({ limit: 2, dynamoDBClient });
+    await listReviews({ limit: 2, cursor: first.nextCursor, dynamoDBClient });
+
+    expect(dynamoDBClient.send.mock.calls[0][0].input).toMatchObject({
+      IndexName: "review_feed-created_at-index",
+      KeyConditionExpression: "review_feed = :feed",
+      ScanIndexForward: false,
+      Limit: 2,
+    });
+    expect(dynamoDBClient.send.mock.calls[1][0].input.ExclusiveStartKey).toEqual(lastKey);
+    expect(first.items[0]).not.toHaveProperty("review_feed");
+  });
+
+  it("should fall back to a scan when the index does not exist yet", async () => {
+    const missingIndex = Object.assign(new Error("The table does not have the specified index"), {
+      name: "ValidationException",
+    });
+    const dynamoDBClient = {
+      send: jest
+        .fn()
+        .mockRejectedValueOnce(missingIndex)
+        .mockResolvedValueOnce({ Items: [review(1), review(3), review(2)] })
+        .mockRejectedValueOnce(missingIndex)
+        .mockRejectedValueOnce(new Error("Scan failed")),
+    };
+    const log = { error: jest.fn(), debug: jest.fn(), info: jest.fn(), isLevelEnabled: () => false };
+    setLogger({ child: () => log });
+
+    try {
+      const { items, nextCursor } = await listReviews({ limit: 2, dynamoDBClient });
+      expect(items.map((r) => r.review_id)).toEqual(["review-3", "review-2"]);
+      expect(nextCursor).toBeNull();
+
+      // Scan 실패는 호출 측(라우트)으로 전달만 하고, fallback 원인은 처음 한 번만 기록
+      await expect(listReviews({ limit: 2, dynamoDBClient })).rejects.toThrow("Scan failed");
+      expect(log.error).toHaveBeenCalledTimes(1);
+      expect(log.error.mock.calls[0][0]).toContain("does not have the specified index");
+    } finally {
+      setLogger(null);
+    }
+  });
+
+  it("should reject malformed cursors", async () => {
+    await expect(listReviews({ cursor: "bogus", dynamoDBClient: { send: jest.fn() } })).rejects.toThrow(
+      "Invalid cursor"
+    );
+  });
+
+  it("should store the feed key with new reviews", async () => {
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({}) };
+    const { review_feed, ...input } = review(1);
+
+    expect(await putReview(input, { dynamoDBClient })).toEqual(input);
+    expect(dynamoDBClient.send.mock.calls[0][0].input.Item.review_feed).toBe(REVIEW_FEED);
+  });
+});
+
+describe("GET /reviews cursor", () => {
+  let app;
+
+  beforeAll(async () => {
+    app = fastify();
+    await app.register(authPlugin);
+    await app.register(routes);
+    await app.ready();
+  });
+
+  afterAll(async () => {
+    await app.close();
+  });
+
+  it("should return 400 for an invalid cursor", async () => {
+    const response = await app.inject({ method: "GET", url: "/reviews?cursor=bogus" });
+    expect(response.statusCode).toBe(400);
+  });
+});
@@ -0,0 +1,54 @@
+const { updateReview, deleteReview } = require("../../src/services/dynamodbService");
+
+const conditionFailed = (item) =>
+  Object.assign(new Error("The conditional request failed"), {
+    name: "ConditionalCheckFailedException",
+    ...(item && { Item: item }),
+  });
+
+describe("conditional review writes", () => {
+  it("should update with a single ownership-checked UpdateCommand", async () => {
+    const updated = { review_id: "r1", user_id: "alice", content: "수정", review_feed: "ALL" };
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({ Attributes: updated }) };
+
+    const result = await updateReview("r1", "  수정 ", { userId: "alice", dynamoDBClient });
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+    expect(dynamoDBClient.send.mock.calls[0][0].input).toMatchObject({
+      Key: { review_id: "r1" },
+      ConditionExpression: "attribute_exists(review_id) AND user_id = :user_id",
+      ExpressionAttributeValues: { ":user_id": "alice", ":content": "수정" },
+      ReturnValues: "ALL_NEW",
+      ReturnValuesOnConditionCheckFailure: "ALL_OLD",
+    });
+    expect(result).not.toHaveProperty("review_feed");
+  });
+
+  it("should only check existence when no userId is given", async () => {
+    const dynamoDBClient = { send: jest.fn().mockResolvedValue({}) };
+
+    await deleteReview("r1", { dynamoDBClient });
+
+    expect(dynamoDBClient.send).toHaveBeenCalledTimes(1);
+    expect(dynamoDBClient.send.mock.calls[0][0].input).toMatchObject({
+      Key: { review_id: "r1" },
+      ConditionExpression: "attribute_exists(review_id)",
+    });
+  });
+
+  it("should map a failed condition with an existing item to Forbidden", async () => {
+    const dynamoDBClient = {
+      send: jest.fn().mockRejectedValue(conditionFailed({ review_id: { S: "r1" } })),
+    };
+
+    await expect(deleteReview("r1", { userId: "mallory", dynamoDBClient })).rejects.toThrow("Forbidden");
+  });
+
+  it("should map a failed condition without an item to Review not found", async () => {
+    const dynamoDBClient = { send: jest.fn().mockRejectedValue(conditionFailed()) };
+
+    await expect(updateReview("missing", "내용", { userId: "alice", dynamoDBClient })).rejects.toThrow(
+      "Review not found"
+    );
+  });
+});
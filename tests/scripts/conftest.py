@@ -0,0 +1,43 @@
+# 배포 스크립트(scripts/*.py) 테스트 공통 설정
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_k8s_api import FakeKubernetesApi  # noqa: E402
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeKubernetesApi()
+    api.start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def kubeconfig(tmp_path, fake_api):
+    path = tmp_path / 'kubeconfig'
+    path.write_text(f"""apiVersion: v1
+kind: Config
+clusters:
+  - name: fake
+    cluster:
+      server: {fake_api.url}
+contexts:
+  - name: fake
+    context:
+      cluster: fake
+      user: fake
+current-context: fake
+users:
+  - name: fake
+    user:
+      token: fake-token
+""")
+    return str(path)
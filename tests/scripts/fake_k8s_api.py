@@ -0,0 +1,244 @@
+# 테스트용 최소 Kubernetes API 서버 (list/get/apply/delete + resourceVersion 기반 watch 스트림)
+
+import copy
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from k8s_client import RESOURCES, resource_path
+
+COLLECTIONS = {plural for _, plural, _ in RESOURCES.values()}
+
+
+def matches_selectors(obj, label_selector, field_selector):
+    for term in filter(None, (field_selector or '').split(',')):
+        key, value = term.split('=', 1)
+        if key == 'metadata.name' and obj['metadata']['name'] != value:
+            return False
+    labels = obj['metadata'].get('labels') or {}
+    for term in filter(None, (label_selector or '').split(',')):
+        if '!=' in term:
+            key, value = term.split('!=', 1)
+            if labels.get(key) == value:
+                return False
+            continue
+        key, value = term.split('=', 1)
+        if labels.get(key) != value:
+            return False
+    return True
+
+
+class FakeKubernetesApi:
+    def __init__(self):
+        self.objects = {}
+        self.events = []
+        self.resource_version = 0
+        # 이 값보다 오래된 resourceVersion으로 watch하면 410 Gone
+        self.compacted_version = 0
+        self.requests = []
+        self.connections = 0
+        self.changed = threading.Condition()
+        self.server = None
+        # True면 apply된 Deployment의 롤아웃이 즉시 끝난 것처럼 status를 채운다 (컨트롤러 흉내)
+        self.complete_rollouts = False
+        # apply(PATCH)된 객체를 받아 컨트롤러 동작(Pod 생성 등)을 흉내 내는 콜백
+        self.after_apply = None
+        # {(method, path): (status, message)}: 해당 요청에 오류 응답 (권한 부족, 충돌 등 흉내)
+        # (status, body, content_type)이면 Status 객체 대신 body를 그대로 보낸다
+        self.failures = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        api = self
+
+        class Handler(RequestHandler):
+            fake = api
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def upsert(self, obj, event_type=None):
+        path = resource_path(obj['kind'], obj['metadata']['name'], obj['metadata'].get('namespace'), obj.get('apiVersion'))
+        with self.changed:
+            self.resource_version += 1
+            stored = copy.deepcopy(obj)
+            stored['metadata']['resourceVersion'] = str(self.resource_version)
+            stored['metadata'].setdefault('generation', 1)
+            stored['metadata'].setdefault('creationTimestamp', '2024-01-01T00:00:00Z')
+            event_type = event_type or ('MODIFIED' if path in self.objects else 'ADDED')
+            self.objects[path] = stored
+            self.events.append((self.resource_version, path.rsplit('/', 1)[0], event_type, stored))
+            self.changed.notify_all()
+        return stored
+
+    def delete(self, path):
+        with self.changed:
+            obj = self.objects.pop(path, None)
+            if obj is None:
+                return None
+            self.resource_version += 1
+            self.events.append((self.resource_version, path.rsplit('/', 1)[0], 'DELETED', obj))
+            self.changed.notify_all()
+            return obj
+
+    def update_later(self, delay, obj):
+        timer = threading.Timer(delay, self.upsert, args=(obj,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def compact(self):
+        with self.changed:
+            self.compacted_version = self.resource_version
+
+    def count(self, method, path_prefix, watch=None):
+        return sum(
+            1 for m, path, is_watch in self.requests
+            if m == method and path.startswith(path_prefix) and (watch is None or is_watch == watch)
+        )
+
+
+def rolled_out(deployment):
+    replicas = deployment.get('spec', {}).get('replicas', 1)
+    deployment['metadata'].setdefault('generation', 1)
+    deployment['status'] = {
+        'observedGeneration': deployment['metadata']['generation'],
+        'replicas': replicas,
+        'updatedReplicas': replicas,
+        'availableReplicas': replicas,
+    }
+    return deployment
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.fake.connections += 1
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_chunk(self, body):
+        payload = json.dumps(body).encode() + b'\n'
+        self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b'\r\n')
+        self.wfile.flush()
+
+    def send_failure(self, method, path):
+        failure = self.fake.failures.get((method, path))
+        if failure:
+            status, message = failure[:2]
+            if len(failure) > 2:
+                # (status, body, content_type): API 서버 앞단 프록시의 raw 응답
+                payload = message.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', failure[2])
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            else:
+                self.send_json(status, {'kind': 'Status', 'message': message, 'code': status})
+        return bool(failure)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        path = parsed.path
+        is_watch = query.get('watch') == '1'
+        self.fake.requests.append(('GET', path, is_watch))
+        if self.send_failure('GET', path):
+            return
+
+        if path == '/version':
+            return self.send_json(200, {'gitVersion': 'v1.30.0-fake'})
+        if is_watch:
+            return self.stream_watch(path, query)
+        if path in self.fake.objects:
+            return self.send_json(200, self.fake.objects[path])
+
+        with self.fake.changed:
+            items = [
+                obj for obj_path, obj in self.fake.objects.items()
+                if obj_path.rsplit('/', 1)[0] == path
+                and matches_selectors(obj, query.get('labelSelector'), query.get('fieldSelector'))
+            ]
+            version = str(self.fake.resource_version)
+        if path.rsplit('/', 1)[1] not in COLLECTIONS:
+            return self.send_json(404, {'message': 'not found', 'code': 404})
+        self.send_json(200, {'kind': 'List', 'metadata': {'resourceVersion': version}, 'items': items})
+
+    def stream_watch(self, path, query):
+        since = int(query.get('resourceVersion') or 0)
+        deadline = time.monotonic() + int(query.get('timeoutSeconds', 30))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        if since and since < self.fake.compacted_version:
+            self.send_chunk({'type': 'ERROR', 'object': {'kind': 'Status', 'code': 410, 'message': 'too old resource version'}})
+        else:
+            while True:
+                with self.fake.changed:
+                    pending = [
+                        (rv, event_type, obj) for rv, collection, event_type, obj in self.fake.events
+                        if rv > since and collection == path
+                        and matches_selectors(obj, query.get('labelSelector'), query.get('fieldSelector'))
+                    ]
+                    if not pending:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.fake.changed.wait(remaining)
+                        continue
+                for rv, event_type, obj in pending:
+                    self.send_chunk({'type': event_type, 'object': obj})
+                    since = rv
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+    def do_PATCH(self):
+        path = urlparse(self.path).path
+        self.fake.requests.append(('PATCH', path, False))
+        obj = self.read_body()
+        if self.send_failure('PATCH', path):
+            return
+        if self.fake.complete_rollouts and obj.get('kind') == 'Deployment':
+            obj = rolled_out(obj)
+        stored = self.fake.upsert(obj)
+        if self.fake.after_apply:
+            self.fake.after_apply(stored)
+        self.send_json(200, stored)
+
+    def do_DELETE(self):
+        path = urlparse(self.path).path
+        self.fake.requests.append(('DELETE', path, False))
+        if self.send_failure('DELETE', path):
+            return
+        if self.fake.delete(path) is None:
+            return self.send_json(404, {'message': 'not found', 'code': 404})
+        self.send_json(200, {'kind': 'Status', 'status': 'Success'})
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+import aws_session
+
+
+@pytest.fixture
+def resolvers(monkeypatch, tmp_path):
+    monkeypatch.setattr(aws_session, 'CACHE_FILE', tmp_path / 'aws_values.json')
+    calls = []
+
+    def slow(key, value):
+        def resolve():
+            calls.append(key)
+            time.sleep(0.3)
+            return value
+        return resolve
+
+    monkeypatch.setitem(aws_session.RESOLVERS, 'ec2_public_ip', slow('ec2_public_ip', '203.0.113.10'))
+    monkeypatch.setitem(aws_session.RESOLVERS, 'api_gateway_id', slow('api_gateway_id', 'abc123'))
+    monkeypatch.setitem(aws_session.RESOLVERS, 'release_image_digest', slow('release_image_digest', ''))
+    return calls
+
+
+def test_resolve_values_runs_lookups_concurrently(resolvers):
+    start = time.monotonic()
+    values = aws_session.resolve_values(['ec2_public_ip', 'api_gateway_id', 'release_image_digest'])
+
+    assert values == {'ec2_public_ip': '203.0.113.10', 'api_gateway_id': 'abc123', 'release_image_digest': ''}
+    assert time.monotonic() - start < 0.8
+
+
+def test_resolve_values_reuses_cached_non_empty_values(resolvers):
+    aws_session.resolve_values(['ec2_public_ip', 'release_image_digest'])
+    resolvers.clear()
+
+    values = aws_session.resolve_values(['ec2_public_ip', 'release_image_digest'])
+
+    assert values['ec2_public_ip'] == '203.0.113.10'
+    # 빈 값은 캐시하지 않으므로 다시 조회한다
+    assert resolvers == ['release_image_digest']
+
+
+def test_resolve_values_never_caches_release_image_digest(resolvers, monkeypatch):
+    digests = iter(['sha256:1', 'sha256:2'])
+    monkeypatch.setitem(aws_session.RESOLVERS, 'release_image_digest', lambda: next(digests))
+
+    assert aws_session.resolve_value('release_image_digest') == 'sha256:1'
+    # TTL 안에 새 이미지가 푸시되어도 이전 태그를 돌려주지 않는다
+    assert aws_session.resolve_value('release_image_digest') == 'sha256:2'
+    assert 'release_image_digest' not in aws_session.CACHE_FILE.read_text()
+
+
+class StubEcr:
+    def __init__(self, images):
+        self.images = images
+        self.calls = []
+
+    def describe_images(self, repositoryName, imageIds):
+        self.calls.append((repositoryName, imageIds))
+        tag = imageIds[0]['imageTag']
+        if tag not in self.images:
+            raise ClientError({'Error': {'Code': 'ImageNotFoundException', 'Message': 'not found'}}, 'DescribeImages')
+        return {'imageDetails': [{'imageDigest': self.images[tag]}]}
+
+
+def test_release_image_digest_follows_release_tag_not_push_time(monkeypatch):
+    # 재태깅된 이전 이미지(X)가 main 태그를 가지면 나중에 푸시된 Y가 아니라 X를 배포한다
+    ecr = StubEcr({'main': 'sha256:x', 'sha-b': 'sha256:y'})
+    monkeypatch.setattr(aws_session, 'get_client', lambda service: ecr)
+
+    assert aws_session.resolve_release_image_digest() == 'sha256:x'
+    assert ecr.calls == [(aws_session.ecr_repository_name(), [{'imageTag': aws_session.RELEASE_TAG}])]
+
+    ecr.images = {}
+    assert aws_session.resolve_release_image_digest() == ''
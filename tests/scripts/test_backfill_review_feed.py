@@ -0,0 +1,52 @@
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+
+import backfill_review_feed
+from local_dynamodb import LocalDynamoDBServer
+from loadtest import synthetic_reviews
+
+
+@pytest.fixture
+def reviews_table():
+    with LocalDynamoDBServer() as server:
+        server.database.create_tables()
+        options = {
+            'endpoint_url': server.endpoint, 'region_name': 'ap-northeast-2',
+            'aws_access_key_id': 'local', 'aws_secret_access_key': 'local',
+        }
+        yield boto3.resource('dynamodb', **options).Table('QuizNox_Reviews'), boto3.client('dynamodb', **options)
+
+
+def test_backfill_fills_missing_feed_in_parallel_segments(reviews_table):
+    table, client = reviews_table
+    reviews = list(synthetic_reviews(120))
+    with table.batch_writer() as batch:
+        for index, review in enumerate(reviews):
+            if index % 3:
+                review.pop('review_feed')
+            batch.put_item(Item=review)
+        batch.put_item(Item={'review_id': 'no-created-at', 'content': 'legacy'})
+
+    dry_run, _ = backfill_review_feed.backfill(client, 'QuizNox_Reviews', segments=4, dry_run=True, page_size=7)
+    totals, timings = backfill_review_feed.backfill(client, 'QuizNox_Reviews', segments=4, page_size=7)
+    again, _ = backfill_review_feed.backfill(client, 'QuizNox_Reviews', segments=4)
+
+    assert dry_run['missing'] == totals['updated'] == 80
+    assert totals['scanned'] == 121 and len(timings) == 4
+    assert again['missing'] == 0
+
+    listed = table.query(
+        IndexName=backfill_review_feed.INDEX_NAME,
+        KeyConditionExpression=Key('review_feed').eq('ALL'),
+        ScanIndexForward=False, Limit=10,
+    )
+    expected = sorted((r['created_at'] for r in reviews), reverse=True)[:10]
+    assert [item['created_at'] for item in listed['Items']] == expected
+    assert 'LastEvaluatedKey' in listed
+
+
+def test_index_status(reviews_table):
+    _, client = reviews_table
+    assert backfill_review_feed.index_status(client, 'QuizNox_Reviews') == 'ACTIVE'
+    assert backfill_review_feed.index_status(client, 'QuizNox_Reviews', 'missing-index') == ''
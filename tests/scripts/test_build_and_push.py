@@ -0,0 +1,101 @@
+import build_and_push
+
+DOCKERIGNORE = """# 테스트용 규칙
+*.md
+!CHANGELOG.md
+docs
+!docs/openapi.md
+**/__pycache__
+src/*.tmp
+"""
+
+
+def write_context(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_is_ignored_follows_dockerignore_segment_semantics(tmp_path):
+    (tmp_path / '.dockerignore').write_text(DOCKERIGNORE)
+    rules = build_and_push.load_dockerignore(str(tmp_path))
+
+    def ignored(rel_path):
+        return build_and_push.is_ignored(rel_path, rules)
+
+    # *는 /를 넘지 않는다: 루트의 .md만 제외
+    assert ignored('README.md')
+    assert not ignored('src/README.md')
+    assert ignored('src/cache.tmp')
+    assert not ignored('src/nested/cache.tmp')
+    # **는 0개 이상의 경로 구간
+    assert ignored('__pycache__/a.pyc')
+    assert ignored('scripts/lib/__pycache__/a.pyc')
+    # 디렉토리 규칙은 하위 파일 전체에 적용되고, 뒤에 오는 !가 다시 포함시킨다
+    assert ignored('docs/guide/intro.txt')
+    assert not ignored('docs/openapi.md')
+    assert not ignored('CHANGELOG.md')
+
+
+def test_pattern_matches_character_classes_and_single_segments():
+    assert build_and_push.pattern_matches('log?.txt', 'log1.txt')
+    assert not build_and_push.pattern_matches('log?.txt', 'log/.txt')
+    assert build_and_push.pattern_matches('[a-c]*.js', 'bundle.js')
+    assert not build_and_push.pattern_matches('[a-c]*.js', 'b/app.js')
+    assert not build_and_push.pattern_matches('[^a-c]*.js', 'app.js')
+
+
+def test_context_digest_ignores_excluded_files_and_tracks_reincluded_ones(tmp_path):
+    (tmp_path / '.dockerignore').write_text(DOCKERIGNORE)
+    write_context(tmp_path, {
+        'Dockerfile': 'FROM node:20\n',
+        'src/index.js': 'console.log(1)\n',
+        'README.md': 'readme\n',
+        'CHANGELOG.md': 'v1\n',
+        'docs/openapi.md': 'openapi: 3.0.0\n',
+        'docs/notes.txt': 'notes\n',
+    })
+    digest, count = build_and_push.compute_context_digest(str(tmp_path))
+    assert count == 5  # .dockerignore, Dockerfile, src/index.js, CHANGELOG.md, docs/openapi.md
+
+    # 제외된 파일만 바뀌면 digest는 그대로
+    write_context(tmp_path, {'README.md': 'changed\n', 'docs/notes.txt': 'changed\n'})
+    assert build_and_push.compute_context_digest(str(tmp_path)) == (digest, count)
+
+    # !로 다시 포함된 파일이 바뀌면 digest도 바뀐다
+    write_context(tmp_path, {'docs/openapi.md': 'openapi: 3.1.0\n'})
+    changed, _ = build_and_push.compute_context_digest(str(tmp_path))
+    assert changed != digest
+
+
+class StubEcr:
+    def __init__(self, tags):
+        self.tags = tags
+
+    def batch_get_image(self, repositoryName, imageIds):
+        tag = imageIds[0]['imageTag']
+        manifest = self.tags.get(tag)
+        return {'images': [{'imageManifest': manifest}] if manifest else []}
+
+    def put_image(self, repositoryName, imageManifest, imageTag):
+        # 가변 태그 저장소: 같은 태그를 다른 manifest로 옮긴다
+        self.tags[imageTag] = imageManifest
+
+
+def test_cache_hit_moves_release_tag_to_the_reused_image(monkeypatch, tmp_path):
+    digest = 'a' * 64
+    # X(ctx 태그)가 캐시에 있고, main은 그 뒤에 빌드된 Y를 가리키는 상태
+    ecr = StubEcr({f"ctx-{digest[:32]}": 'manifest-x', build_and_push.RELEASE_TAG: 'manifest-y'})
+    monkeypatch.setattr(build_and_push, 'get_client', lambda service: ecr)
+    monkeypatch.setattr(build_and_push, 'resolve_value', lambda key: '123456789012')
+    monkeypatch.setattr(build_and_push, 'compute_context_digest', lambda root: (digest, 1))
+    monkeypatch.setattr(build_and_push, 'open', lambda *args, **kwargs: open(tmp_path / 'image_uri', 'w'), raising=False)
+    monkeypatch.setenv('IMAGE_TAG', 'sha-c')
+    monkeypatch.delenv('FORCE_BUILD', raising=False)
+
+    build_and_push.main()
+
+    # 캐시 재사용(재태깅)에서도 main 태그가 재사용된 이미지(X)로 옮겨져야 배포 전용 커밋이 X를 배포한다
+    assert ecr.tags['sha-c'] == 'manifest-x'
+    assert ecr.tags[build_and_push.RELEASE_TAG] == 'manifest-x'
@@ -0,0 +1,340 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import canary as canary_module
+import deploy_to_k8s
+from k8s_client import NativeClusterClient
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+NAMESPACE = 'quiznox'
+PROBE_SETTINGS = {'duration': 1, 'rate': 30, 'latency_slack_ms': 20}
+
+
+def test_config_data_includes_dynamodb_client_tuning(monkeypatch):
+    monkeypatch.setenv('DYNAMODB_MAX_SOCKETS', '128')
+    monkeypatch.delenv('DYNAMODB_RETRY_MODE', raising=False)
+
+    data = deploy_to_k8s.get_config_data('ap-northeast-2', 'prod', 'QuizNox_Questions')
+
+    assert data['DYNAMODB_MAX_SOCKETS'] == '128'
+    assert data['DYNAMODB_RETRY_MODE'] == 'adaptive'
+    assert set(deploy_to_k8s.DYNAMODB_CLIENT_DEFAULTS) <= set(data)
+    assert set(deploy_to_k8s.SERVER_DEFAULTS) <= set(data)
+    configmap = deploy_to_k8s.build_configmap('quiznox', data)
+    assert all(isinstance(value, str) for value in configmap['data'].values())
+
+
+def test_stamp_hash_ignores_existing_annotation_and_diff_compares_live_hash():
+    configmap = deploy_to_k8s.stamp_hash(deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': 'info'}))
+    stamped = configmap['metadata']['annotations'][deploy_to_k8s.APPLIED_HASH_ANNOTATION]
+
+    # 이미 찍힌 hash annotation은 해시 계산에서 제외되므로 다시 찍어도 같은 값
+    assert deploy_to_k8s.object_hash(configmap) == stamped
+    changed = deploy_to_k8s.stamp_hash(deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': 'debug'}))
+    assert changed['metadata']['annotations'][deploy_to_k8s.APPLIED_HASH_ANNOTATION] != stamped
+
+    secret = deploy_to_k8s.stamp_hash(deploy_to_k8s.build_secret(NAMESPACE, 'jwt-secret'))
+    live = {'configmap/quiznox-config': configmap}
+    assert deploy_to_k8s.diff_objects([configmap, secret], live) == [secret]
+    assert deploy_to_k8s.diff_objects([changed], live) == [changed]
+
+
+def test_reconcile_creates_missing_skips_unchanged_and_applies_changed(fake_api, kubeconfig):
+    client = NativeClusterClient(kubeconfig)
+    applied = []
+    apply_many = client.apply_many
+
+    def recording_apply_many(objects, field_manager):
+        applied.append(([deploy_to_k8s.object_ref(obj) for obj in objects], field_manager))
+        return apply_many(objects, field_manager)
+
+    client.apply_many = recording_apply_many
+
+    def desired(log_level):
+        return [
+            deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': log_level}),
+            deploy_to_k8s.build_secret(NAMESPACE, 'jwt-secret'),
+        ]
+
+    # 클러스터에 없는 객체는 모두 생성
+    created = deploy_to_k8s.reconcile(client, NAMESPACE, desired('info'))
+    assert [obj['kind'] for obj in created] == ['ConfigMap', 'Secret']
+    assert f"/api/v1/namespaces/{NAMESPACE}/secrets/quiznox-secrets" in fake_api.objects
+
+    # hash가 같으면 apply하지 않는다
+    patches = fake_api.count('PATCH', '/api/v1/')
+    assert deploy_to_k8s.reconcile(client, NAMESPACE, desired('info')) == []
+    assert fake_api.count('PATCH', '/api/v1/') == patches
+
+    # create_only: 이미 있는 객체의 변경은 보류 (카나리 전 단계)
+    assert deploy_to_k8s.reconcile(client, NAMESPACE, desired('warn'), create_only=True) == []
+    assert fake_api.count('PATCH', '/api/v1/') == patches
+
+    # 바뀐 필드가 있는 객체만 server-side apply
+    changed = deploy_to_k8s.reconcile(client, NAMESPACE, desired('debug'))
+    assert [obj['kind'] for obj in changed] == ['ConfigMap']
+    assert applied[-1] == (['configmap/quiznox-config'], deploy_to_k8s.FIELD_MANAGER)
+    live = fake_api.objects[f"/api/v1/namespaces/{NAMESPACE}/configmaps/quiznox-config"]
+    assert live['data'] == {'LOG_LEVEL': 'debug'}
+    assert len(applied) == 2
+
+
+def test_reconcile_refreshes_ecr_secret_only_near_expiry(fake_api, kubeconfig):
+    client = NativeClusterClient(kubeconfig)
+    builds = []
+
+    def ecr_builder(expires_in):
+        def build():
+            builds.append(expires_in)
+            return {
+                'apiVersion': 'v1', 'kind': 'Secret',
+                'metadata': {
+                    'name': deploy_to_k8s.ECR_SECRET_NAME, 'namespace': NAMESPACE,
+                    'annotations': {deploy_to_k8s.ECR_EXPIRES_ANNOTATION: str(int(time.time()) + expires_in)},
+                },
+                'data': {'.dockerconfigjson': 'e30='},
+            }
+        return build
+
+    # 없으면 생성하고, live secret의 만료까지 여유가 있으면 토큰을 다시 받지 않는다
+    changed = deploy_to_k8s.reconcile(client, NAMESPACE, [], ecr_builder(12 * 3600))
+    assert [deploy_to_k8s.object_ref(obj) for obj in changed] == [f"secret/{deploy_to_k8s.ECR_SECRET_NAME}"]
+    assert deploy_to_k8s.reconcile(client, NAMESPACE, [], ecr_builder(12 * 3600)) == []
+    assert builds == [12 * 3600]
+
+    # 만료가 갱신 구간 안으로 들어오면 다시 발급
+    fake_api.objects[f"/api/v1/namespaces/{NAMESPACE}/secrets/{deploy_to_k8s.ECR_SECRET_NAME}"]['metadata']['annotations'][
+        deploy_to_k8s.ECR_EXPIRES_ANNOTATION] = str(int(time.time()) + 60)
+    assert len(deploy_to_k8s.reconcile(client, NAMESPACE, [], ecr_builder(12 * 3600))) == 1
+    assert len(builds) == 2
+
+
+def test_reconcile_applies_hpa_and_pdb_and_leaves_replicas_to_hpa(fake_api, kubeconfig, monkeypatch):
+    monkeypatch.setenv('HPA_TARGET_RPS', '25')
+    monkeypatch.delenv('HPA_MAX_REPLICAS', raising=False)
+    settings = deploy_to_k8s.get_autoscaling_settings()
+    client = NativeClusterClient(kubeconfig)
+
+    def desired():
+        objects = deploy_to_k8s.render_manifests(ROOT_DIR / 'k8s', NAMESPACE, {'IMAGE_URI': 'quiznox:new'})
+        return deploy_to_k8s.release_replicas(objects, settings) + deploy_to_k8s.build_autoscaling(NAMESPACE, settings)
+
+    changed = deploy_to_k8s.reconcile(client, NAMESPACE, desired())
+
+    assert [obj['kind'] for obj in changed][-2:] == ['HorizontalPodAutoscaler', 'PodDisruptionBudget']
+    hpa = fake_api.objects[f"/apis/autoscaling/v2/namespaces/{NAMESPACE}/horizontalpodautoscalers/quiznox-api"]
+    assert hpa['spec']['scaleTargetRef']['name'] == 'quiznox-api'
+    assert (hpa['spec']['minReplicas'], hpa['spec']['maxReplicas']) == (2, 6)
+    pods_metric = next(metric for metric in hpa['spec']['metrics'] if metric['type'] == 'Pods')
+    assert pods_metric['pods']['metric']['name'] == deploy_to_k8s.RPS_METRIC
+    assert pods_metric['pods']['target']['averageValue'] == '25'
+    pdb = fake_api.objects[f"/apis/policy/v1/namespaces/{NAMESPACE}/poddisruptionbudgets/quiznox-api"]
+    assert pdb['spec'] == {'minAvailable': 1, 'selector': {'matchLabels': {'app': 'quiznox-api'}}}
+    deployment = fake_api.objects[f"/apis/apps/v1/namespaces/{NAMESPACE}/deployments/quiznox-api"]
+    assert 'replicas' not in deployment['spec']
+
+    assert deploy_to_k8s.reconcile(client, NAMESPACE, desired()) == []
+
+
+def test_configmap_only_change_rolls_the_deployment(fake_api, kubeconfig):
+    client = NativeClusterClient(kubeconfig)
+
+    def desired(log_level):
+        objects = deploy_to_k8s.render_manifest(ROOT_DIR / 'k8s' / 'deployment.yaml', NAMESPACE, {'IMAGE_URI': 'quiznox:1'})
+        objects += [
+            deploy_to_k8s.build_secret(NAMESPACE, 'jwt-secret'),
+            deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': log_level}),
+        ]
+        return deploy_to_k8s.stamp_config_hash(objects)
+
+    deploy_to_k8s.reconcile(client, NAMESPACE, desired('info'))
+    assert deploy_to_k8s.reconcile(client, NAMESPACE, desired('info')) == []
+
+    # 이미지가 같아도 설정이 바뀌면 Pod template annotation이 바뀌어 Deployment도 롤아웃된다
+    changed = deploy_to_k8s.reconcile(client, NAMESPACE, desired('debug'))
+    assert sorted(obj['kind'] for obj in changed) == ['ConfigMap', 'Deployment']
+    stamped = next(obj for obj in changed if obj['kind'] == 'Deployment')
+    live = fake_api.objects[f"/apis/apps/v1/namespaces/{NAMESPACE}/deployments/quiznox-api"]
+    assert live['spec']['template']['metadata']['annotations'] == stamped['spec']['template']['metadata']['annotations']
+
+
+def test_autoscaling_settings_can_disable_hpa_and_validate_pdb(monkeypatch):
+    # 기본값은 adapter 없이도 동작하는 CPU 지표만 사용
+    for name in deploy_to_k8s.AUTOSCALING_DEFAULTS:
+        monkeypatch.delenv(name, raising=False)
+    default_hpa = deploy_to_k8s.build_hpa(NAMESPACE, deploy_to_k8s.get_autoscaling_settings())
+    assert [metric['type'] for metric in default_hpa['spec']['metrics']] == ['Resource']
+
+    monkeypatch.setenv('HPA_MAX_REPLICAS', '0')
+    settings = deploy_to_k8s.get_autoscaling_settings()
+    deployment = deploy_to_k8s.render_manifest(ROOT_DIR / 'k8s' / 'deployment.yaml', NAMESPACE)
+
+    assert [obj['kind'] for obj in deploy_to_k8s.build_autoscaling(NAMESPACE, settings)] == ['PodDisruptionBudget']
+    assert deploy_to_k8s.release_replicas(deployment, settings)[0]['spec']['replicas'] == 2
+    hpa = deploy_to_k8s.build_hpa(NAMESPACE, {**settings, 'HPA_MAX_REPLICAS': 4})
+    assert [metric['type'] for metric in hpa['spec']['metrics']] == ['Resource']
+
+    monkeypatch.setenv('HPA_MAX_REPLICAS', '4')
+    monkeypatch.setenv('PDB_MIN_AVAILABLE', '2')
+    with pytest.raises(ValueError, match='PDB_MIN_AVAILABLE'):
+        deploy_to_k8s.get_autoscaling_settings()
+
+
+class StubApi:
+    """지연을 조절할 수 있는 QuizNox API 대역 (/questions는 Authorization 헤더 필요)"""
+
+    def __init__(self, delay_ms=0):
+        stub = self
+        self.delay_ms = delay_ms
+        self.paths = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.paths.append(self.path)
+                time.sleep(stub.delay_ms / 1000)
+                authorized = self.path == '/health' or self.headers.get('Authorization', '').startswith('Bearer ')
+                payload = b'{"status":"ok"}' if authorized else b'{"message":"Unauthorized"}'
+                self.send_response(200 if authorized else 401)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def api_pod(name, port, track=None):
+    labels = {'app': 'quiznox-api', **({'track': track} if track else {})}
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Pod',
+        'metadata': {'name': name, 'namespace': NAMESPACE, 'labels': labels},
+        'spec': {'containers': [{'name': 'quiznox-api', 'ports': [{'containerPort': port, 'name': 'http'}]}]},
+        'status': {'podIP': '127.0.0.1', 'conditions': [{'type': 'Ready', 'status': 'True'}]},
+    }
+
+
+@pytest.fixture
+def canary_cluster(fake_api, kubeconfig):
+    """stable Pod(지연 없음)와 카나리 Pod가 있는 가짜 클러스터. canary_stub.delay_ms로 카나리를 느리게 만든다"""
+    stable_stub, canary_stub = StubApi(), StubApi()
+    fake_api.complete_rollouts = True
+    deployment_file = ROOT_DIR / 'k8s' / 'deployment.yaml'
+    current = deploy_to_k8s.render_manifest(deployment_file, NAMESPACE, {'IMAGE_URI': 'quiznox:old'})[0]
+    fake_api.upsert(current)
+    fake_api.upsert({
+        'apiVersion': 'v1', 'kind': 'Service',
+        'metadata': {'name': 'quiznox-api', 'namespace': NAMESPACE},
+        'status': {'loadBalancer': {'ingress': [{'ip': '10.0.0.7'}]}},
+    })
+    fake_api.upsert(deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': 'info'}))
+    fake_api.upsert(api_pod('quiznox-api-1', stable_stub.port))
+    fake_api.upsert(api_pod('quiznox-api-canary-1', canary_stub.port, track='canary'))
+    desired = deploy_to_k8s.render_manifest(deployment_file, NAMESPACE, {'IMAGE_URI': 'quiznox:new'})[0]
+    yield NativeClusterClient(kubeconfig), desired, canary_stub
+    stable_stub.stop()
+    canary_stub.stop()
+
+
+def live_image(fake_api, name):
+    deployment = fake_api.objects.get(f"/apis/apps/v1/namespaces/{NAMESPACE}/deployments/{name}")
+    return deployment and deployment['spec']['template']['spec']['containers'][0]['image']
+
+
+def live_log_level(fake_api):
+    return fake_api.objects[f"/api/v1/namespaces/{NAMESPACE}/configmaps/quiznox-config"]['data']['LOG_LEVEL']
+
+
+RELEASE_OBJECTS = [deploy_to_k8s.build_configmap(NAMESPACE, {'LOG_LEVEL': 'debug'})]
+
+
+def test_canary_within_thresholds_is_promoted(fake_api, canary_cluster):
+    client, desired, canary_stub = canary_cluster
+
+    report = deploy_to_k8s.canary_deploy(client, NAMESPACE, desired, 'jwt-secret', PROBE_SETTINGS, RELEASE_OBJECTS)
+
+    assert report['verdict'] == 'promote' and report['promoted']
+    assert report['pods'] == {'stable': ['quiznox-api-1'], 'canary': ['quiznox-api-canary-1']}
+    assert report['results']['canary']['/questions?topicId=AWS_DVA']['errors'] == 0
+    assert '/questions?topicId=AWS_DVA' in canary_stub.paths
+    assert live_image(fake_api, 'quiznox-api') == 'quiznox:new'
+    assert live_log_level(fake_api) == 'debug'
+    assert live_image(fake_api, 'quiznox-api-canary') is None
+    # stable selector(app=...)는 카나리 Pod도 포함하므로 stable 쪽은 track!=canary로 거른다
+    stable_pods = client.list('Pod', NAMESPACE, canary_module.stable_selector('quiznox-api'))
+    assert [pod['metadata']['name'] for pod in stable_pods] == ['quiznox-api-1']
+
+
+def test_slow_canary_is_rolled_back(fake_api, canary_cluster):
+    client, desired, canary_stub = canary_cluster
+    canary_stub.delay_ms = 60
+
+    report = deploy_to_k8s.canary_deploy(client, NAMESPACE, desired, 'jwt-secret', PROBE_SETTINGS, RELEASE_OBJECTS)
+
+    assert report['verdict'] == 'rollback'
+    assert 'p50_ms' in report['reason']
+    # 롤백하면 이미지뿐 아니라 보류했던 설정 변경도 반영하지 않는다
+    assert live_image(fake_api, 'quiznox-api') == 'quiznox:old'
+    assert live_log_level(fake_api) == 'info'
+    assert live_image(fake_api, 'quiznox-api-canary') is None
+    applied = next(obj for _, _, _, obj in fake_api.events if obj['metadata']['name'] == 'quiznox-api-canary')
+    assert applied['spec']['replicas'] == 1
+    assert applied['spec']['selector']['matchLabels'] == {'app': 'quiznox-api', 'track': 'canary'}
+    assert applied['spec']['template']['spec']['containers'][0]['image'] == 'quiznox:new'
+
+
+def test_canary_is_deleted_when_probing_fails(fake_api, canary_cluster, monkeypatch):
+    client, desired, _ = canary_cluster
+
+    def failing_evaluate(tracks, jwt_secret, settings):
+        raise RuntimeError('probe crashed')
+
+    monkeypatch.setattr(deploy_to_k8s, 'evaluate', failing_evaluate)
+    with pytest.raises(RuntimeError, match='probe crashed'):
+        deploy_to_k8s.canary_deploy(client, NAMESPACE, desired, 'jwt-secret', PROBE_SETTINGS, RELEASE_OBJECTS)
+
+    assert live_image(fake_api, 'quiznox-api-canary') is None
+    assert live_image(fake_api, 'quiznox-api') == 'quiznox:old'
+    assert live_log_level(fake_api) == 'info'
+
+
+def test_compare_allows_small_regressions_and_checks_error_rate():
+    stable = {'/health': {'requests': 20, 'errors': 0, 'error_rate': 0, 'p50_ms': 10.0, 'p95_ms': 20.0}}
+    canary = {'/health': {'requests': 20, 'errors': 1, 'error_rate': 0.05, 'p50_ms': 11.0, 'p95_ms': 24.0}}
+    settings = {**canary_module.DEFAULT_SETTINGS, 'latency_slack_ms': 0, 'max_error_rate_increase': 0.01}
+
+    checks = {c['metric']: c for c in canary_module.compare({'stable': stable, 'canary': canary}, settings)}
+
+    assert checks['p50_ms']['passed'] and checks['p95_ms']['passed']
+    assert checks['p50_ms']['limit'] == 12.0
+    assert not checks['error_rate']['passed']
+
+
+def test_canary_settings_are_read_from_env_at_call_time(monkeypatch):
+    monkeypatch.setenv('CANARY_RATE', '25')
+    monkeypatch.setenv('CANARY_PATHS', '/health,,/questions')
+
+    settings = canary_module.canary_settings()
+
+    assert settings['rate'] == 25.0 and settings['paths'] == ['/health', '/questions']
+    assert settings['duration'] == canary_module.DEFAULT_SETTINGS['duration']
+    assert canary_module.DEFAULT_SETTINGS['rate'] == 10.0
@@ -0,0 +1,136 @@
+import socket
+from pathlib import Path
+
+import pytest
+import urllib3
+
+import k8s_client
+from k8s_client import K8sApiError, KubectlClusterClient, NativeClusterClient, get_cluster_client
+
+NAMESPACE = 'quiznox'
+CONFIGMAP_PATH = f"/api/v1/namespaces/{NAMESPACE}/configmaps/quiznox-config"
+
+
+def configmap(data):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': 'quiznox-config', 'namespace': NAMESPACE},
+        'data': data,
+    }
+
+
+def test_get_cluster_client_prefers_native_client(kubeconfig, monkeypatch):
+    monkeypatch.delenv('K8S_CLIENT', raising=False)
+
+    client = get_cluster_client(kubeconfig)
+
+    assert isinstance(client, NativeClusterClient)
+    assert client.version()['gitVersion'] == 'v1.30.0-fake'
+    client.close()
+
+
+def test_get_cluster_client_falls_back_to_kubectl(tmp_path, monkeypatch):
+    monkeypatch.delenv('K8S_CLIENT', raising=False)
+    # exec 플러그인 인증(EKS 등)은 네이티브 클라이언트가 처리하지 못한다
+    path = tmp_path / 'kubeconfig'
+    path.write_text("""apiVersion: v1
+kind: Config
+clusters:
+  - name: eks
+    cluster:
+      server: https://example.eks.amazonaws.com
+contexts:
+  - name: eks
+    context:
+      cluster: eks
+      user: eks
+current-context: eks
+users:
+  - name: eks
+    user:
+      exec:
+        apiVersion: client.authentication.k8s.io/v1beta1
+        command: aws
+""")
+
+    client = get_cluster_client(str(path))
+
+    assert isinstance(client, KubectlClusterClient)
+    assert client._env['KUBECONFIG'] == str(path)
+
+
+def test_get_cluster_client_can_force_kubectl(kubeconfig, monkeypatch):
+    monkeypatch.setenv('K8S_CLIENT', 'kubectl')
+
+    assert isinstance(get_cluster_client(kubeconfig), KubectlClusterClient)
+
+
+def test_native_client_maps_api_errors(fake_api, kubeconfig):
+    client = NativeClusterClient(kubeconfig)
+
+    # 404는 "없음"으로 처리: get은 None, delete는 무시
+    assert client.get('ConfigMap', 'quiznox-config', NAMESPACE) is None
+    client.delete('ConfigMap', 'quiznox-config', NAMESPACE)
+
+    client.apply(configmap({'LOG_LEVEL': 'info'}), 'quiznox-deploy')
+    assert client.get('ConfigMap', 'quiznox-config', NAMESPACE)['data'] == {'LOG_LEVEL': 'info'}
+
+    # 그 밖의 오류는 상태 코드와 서버 메시지를 담은 K8sApiError
+    fake_api.failures[('GET', CONFIGMAP_PATH)] = (403, 'configmaps "quiznox-config" is forbidden')
+    with pytest.raises(K8sApiError, match='forbidden') as error:
+        client.get('ConfigMap', 'quiznox-config', NAMESPACE)
+    assert error.value.status == 403
+
+    fake_api.failures[('PATCH', CONFIGMAP_PATH)] = (409, 'Apply failed with 1 conflict')
+    with pytest.raises(K8sApiError) as error:
+        client.apply(configmap({'LOG_LEVEL': 'debug'}), 'quiznox-deploy')
+    assert error.value.status == 409
+
+    fake_api.failures[('DELETE', CONFIGMAP_PATH)] = (500, 'etcdserver: request timed out')
+    with pytest.raises(K8sApiError) as error:
+        client.delete('ConfigMap', 'quiznox-config', NAMESPACE)
+    assert error.value.status == 500
+    assert fake_api.objects[CONFIGMAP_PATH]['data'] == {'LOG_LEVEL': 'info'}
+    client.close()
+
+
+def test_native_client_maps_proxy_and_connection_errors(fake_api, kubeconfig, tmp_path):
+    client = NativeClusterClient(kubeconfig)
+
+    # API 서버 앞단 프록시의 HTML 오류 페이지: 본문 텍스트를 메시지로 사용
+    fake_api.failures[('GET', CONFIGMAP_PATH)] = (502, '<html><body>502 Bad Gateway</body></html>', 'text/html')
+    with pytest.raises(K8sApiError, match='502 Bad Gateway') as error:
+        client.get('ConfigMap', 'quiznox-config', NAMESPACE)
+    assert error.value.status == 502
+    client.close()
+
+    # 연결 거부(NewConnectionError)는 status 없는 K8sApiError
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        closed_port = sock.getsockname()[1]
+    refused = tmp_path / 'refused-kubeconfig'
+    refused.write_text(Path(kubeconfig).read_text().replace(fake_api.url, f"http://127.0.0.1:{closed_port}"))
+    client = NativeClusterClient(str(refused))
+    with pytest.raises(K8sApiError, match='GET /version failed') as error:
+        client.version()
+    assert error.value.status is None
+    assert isinstance(error.value.__cause__, urllib3.exceptions.NewConnectionError)
+    client.close()
+
+
+def test_native_client_rejects_unsupported_server_scheme(tmp_path):
+    path = tmp_path / 'kubeconfig'
+    path.write_text("""clusters:
+  - name: local
+    cluster:
+      server: unix:///var/run/k8s.sock
+contexts:
+  - name: local
+    context:
+      cluster: local
+current-context: local
+""")
+
+    with pytest.raises(k8s_client.UnsupportedKubeconfig):
+        NativeClusterClient(str(path))
@@ -0,0 +1,185 @@
+import time
+
+import pytest
+
+from k8s_client import NativeClusterClient
+from k8s_watch import RolloutFailed, pod_readiness_timings, rollout_complete, wait_for_ready, watch_until
+
+NAMESPACE = 'quiznox'
+
+
+def deployment(ready_replicas=0, generation=1):
+    return {
+        'apiVersion': 'apps/v1',
+        'kind': 'Deployment',
+        'metadata': {'name': 'quiznox-api', 'namespace': NAMESPACE, 'generation': generation},
+        'spec': {'replicas': 2},
+        'status': {
+            'observedGeneration': generation,
+            'replicas': 2,
+            'updatedReplicas': 2,
+            'availableReplicas': ready_replicas,
+        },
+    }
+
+
+def service(address=None):
+    status = {'loadBalancer': {'ingress': [{'ip': address}]}} if address else {'loadBalancer': {}}
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Service',
+        'metadata': {'name': 'quiznox-api', 'namespace': NAMESPACE},
+        'spec': {'ports': [{'port': 80, 'nodePort': 30080}]},
+        'status': status,
+    }
+
+
+def ready_pod(name, labels=None):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Pod',
+        'metadata': {
+            'name': name,
+            'namespace': NAMESPACE,
+            'labels': labels or {'app': 'quiznox-api'},
+            'creationTimestamp': '2024-01-01T00:00:00Z',
+        },
+        'status': {
+            'conditions': [
+                {'type': 'PodScheduled', 'status': 'True', 'lastTransitionTime': '2024-01-01T00:00:01Z'},
+                {'type': 'Ready', 'status': 'True', 'lastTransitionTime': '2024-01-01T00:00:12Z'},
+            ],
+            'containerStatuses': [{'state': {'running': {'startedAt': '2024-01-01T00:00:04Z'}}}],
+        },
+    }
+
+
+def test_rollout_complete_requires_observed_generation_and_available_replicas():
+    assert rollout_complete(deployment(ready_replicas=2))
+    assert not rollout_complete(deployment(ready_replicas=1))
+    stale = deployment(ready_replicas=2)
+    stale['metadata']['generation'] = 2
+    assert not rollout_complete(stale)
+
+
+def stuck(obj):
+    obj['status']['conditions'] = [{
+        'type': 'Progressing', 'status': 'False', 'reason': 'ProgressDeadlineExceeded',
+        'message': 'ReplicaSet "quiznox-api-7f9" has timed out progressing.',
+    }]
+    return obj
+
+
+def test_rollout_complete_raises_when_progress_deadline_exceeded():
+    with pytest.raises(RolloutFailed, match='progress deadline'):
+        rollout_complete(stuck(deployment(ready_replicas=1)))
+    # 새 generation을 아직 관찰하지 않았다면 이전 롤아웃의 조건이므로 무시
+    restarted = stuck(deployment(ready_replicas=1))
+    restarted['metadata']['generation'] = 2
+    assert not rollout_complete(restarted)
+
+
+def test_wait_for_ready_fails_fast_on_progress_deadline(fake_api, kubeconfig):
+    fake_api.upsert(deployment(ready_replicas=0))
+    fake_api.update_later(0.3, stuck(deployment(ready_replicas=1)))
+
+    client = NativeClusterClient(kubeconfig)
+    start = time.monotonic()
+    result = wait_for_ready(client, NAMESPACE, 'quiznox-api', timeout=30)
+
+    assert not result['rollout_ready']
+    assert 'exceeded its progress deadline' in result['errors'][0]
+    assert time.monotonic() - start < 5
+
+
+def test_wait_for_ready_lists_pods_by_deployment_selector(fake_api, kubeconfig):
+    canary = deployment(ready_replicas=2)
+    canary['metadata']['name'] = 'quiznox-api-canary'
+    canary['spec']['selector'] = {'matchLabels': {'app': 'quiznox-api', 'track': 'canary'}}
+    fake_api.upsert(canary)
+    fake_api.upsert(ready_pod('quiznox-api-1'))
+    fake_api.upsert(ready_pod('quiznox-api-canary-1', {'app': 'quiznox-api', 'track': 'canary'}))
+
+    client = NativeClusterClient(kubeconfig)
+    result = wait_for_ready(client, NAMESPACE, 'quiznox-api-canary', timeout=10)
+
+    assert list(result['pods']) == ['quiznox-api-canary-1']
+
+
+def test_pod_readiness_timings_uses_server_timestamps():
+    assert pod_readiness_timings(ready_pod('a')) == {'scheduled': 1.0, 'started': 4.0, 'ready': 12.0}
+
+
+def test_wait_for_ready_returns_once_rollout_and_ingress_are_ready(fake_api, kubeconfig):
+    fake_api.upsert(deployment(ready_replicas=0))
+    fake_api.upsert(service())
+    fake_api.upsert(ready_pod('quiznox-api-1'))
+    fake_api.update_later(0.3, deployment(ready_replicas=2))
+    fake_api.update_later(0.5, service('10.0.0.7'))
+
+    client = NativeClusterClient(kubeconfig)
+    start = time.monotonic()
+    result = wait_for_ready(client, NAMESPACE, 'quiznox-api', service_name='quiznox-api', timeout=10)
+    elapsed = time.monotonic() - start
+
+    assert result['rollout_ready']
+    assert result['service_address'] == '10.0.0.7'
+    assert result['pods'] == {'quiznox-api-1': {'scheduled': 1.0, 'started': 4.0, 'ready': 12.0}}
+    assert result['errors'] == []
+    assert elapsed < 3
+    # 폴링이 아니라 list 1회 + watch 스트림으로 대기해야 한다
+    assert fake_api.count('GET', '/apis/apps/v1/namespaces/quiznox/deployments', watch=False) == 1
+    assert fake_api.count('GET', '/apis/apps/v1/namespaces/quiznox/deployments', watch=True) == 1
+
+
+def test_wait_for_ready_reports_missing_ingress_without_failing_rollout(fake_api, kubeconfig):
+    fake_api.upsert(deployment(ready_replicas=2))
+    fake_api.upsert(service())
+
+    client = NativeClusterClient(kubeconfig)
+    result = wait_for_ready(client, NAMESPACE, 'quiznox-api', service_name='quiznox-api', timeout=10, service_timeout=1)
+
+    assert result['rollout_ready']
+    assert result['service_address'] == ''
+
+
+def test_watch_resumes_from_last_resource_version_after_stream_ends(fake_api, kubeconfig):
+    fake_api.upsert(deployment(ready_replicas=0))
+    fake_api.update_later(1.5, deployment(ready_replicas=2))
+
+    client = NativeClusterClient(kubeconfig)
+    found = watch_until(
+        client, 'Deployment', NAMESPACE, rollout_complete, time.monotonic() + 10,
+        field_selector='metadata.name=quiznox-api', watch_window=1,
+    )
+
+    assert found['status']['availableReplicas'] == 2
+    assert fake_api.count('GET', '/apis/apps/v1/namespaces/quiznox/deployments', watch=False) == 1
+    assert fake_api.count('GET', '/apis/apps/v1/namespaces/quiznox/deployments', watch=True) == 2
+
+
+def test_watch_relists_when_resource_version_expired(fake_api, kubeconfig):
+    fake_api.upsert(deployment(ready_replicas=0))
+    fake_api.upsert(service())
+    fake_api.compact()
+
+    client = NativeClusterClient(kubeconfig)
+    original_list = client.list_resource
+    calls = []
+
+    def list_with_stale_version(*args, **kwargs):
+        listing = original_list(*args, **kwargs)
+        if not calls:
+            listing['metadata']['resourceVersion'] = '1'
+        calls.append(listing)
+        return listing
+
+    client.list_resource = list_with_stale_version
+    fake_api.update_later(0.3, deployment(ready_replicas=2))
+    found = watch_until(
+        client, 'Deployment', NAMESPACE, rollout_complete, time.monotonic() + 10,
+        field_selector='metadata.name=quiznox-api',
+    )
+
+    assert found is not None
+    assert len(calls) == 2
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import loadtest
+
+
+class StubApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    authorizations = []
+    posted = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.authorizations.append(self.headers.get('Authorization'))
+        time.sleep(0.01)
+        if self.path.startswith('/reviews'):
+            # chunked 응답
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in (b'[', b'{"id":1}', b']'):
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+            return
+        payload = b'[{"question_number":"0001"}]'
+        self.send_response(200 if 'topicId=' in self.path else 400)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.posted.append(body)
+        payload = json.dumps(body).encode()
+        self.send_response(201)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stub_api():
+    StubApi.authorizations = []
+    StubApi.posted = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_mint_jwt_is_hs256_signed():
+    token = loadtest.mint_jwt('secret', 'user-1')
+    header, payload, signature = token.split('.')
+    expected = hmac.new(b'secret', f"{header}.{payload}".encode(), hashlib.sha256).digest()
+
+    assert base64.urlsafe_b64decode(signature + '==') == expected
+    claims = json.loads(base64.urlsafe_b64decode(payload + '=='))
+    assert claims['user_id'] == 'user-1' and claims['exp'] > time.time()
+
+
+def test_open_loop_scenario_reports_latency_and_rps(stub_api):
+    context = {'topics': ['AWS_DVA'], 'token': 'token'}
+
+    summary = asyncio.run(loadtest.run_scenario(stub_api, 'mixed', context, rate=100, duration=1,
+                                                connections=4, max_inflight=100))
+
+    assert summary['requests'] == 100
+    assert summary['status_codes'] == {'200': 100}
+    assert 0 < summary['latency_ms']['p50'] <= summary['latency_ms']['p99'] <= summary['latency_ms']['max']
+    assert sum(bucket['count'] for bucket in summary['histogram']) == 100
+    assert 50 < summary['rps'] <= 100
+    assert set(StubApi.authorizations) == {'Bearer token'}
+
+
+def test_write_scenario_posts_json_bodies(stub_api):
+    context = {'topics': ['AWS_DVA'], 'token': 'token'}
+
+    summary = asyncio.run(loadtest.run_scenario(stub_api, 'review-writes', context, rate=100, duration=0.5,
+                                                connections=4, max_inflight=100))
+
+    assert summary['requests'] == 50
+    assert summary['error_rate'] == 0
+    assert StubApi.posted and all(body['content'].startswith('loadtest review') for body in StubApi.posted)
@@ -0,0 +1,147 @@
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from local_dynamodb import LocalDynamoDBServer
+from loadtest import seed_tables
+
+
+@pytest.fixture
+def dynamodb():
+    with LocalDynamoDBServer() as server:
+        server.database.create_tables()
+        yield boto3.resource(
+            'dynamodb', endpoint_url=server.endpoint, region_name='ap-northeast-2',
+            aws_access_key_id='local', aws_secret_access_key='local',
+        )
+
+
+def test_query_pages_large_topics_like_dynamodb(dynamodb):
+    seed_tables(dynamodb.meta.client.meta.endpoint_url, ['AWS_DVA'], 1500, 0)
+    table = dynamodb.Table('QuizNox_Questions')
+
+    pages, items, params = 0, [], {'KeyConditionExpression': Key('topic_id').eq('AWS_DVA')}
+    while True:
+        resp = table.query(**params)
+        pages += 1
+        items.extend(resp['Items'])
+        if 'LastEvaluatedKey' not in resp:
+            break
+        params['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+    assert pages > 1
+    assert [item['question_number'] for item in items] == [f"{n:04d}" for n in range(1, 1501)]
+    assert set(items[0]) == {'topic_id', 'question_number', 'question_text', 'choices', 'most_voted_answer'}
+
+
+def test_query_range_conditions_and_projection(dynamodb):
+    table = dynamodb.Table('QuizNox_Questions')
+    for number in range(1, 11):
+        table.put_item(Item={'topic_id': 'T', 'question_number': f"{number:04d}", 'question_text': 'q'})
+
+    resp = table.query(
+        KeyConditionExpression=Key('topic_id').eq('T') & Key('question_number').between('0003', '0005'),
+        ProjectionExpression='question_number', ScanIndexForward=False,
+    )
+
+    assert resp['Items'] == [{'question_number': '0005'}, {'question_number': '0004'}, {'question_number': '0003'}]
+
+
+def test_scan_segments_cover_table_once(dynamodb):
+    seed_tables(dynamodb.meta.client.meta.endpoint_url, [], 0, 200)
+    table = dynamodb.Table('QuizNox_Reviews')
+
+    seen = []
+    for segment in range(4):
+        seen.extend(item['review_id'] for item in table.scan(Segment=segment, TotalSegments=4)['Items'])
+
+    assert len(seen) == len(set(seen)) == 200
+
+
+def test_missing_table_is_resource_not_found(dynamodb):
+    with pytest.raises(ClientError) as error:
+        dynamodb.Table('Missing').get_item(Key={'id': 'x'})
+    assert error.value.response['Error']['Code'] == 'ResourceNotFoundException'
+
+
+def test_index_query_pages_newest_first(dynamodb):
+    table = dynamodb.Table('QuizNox_Reviews')
+    for minute in range(10):
+        table.put_item(Item={'review_id': f"r{minute}", 'review_feed': 'ALL', 'created_at': f"2024-01-01T00:{minute:02d}"})
+    table.put_item(Item={'review_id': 'r3', 'review_feed': 'ALL', 'created_at': '2024-01-02T00:00'})
+    table.delete_item(Key={'review_id': 'r9'})
+
+    seen, params = [], {'IndexName': 'review_feed-created_at-index', 'ScanIndexForward': False, 'Limit': 4,
+                        'KeyConditionExpression': Key('review_feed').eq('ALL')}
+    while True:
+        resp = table.query(**params)
+        seen.extend(item['review_id'] for item in resp['Items'])
+        if 'LastEvaluatedKey' not in resp:
+            break
+        params['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+    assert seen == ['r3', 'r8', 'r7', 'r6', 'r5', 'r4', 'r2', 'r1', 'r0']
+
+
+def test_conditional_writes(dynamodb):
+    table = dynamodb.Table('QuizNox_Reviews')
+    table.put_item(Item={'review_id': 'r1', 'user_id': 'alice', 'content': 'hi'})
+
+    updated = table.update_item(
+        Key={'review_id': 'r1'}, UpdateExpression='SET content = :c, updated_at = :u REMOVE #old',
+        ConditionExpression='attribute_exists(review_id) AND user_id = :uid',
+        ExpressionAttributeNames={'#old': 'missing'},
+        ExpressionAttributeValues={':c': 'edited', ':u': 'now', ':uid': 'alice'}, ReturnValues='ALL_NEW',
+    )['Attributes']
+    assert updated == {'review_id': 'r1', 'user_id': 'alice', 'content': 'edited', 'updated_at': 'now'}
+
+    with pytest.raises(ClientError) as error:
+        table.delete_item(Key={'review_id': 'r1'}, ConditionExpression='user_id = :uid',
+                          ExpressionAttributeValues={':uid': 'mallory'})
+    assert error.value.response['Error']['Code'] == 'ConditionalCheckFailedException'
+
+    with pytest.raises(ClientError):
+        table.put_item(Item={'review_id': 'r1'}, ConditionExpression='attribute_not_exists(review_id)')
+    assert table.get_item(Key={'review_id': 'r1'})['Item']['content'] == 'edited'
+
+
+def test_condition_failure_returns_old_item(dynamodb):
+    table = dynamodb.Table('QuizNox_Reviews')
+    table.put_item(Item={'review_id': 'r1', 'user_id': 'alice'})
+    condition = {
+        'ConditionExpression': 'attribute_exists(review_id) AND user_id = :uid',
+        'ExpressionAttributeValues': {':uid': 'mallory'},
+        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+    }
+
+    with pytest.raises(ClientError) as error:
+        table.delete_item(Key={'review_id': 'r1'}, **condition)
+    assert error.value.response['Item'] == {'review_id': {'S': 'r1'}, 'user_id': {'S': 'alice'}}
+
+    with pytest.raises(ClientError) as error:
+        table.delete_item(Key={'review_id': 'missing'}, **condition)
+    assert 'Item' not in error.value.response
+
+
+def test_batch_write_returns_unprocessed_items():
+    with LocalDynamoDBServer(unprocessed_rate=0.5) as server:
+        server.database.create_tables()
+        client = boto3.client(
+            'dynamodb', endpoint_url=server.endpoint, region_name='ap-northeast-2',
+            aws_access_key_id='local', aws_secret_access_key='local',
+        )
+        requests = [{'PutRequest': {'Item': {'review_id': {'S': f"r{n}"}}}} for n in range(25)]
+
+        written = 0
+        attempts = 0
+        while requests:
+            attempts += 1
+            unprocessed = client.batch_write_item(RequestItems={'QuizNox_Reviews': requests})['UnprocessedItems']
+            remaining = unprocessed.get('QuizNox_Reviews', [])
+            written += len(requests) - len(remaining)
+            requests = remaining
+
+        assert written == 25
+        assert attempts > 1
+        assert client.describe_table(TableName='QuizNox_Reviews')['Table']['ItemCount'] == 25
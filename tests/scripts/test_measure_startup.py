@@ -0,0 +1,58 @@
+import itertools
+
+import measure_startup
+from k8s_client import NativeClusterClient
+
+NAMESPACE = 'quiznox'
+
+
+def started_pod(name, ready_after):
+    """생성 후 1초에 컨테이너가 시작되고 ready_after초에 Ready가 된 Pod"""
+    def at(seconds):
+        return f"2024-01-01T00:00:{seconds:06.3f}Z"
+
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Pod',
+        'metadata': {
+            'name': name, 'namespace': NAMESPACE, 'labels': {'app': 'quiznox-api'},
+            'creationTimestamp': at(0),
+        },
+        'status': {
+            'conditions': [
+                {'type': 'PodScheduled', 'status': 'True', 'lastTransitionTime': at(0.5)},
+                {'type': 'Ready', 'status': 'True', 'lastTransitionTime': at(ready_after)},
+            ],
+            'containerStatuses': [{'state': {'running': {'startedAt': at(1)}}}],
+        },
+    }
+
+
+def test_measure_restarts_deployment_and_times_only_new_pods(fake_api, kubeconfig):
+    fake_api.complete_rollouts = True
+    fake_api.upsert({
+        'apiVersion': 'apps/v1', 'kind': 'Deployment',
+        'metadata': {'name': 'quiznox-api', 'namespace': NAMESPACE}, 'spec': {'replicas': 1},
+    })
+    fake_api.upsert(started_pod('quiznox-api-old', 30))
+    ready_times = itertools.count(2)
+
+    def replace_pod(obj):
+        # 컨트롤러처럼 재시작마다 새 Pod를 만든다
+        if obj['kind'] == 'Deployment':
+            fake_api.upsert(started_pod(f"quiznox-api-{len(fake_api.objects)}", next(ready_times)))
+
+    fake_api.after_apply = replace_pod
+
+    report = measure_startup.measure(NativeClusterClient(kubeconfig), NAMESPACE, 'quiznox-api', restarts=3)
+
+    assert [len(entry['pods']) for entry in report['rounds']] == [1, 1, 1]
+    assert all('quiznox-api-old' not in entry['pods'] for entry in report['rounds'])
+    assert report['summary']['app'] == {'p50': 2.0, 'p95': 3.0, 'max': 3.0}
+    assert report['summary']['scheduled']['max'] == 0.5
+    patches = [obj for _, _, _, obj in fake_api.events if obj['kind'] == 'Deployment']
+    restarted = {
+        obj['spec']['template']['metadata']['annotations'][measure_startup.RESTART_ANNOTATION]
+        for obj in patches[1:]
+    }
+    assert len(restarted) == 3
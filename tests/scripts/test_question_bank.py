@@ -0,0 +1,117 @@
+import csv
+import gzip
+import json
+
+import boto3
+import pytest
+
+import question_bank
+from local_dynamodb import LocalDynamoDBServer
+from loadtest import synthetic_questions
+
+TEMPLATE = {
+    'question_text': 'Which AWS service should the company use?',
+    'choices': ['A. Amazon ElastiCache', 'B. Amazon RDS', 'C. Amazon DynamoDB', 'D. Amazon S3'],
+    'most_voted_answer': 'A',
+}
+
+
+@pytest.fixture
+def dynamodb():
+    with LocalDynamoDBServer(unprocessed_rate=0.2) as server:
+        server.database.create_tables()
+        yield boto3.client(
+            'dynamodb', endpoint_url=server.endpoint, region_name='ap-northeast-2',
+            aws_access_key_id='local', aws_secret_access_key='local',
+        )
+
+
+def write_inputs(tmp_path):
+    questions = list(synthetic_questions('AWS_DVA', 40, [TEMPLATE]))
+    (tmp_path / 'dva.json').write_text(json.dumps(questions[:30]))
+    with gzip.open(tmp_path / 'dva.ndjson.gz', 'wt') as handle:
+        for question in questions[25:]:
+            handle.write(json.dumps(question) + '\n')
+    with open(tmp_path / 'saa.csv', 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=question_bank.QUESTION_FIELDS)
+        writer.writeheader()
+        for number in range(1, 6):
+            writer.writerow({**TEMPLATE, 'topic_id': 'AWS_SAA', 'question_number': number,
+                             'choices': '|'.join(TEMPLATE['choices'])})
+    return [tmp_path / 'dva.json', tmp_path / 'dva.ndjson.gz', tmp_path / 'saa.csv']
+
+
+def test_load_questions_validates_and_dedupes(tmp_path):
+    paths = write_inputs(tmp_path)
+    (tmp_path / 'bad.ndjson').write_text(
+        json.dumps({**TEMPLATE, 'topic_id': 'X', 'question_number': '1', 'most_voted_answer': 'E'}) + '\n'
+        + json.dumps({'topic_id': 'X', 'question_number': '', 'choices': 'A'}) + '\n'
+    )
+
+    questions, errors, duplicates = question_bank.load_questions(paths + [tmp_path / 'bad.ndjson'])
+
+    assert len(questions) == 45 and duplicates == 5
+    assert questions[-1]['topic_id'] == 'AWS_SAA' and questions[-1]['question_number'] == '0005'
+    assert any('bad.ndjson:1' in error and 'out of range' in error for error in errors)
+    assert sum('bad.ndjson:2' in error for error in errors) == 4
+
+
+def test_import_retries_unprocessed_items_and_resumes(dynamodb, tmp_path):
+    questions, _, _ = question_bank.load_questions(write_inputs(tmp_path))
+    path = tmp_path / 'import-checkpoint.json'
+    meta = {'input': question_bank.fingerprint(questions)}
+    question_bank.Checkpoint(path, meta).update(lambda state: state.update(done=[0]))
+
+    stats = question_bank.import_questions(
+        dynamodb, 'QuizNox_Questions', questions, workers=4,
+        checkpoint=question_bank.Checkpoint(path, meta),
+        throttle=question_bank.AdaptiveThrottle(rate=1000),
+    )
+
+    assert stats['batches'] == 2 and stats['skipped'] == 1 and stats['written'] == 20
+    assert stats['throttles'] > 0
+    count = dynamodb.scan(TableName='QuizNox_Questions', Select='COUNT')['Count']
+    assert count == 20
+
+
+class FailingClient:
+    """scan을 fail_after번 성공한 뒤 실패하는 클라이언트 (중단 후 재시작 확인용)"""
+
+    def __init__(self, client, fail_after):
+        self.client = client
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def scan(self, **params):
+        self.calls += 1
+        if self.calls > self.fail_after:
+            raise RuntimeError('connection lost')
+        return self.client.scan(**params)
+
+
+def test_export_segments_to_gzip_ndjson_and_resumes(dynamodb, tmp_path):
+    questions = list(synthetic_questions('AWS_DVA', 60, [TEMPLATE]))
+    question_bank.import_questions(dynamodb, 'QuizNox_Questions', questions,
+                                   throttle=question_bank.AdaptiveThrottle(rate=1000))
+    output = tmp_path / 'dump'
+
+    with pytest.raises(RuntimeError):
+        question_bank.export_table(FailingClient(dynamodb, 3), 'QuizNox_Questions', output,
+                                   segments=2, page_size=7)
+    counts, resumed = question_bank.export_table(dynamodb, 'QuizNox_Questions', output, segments=2, page_size=7)
+
+    assert resumed and sum(counts.values()) == 60
+    exported, _, duplicates = question_bank.load_questions([output])
+    assert duplicates == 0
+    assert exported == sorted(questions, key=lambda q: (q['topic_id'], q['question_number']))
+
+
+def test_adaptive_throttle_halves_on_throttle_and_recovers():
+    throttle = question_bank.AdaptiveThrottle(rate=40, min_rate=5, increase=2)
+    throttle.on_throttle()
+    throttle.on_throttle()
+    throttle.on_throttle()
+    throttle.on_throttle()
+    assert throttle.rate == 5
+    throttle.on_success()
+    assert throttle.rate == 7 and throttle.throttles == 4
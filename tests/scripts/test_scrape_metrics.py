@@ -0,0 +1,77 @@
+import pytest
+
+import scrape_metrics
+
+BEFORE = '''
+# TYPE quiznox_http_request_duration_seconds histogram
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="0.01"} 10
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="0.1"} 10
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="+Inf"} 10
+quiznox_http_request_duration_seconds_sum{method="GET",route="/questions",status_code="200"} 0.05
+quiznox_http_request_duration_seconds_count{method="GET",route="/questions",status_code="200"} 10
+quiznox_dynamodb_requests_total{operation="Query",table="QuizNox_Questions",outcome="ok"} 4
+'''
+
+AFTER = '''
+# TYPE quiznox_http_request_duration_seconds histogram
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="0.01"} 60
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="0.1"} 110
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/questions",status_code="200",le="+Inf"} 110
+quiznox_http_request_duration_seconds_sum{method="GET",route="/questions",status_code="200"} 3.05
+quiznox_http_request_duration_seconds_count{method="GET",route="/questions",status_code="200"} 110
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/reviews",status_code="500",le="0.01"} 2
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/reviews",status_code="500",le="0.1"} 2
+quiznox_http_request_duration_seconds_bucket{method="GET",route="/reviews",status_code="500",le="+Inf"} 2
+quiznox_http_request_duration_seconds_sum{method="GET",route="/reviews",status_code="500"} 0.01
+quiznox_http_request_duration_seconds_count{method="GET",route="/reviews",status_code="500"} 2
+quiznox_http_request_phase_seconds_sum{route="/questions",phase="handler"} 0.2
+quiznox_http_request_phase_seconds_count{route="/questions",phase="handler"} 100
+quiznox_dynamodb_requests_total{operation="Query",table="QuizNox_Questions",outcome="ok"} 8
+quiznox_dynamodb_requests_total{operation="Query",table="QuizNox_Questions",outcome="ThrottlingException"} 1
+quiznox_dynamodb_request_duration_seconds_bucket{operation="Query",table="QuizNox_Questions",le="0.01"} 5
+quiznox_dynamodb_request_duration_seconds_bucket{operation="Query",table="QuizNox_Questions",le="+Inf"} 5
+quiznox_dynamodb_request_duration_seconds_sum{operation="Query",table="QuizNox_Questions"} 0.02
+quiznox_dynamodb_request_duration_seconds_count{operation="Query",table="QuizNox_Questions"} 5
+quiznox_dynamodb_retries_total{operation="Query",table="QuizNox_Questions"} 3
+quiznox_dynamodb_consumed_capacity_units_total{operation="Query",table="QuizNox_Questions"} 12.5
+quiznox_eventloop_lag_seconds{stat="p99"} 0.0125
+quiznox_http_requests_in_flight 0
+'''
+
+
+def test_parse_metrics_reads_labels_and_special_values():
+    samples = scrape_metrics.parse_metrics('m{a="x\\"y\\\\",le="+Inf"} 3\nplain 1.5\n# comment\n')
+
+    assert samples[('m', (('a', 'x"y\\'), ('le', '+Inf')))] == 3
+    assert samples[('plain', ())] == 1.5
+
+
+def test_histogram_quantile_interpolates_like_prometheus():
+    buckets = [(0.01, 50), (0.1, 100), (float('inf'), 100)]
+
+    assert scrape_metrics.histogram_quantile(0.5, buckets) == pytest.approx(0.01)
+    assert scrape_metrics.histogram_quantile(0.75, buckets) == pytest.approx(0.055)
+    assert scrape_metrics.histogram_quantile(0.5, [(0.1, 0), (float('inf'), 0)]) is None
+
+
+def test_summarize_reports_the_window_between_scrapes():
+    summary = scrape_metrics.summarize(scrape_metrics.parse_metrics(BEFORE), scrape_metrics.parse_metrics(AFTER))
+
+    questions = summary['routes']['GET /questions']
+    assert questions['count'] == 100
+    assert questions['mean_ms'] == pytest.approx(30)
+    assert questions['p50_ms'] == pytest.approx(10)
+    assert summary['routes']['GET /reviews']['errors_5xx'] == 2
+    assert summary['phases_mean_ms']['/questions']['handler'] == pytest.approx(2)
+    query = summary['dynamodb']['Query QuizNox_Questions']
+    assert query['errors'] == 1 and query['retries'] == 3 and query['capacity_units'] == 12.5
+    assert summary['eventloop_lag_ms'] == {'p99': 12.5}
+
+
+def test_check_flags_lag_and_dynamodb_errors():
+    summary = scrape_metrics.summarize({}, scrape_metrics.parse_metrics(AFTER))
+
+    failures = scrape_metrics.check(summary, max_lag_ms=10, max_error_rate=0.1)
+
+    assert len(failures) == 2
+    assert scrape_metrics.check(summary, max_lag_ms=20, max_error_rate=0.5) == []
@@ -0,0 +1,69 @@
+import update_apigateway_backend as gateway
+
+
+class FakeApiGateway:
+    def __init__(self, integrations, routes, page_size=1):
+        self.integrations = integrations
+        self.routes = routes
+        self.page_size = page_size
+        self.calls = []
+
+    def page(self, items, NextToken=None):
+        start = int(NextToken or 0)
+        end = start + self.page_size
+        resp = {'Items': items[start:end]}
+        if end < len(items):
+            resp['NextToken'] = str(end)
+        return resp
+
+    def get_integrations(self, ApiId, NextToken=None):
+        self.calls.append('get_integrations')
+        return self.page(self.integrations, NextToken)
+
+    def get_routes(self, ApiId, NextToken=None):
+        self.calls.append('get_routes')
+        return self.page(self.routes, NextToken)
+
+    def create_route(self, **params):
+        self.calls.append(('create_route', params['RouteKey']))
+
+    def update_route(self, **params):
+        self.calls.append(('update_route', params['RouteId']))
+
+
+def test_list_all_follows_next_token():
+    client = FakeApiGateway([], [{'RouteKey': key} for key in 'abc'])
+
+    assert [route['RouteKey'] for route in gateway.list_all(client.get_routes, ApiId='api')] == ['a', 'b', 'c']
+    assert client.calls.count('get_routes') == 3
+
+
+def test_plan_only_touches_routes_that_differ(monkeypatch):
+    monkeypatch.setattr(gateway, 'MUTATIONS_PER_SECOND', 100)
+    integrations = [
+        {'IntegrationId': 'lambda', 'IntegrationType': 'AWS_PROXY'},
+        {'IntegrationId': 'i1', 'IntegrationType': 'HTTP_PROXY', 'IntegrationUri': 'http://203.0.113.10:30080'},
+    ]
+    routes = [
+        {'RouteKey': '$default', 'RouteId': 'r1', 'Target': 'integrations/i1'},
+        {'RouteKey': 'GET /health', 'RouteId': 'r2', 'Target': 'integrations/old'},
+    ]
+    client = FakeApiGateway(integrations, routes)
+
+    integration = gateway.plan_integration(gateway.list_all(client.get_integrations, ApiId='api'), 'http://203.0.113.10:30080')
+    actions = gateway.plan_routes(routes, integration['integration_id'])
+    gateway.apply_routes(client, 'api', actions)
+
+    assert integration['action'] == 'noop'
+    assert [action['action'] for action in actions] == ['noop', 'create', 'update']
+    assert sorted(call for call in client.calls if isinstance(call, tuple)) == [
+        ('create_route', 'ANY /{proxy+}'), ('update_route', 'r2'),
+    ]
+
+
+def test_plan_for_new_integration_uses_placeholder_target():
+    integration = gateway.plan_integration([], 'http://lb.example.com')
+    actions = gateway.plan_routes([], integration['integration_id'])
+
+    assert integration['action'] == 'create'
+    assert {action['target'] for action in actions} == {'integrations/<new>'}